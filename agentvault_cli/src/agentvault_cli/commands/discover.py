@@ -36,19 +36,31 @@ DEFAULT_REGISTRY_URL = "http://localhost:8000" # Default for local development
     help="Number of results to skip (for pagination).",
     show_default=True
 )
+@click.option(
+    "--cursor",
+    default=None,
+    help="Continue from the cursor printed with a previous page (stable pagination; cannot be combined with --offset).",
+)
 @click.pass_context # Pass context for exiting on error
 async def discover_command(
     ctx: click.Context,
     search_query: Optional[str],
     registry_url: str,
     limit: int,
-    offset: int
+    offset: int,
+    cursor: Optional[str] = None
 ):
     """
     Discover agents listed in the AgentVault Registry.
 
     Optionally provide a SEARCH_QUERY to filter agents by name or description.
+    Each page prints a cursor for the next one; pass it with --cursor to page
+    through results without skipping or repeating agents that change meanwhile.
     """
+    if cursor and offset:
+        utils.display_error("--cursor and --offset cannot be combined.")
+        ctx.exit(1)
+        return
     utils.display_info(f"Discovering agents from registry: {registry_url}")
     if search_query:
         utils.display_info(f"Searching for: '{search_query}'")
@@ -56,9 +68,12 @@ async def discover_command(
     api_endpoint = f"{registry_url.rstrip('/')}/api/v1/agent-cards"
     params: Dict[str, Any] = {
         "limit": limit,
-        "offset": offset,
+        "skip": offset, # The registry's offset parameter
         "active_only": True # Default to searching active agents
     }
+    if cursor:
+        params["cursor"] = cursor
+        del params["skip"]
     if search_query:
         params["search"] = search_query
 
@@ -82,6 +97,7 @@ async def discover_command(
                 data = response.json()
                 items = data.get("items", [])
                 pagination = data.get("pagination")
+                next_cursor = data.get("next_cursor")
 
                 if not items:
                     utils.display_info("No matching agents found.")
@@ -93,19 +109,26 @@ async def discover_command(
                     for item in items
                 ]
                 utils.display_table(
-                    f"Found Agents (Page {pagination.get('current_page', '?') if pagination else '?'})",
+                    "Found Agents" if cursor else f"Found Agents (Page {pagination.get('current_page', '?') if pagination else '?'})",
                     ["ID", "Name", "Description"],
                     table_data
                 )
 
                 # Display pagination info
-                if pagination:
+                if cursor:
+                    total_str = f" out of {pagination.get('total_items')} total" if pagination and pagination.get('total_items') is not None else ""
+                    utils.display_info(f"\nShowing {len(items)} items{total_str}.")
+                    if next_cursor:
+                        utils.display_info(f"Hint: Use '--cursor {next_cursor}' to view the next page.")
+                elif pagination:
                     utils.display_info(
                         f"\nShowing {len(items)} items (offset {pagination.get('offset', 0)}) "
                         f"out of {pagination.get('total_items', 0)} total. "
                         f"Page {pagination.get('current_page', '?')} of {pagination.get('total_pages', '?')}."
                     )
-                    if pagination.get('offset', 0) + limit < pagination.get('total_items', 0):
+                    if next_cursor:
+                         utils.display_info(f"Hint: Use '--cursor {next_cursor}' to view the next page.")
+                    elif pagination.get('offset', 0) + limit < pagination.get('total_items', 0):
                          next_offset = pagination.get('offset', 0) + limit
                          utils.display_info(f"Hint: Use '--offset {next_offset}' to view the next page.")
                 else:
@@ -19,6 +19,8 @@ try:
     from agentvault import models as av_models
     from agentvault import key_manager
     from agentvault import client as av_client # Import the client class
+    from agentvault import http_pool # Shared connection pool
+    from agentvault import token_cache as av_token_cache
     _agentvault_lib_imported = True
 except ImportError as e:
     import sys
@@ -29,6 +31,8 @@ except ImportError as e:
     av_models = None
     key_manager = None
     av_client = None
+    http_pool = None
+    av_token_cache = None
     _agentvault_lib_imported = False
 
 # Import default registry URL from discover command
@@ -97,8 +101,8 @@ async def _load_agent_card(
                 lookup_url = f"{registry_url.rstrip('/')}/api/v1/agent-cards/id/{encoded_id}"
                 utils.display_info(f"Attempting direct lookup: {lookup_url}")
 
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(lookup_url, timeout=15.0, follow_redirects=True)
+                # Shared pooled client keeps the registry connection alive for later lookups
+                response = await http_pool.get_shared_http_client().get(lookup_url, timeout=15.0, follow_redirects=True)
 
                 if response.status_code == 200:
                     card_full_data = response.json()
@@ -196,6 +200,7 @@ def _get_artifact_filename(artifact: av_models.Artifact, content_is_structured:
     default=None,
     help="Directory to save artifact content larger than 1KB."
 )
+@click.option("--token-cache/--no-token-cache", "use_token_cache", default=True, show_default=True, help="Reuse OAuth access tokens across invocations via the on-disk token cache (path: $AGENTVAULT_TOKEN_CACHE).")
 @click.pass_context
 async def run_command(
     ctx: click.Context,
@@ -205,9 +210,29 @@ async def run_command(
     registry_url: str,
     key_service_override: Optional[str],
     auth_key_override: Optional[str],
-    output_artifacts: Optional[pathlib.Path]
+    output_artifacts: Optional[pathlib.Path],
+    use_token_cache: bool = True
 ):
     """ Runs a task on a specified remote agent... """
+    try:
+        await _run_task(ctx, agent_ref, input_data, context_file, registry_url, key_service_override, auth_key_override, output_artifacts, use_token_cache)
+    finally:
+        # Close pooled connections before the event loop of this invocation ends
+        if http_pool is not None: await http_pool.close_shared_http_client()
+
+
+async def _run_task(
+    ctx: click.Context,
+    agent_ref: str,
+    input_data: str,
+    context_file: Optional[pathlib.Path],
+    registry_url: str,
+    key_service_override: Optional[str],
+    auth_key_override: Optional[str],
+    output_artifacts: Optional[pathlib.Path],
+    use_token_cache: bool
+) -> None:
+    """Body of `run_command`; the shared HTTP client is closed by the caller."""
     global terminate_requested
     terminate_requested = False
 
@@ -289,7 +314,8 @@ async def run_command(
     signal.signal(signal.SIGINT, handle_interrupt)
 
     try:
-        async with av_client.AgentVaultClient() as client:
+        token_cache = av_token_cache.FileTokenCache() if use_token_cache else None
+        async with av_client.AgentVaultClient(token_cache=token_cache) as client:
             try:
                 utils.display_info("Initiating task with agent...")
                 task_id = await client.initiate_task(
@@ -400,7 +426,7 @@ async def run_command(
                  if task_id and final_task_state not in [av_models.TaskState.COMPLETED, av_models.TaskState.FAILED, av_models.TaskState.CANCELED]:
                      utils.display_info("-" * 20)
                      with utils.console.status("[bold cyan]Fetching final task status...", spinner="earth"):
-                         try: final_task = await client.get_task_status(agent_card, task_id, manager); final_task_state = final_task.state
+                         try: final_task = await client.get_task_status(agent_card, task_id, manager, include=[]); final_task_state = final_task.state # State only, not the history
                          except av_exceptions.A2AError as e: utils.display_error(f"Could not fetch final task status: {e}")
                          except Exception as e: utils.display_error(f"Unexpected error fetching final status: {e}")
                      utils.display_info(f"Final Task State: {final_task_state.value if final_task_state else 'Unknown/Fetch Failed'}")
@@ -75,7 +75,7 @@ async def test_discover_success(mock_display_info, mock_display_table, mock_ctx:
         "total_pages": 1, "current_page": 1
     }
     mock_response_data = {"items": mock_items, "pagination": mock_pagination}
-    route = respx.get(mock_url, params={'limit': 25, 'offset': 0, 'active_only': True}).mock(
+    route = respx.get(mock_url, params={'limit': 25, 'skip': 0, 'active_only': True}).mock(
         return_value=httpx.Response(200, json=mock_response_data)
     )
 
@@ -122,7 +122,7 @@ async def test_discover_search_and_pagination(mock_display_info, mock_display_ta
     mock_response_data = {"items": mock_items, "pagination": mock_pagination}
     route = respx.get(
         mock_url,
-        params={'limit': limit, 'offset': offset, 'active_only': True, 'search': search_term}
+        params={'limit': limit, 'skip': offset, 'active_only': True, 'search': search_term}
     ).mock(return_value=httpx.Response(200, json=mock_response_data))
 
     # Use the helper function instead of directly calling the callback
@@ -158,7 +158,7 @@ async def test_discover_custom_registry(mock_display_info, mock_ctx: MagicMock,
     custom_registry = "https://my-registry.test"
     mock_url = f"{custom_registry}/api/v1/agent-cards"
     mock_response_data = {"items": [], "pagination": {"total_items": 0, "limit": 25, "offset": 0, "total_pages": 0, "current_page": 1}}
-    route = respx.get(mock_url, params={'limit': 25, 'offset': 0, 'active_only': True}).mock(
+    route = respx.get(mock_url, params={'limit': 25, 'skip': 0, 'active_only': True}).mock(
         return_value=httpx.Response(200, json=mock_response_data)
     )
 
@@ -186,7 +186,7 @@ async def test_discover_registry_error_404(mock_display_error, mock_ctx: MagicMo
     """Test discovery when registry returns 404."""
     mock_url = f"{DEFAULT_REGISTRY_URL}/api/v1/agent-cards"
     error_detail = "Specific Agent Not Found"
-    respx.get(mock_url, params={'limit': 25, 'offset': 0, 'active_only': True}).mock(
+    respx.get(mock_url, params={'limit': 25, 'skip': 0, 'active_only': True}).mock(
         return_value=httpx.Response(404, json={"detail": error_detail})
     )
 
@@ -214,7 +214,7 @@ async def test_discover_registry_error_500(mock_display_error, mock_ctx: MagicMo
     """Test discovery when registry returns 500."""
     mock_url = f"{DEFAULT_REGISTRY_URL}/api/v1/agent-cards"
     error_text = "Internal Server Error Occurred"
-    respx.get(mock_url, params={'limit': 25, 'offset': 0, 'active_only': True}).mock(
+    respx.get(mock_url, params={'limit': 25, 'skip': 0, 'active_only': True}).mock(
         return_value=httpx.Response(500, text=error_text)
     )
 
@@ -249,7 +249,7 @@ async def test_discover_network_error(mock_display_error, mock_ctx: MagicMock, a
     """Test discovery with a network connection error."""
     mock_url = f"{DEFAULT_REGISTRY_URL}/api/v1/agent-cards"
     error_msg = "Connection refused"
-    respx.get(mock_url, params={'limit': 25, 'offset': 0, 'active_only': True}).mock(
+    respx.get(mock_url, params={'limit': 25, 'skip': 0, 'active_only': True}).mock(
         side_effect=httpx.ConnectError(error_msg)
     )
 
@@ -279,7 +279,7 @@ async def test_discover_network_error(mock_display_error, mock_ctx: MagicMock, a
 async def test_discover_invalid_json_response(mock_display_error, mock_ctx: MagicMock, anyio_backend):
     """Test discovery when registry returns invalid JSON."""
     mock_url = f"{DEFAULT_REGISTRY_URL}/api/v1/agent-cards"
-    respx.get(mock_url, params={'limit': 25, 'offset': 0, 'active_only': True}).mock(
+    respx.get(mock_url, params={'limit': 25, 'skip': 0, 'active_only': True}).mock(
         return_value=httpx.Response(200, text="{invalid json")
     )
 
@@ -301,4 +301,44 @@ async def test_discover_invalid_json_response(mock_display_error, mock_ctx: Magi
         "Failed to parse registry response" in args[0] 
         for args, _ in mock_display_error.call_args_list if isinstance(args[0], str)
     )
-    assert any_error_contains_text, "No error message containing 'Failed to parse registry response' found"
\ No newline at end of file
+    assert any_error_contains_text, "No error message containing 'Failed to parse registry response' found"
+
+@pytest.mark.asyncio
+@respx.mock
+@patch('agentvault_cli.commands.discover.utils.display_table')
+@patch('agentvault_cli.commands.discover.utils.display_info')
+async def test_discover_cursor_pagination(mock_display_info, mock_display_table, mock_ctx: MagicMock, anyio_backend):
+    """Test that pages print a --cursor hint and that --cursor requests the next page."""
+    mock_url = f"{DEFAULT_REGISTRY_URL}/api/v1/agent-cards"
+    first_page = {
+        "items": [{"id": "uuid-1", "name": "Agent One", "description": "Desc 1"}],
+        "pagination": {"total_items": 2, "limit": 1, "offset": 0, "total_pages": 2, "current_page": 1},
+        "next_cursor": "cursor-2"
+    }
+    second_page = {
+        "items": [{"id": "uuid-2", "name": "Agent Two", "description": "Desc 2"}],
+        "pagination": {"total_items": 2, "limit": 1, "offset": None, "total_pages": 2, "current_page": None},
+        "next_cursor": None
+    }
+    first_route = respx.get(mock_url, params={'limit': 1, 'skip': 0}).mock(return_value=httpx.Response(200, json=first_page))
+    second_route = respx.get(mock_url, params={'limit': 1, 'cursor': 'cursor-2'}).mock(return_value=httpx.Response(200, json=second_page))
+
+    await run_click_command(discover_command, mock_ctx=mock_ctx, search_query=None, registry_url=DEFAULT_REGISTRY_URL, limit=1, offset=0)
+    mock_display_info.assert_any_call("Hint: Use '--cursor cursor-2' to view the next page.")
+
+    await run_click_command(discover_command, mock_ctx=mock_ctx, search_query=None, registry_url=DEFAULT_REGISTRY_URL, limit=1, offset=0, cursor="cursor-2")
+
+    assert first_route.call_count == 1 and second_route.call_count == 1
+    assert "skip" not in second_route.calls.last.request.url.params
+    mock_display_table.assert_called_with("Found Agents", ["ID", "Name", "Description"], [['uuid-2', 'Agent Two', 'Desc 2']])
+    mock_display_info.assert_any_call("\nShowing 1 items out of 2 total.")
+    assert not any(args[0] != 0 for args, _ in mock_ctx.exit.call_args_list)
+
+
+@pytest.mark.asyncio
+@patch('agentvault_cli.commands.discover.utils.display_error')
+async def test_discover_cursor_with_offset_fails(mock_display_error, mock_ctx: MagicMock, anyio_backend):
+    """Test that --cursor cannot be combined with --offset."""
+    await run_click_command(discover_command, mock_ctx=mock_ctx, search_query=None, registry_url=DEFAULT_REGISTRY_URL, limit=25, offset=10, cursor="abc")
+    mock_display_error.assert_called_once_with("--cursor and --offset cannot be combined.")
+    assert any(args[0] == 1 for args, _ in mock_ctx.exit.call_args_list)
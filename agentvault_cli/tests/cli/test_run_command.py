@@ -126,6 +126,19 @@ async def test_run_calls_load_agent(mock_key_mgr, mock_load_card_helper,
     mock_display_success.assert_any_call(f"Successfully loaded agent: {mock_agent_card.name} ({mock_agent_card.human_readable_id})")
     assert any(args[0] == 0 for args, _ in mock_ctx.exit.call_args_list)
 
+@pytest.mark.asyncio
+@patch('agentvault_cli.commands.run.http_pool.close_shared_http_client', new_callable=AsyncMock)
+@patch('agentvault_cli.commands.run._run_task', new_callable=AsyncMock)
+async def test_run_closes_shared_http_client(mock_run_task, mock_close_client, mock_ctx, anyio_backend):
+    mock_run_task.side_effect = click.exceptions.Exit(1)
+    with pytest.raises(click.exceptions.Exit):
+        await run_click_command(
+            run_command, mock_ctx=mock_ctx, agent_ref='some-ref', input_data='test', context_file=None,
+            registry_url='dummy_url', key_service_override=None, auth_key_override=None,
+            output_artifacts=None
+        )
+    mock_close_client.assert_awaited_once()
+
 @pytest.mark.asyncio
 @patch('agentvault_cli.commands.run.run_command.callback')
 @patch('agentvault_cli.commands.run.utils.display_error')
@@ -0,0 +1,71 @@
+"""
+Benchmark of the JSON codecs behind `agentvault.json_codec`.
+
+Builds a `tasks/get` JSON-RPC response for a Task with a long message history
+(text and data parts) and some artifacts, then measures for every installed
+backend (orjson, msgspec, json):
+
+- encode: `json_codec.dumps` of the response dict (what the Server SDK router
+  and the registry send after `model_dump(mode='json')`)
+- decode: `json_codec.loads` of the encoded bytes (what AgentVaultClient does
+  with every response body and SSE event)
+
+Usage:
+    python benchmarks/bench_json_codec.py --messages 100 1000 5000 --repeat 20
+"""
+
+import argparse
+import datetime
+import time
+from typing import Any, Callable, Dict
+
+from agentvault import json_codec
+from agentvault.models import Task, TaskState, Message, TextPart, DataPart, Artifact
+
+
+def build_task(messages: int) -> Task:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    history = []
+    for i in range(messages):
+        if i % 4 == 3:
+            parts = [DataPart(content={"tool": "search", "call": i, "results": [{"title": f"Result {j}", "score": j / 10} for j in range(5)]})]
+        else:
+            parts = [TextPart(content=f"Message {i}: " + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4)]
+        history.append(Message(role="user" if i % 2 == 0 else "assistant", parts=parts, metadata={"timestamp": now.isoformat(), "index": i}))
+    artifacts = [Artifact(id=f"artifact-{i}", type="log", content="line\n" * 50, media_type="text/plain") for i in range(10)]
+    return Task(id="task-bench", state=TaskState.COMPLETED, createdAt=now, updatedAt=now, messages=history, artifacts=artifacts)
+
+
+def measure(func: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter(); func(); best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    codecs = json_codec.available_json_codecs()
+    print(f"Installed codecs: {', '.join(codecs)}")
+    print(f"{'messages':>8}  {'codec':<8} {'size':>9}  {'encode ms':>9}  {'decode ms':>9}  {'vs json':>10}")
+    try:
+        for messages in args.messages:
+            response: Dict[str, Any] = {"jsonrpc": "2.0", "id": 1, "result": build_task(messages).model_dump(mode="json", by_alias=True)}
+            baseline = None
+            for name in reversed(codecs): # json first, as baseline
+                json_codec.set_json_codec(name)
+                encoded = json_codec.dumps(response)
+                encode = measure(lambda: json_codec.dumps(response), args.repeat)
+                decode = measure(lambda: json_codec.loads(encoded), args.repeat)
+                if baseline is None: baseline = encode + decode
+                print(f"{messages:>8}  {name:<8} {len(encoded) / 1024:>7.0f}KB  {encode * 1000:>9.2f}  {decode * 1000:>9.2f}  {baseline / (encode + decode):>9.2f}x")
+    finally:
+        json_codec.set_json_codec(None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark of the ways AgentVaultClient can turn a `tasks/get` response body
+into a `Task`.
+
+Builds the JSON-RPC response for a Task with a long message history (text,
+file and data parts) and measures:
+
+- undiscriminated Part: `json_codec.loads`, then `model_validate` of a Task
+  whose `Part` is a plain union, as before `Part` was discriminated by `type`
+- model_validate: `json_codec.loads`, then `Task.model_validate` of the result
+- validate_json: `jsonrpc_response_adapter(Task).validate_json` of the raw
+  body, without an intermediate dict
+- adapter validate_python: `json_codec.loads`, then
+  `jsonrpc_response_adapter(Task).validate_python` (what AgentVaultClient does)
+
+Usage:
+    python benchmarks/bench_models.py --messages 100 1000 5000 --repeat 20
+"""
+
+import argparse
+import datetime
+import time
+from typing import Any, Callable, List, Union
+
+from agentvault import json_codec
+from agentvault.models import (
+    Task, TaskState, Message, TextPart, FilePart, DataPart, Artifact,
+    jsonrpc_response_adapter
+)
+
+
+class UndiscriminatedMessage(Message):
+    parts: List[Union[TextPart, FilePart, DataPart]] # type: ignore[assignment]
+
+class UndiscriminatedTask(Task):
+    messages: List[UndiscriminatedMessage] # type: ignore[assignment]
+
+
+def build_task(messages: int) -> Task:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    history = []
+    for i in range(messages):
+        if i % 4 == 3:
+            parts = [DataPart(content={"tool": "search", "call": i, "results": [{"title": f"Result {j}", "score": j / 10} for j in range(5)]})]
+        elif i % 8 == 5:
+            parts = [TextPart(content=f"See attachment {i}."), FilePart(url=f"https://files.example.com/{i}.pdf", media_type="application/pdf")]
+        else:
+            parts = [TextPart(content=f"Message {i}: " + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4)]
+        history.append(Message(role="user" if i % 2 == 0 else "assistant", parts=parts, metadata={"index": i}))
+    artifacts = [Artifact(id=f"artifact-{i}", type="log", content="line\n" * 50, media_type="text/plain") for i in range(10)]
+    return Task(id="task-bench", state=TaskState.COMPLETED, createdAt=now, updatedAt=now, messages=history, artifacts=artifacts)
+
+
+def measure(func: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter(); func(); best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    adapter = jsonrpc_response_adapter(Task)
+    print(f"JSON codec: {json_codec.get_json_codec()}")
+    print(f"{'messages':>8}  {'method':<24} {'ms':>9}  {'speedup':>8}")
+    for messages in args.messages:
+        task = build_task(messages)
+        body = json_codec.dumps({"jsonrpc": "2.0", "id": 1, "result": task.model_dump(mode="json", by_alias=True)})
+        assert adapter.validate_json(body)["result"] == adapter.validate_python(json_codec.loads(body))["result"] == task
+        methods = {
+            "undiscriminated Part": lambda: UndiscriminatedTask.model_validate(json_codec.loads(body)["result"]),
+            "model_validate": lambda: Task.model_validate(json_codec.loads(body)["result"]),
+            "validate_json": lambda: adapter.validate_json(body)["result"],
+            "adapter validate_python": lambda: adapter.validate_python(json_codec.loads(body))["result"],
+        }
+        baseline = None
+        for name, func in methods.items():
+            elapsed = measure(func, args.repeat)
+            if baseline is None: baseline = elapsed
+            print(f"{messages:>8}  {name:<24} {elapsed * 1000:>9.2f}  {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
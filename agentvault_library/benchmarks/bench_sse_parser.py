@@ -0,0 +1,119 @@
+"""
+Microbenchmark of SSE parsing in AgentVaultClient.
+
+Compares the previous line-based approach (`aiter_lines()`, per-line `find(':')`,
+string slicing, `'\\n'.join()` and `json.loads` of the joined string) with the
+incremental byte-level `SSEParser` fed `aiter_bytes()`-sized chunks. Both
+decode the JSON data of every event. Reports events per second.
+
+Usage:
+    python benchmarks/bench_sse_parser.py --events 20000 --chunk-size 4096 --artifact-size 256
+"""
+
+import argparse
+import io
+import json
+import logging
+import time
+from typing import Callable, Iterator, List
+
+from httpx._decoders import LineDecoder, TextDecoder
+
+from agentvault.sse import SSEParser
+
+logger = logging.getLogger("bench_sse_parser") # Debug disabled, as in production
+
+
+def build_stream(events: int, artifact_size: int) -> bytes:
+    """Alternating status and artifact events; artifact content spans several data lines."""
+    content = "x" * artifact_size
+    out = io.BytesIO()
+    for i in range(events):
+        if i % 2:
+            artifact = {"taskId": "t-1", "artifact": {"id": f"a-{i}", "type": "text", "content": content}, "timestamp": "2025-01-01T00:00:00Z"}
+            body = json.dumps(artifact, indent=1) # Multi-line data
+            out.write(f"id: {i}\nevent: task_artifact\n".encode())
+            for line in body.split("\n"): out.write(f"data: {line}\n".encode())
+            out.write(b"\n")
+        else:
+            status = {"taskId": "t-1", "state": "WORKING", "timestamp": "2025-01-01T00:00:00Z"}
+            out.write(f"id: {i}\nevent: task_status\ndata: {json.dumps(status)}\n\n".encode())
+    return out.getvalue()
+
+
+def split_chunks(stream: bytes, chunk_size: int) -> List[bytes]:
+    return [stream[i:i + chunk_size] for i in range(0, len(stream), chunk_size)]
+
+
+def _iter_lines(chunks: List[bytes]) -> Iterator[str]:
+    """What `httpx.Response.aiter_lines()` does: incremental UTF-8 decoding and line splitting."""
+    text_decoder = TextDecoder(encoding="utf-8"); line_decoder = LineDecoder()
+    for chunk in chunks:
+        yield from line_decoder.decode(text_decoder.decode(chunk))
+    yield from line_decoder.decode(text_decoder.flush())
+    yield from line_decoder.flush()
+
+
+def parse_lines(chunks: List[bytes]) -> int:
+    """The previous implementation, including its per-line debug f-string."""
+    count = 0
+    event_type = None; data_lines: List[str] = []
+    for line in _iter_lines(chunks):
+        logger.debug(f"SSE Line Received: {line!r}")
+        if not line:
+            if data_lines:
+                json.loads("\n".join(data_lines)); count += 1
+            data_lines = []; event_type = None
+            continue
+        if line.startswith(":"): continue
+        colon_pos = line.find(":")
+        if colon_pos == -1: continue
+        field = line[:colon_pos].strip()
+        value_start = colon_pos + 1
+        if value_start < len(line) and line[value_start] == " ": value_start += 1
+        value = line[value_start:]
+        if field == "event": event_type = value
+        elif field == "data": data_lines.append(value)
+    return count
+
+
+def parse_bytes(chunks: List[bytes]) -> int:
+    parser = SSEParser()
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    count = 0
+    for chunk in chunks:
+        if debug_enabled: logger.debug(f"SSE chunk received: {len(chunk)} bytes")
+        for event in parser.feed(chunk):
+            json.loads(event.data); count += 1
+    return count
+
+
+def measure(name: str, func: Callable[[List[bytes]], int], chunks: List[bytes], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = func(chunks)
+        best = min(best, time.perf_counter() - start)
+    rate = count / best
+    print(f"{name:<12} {count:>8} events  {best * 1000:>9.1f} ms  {rate:>12,.0f} events/s")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--chunk-size", type=int, default=4096, help="Bytes per network chunk")
+    parser.add_argument("--artifact-size", type=int, default=256, help="Characters of artifact content")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    stream = build_stream(args.events, args.artifact_size)
+    chunks = split_chunks(stream, args.chunk_size)
+    print(f"{len(stream) / 1e6:.1f} MB in {len(chunks)} chunks of {args.chunk_size} bytes")
+    line_rate = measure("lines (old)", parse_lines, chunks, args.repeat)
+    byte_rate = measure("bytes (new)", parse_bytes, chunks, args.repeat)
+    print(f"speedup: {byte_rate / line_rate:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
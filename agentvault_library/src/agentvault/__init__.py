@@ -9,13 +9,18 @@ try:
     from .exceptions import (
         AgentVaultError, AgentCardError, AgentCardValidationError, AgentCardFetchError,
         A2AError, A2AConnectionError, A2AAuthenticationError, A2ARemoteAgentError,
-        A2ATimeoutError, A2AMessageError, KeyManagementError
+        A2ATimeoutError, A2ACircuitOpenError, A2AMessageError, KeyManagementError
     )
     from .key_manager import KeyManager
     from .agent_card_utils import (
         parse_agent_card_from_dict, load_agent_card_from_file, fetch_agent_card_from_url
     )
     from .client import AgentVaultClient
+    from .retry import RetryPolicy, RequestAttempt
+    from .circuit_breaker import CircuitBreakerConfig, CircuitState
+    from .hedging import HedgingPolicy, HedgeBudget
+    from .http_pool import HttpPoolConfig, configure_http_pool, get_shared_http_client, get_http_pool_stats
+    from .token_cache import FileTokenCache
     from .models.agent_card import AgentCard # Expose main model
     from .models.a2a_protocol import Message, TextPart, FilePart, DataPart # Expose core message parts
 except ImportError:
@@ -12,6 +12,7 @@ import pydantic
 
 # Import local models and exceptions
 from .models.agent_card import AgentCard
+from .http_pool import get_shared_http_client
 from .exceptions import (
     AgentCardError,
     AgentCardValidationError,
@@ -96,7 +97,7 @@ async def fetch_agent_card_from_url(
     Args:
         url: The URL to fetch the Agent Card JSON from.
         http_client: An optional httpx.AsyncClient instance for making the request.
-                     If None, a temporary client will be created.
+                     If None, the shared pooled client (see `agentvault.http_pool`) is used.
 
     Returns:
         A validated AgentCard Pydantic model instance.
@@ -106,7 +107,6 @@ async def fetch_agent_card_from_url(
                              status code, or the response is not valid JSON.
         AgentCardValidationError: If the fetched JSON content fails Agent Card validation.
     """
-    client_to_use: httpx.AsyncClient
 
     async def _fetch(client: httpx.AsyncClient):
         try:
@@ -141,11 +141,6 @@ async def fetch_agent_card_from_url(
             # Catch any other unexpected errors during fetch/parse
             raise AgentCardFetchError(f"An unexpected error occurred fetching Agent Card from '{url}': {e}") from e
 
-    if http_client:
-        return await _fetch(http_client)
-    else:
-        # Create a temporary client if none was provided
-        async with httpx.AsyncClient() as temp_client:
-            return await _fetch(temp_client)
+    return await _fetch(http_client or get_shared_http_client())
 
 #
@@ -0,0 +1,138 @@
+"""
+Circuit breaker used by AgentVaultClient to fail fast on unavailable agent endpoints.
+"""
+
+import enum
+import time
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Any, Callable, Deque
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, enum.Enum):
+    """State of the circuit for one agent endpoint."""
+    CLOSED = "closed" # Requests pass; outcomes are recorded
+    OPEN = "open" # Requests fail immediately until the probe interval has passed
+    HALF_OPEN = "half_open" # A limited number of probe requests decide whether to close again
+
+
+@dataclass(frozen=True)
+class CircuitBreakerConfig:
+    """
+    Settings for the per-endpoint circuit breakers of AgentVaultClient.
+
+    Attributes:
+        failure_rate_threshold: Fraction of failed calls in the window (0-1) that opens the circuit.
+        window_size: Number of most recent calls the failure rate is computed over.
+        minimum_calls: Calls needed in the window before the failure rate is evaluated.
+        probe_interval: Seconds an open circuit rejects calls before letting probes through.
+        half_open_max_calls: Concurrent probe calls allowed while half-open. All of
+            them must succeed to close the circuit; any failure opens it again.
+    """
+    failure_rate_threshold: float = 0.5
+    window_size: int = 20
+    minimum_calls: int = 5
+    probe_interval: float = 30.0
+    half_open_max_calls: int = 1
+
+    def __post_init__(self):
+        if not 0 < self.failure_rate_threshold <= 1: raise ValueError("failure_rate_threshold must be in (0, 1].")
+        if self.window_size < 1: raise ValueError("window_size must be at least 1.")
+        if not 1 <= self.minimum_calls <= self.window_size: raise ValueError("minimum_calls must be between 1 and window_size.")
+        if self.probe_interval < 0: raise ValueError("probe_interval must not be negative.")
+        if self.half_open_max_calls < 1: raise ValueError("half_open_max_calls must be at least 1.")
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for a single endpoint, based on the failure rate of a sliding
+    window of recent calls. Not thread-safe; meant for use within one event loop.
+
+    Callers check `allow_request()` before a call and report its outcome with
+    `record_success()`, `record_failure()` or, if the call ended without a
+    meaningful outcome (e.g. it was cancelled), `record_ignored()`.
+    """
+    def __init__(self, endpoint: str, config: CircuitBreakerConfig, clock: Callable[[], float] = time.monotonic):
+        self.endpoint = endpoint
+        self.config = config
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._outcomes: Deque[bool] = deque(maxlen=config.window_size) # True = failure
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._stats: Dict[str, int] = {"calls": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state; an open circuit whose probe interval has passed reports HALF_OPEN."""
+        if self._state == CircuitState.OPEN and self._clock() - self._opened_at >= self.config.probe_interval:
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    @property
+    def failure_rate(self) -> float:
+        return sum(self._outcomes) / len(self._outcomes) if self._outcomes else 0.0
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a probe through (0 if not open)."""
+        if self.state != CircuitState.OPEN: return 0.0
+        return max(0.0, self.config.probe_interval - (self._clock() - self._opened_at))
+
+    def allow_request(self) -> bool:
+        """Returns whether a call may be made now. Rejected calls are counted."""
+        state = self.state
+        if state == CircuitState.CLOSED: return True
+        if state == CircuitState.HALF_OPEN and self._probes_in_flight < self.config.half_open_max_calls:
+            self._probes_in_flight += 1
+            return True
+        self._stats["rejected"] += 1
+        return False
+
+    def record_success(self) -> None:
+        self._stats["calls"] += 1
+        if self._state == CircuitState.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            self._probe_successes += 1
+            if self._probe_successes >= self.config.half_open_max_calls: self._transition(CircuitState.CLOSED)
+            return
+        self._outcomes.append(False)
+
+    def record_failure(self) -> None:
+        self._stats["calls"] += 1; self._stats["failures"] += 1
+        if self._state == CircuitState.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            self._transition(CircuitState.OPEN)
+            return
+        self._outcomes.append(True)
+        if self._state == CircuitState.CLOSED and len(self._outcomes) >= self.config.minimum_calls and self.failure_rate >= self.config.failure_rate_threshold:
+            self._transition(CircuitState.OPEN)
+
+    def record_ignored(self) -> None:
+        """Releases a probe slot taken by `allow_request()` for a call without outcome."""
+        if self._state == CircuitState.HALF_OPEN: self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def reset(self) -> None:
+        """Closes the circuit and forgets recorded outcomes."""
+        self._transition(CircuitState.CLOSED)
+
+    def get_stats(self) -> Dict[str, Any]:
+        state = self.state
+        return {**self._stats, "state": state.value, "failure_rate": self.failure_rate, "window_calls": len(self._outcomes), "retry_after": self.retry_after()}
+
+    def _transition(self, new_state: CircuitState) -> None:
+        if new_state == CircuitState.OPEN:
+            self._opened_at = self._clock(); self._stats["opened"] += 1
+            reason = "probe call failed" if self._state == CircuitState.HALF_OPEN else f"failure rate {self.failure_rate:.0%} over {len(self._outcomes)} calls"
+            logger.warning(f"Circuit for '{self.endpoint}' opened ({reason}); rejecting calls for {self.config.probe_interval}s.")
+        elif new_state == CircuitState.HALF_OPEN:
+            logger.info(f"Circuit for '{self.endpoint}' half-open; allowing probe calls.")
+        elif self._state != CircuitState.CLOSED:
+            logger.info(f"Circuit for '{self.endpoint}' closed.")
+        if new_state != CircuitState.OPEN: self._outcomes.clear()
+        self._state = new_state
+        self._probes_in_flight = 0; self._probe_successes = 0
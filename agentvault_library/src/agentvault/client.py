@@ -13,23 +13,41 @@ import typing
 import uuid
 import pydantic
 import time
+import random
 from typing import Optional, Dict, Any, Union, AsyncGenerator, Tuple, List
 
 # Import local models
 from agentvault.models import (
     AgentCard, AgentAuthentication, Message, Task, TaskState, TaskStatusUpdateEvent,
     TaskArtifactUpdateEvent, TaskMessageEvent, TaskSendParams, TaskSendResult,
-    TaskGetParams, GetTaskResult, TaskCancelParams, TaskCancelResult, A2AEvent
+    TaskGetParams, TaskGetInclude, GetTaskResult, TaskWaitParams, TERMINAL_TASK_STATES, TaskCancelParams, TaskCancelResult, A2AEvent
 )
+from agentvault.models.a2a_protocol import SSE_EVENT_ADAPTERS, TASK_ADAPTER, jsonrpc_response_adapter
 # Import local exceptions
 from agentvault.exceptions import (
     AgentVaultError, A2AError, A2AConnectionError, A2AAuthenticationError,
-    A2ARemoteAgentError, A2ATimeoutError, A2AMessageError, KeyManagementError
+    A2ARemoteAgentError, A2ATimeoutError, A2AMessageError, KeyManagementError, A2ACircuitOpenError
 )
 # Import KeyManager
 from agentvault.key_manager import KeyManager
 # Import MCP Utils
 from agentvault.mcp_utils import format_mcp_context
+# Import retry policy
+from agentvault.retry import (
+    RetryPolicy, RequestAttempt, IDEMPOTENT_METHODS, IDEMPOTENCY_KEY_METHODS, IDEMPOTENCY_KEY_HEADER, parse_retry_after
+)
+# Import circuit breaker
+from agentvault.circuit_breaker import CircuitBreaker, CircuitBreakerConfig, CircuitState
+# Import request hedging
+from agentvault.hedging import HedgingPolicy, LatencyTracker, hedge_delay, HEDGEABLE_METHODS
+# Import shared HTTP connection pool
+from agentvault.http_pool import get_shared_http_client
+# Import on-disk OAuth token cache
+from agentvault.token_cache import FileTokenCache
+# Import incremental SSE parser
+from agentvault.sse import SSEParser
+# Import pluggable JSON codec
+from agentvault import json_codec
 
 
 logger = logging.getLogger(__name__)
@@ -44,39 +62,136 @@ SSE_EVENT_TYPE_MAP = {
 
 
 CACHE_EXPIRY_BUFFER_SECONDS = 60
+JSONRPC_METHOD_NOT_FOUND = -32601 # Error code of agents that do not implement a method (e.g. tasks/wait)
 
 class AgentVaultClient:
     """ Client for interacting with remote agents... """
     def __init__(
         self,
         http_client: Optional[httpx.AsyncClient] = None,
-        default_timeout: float = 30.0
+        default_timeout: float = 30.0,
+        sse_max_reconnects: int = 5,
+        sse_reconnect_delay: float = 0.5,
+        sse_max_reconnect_delay: float = 10.0,
+        retry_policy: Optional[RetryPolicy] = None,
+        on_request_attempt: Optional[typing.Callable[[RequestAttempt], None]] = None,
+        circuit_breaker: Optional[CircuitBreakerConfig] = None,
+        hedging_policy: Optional[HedgingPolicy] = None,
+        use_shared_pool: bool = True,
+        oauth_refresh_ahead: float = 60.0,
+        oauth_retry_backoff: float = 1.0,
+        oauth_max_retry_backoff: float = 60.0,
+        token_cache: Optional[FileTokenCache] = None,
     ):
-        """Initializes the AgentVaultClient."""
+        """
+        Initializes the AgentVaultClient.
+
+        Args:
+            http_client: Optional externally managed httpx.AsyncClient.
+            default_timeout: Request timeout in seconds (unless `http_client` is given).
+            sse_max_reconnects: How often an interrupted SSE stream is resumed (with
+                `Last-Event-ID`) before the error is raised. Only streams whose
+                events carry IDs are resumed; the count resets after each event.
+            sse_reconnect_delay: Initial delay before resuming, doubled per attempt
+                with jitter. A `retry:` field sent by the agent replaces it.
+            sse_max_reconnect_delay: Upper bound for the reconnect delay.
+            retry_policy: How failed non-streaming requests are retried (default:
+                no retries). See RetryPolicy for which methods are retried.
+            on_request_attempt: Optional callback receiving a RequestAttempt for
+                every HTTP attempt, e.g. to export per-attempt metrics.
+            circuit_breaker: Enables a circuit breaker per agent endpoint URL (default:
+                disabled). Requests to an endpoint whose circuit is open raise
+                A2ACircuitOpenError without contacting the agent.
+            hedging_policy: Enables hedged requests for idempotent methods (default:
+                disabled): a slow request is sent again and the first response wins.
+            use_shared_pool: Without `http_client`, use the process-wide pooled client
+                from `agentvault.http_pool` (default) so connections are reused
+                across client instances. False creates a private client per instance.
+            oauth_refresh_ahead: Seconds before a cached OAuth token's expiry (which
+                already excludes CACHE_EXPIRY_BUFFER_SECONDS) at which it is refreshed
+                in the background while still being used. 0 disables proactive refresh.
+            oauth_retry_backoff: Initial wait after a failed token request before the
+                token endpoint is contacted again for that service; doubled per failure.
+            oauth_max_retry_backoff: Upper bound for the token request backoff.
+            token_cache: Optional on-disk OAuth token cache consulted before requesting
+                a token, so tokens survive across processes (e.g. CLI invocations).
+        """
         self.default_timeout = default_timeout
+        self.sse_max_reconnects = sse_max_reconnects
+        self.sse_reconnect_delay = sse_reconnect_delay
+        self.sse_max_reconnect_delay = sse_max_reconnect_delay
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=1)
+        self.on_request_attempt = on_request_attempt
+        self.circuit_breaker_config = circuit_breaker
+        self._circuit_breakers: Dict[str, CircuitBreaker] = {}
+        self.hedging_policy = hedging_policy
+        self._latency_trackers: Dict[str, LatencyTracker] = {}
+        self._request_stats: Dict[str, int] = {"requests": 0, "attempts": 0, "retries": 0, "failed_requests": 0, "retry_after_waits": 0, "hedged_requests": 0, "hedge_wins": 0, "hedges_denied": 0}
+        self._provided_http_client: Optional[httpx.AsyncClient] = None
+        self._uses_shared_pool = False
         if http_client:
-            self._http_client = http_client
+            self._provided_http_client = http_client
             self._should_close_client = False
             logger.debug("Using provided httpx.AsyncClient instance.")
+        elif use_shared_pool:
+            # Resolved per request: the shared client belongs to the running event loop
+            self._uses_shared_pool = True
+            self._should_close_client = False
+            logger.debug("Using the shared pooled httpx.AsyncClient.")
         else:
             logger.debug(f"Creating internal httpx.AsyncClient instance with timeout {default_timeout}s.")
-            self._http_client = httpx.AsyncClient(
+            self._provided_http_client = httpx.AsyncClient(
                 timeout=default_timeout,
                 http2=True,
                 follow_redirects=True
             )
             self._should_close_client = True
         self._token_cache: Dict[str, Tuple[str, Optional[float]]] = {}
+        self.oauth_refresh_ahead = oauth_refresh_ahead
+        self.oauth_retry_backoff = oauth_retry_backoff
+        self.oauth_max_retry_backoff = oauth_max_retry_backoff
+        self.token_cache = token_cache
+        self._token_refreshes: Dict[str, "asyncio.Task[str]"] = {} # service_id -> in-flight token request
+        self._token_failures: Dict[str, Tuple[int, float]] = {} # service_id -> (consecutive failures, monotonic time of next attempt)
 
 
+    @property
+    def _http_client(self) -> httpx.AsyncClient:
+        return self._provided_http_client if self._provided_http_client is not None else get_shared_http_client()
+
     async def close(self) -> None:
-        """Closes the underlying HTTP client if it was created internally."""
-        if self._should_close_client and not self._http_client.is_closed:
+        """Closes the underlying HTTP client if it was created internally. The shared pooled client stays open."""
+        for refresh in list(self._token_refreshes.values()): refresh.cancel()
+        if self._uses_shared_pool:
+            logger.debug("Using the shared pooled httpx.AsyncClient, not closing.")
+        elif self._should_close_client and not self._http_client.is_closed:
             logger.debug("Closing internally managed httpx.AsyncClient instance.")
             await self._http_client.aclose()
         elif not self._should_close_client:
              logger.debug("Using externally managed httpx.AsyncClient, not closing.")
 
+    def get_request_stats(self) -> Dict[str, int]:
+        """Returns counters of non-streaming requests, HTTP attempts, retries, failed requests and hedging."""
+        return dict(self._request_stats)
+
+    def get_circuit_state(self, agent: Union[AgentCard, str]) -> CircuitState:
+        """
+        Returns the circuit state for an agent (card or endpoint URL), e.g. to route
+        work to healthy agents. Endpoints without recorded calls, or all endpoints
+        when circuit breaking is disabled, are CLOSED.
+        """
+        breaker = self._circuit_breakers.get(str(agent.url) if isinstance(agent, AgentCard) else str(agent))
+        return breaker.state if breaker is not None else CircuitState.CLOSED
+
+    def get_circuit_breaker_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Returns state, failure rate and call/rejection counters per agent endpoint URL."""
+        return {endpoint: breaker.get_stats() for endpoint, breaker in self._circuit_breakers.items()}
+
+    def reset_circuit(self, agent: Union[AgentCard, str]) -> None:
+        """Closes the circuit for an agent (card or endpoint URL) and forgets its recorded failures."""
+        breaker = self._circuit_breakers.get(str(agent.url) if isinstance(agent, AgentCard) else str(agent))
+        if breaker is not None: breaker.reset()
+
     async def __aenter__(self) -> "AgentVaultClient":
         """Enter the async context manager."""
         return self
@@ -89,8 +204,15 @@ class AgentVaultClient:
     async def initiate_task(
         self, agent_card: AgentCard, initial_message: Message, key_manager: KeyManager,
         mcp_context: Optional[Dict[str, Any]] = None,
-        webhook_url: Optional[str] = None
+        webhook_url: Optional[str] = None,
+        idempotency_key: Optional[str] = None
     ) -> str:
+        """
+        Starts a new task on the agent and returns its task ID.
+
+        Pass an `idempotency_key` (sent as `Idempotency-Key` header) to allow the
+        request to be retried according to the client's retry policy.
+        """
         logger.info(f"Initiating task with agent: {agent_card.human_readable_id}")
         if webhook_url: logger.info(f"Webhook URL provided for push notifications: {webhook_url}")
         try:
@@ -112,8 +234,8 @@ class AgentVaultClient:
             if webhook_url: request_params_dict['webhookUrl'] = webhook_url; logger.debug(f"Adding webhookUrl='{webhook_url}' to initiate task params.")
             request_payload = {"jsonrpc": "2.0", "method": "tasks/send", "params": request_params_dict, "id": request_id}
             logger.debug(f"Initiate task request payload (id: {request_id})")
-            response_data = await self._make_request('POST', str(agent_card.url), headers=auth_headers, json_payload=request_payload, stream=False)
-            try: result_obj = TaskSendResult.model_validate(response_data)
+            response_data = await self._make_request('POST', str(agent_card.url), headers=auth_headers, json_payload=request_payload, stream=False, idempotency_key=idempotency_key, result_model=TaskSendResult)
+            try: result_obj = response_data if isinstance(response_data, TaskSendResult) else TaskSendResult.model_validate(response_data)
             except pydantic.ValidationError as e: raise A2AMessageError(f"Failed to validate task initiation result structure: {e}") from e
             task_id = result_obj.id
             if not task_id or not isinstance(task_id, str): raise A2AMessageError("Invalid response format: 'result.id' is missing, empty, or not a string.")
@@ -125,8 +247,15 @@ class AgentVaultClient:
 
     async def send_message(
         self, agent_card: AgentCard, task_id: str, message: Message, key_manager: KeyManager,
-        mcp_context: Optional[Dict[str, Any]] = None
+        mcp_context: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None
     ) -> bool:
+        """
+        Sends a message to an existing task.
+
+        Pass an `idempotency_key` (sent as `Idempotency-Key` header) to allow the
+        request to be retried according to the client's retry policy.
+        """
         logger.info(f"Sending message to task {task_id} on agent: {agent_card.human_readable_id}")
         if not task_id or not isinstance(task_id, str): raise ValueError("Invalid task_id provided for send_message.")
         try:
@@ -144,8 +273,9 @@ class AgentVaultClient:
             request_id = f"req-send-{uuid.uuid4()}"; request_params_dict = task_send_params.model_dump(mode='json', exclude_none=True, by_alias=True)
             request_payload = {"jsonrpc": "2.0", "method": "tasks/send", "params": request_params_dict, "id": request_id}
             logger.debug(f"Send message request payload (id: {request_id})")
-            response_data = await self._make_request('POST', str(agent_card.url), headers=auth_headers, json_payload=request_payload, stream=False)
-            try: TaskSendResult.model_validate(response_data)
+            response_data = await self._make_request('POST', str(agent_card.url), headers=auth_headers, json_payload=request_payload, stream=False, idempotency_key=idempotency_key, result_model=TaskSendResult)
+            try:
+                if not isinstance(response_data, TaskSendResult): TaskSendResult.model_validate(response_data)
             except pydantic.ValidationError as e: raise A2AMessageError(f"Failed to validate send message result structure: {e}") from e
             logger.info(f"Message successfully sent to task {task_id} on agent {agent_card.human_readable_id}.")
             return True
@@ -154,19 +284,31 @@ class AgentVaultClient:
         except Exception as e: logger.exception(f"Unexpected error sending message to task {task_id} on agent {agent_card.human_readable_id}: {e}"); raise A2AError(f"An unexpected error occurred sending message: {e}") from e
 
     async def get_task_status(
-        self, agent_card: AgentCard, task_id: str, key_manager: KeyManager
+        self, agent_card: AgentCard, task_id: str, key_manager: KeyManager,
+        *, include: Optional[List[TaskGetInclude]] = None, since: Optional[int] = None, limit: Optional[int] = None
     ) -> Task:
+        """
+        Retrieves a task from the agent (`tasks/get`).
+
+        By default the whole Task including all messages and artifacts is returned.
+        `include=[]` fetches only the state and timestamps (cheap for polling),
+        `include=["messages"]` etc. selects collections, and `since`/`limit` return
+        a window of the messages; the result's `message_count` and `next_cursor`
+        then describe the full history. Agents built before these parameters
+        ignore them and return the whole Task.
+        """
         logger.info(f"Getting status for task {task_id} on agent: {agent_card.human_readable_id}")
         if not task_id or not isinstance(task_id, str): raise ValueError("Invalid task_id provided for get_task_status.")
+        try: task_get_params = TaskGetParams(id=task_id, include=include, since=since, limit=limit)
+        except pydantic.ValidationError as e: raise ValueError(f"Invalid tasks/get parameters: {e}") from e
         try:
             auth_headers = await self._get_auth_headers(agent_card, key_manager)
-            task_get_params = TaskGetParams(id=task_id)
-            request_id = f"req-get-{uuid.uuid4()}"; request_params_dict = task_get_params.model_dump(mode='json', by_alias=True)
+            request_id = f"req-get-{uuid.uuid4()}"; request_params_dict = task_get_params.model_dump(mode='json', by_alias=True, exclude_none=True)
             request_payload = {"jsonrpc": "2.0", "method": "tasks/get", "params": request_params_dict, "id": request_id}
             logger.debug(f"Get task status request payload (id: {request_id})")
-            response_data = await self._make_request('POST', str(agent_card.url), headers=auth_headers, json_payload=request_payload, stream=False)
+            response_data = await self._make_request('POST', str(agent_card.url), headers=auth_headers, json_payload=request_payload, stream=False, result_model=GetTaskResult)
             try:
-                task_object = GetTaskResult.model_validate(response_data)
+                task_object = response_data if isinstance(response_data, GetTaskResult) else GetTaskResult.model_validate(response_data)
                 logger.info(f"Successfully retrieved status for task {task_id}. State: {task_object.state}")
                 return task_object
             except pydantic.ValidationError as e:
@@ -175,6 +317,110 @@ class AgentVaultClient:
         except KeyManagementError as e: logger.error(f"Key management error getting status for task {task_id}: {e}"); raise A2AAuthenticationError(f"Authentication failed due to key management error: {e}") from e
         except Exception as e: logger.exception(f"Unexpected error getting status for task {task_id} on agent {agent_card.human_readable_id}: {e}"); raise A2AError(f"An unexpected error occurred getting task status: {e}") from e
 
+    async def get_task_statuses(
+        self, agent_card: AgentCard, task_ids: List[str], key_manager: KeyManager,
+        *, include: Optional[List[TaskGetInclude]] = None
+    ) -> Dict[str, Union[Task, A2AError]]:
+        """
+        Retrieves the status of several tasks in one HTTP round-trip using a JSON-RPC batch request.
+        `include` is passed to every `tasks/get` entry (see `get_task_status`), e.g.
+        `include=[]` to poll only the states.
+
+        Errors affecting the whole call (authentication, connection, HTTP errors, a
+        batch rejected by the agent) are raised. Per-task failures do not raise;
+        instead the returned mapping holds an A2AError for that task ID
+        (A2ARemoteAgentError for JSON-RPC errors such as "task not found",
+        A2AMessageError for malformed or missing entries).
+
+        Returns:
+            A dictionary mapping each requested task ID (deduplicated, in request order)
+            to its Task or to the error raised for it.
+        """
+        logger.info(f"Getting status for {len(task_ids)} tasks on agent: {agent_card.human_readable_id}")
+        unique_task_ids = list(dict.fromkeys(task_ids))
+        if not unique_task_ids: return {}
+        if any(not task_id or not isinstance(task_id, str) for task_id in unique_task_ids): raise ValueError("Invalid task_id provided for get_task_statuses.")
+        try:
+            auth_headers = await self._get_auth_headers(agent_card, key_manager)
+            batch_id = uuid.uuid4().hex
+            request_ids: Dict[str, str] = {f"req-get-{batch_id}-{index}": task_id for index, task_id in enumerate(unique_task_ids)}
+            batch_payload = [
+                {"jsonrpc": "2.0", "method": "tasks/get", "params": TaskGetParams(id=task_id, include=include).model_dump(mode='json', by_alias=True, exclude_none=True), "id": request_id}
+                for request_id, task_id in request_ids.items()
+            ]
+            logger.debug(f"Get task statuses batch payload ({len(batch_payload)} entries, batch: {batch_id})")
+            response_entries = await self._make_request('POST', str(agent_card.url), headers=auth_headers, json_payload=batch_payload, stream=False)
+            results: Dict[str, Union[Task, A2AError]] = {}
+            for entry in response_entries:
+                task_id = request_ids.get(entry.get("id")) if isinstance(entry, dict) else None
+                if task_id is None: logger.warning(f"Ignoring batch response entry with unknown id: {entry!r:.200}"); continue
+                results[task_id] = self._parse_task_status_entry(task_id, entry)
+            for task_id in unique_task_ids:
+                if task_id not in results: results[task_id] = A2AMessageError(f"Agent returned no response for task {task_id} in batch request.")
+            failed_count = sum(1 for value in results.values() if isinstance(value, A2AError))
+            logger.info(f"Retrieved status for {len(results) - failed_count}/{len(results)} tasks on agent {agent_card.human_readable_id}.")
+            return {task_id: results[task_id] for task_id in unique_task_ids}
+        except (A2AAuthenticationError, A2AConnectionError, A2ARemoteAgentError, A2AMessageError, A2ATimeoutError) as e: logger.error(f"A2A error getting task statuses: {type(e).__name__}: {e}"); raise
+        except KeyManagementError as e: logger.error(f"Key management error getting task statuses: {e}"); raise A2AAuthenticationError(f"Authentication failed due to key management error: {e}") from e
+        except Exception as e: logger.exception(f"Unexpected error getting task statuses on agent {agent_card.human_readable_id}: {e}"); raise A2AError(f"An unexpected error occurred getting task statuses: {e}") from e
+
+    async def wait_for_terminal_state(
+        self, agent_card: AgentCard, task_id: str, key_manager: KeyManager,
+        *, timeout: Optional[float] = None, poll_timeout: float = 30.0, poll_interval: float = 1.0,
+        include: Optional[List[TaskGetInclude]] = None
+    ) -> Task:
+        """
+        Waits until a task is COMPLETED, FAILED or CANCELED and returns it.
+
+        Uses `tasks/wait` long polls of up to `poll_timeout` seconds each, so the
+        agent answers as soon as the state changes. Agents without `tasks/wait`
+        (JSON-RPC "method not found") are polled with state-only `tasks/get`
+        requests every `poll_interval` seconds instead. `include` selects what the
+        returned Task contains (see `get_task_status`; default: everything).
+
+        Raises:
+            A2ATimeoutError: If the task is not finished after `timeout` seconds (None = no limit).
+        """
+        logger.info(f"Waiting for task {task_id} on agent {agent_card.human_readable_id} to finish.")
+        if not task_id or not isinstance(task_id, str): raise ValueError("Invalid task_id provided for wait_for_terminal_state.")
+        if poll_timeout <= 0 or poll_interval <= 0: raise ValueError("poll_timeout and poll_interval must be positive.")
+        started_at = time.monotonic()
+        long_poll = True
+        while True:
+            remaining = None if timeout is None else timeout - (time.monotonic() - started_at)
+            if remaining is not None and remaining <= 0: raise A2ATimeoutError(f"Task {task_id} did not reach a terminal state within {timeout}s.")
+            wait_time = poll_timeout if remaining is None else min(poll_timeout, remaining)
+            if long_poll:
+                try: task = await self._wait_for_task(agent_card, task_id, key_manager, TaskWaitParams(id=task_id, timeout=wait_time, include=include))
+                except A2ARemoteAgentError as e:
+                    if e.status_code != JSONRPC_METHOD_NOT_FOUND: raise
+                    logger.info(f"Agent {agent_card.human_readable_id} does not support tasks/wait; polling tasks/get every {poll_interval}s.")
+                    long_poll = False
+                    continue
+                if task.state in TERMINAL_TASK_STATES: return task
+            else:
+                task = await self.get_task_status(agent_card, task_id, key_manager, include=[])
+                if task.state in TERMINAL_TASK_STATES:
+                    return task if include == [] else await self.get_task_status(agent_card, task_id, key_manager, include=include)
+                await asyncio.sleep(poll_interval if remaining is None else max(0.0, min(poll_interval, remaining)))
+
+    async def _wait_for_task(self, agent_card: AgentCard, task_id: str, key_manager: KeyManager, wait_params: TaskWaitParams) -> Task:
+        """Sends one `tasks/wait` long poll and returns the task it answered with."""
+        try:
+            auth_headers = await self._get_auth_headers(agent_card, key_manager)
+            request_payload = {"jsonrpc": "2.0", "method": "tasks/wait", "params": wait_params.model_dump(mode='json', by_alias=True, exclude_none=True), "id": f"req-wait-{uuid.uuid4()}"}
+            http_timeout = (wait_params.timeout or 0) + self.default_timeout # The agent answers after at most `timeout` seconds
+            response_data = await self._make_request('POST', str(agent_card.url), headers=auth_headers, json_payload=request_payload, stream=False, result_model=GetTaskResult, timeout=http_timeout)
+            try: task = response_data if isinstance(response_data, GetTaskResult) else GetTaskResult.model_validate(response_data)
+            except pydantic.ValidationError as e: raise A2AMessageError(f"Failed to validate tasks/wait result (Task model): {e}") from e
+            logger.debug(f"tasks/wait for task {task_id} returned state {task.state}.")
+            return task
+        except (A2AAuthenticationError, A2AConnectionError, A2ARemoteAgentError, A2AMessageError, A2ATimeoutError) as e:
+            if not (isinstance(e, A2ARemoteAgentError) and e.status_code == JSONRPC_METHOD_NOT_FOUND): logger.error(f"A2A error waiting for task {task_id}: {type(e).__name__}: {e}")
+            raise
+        except KeyManagementError as e: logger.error(f"Key management error waiting for task {task_id}: {e}"); raise A2AAuthenticationError(f"Authentication failed due to key management error: {e}") from e
+        except Exception as e: logger.exception(f"Unexpected error waiting for task {task_id} on agent {agent_card.human_readable_id}: {e}"); raise A2AError(f"An unexpected error occurred waiting for the task: {e}") from e
+
     async def terminate_task(
         self, agent_card: AgentCard, task_id: str, key_manager: KeyManager
     ) -> bool:
@@ -186,9 +432,9 @@ class AgentVaultClient:
             request_id = f"req-cancel-{uuid.uuid4()}"; request_params_dict = task_cancel_params.model_dump(mode='json', by_alias=True)
             request_payload = {"jsonrpc": "2.0", "method": "tasks/cancel", "params": request_params_dict, "id": request_id}
             logger.debug(f"Terminate task request payload (id: {request_id})")
-            response_data = await self._make_request('POST', str(agent_card.url), headers=auth_headers, json_payload=request_payload, stream=False)
+            response_data = await self._make_request('POST', str(agent_card.url), headers=auth_headers, json_payload=request_payload, stream=False, result_model=TaskCancelResult)
             try:
-                result_obj = TaskCancelResult.model_validate(response_data)
+                result_obj = response_data if isinstance(response_data, TaskCancelResult) else TaskCancelResult.model_validate(response_data)
                 if not result_obj.success: logger.warning(f"Agent acknowledged termination request for task {task_id} but indicated failure (success=false). Message: {result_obj.message}")
             except pydantic.ValidationError as e: raise A2AMessageError(f"Failed to validate terminate task result structure: {e}") from e
             logger.info(f"Termination request for task {task_id} acknowledged by agent {agent_card.human_readable_id}.")
@@ -199,9 +445,15 @@ class AgentVaultClient:
 
 
     async def receive_messages(
-        self, agent_card: AgentCard, task_id: str, key_manager: KeyManager
+        self, agent_card: AgentCard, task_id: str, key_manager: KeyManager,
+        last_event_id: Optional[str] = None
     ) -> AsyncGenerator[A2AEvent, None]:
-        """ Subscribes to Server-Sent Events (SSE)... """
+        """
+        Subscribes to Server-Sent Events (SSE)...
+
+        Interrupted streams are resumed transparently from the last received event ID.
+        Pass `last_event_id` to resume a subscription from an earlier session.
+        """
         logger.info(f"Subscribing to events for task {task_id} on agent: {agent_card.human_readable_id}")
         if not task_id or not isinstance(task_id, str):
              raise ValueError("Invalid task_id provided for receive_messages.")
@@ -211,6 +463,7 @@ class AgentVaultClient:
             auth_headers["Accept"] = "text/event-stream"
             # Ensure connection stays open and disable response size limits if needed
             auth_headers["Connection"] = "keep-alive"
+            if last_event_id is not None: auth_headers["Last-Event-ID"] = str(last_event_id)
 
             request_id = f"req-sub-{uuid.uuid4()}"
             request_payload = {
@@ -228,10 +481,24 @@ class AgentVaultClient:
                 event_type = event_dict.get("event_type")
                 event_data = event_dict.get("data")
 
-                if not event_type or not isinstance(event_data, dict):
+                if not event_type or not isinstance(event_data, (dict, bytes)):
                     logger.warning(f"Skipping malformed event from SSE stream: {event_dict}")
                     continue
 
+                event_adapter = SSE_EVENT_ADAPTERS.get(event_type)
+                if event_adapter is not None and isinstance(event_data, bytes):
+                    # Validate straight from the event bytes
+                    try: validated_event = event_adapter.validate_json(event_data)
+                    except pydantic.ValidationError as e: logger.error(f"Failed to validate SSE event type '{event_type}': {e}. Data: {event_data[:200]!r}"); continue
+                    logger.debug(f"Yielding validated event: {type(validated_event).__name__}")
+                    yield validated_event
+                    continue
+
+                if isinstance(event_data, bytes):
+                    try: event_data = json_codec.loads(event_data)
+                    except json.JSONDecodeError as e: logger.error(f"Failed to decode JSON data for SSE event type '{event_type}': {e}. Data: {event_data[:200]!r}..."); continue
+                    if not isinstance(event_data, dict): logger.warning(f"Skipping SSE event type '{event_type}' whose data is not a JSON object."); continue
+
                 if event_type == "error":
                     err_msg = event_data.get('message', 'Unknown SSE error from agent')
                     logger.error(f"Received SSE error event from agent for task {task_id}: {err_msg}")
@@ -244,7 +511,7 @@ class AgentVaultClient:
 
                 try:
                     validated_event = event_model.model_validate(event_data)
-                    logger.debug(f"Yielding validated event: {validated_event!r}")
+                    logger.debug(f"Yielding validated event: {type(validated_event).__name__}")
                     yield validated_event
                 except pydantic.ValidationError as e:
                     logger.error(f"Failed to validate SSE event type '{event_type}': {e}. Data: {event_data}")
@@ -265,6 +532,17 @@ class AgentVaultClient:
 
 
     # --- Private Helper Methods ---
+    def _parse_task_status_entry(self, task_id: str, entry: Dict[str, Any]) -> Union[Task, A2AError]:
+        """Converts one tasks/get entry of a batch response into a Task or the error for that task."""
+        if "error" in entry:
+            error_obj = entry["error"]
+            if not isinstance(error_obj, dict): return A2AMessageError(f"Invalid JSON-RPC error format for task {task_id}: 'error' field is not a dictionary.")
+            logger.debug(f"Agent returned JSON-RPC error for task {task_id}: code={error_obj.get('code')}, msg='{error_obj.get('message')}'")
+            return A2ARemoteAgentError(message=error_obj.get("message", "Unknown remote agent error"), status_code=error_obj.get("code", -1), response_body=error_obj.get("data"))
+        if "result" not in entry: return A2AMessageError(f"Invalid JSON-RPC response for task {task_id}: Missing 'result' or 'error' key.")
+        try: return TASK_ADAPTER.validate_python(entry["result"])
+        except pydantic.ValidationError as e: return A2AMessageError(f"Failed to validate task status result (Task model) for task {task_id}: {e}")
+
     async def _get_auth_headers(self, agent_card: AgentCard, key_manager: KeyManager) -> Dict[str, str]:
         # (Code unchanged)
         agent_schemes = agent_card.auth_schemes; supported_schemes_str = [s.scheme for s in agent_schemes]; logger.debug(f"Agent supports auth schemes: {supported_schemes_str}")
@@ -282,144 +560,378 @@ class AgentVaultClient:
             service_id = oauth2_scheme.service_identifier or agent_card.human_readable_id
             if not service_id: raise A2AAuthenticationError(f"Cannot determine service identifier for oauth2 scheme on agent {agent_card.human_readable_id}.")
             if not oauth2_scheme.token_url: raise A2AAuthenticationError(f"Agent card specifies oauth2 scheme but is missing 'tokenUrl' for agent {agent_card.human_readable_id}.")
-            now = time.time(); cached_token_info = self._token_cache.get(service_id)
-            if cached_token_info:
-                token, expiry = cached_token_info
-                if expiry is None or expiry > now: logger.debug(f"Using cached OAuth token for service '{service_id}'."); return {"Authorization": f"Bearer {token}"}
-                else: logger.debug(f"Cached OAuth token for service '{service_id}' expired. Fetching new token.")
-            logger.debug(f"Retrieving OAuth credentials for service_id '{service_id}'.")
-            client_id = key_manager.get_oauth_client_id(service_id); client_secret = key_manager.get_oauth_client_secret(service_id)
-            if not client_id or not client_secret: raise A2AAuthenticationError(f"Missing OAuth Client ID or Client Secret for service '{service_id}'. Check local configuration.")
-            token_url_str = str(oauth2_scheme.token_url); token_data = {"grant_type": "client_credentials", "client_id": client_id, "client_secret": client_secret,}
-            if oauth2_scheme.scopes: token_data["scope"] = " ".join(oauth2_scheme.scopes)
-            token_headers = {"Content-Type": "application/x-www-form-urlencoded"}; logger.debug(f"Requesting OAuth token from {token_url_str} for service '{service_id}'.")
-            try:
-                response = await self._http_client.request(method="POST", url=token_url_str, data=token_data, headers=token_headers, timeout=self.default_timeout); response.raise_for_status()
-                try: token_response_data = response.json()
-                except json.JSONDecodeError as e: logger.error(f"Failed to decode JSON response from token endpoint {token_url_str}: {e}. Response: {response.text[:200]}..."); raise A2AAuthenticationError(f"Invalid JSON response from token endpoint {token_url_str}: {e}") from e
-                access_token = token_response_data.get("access_token"); token_type = token_response_data.get("token_type", "bearer")
-                if not access_token or not isinstance(access_token, str): logger.error(f"Token response from {token_url_str} missing 'access_token'. Response: {token_response_data}"); raise A2AAuthenticationError(f"Invalid token response from {token_url_str}: missing 'access_token'.")
-                if token_type.lower() != "bearer": logger.warning(f"Token response from {token_url_str} has non-Bearer token_type: '{token_type}'. Proceeding anyway.")
-                logger.info(f"Successfully obtained OAuth token for service '{service_id}'.")
-                expires_in = token_response_data.get("expires_in"); expiry_timestamp: Optional[float] = None
-                if isinstance(expires_in, (int, float)) and expires_in > 0: expiry_timestamp = time.time() + expires_in - CACHE_EXPIRY_BUFFER_SECONDS; logger.debug(f"Caching token for service '{service_id}' with expiry {expiry_timestamp} (expires_in={expires_in}s).")
-                else: logger.debug(f"Caching token for service '{service_id}' without expiry.")
-                self._token_cache[service_id] = (access_token, expiry_timestamp); return {"Authorization": f"Bearer {access_token}"}
-            except httpx.TimeoutException as e: logger.error(f"Timeout requesting OAuth token from {token_url_str}: {e}"); raise A2AAuthenticationError(f"Timeout connecting to token endpoint {token_url_str}.") from e
-            except httpx.ConnectError as e: logger.error(f"Connection error requesting OAuth token from {token_url_str}: {e}"); raise A2AAuthenticationError(f"Could not connect to token endpoint {token_url_str}.") from e
-            except httpx.HTTPStatusError as e:
-                status_code = e.response.status_code; error_detail = e.response.text[:200]; logger.error(f"HTTP error {status_code} from token endpoint {token_url_str}: {error_detail}")
-                if status_code in [400, 401, 403]: raise A2AAuthenticationError(f"Invalid credentials or request for token endpoint {token_url_str} (HTTP {status_code}): {error_detail}") from e
-                else: raise A2AAuthenticationError(f"Token endpoint {token_url_str} returned server error (HTTP {status_code}): {error_detail}") from e
-            except httpx.RequestError as e: logger.error(f"Network error requesting OAuth token from {token_url_str}: {e}"); raise A2AAuthenticationError(f"Network error communicating with token endpoint {token_url_str}: {e}") from e
-            except Exception as e: logger.exception(f"Unexpected error during OAuth token request to {token_url_str}: {e}"); raise A2AAuthenticationError(f"Unexpected error during OAuth token request: {e}") from e
+            token = await self._get_oauth_token(service_id, str(oauth2_scheme.token_url), oauth2_scheme.scopes, key_manager)
+            return {"Authorization": f"Bearer {token}"}
         none_scheme_present = any(s.scheme == 'none' for s in agent_schemes)
         if none_scheme_present: logger.debug("Using 'none' authentication scheme."); return {}
         client_supported = ['apiKey', 'oauth2', 'none']; log_msg = (f"No compatible authentication scheme found for agent {agent_card.human_readable_id}. Agent supports: {supported_schemes_str}. Client supports: {client_supported}."); logger.error(log_msg); raise A2AAuthenticationError(log_msg)
 
 
+    # --- ADDED: Coalesced and proactive OAuth token refresh ---
+    async def _get_oauth_token(self, service_id: str, token_url_str: str, scopes: Optional[List[str]], key_manager: KeyManager) -> str:
+        """
+        Returns a valid access token for the service. Concurrent callers share one
+        token request per service_id; tokens close to expiry are refreshed in the
+        background while the cached token is still handed out.
+        """
+        now = time.time(); cached_token_info = self._token_cache.get(service_id)
+        if cached_token_info:
+            token, expiry = cached_token_info
+            if expiry is None or expiry > now:
+                if expiry is not None and expiry - now <= self.oauth_refresh_ahead: self._start_token_refresh(service_id, token_url_str, scopes, key_manager, background=True)
+                logger.debug(f"Using cached OAuth token for service '{service_id}'."); return token
+            else: logger.debug(f"Cached OAuth token for service '{service_id}' expired. Fetching new token.")
+        refresh = self._start_token_refresh(service_id, token_url_str, scopes, key_manager)
+        # Shielded so that a cancelled caller does not cancel the request other callers wait for
+        return await asyncio.shield(refresh) # type: ignore[arg-type]
+
+    def _start_token_refresh(self, service_id: str, token_url_str: str, scopes: Optional[List[str]], key_manager: KeyManager, background: bool = False) -> Optional["asyncio.Task[str]"]:
+        """Returns the in-flight token request for the service, starting one unless the last failure is still backing off."""
+        refresh = self._token_refreshes.get(service_id)
+        if refresh is not None: return refresh
+        failures, retry_at = self._token_failures.get(service_id, (0, 0.0))
+        if time.monotonic() < retry_at:
+            if background: return None
+            raise A2AAuthenticationError(f"Token request for service '{service_id}' failed {failures} time(s); next attempt in {retry_at - time.monotonic():.1f}s.")
+        if background: logger.debug(f"OAuth token for service '{service_id}' expires soon; refreshing in the background.")
+        refresh = asyncio.get_running_loop().create_task(self._fetch_oauth_token(service_id, token_url_str, scopes, key_manager))
+        self._token_refreshes[service_id] = refresh
+        refresh.add_done_callback(lambda task: self._token_refresh_done(service_id, task))
+        return refresh
+
+    def _token_refresh_done(self, service_id: str, task: "asyncio.Task[str]") -> None:
+        if self._token_refreshes.get(service_id) is task: del self._token_refreshes[service_id]
+        if task.cancelled(): return
+        error = task.exception() # Also marks errors of unawaited background refreshes as retrieved
+        if error is None: self._token_failures.pop(service_id, None); return
+        failures = self._token_failures.get(service_id, (0, 0.0))[0] + 1
+        delay = min(self.oauth_max_retry_backoff, self.oauth_retry_backoff * (2 ** (failures - 1))) * random.uniform(0.5, 1.0)
+        self._token_failures[service_id] = (failures, time.monotonic() + delay)
+        logger.warning(f"OAuth token request for service '{service_id}' failed ({type(error).__name__}); backing off for {delay:.1f}s.")
+
+    async def _fetch_oauth_token(self, service_id: str, token_url_str: str, scopes: Optional[List[str]], key_manager: KeyManager) -> str:
+        """Performs the client credentials grant (unless the on-disk cache has a valid token) and caches the token."""
+        if self.token_cache is not None:
+            try: stored = await self.token_cache.get(service_id, token_url_str, scopes)
+            except Exception as e: logger.warning(f"Could not read OAuth token cache for service '{service_id}': {e}"); stored = None
+            if stored is not None and stored[1] - time.time() > self.oauth_refresh_ahead: # Tokens due for refresh are fetched anew
+                logger.debug(f"Using OAuth token for service '{service_id}' from the on-disk token cache.")
+                self._token_cache[service_id] = stored; return stored[0]
+        logger.debug(f"Retrieving OAuth credentials for service_id '{service_id}'.")
+        client_id = key_manager.get_oauth_client_id(service_id); client_secret = key_manager.get_oauth_client_secret(service_id)
+        if not client_id or not client_secret: raise A2AAuthenticationError(f"Missing OAuth Client ID or Client Secret for service '{service_id}'. Check local configuration.")
+        token_data = {"grant_type": "client_credentials", "client_id": client_id, "client_secret": client_secret,}
+        if scopes: token_data["scope"] = " ".join(scopes)
+        token_headers = {"Content-Type": "application/x-www-form-urlencoded"}; logger.debug(f"Requesting OAuth token from {token_url_str} for service '{service_id}'.")
+        try:
+            response = await self._http_client.request(method="POST", url=token_url_str, data=token_data, headers=token_headers, timeout=self.default_timeout); response.raise_for_status()
+            try: token_response_data = response.json()
+            except json.JSONDecodeError as e: logger.error(f"Failed to decode JSON response from token endpoint {token_url_str}: {e}. Response: {response.text[:200]}..."); raise A2AAuthenticationError(f"Invalid JSON response from token endpoint {token_url_str}: {e}") from e
+            access_token = token_response_data.get("access_token"); token_type = token_response_data.get("token_type", "bearer")
+            if not access_token or not isinstance(access_token, str): logger.error(f"Token response from {token_url_str} missing 'access_token'. Response: {token_response_data}"); raise A2AAuthenticationError(f"Invalid token response from {token_url_str}: missing 'access_token'.")
+            if token_type.lower() != "bearer": logger.warning(f"Token response from {token_url_str} has non-Bearer token_type: '{token_type}'. Proceeding anyway.")
+            logger.info(f"Successfully obtained OAuth token for service '{service_id}'.")
+            expires_in = token_response_data.get("expires_in"); expiry_timestamp: Optional[float] = None
+            if isinstance(expires_in, (int, float)) and expires_in > 0: expiry_timestamp = time.time() + expires_in - CACHE_EXPIRY_BUFFER_SECONDS; logger.debug(f"Caching token for service '{service_id}' with expiry {expiry_timestamp} (expires_in={expires_in}s).")
+            else: logger.debug(f"Caching token for service '{service_id}' without expiry.")
+            self._token_cache[service_id] = (access_token, expiry_timestamp)
+            if self.token_cache is not None:
+                try: await self.token_cache.put(service_id, token_url_str, scopes, access_token, expiry_timestamp)
+                except Exception as e: logger.warning(f"Could not write OAuth token cache for service '{service_id}': {e}")
+            return access_token
+        except httpx.TimeoutException as e: logger.error(f"Timeout requesting OAuth token from {token_url_str}: {e}"); raise A2AAuthenticationError(f"Timeout connecting to token endpoint {token_url_str}.") from e
+        except httpx.ConnectError as e: logger.error(f"Connection error requesting OAuth token from {token_url_str}: {e}"); raise A2AAuthenticationError(f"Could not connect to token endpoint {token_url_str}.") from e
+        except httpx.HTTPStatusError as e:
+            status_code = e.response.status_code; error_detail = e.response.text[:200]; logger.error(f"HTTP error {status_code} from token endpoint {token_url_str}: {error_detail}")
+            if status_code in [400, 401, 403]: raise A2AAuthenticationError(f"Invalid credentials or request for token endpoint {token_url_str} (HTTP {status_code}): {error_detail}") from e
+            else: raise A2AAuthenticationError(f"Token endpoint {token_url_str} returned server error (HTTP {status_code}): {error_detail}") from e
+        except httpx.RequestError as e: logger.error(f"Network error requesting OAuth token from {token_url_str}: {e}"); raise A2AAuthenticationError(f"Network error communicating with token endpoint {token_url_str}: {e}") from e
+        except Exception as e: logger.exception(f"Unexpected error during OAuth token request to {token_url_str}: {e}"); raise A2AAuthenticationError(f"Unexpected error during OAuth token request: {e}") from e
+    # --- END ADDED ---
+
+
     async def _make_request(
         self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
-        json_payload: Optional[Dict[str, Any]] = None, stream: bool = False
-    ) -> Union[Dict[str, Any], AsyncGenerator[Dict[str, Any], None]]: # Return type hint changed
-        """ Internal helper to make HTTP requests or process SSE streams. """
+        json_payload: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]] = None, stream: bool = False,
+        idempotency_key: Optional[str] = None, result_model: Optional[typing.Type[pydantic.BaseModel]] = None,
+        timeout: Optional[float] = None
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]], pydantic.BaseModel, AsyncGenerator[Dict[str, Any], None]]: # Return type hint changed
+        """
+        Internal helper to make HTTP requests or process SSE streams.
+
+        For a JSON-RPC batch (`json_payload` is a list) the raw list of response
+        objects is returned; per-entry errors are left to the caller.
+        Non-streaming requests are retried according to `retry_policy`.
+        With `result_model`, the result is returned as that model, validated
+        together with the response envelope by a cached TypeAdapter.
+        `timeout` overrides the HTTP timeout of this request (e.g. for long polls).
+        """
         url_str = str(url)
-        request_kwargs = {"method": method, "url": url_str, "headers": headers or {}, "json": json_payload}
+        request_kwargs = {"method": method, "url": url_str, "headers": headers or {}}
+        if json_payload is not None: request_kwargs["content"] = json_codec.dumps(json_payload); request_kwargs["headers"] = {**request_kwargs["headers"], "Content-Type": "application/json"}
+        if timeout is not None: request_kwargs["timeout"] = timeout
+        elif self._uses_shared_pool: request_kwargs["timeout"] = self.default_timeout
         log_context = f"{method} {url_str}"
 
         if stream:
              logger.debug(f"Calling _process_sse_stream_lines for: {log_context}")
              # This now returns the generator directly
              return self._process_sse_stream_lines(request_kwargs)
-        else:
-            # Non-stream logic (unchanged)
-            logger.debug(f"Making non-stream request: {log_context}");
-            if json_payload: logger.debug(f"Request payload keys: {list(json_payload.keys())}")
+
+        # --- MODIFIED: Retry non-stream requests according to the retry policy ---
+        policy = self.retry_policy
+        rpc_method = json_payload.get("method") if isinstance(json_payload, dict) else ("batch" if isinstance(json_payload, list) else None)
+        rpc_methods = {entry.get("method") for entry in json_payload if isinstance(entry, dict)} if isinstance(json_payload, list) else {rpc_method}
+        if idempotency_key is None and policy.generate_idempotency_keys and rpc_methods <= IDEMPOTENCY_KEY_METHODS: idempotency_key = uuid.uuid4().hex
+        if idempotency_key is not None: request_kwargs["headers"] = {**request_kwargs["headers"], IDEMPOTENCY_KEY_HEADER: idempotency_key}
+        idempotent = bool(rpc_methods) and (rpc_methods <= IDEMPOTENT_METHODS or (idempotency_key is not None and rpc_methods <= IDEMPOTENT_METHODS | IDEMPOTENCY_KEY_METHODS))
+        hedge = self.hedging_policy is not None and bool(rpc_methods) and rpc_methods <= HEDGEABLE_METHODS
+
+        logger.debug(f"Making non-stream request: {log_context}");
+        if isinstance(json_payload, list): logger.debug(f"Request payload is a batch of {len(json_payload)} entries")
+        elif json_payload: logger.debug(f"Request payload keys: {list(json_payload.keys())}")
+        self._request_stats["requests"] += 1
+        breaker = self._get_circuit_breaker(url_str)
+        started_at = time.monotonic(); attempt = 0
+        while True:
+            attempt += 1; attempt_started_at = time.monotonic()
+            deadline = None if policy.total_timeout is None else policy.total_timeout - (attempt_started_at - started_at)
             try:
-                response = await self._http_client.request(**request_kwargs); response.raise_for_status()
-                try:
-                    response_data = response.json()
-                    if not isinstance(response_data, dict): raise A2AMessageError(f"Invalid response format from {url_str}: Expected dictionary, got {type(response_data)}. Body: {response.text[:200]}...")
-                    if "error" in response_data:
-                        error_obj = response_data["error"]
-                        if isinstance(error_obj, dict): err_code = error_obj.get("code", -1); err_msg = error_obj.get("message", "Unknown remote agent error"); err_details = error_obj.get("data"); logger.error(f"Agent returned JSON-RPC error for {log_context}: code={err_code}, msg='{err_msg}', data={err_details}"); raise A2ARemoteAgentError(message=err_msg, status_code=err_code, response_body=err_details)
-                        else: raise A2AMessageError(f"Invalid JSON-RPC error format from {url_str}: 'error' field is not a dictionary. Body: {response.text[:200]}...")
-                    elif "result" in response_data:
-                        log_resp_str = f"size={len(response.content)} bytes, keys={list(response_data.get('result').keys())}" if isinstance(response_data.get('result'), dict) else f"size={len(response.content)} bytes"; logger.debug(f"Request successful ({response.status_code}) for {log_context}. Response: {log_resp_str}"); return response_data["result"]
-                    else: raise A2AMessageError(f"Invalid JSON-RPC response from {url_str}: Missing 'result' or 'error' key. Body: {response.text[:200]}...")
-                except json.JSONDecodeError as e: logger.error(f"Failed to decode JSON response from {log_context}. Status: {response.status_code}. Response text: {response.text[:200]}..."); raise A2AMessageError(f"Failed to decode JSON response from {url_str}. Status: {response.status_code}. Body: {response.text[:200]}...") from e
-            except httpx.TimeoutException as e: logger.error(f"Request timeout for {log_context}: {e}"); raise A2ATimeoutError(f"Request timed out for {url_str}: {e}") from e
-            except httpx.ConnectError as e: logger.error(f"Connection error for {log_context}: {e}"); raise A2AConnectionError(f"Connection failed for {url_str}: {e}") from e
-            except httpx.HTTPStatusError as e: logger.error(f"HTTP error on request {log_context}: {e.response.status_code}"); raise A2ARemoteAgentError(message=f"HTTP error {e.response.status_code} for {url_str}: {e.response.text}", status_code=e.response.status_code, response_body=e.response.text) from e
-            except httpx.RequestError as e: logger.error(f"HTTP request error for {log_context}: {e}"); raise A2AConnectionError(f"HTTP request failed for {url_str}: {e}") from e
-            except (A2AMessageError, A2AAuthenticationError, A2ARemoteAgentError) as e: logger.error(f"A2A error during request processing for {log_context}: {e}"); raise
-            except Exception as e: logger.exception(f"Unexpected error during request {log_context}: {e}"); raise A2AError(f"An unexpected error occurred during the request for {url_str}: {e}") from e
-
-    # --- MODIFIED: Line-by-line SSE processing ---
+                result, status_code = await self._attempt_request(request_kwargs, json_payload, url_str, log_context, breaker, deadline, hedge, result_model)
+            except A2AError as e:
+                retry_delay = self._retry_delay(e, attempt, idempotent, started_at)
+                self._record_attempt(RequestAttempt(rpc_method=rpc_method, url=url_str, attempt=attempt, duration=time.monotonic() - attempt_started_at, status_code=self._error_status_code(e), error=type(e).__name__, retry_delay=retry_delay))
+                if retry_delay is None: self._request_stats["failed_requests"] += 1; raise
+                self._request_stats["retries"] += 1
+                logger.warning(f"Attempt {attempt}/{policy.max_attempts} of {rpc_method} request to {url_str} failed ({type(e).__name__}); retrying in {retry_delay:.2f}s.")
+                await asyncio.sleep(retry_delay)
+                continue
+            self._record_attempt(RequestAttempt(rpc_method=rpc_method, url=url_str, attempt=attempt, duration=time.monotonic() - attempt_started_at, status_code=status_code))
+            return result
+
+    async def _attempt_request(
+        self, request_kwargs: Dict[str, Any], json_payload: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]], url_str: str, log_context: str,
+        breaker: Optional[CircuitBreaker], deadline: Optional[float], hedge: bool = False, result_model: Optional[typing.Type[pydantic.BaseModel]] = None
+    ) -> Tuple[Any, int]:
+        """Makes one attempt of a request, within the remaining deadline and subject to the endpoint's circuit breaker."""
+        if breaker is not None and not breaker.allow_request():
+            retry_after = breaker.retry_after()
+            raise A2ACircuitOpenError(f"Circuit for {url_str} is open after repeated failures; not contacting the agent (next probe in {retry_after:.1f}s).", endpoint=url_str, retry_after=retry_after)
+        send = self._send_hedged(request_kwargs, json_payload, url_str, log_context, result_model) if hedge else self._send_request(request_kwargs, json_payload, url_str, log_context, result_model)
+        try:
+            if deadline is None: outcome = await send
+            else:
+                try: outcome = await asyncio.wait_for(send, timeout=deadline)
+                except asyncio.TimeoutError as e: raise A2ATimeoutError(f"Request deadline of {self.retry_policy.total_timeout}s exceeded for {url_str}.") from e
+        except A2AError as e:
+            if breaker is not None:
+                if self._is_endpoint_failure(e): breaker.record_failure()
+                else: breaker.record_success() # The agent answered, e.g. with a JSON-RPC error
+            raise
+        except BaseException:
+            if breaker is not None: breaker.record_ignored()
+            raise
+        if breaker is not None: breaker.record_success()
+        return outcome
+
+    async def _send_hedged(
+        self, request_kwargs: Dict[str, Any], json_payload: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]], url_str: str, log_context: str,
+        result_model: Optional[typing.Type[pydantic.BaseModel]] = None
+    ) -> Tuple[Any, int]:
+        """
+        Sends the request and, if no response arrived after the hedge delay, sends it
+        again (budget permitting). The first successful response wins and the other
+        requests are cancelled; if all of them fail, the last error is raised.
+        """
+        policy = self.hedging_policy
+        tracker = self._latency_trackers.get(url_str)
+        if tracker is None: tracker = self._latency_trackers[url_str] = LatencyTracker(policy.latency_window)
+        policy.budget.deposit()
+        delay = hedge_delay(policy, tracker)
+        started_at: Dict[asyncio.Future, float] = {}
+        def launch() -> None: started_at[asyncio.ensure_future(self._send_request(request_kwargs, json_payload, url_str, log_context, result_model))] = time.monotonic()
+
+        launch()
+        pending = set(started_at); first = next(iter(pending)); can_hedge = True; last_error: Optional[BaseException] = None
+        try:
+            while pending:
+                may_hedge = can_hedge and len(started_at) <= policy.max_hedges
+                done, pending = await asyncio.wait(pending, timeout=delay if may_hedge else None, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    if policy.budget.try_spend():
+                        self._request_stats["hedged_requests"] += 1
+                        logger.debug(f"No response from {log_context} after {delay:.3f}s; sending hedged request.")
+                        launch(); pending = {task for task in started_at if not task.done()}
+                    else:
+                        self._request_stats["hedges_denied"] += 1; can_hedge = False
+                    continue
+                for task in done:
+                    if task.exception() is not None: last_error = task.exception(); continue
+                    tracker.record(time.monotonic() - started_at[task])
+                    if task is not first: self._request_stats["hedge_wins"] += 1
+                    return task.result()
+            raise last_error # type: ignore[misc]
+        finally:
+            losers = [task for task in started_at if not task.done()]
+            for task in losers: task.cancel()
+            if losers: await asyncio.gather(*losers, return_exceptions=True)
+
+    def _get_circuit_breaker(self, endpoint: str) -> Optional[CircuitBreaker]:
+        if self.circuit_breaker_config is None: return None
+        breaker = self._circuit_breakers.get(endpoint)
+        if breaker is None: breaker = self._circuit_breakers[endpoint] = CircuitBreaker(endpoint, self.circuit_breaker_config)
+        return breaker
+
+    @staticmethod
+    def _is_endpoint_failure(error: A2AError) -> bool:
+        """Connection errors, timeouts and HTTP 5xx responses count against an endpoint's circuit."""
+        if isinstance(error, A2AConnectionError): return True
+        cause = error.__cause__
+        return isinstance(cause, httpx.HTTPStatusError) and cause.response.status_code >= 500
+
+    def _record_attempt(self, record: RequestAttempt) -> None:
+        self._request_stats["attempts"] += 1
+        if self.on_request_attempt is None: return
+        try: self.on_request_attempt(record)
+        except Exception as e: logger.warning(f"Request attempt callback failed: {e}")
+
+    @staticmethod
+    def _error_status_code(error: A2AError) -> Optional[int]:
+        cause = error.__cause__
+        return cause.response.status_code if isinstance(cause, httpx.HTTPStatusError) else None
+
+    def _retry_delay(self, error: A2AError, attempt: int, idempotent: bool, started_at: float) -> Optional[float]:
+        """Returns the delay before the next attempt, or None if the failed request must not be retried."""
+        policy = self.retry_policy
+        if attempt >= policy.max_attempts: return None
+        cause = error.__cause__
+        if isinstance(cause, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)): pass # The agent never saw the request
+        elif not idempotent: return None
+        elif isinstance(cause, httpx.HTTPStatusError):
+            if cause.response.status_code not in policy.retryable_status_codes: return None
+        elif not isinstance(cause, httpx.TransportError): return None # JSON-RPC errors, invalid responses, deadline exceeded
+        delay = policy.backoff_delay(attempt)
+        if policy.respect_retry_after and isinstance(cause, httpx.HTTPStatusError):
+            retry_after = parse_retry_after(cause.response.headers.get("Retry-After"))
+            if retry_after is not None:
+                if retry_after > policy.max_retry_after: logger.info(f"Not retrying: agent asked to retry after {retry_after:.0f}s (max_retry_after={policy.max_retry_after}s)."); return None
+                if retry_after > delay: delay = retry_after; self._request_stats["retry_after_waits"] += 1
+        if policy.total_timeout is not None and time.monotonic() - started_at + delay >= policy.total_timeout: return None
+        return delay
+
+    def _decode_response(self, content: bytes, url_str: str, result_model: Optional[typing.Type[pydantic.BaseModel]]) -> Any:
+        """
+        Decodes a JSON-RPC response body. With `result_model`, the decoded response is
+        validated in one pass by the cached adapter for that result type (decoding with
+        the JSON codec first keeps up with `validate_json` on large results).
+        Malformed envelopes are returned as plain data for the caller's checks.
+        """
+        response_data = json_codec.loads(content)
+        if result_model is None or not isinstance(response_data, dict): return response_data
+        try: return jsonrpc_response_adapter(result_model).validate_python(response_data)
+        except pydantic.ValidationError as e:
+            errors = e.errors()
+            if errors and all(error["loc"][:1] == ("result",) for error in errors):
+                raise A2AMessageError(f"Failed to validate {result_model.__name__} result from {url_str}: {e}") from e
+        return response_data # Not a valid JSON-RPC response object; reported by the caller
+
+    async def _send_request(
+        self, request_kwargs: Dict[str, Any], json_payload: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]], url_str: str, log_context: str,
+        result_model: Optional[typing.Type[pydantic.BaseModel]] = None
+    ) -> Tuple[Any, int]:
+        """Performs one HTTP attempt of a JSON-RPC request, returning its result and HTTP status. Failures are mapped to A2A errors."""
+        try:
+            response = await self._http_client.request(**request_kwargs); response.raise_for_status()
+            try:
+                response_data = self._decode_response(response.content, url_str, result_model if not isinstance(json_payload, list) else None)
+                if isinstance(json_payload, list) and isinstance(response_data, list):
+                    logger.debug(f"Batch request successful ({response.status_code}) for {log_context}. Response: {len(response_data)} entries, size={len(response.content)} bytes"); return response_data, response.status_code
+                if not isinstance(response_data, dict): raise A2AMessageError(f"Invalid response format from {url_str}: Expected dictionary, got {type(response_data)}. Body: {response.text[:200]}...")
+                if "error" in response_data:
+                    error_obj = response_data["error"]
+                    if isinstance(error_obj, dict): err_code = error_obj.get("code", -1); err_msg = error_obj.get("message", "Unknown remote agent error"); err_details = error_obj.get("data"); logger.error(f"Agent returned JSON-RPC error for {log_context}: code={err_code}, msg='{err_msg}', data={err_details}"); raise A2ARemoteAgentError(message=err_msg, status_code=err_code, response_body=err_details)
+                    else: raise A2AMessageError(f"Invalid JSON-RPC error format from {url_str}: 'error' field is not a dictionary. Body: {response.text[:200]}...")
+                elif isinstance(json_payload, list): raise A2AMessageError(f"Invalid JSON-RPC batch response from {url_str}: Expected a list of response objects. Body: {response.text[:200]}...")
+                elif "result" in response_data:
+                    log_resp_str = f"size={len(response.content)} bytes, keys={list(response_data.get('result').keys())}" if isinstance(response_data.get('result'), dict) else f"size={len(response.content)} bytes"; logger.debug(f"Request successful ({response.status_code}) for {log_context}. Response: {log_resp_str}"); return response_data["result"], response.status_code
+                else: raise A2AMessageError(f"Invalid JSON-RPC response from {url_str}: Missing 'result' or 'error' key. Body: {response.text[:200]}...")
+            except json.JSONDecodeError as e: logger.error(f"Failed to decode JSON response from {log_context}. Status: {response.status_code}. Response text: {response.text[:200]}..."); raise A2AMessageError(f"Failed to decode JSON response from {url_str}. Status: {response.status_code}. Body: {response.text[:200]}...") from e
+        except httpx.TimeoutException as e: logger.error(f"Request timeout for {log_context}: {e}"); raise A2ATimeoutError(f"Request timed out for {url_str}: {e}") from e
+        except httpx.ConnectError as e: logger.error(f"Connection error for {log_context}: {e}"); raise A2AConnectionError(f"Connection failed for {url_str}: {e}") from e
+        except httpx.HTTPStatusError as e: logger.error(f"HTTP error on request {log_context}: {e.response.status_code}"); raise A2ARemoteAgentError(message=f"HTTP error {e.response.status_code} for {url_str}: {e.response.text}", status_code=e.response.status_code, response_body=e.response.text) from e
+        except httpx.RequestError as e: logger.error(f"HTTP request error for {log_context}: {e}"); raise A2AConnectionError(f"HTTP request failed for {url_str}: {e}") from e
+        except (A2AMessageError, A2AAuthenticationError, A2ARemoteAgentError) as e: logger.error(f"A2A error during request processing for {log_context}: {e}"); raise
+        except Exception as e: logger.exception(f"Unexpected error during request {log_context}: {e}"); raise A2AError(f"An unexpected error occurred during the request for {url_str}: {e}") from e
+    # --- END MODIFIED ---
+
+    # --- MODIFIED: Incremental byte-level SSE processing with resume ---
+    def _sse_reconnect_delay(self, attempt: int, server_retry_ms: Optional[int]) -> float:
+        base_delay = server_retry_ms / 1000.0 if server_retry_ms is not None else self.sse_reconnect_delay
+        return min(self.sse_max_reconnect_delay, base_delay * (2 ** (attempt - 1))) * random.uniform(0.5, 1.0)
+
     async def _process_sse_stream_lines(self, request_kwargs: Dict[str, Any]) -> AsyncGenerator[Dict[str, Any], None]:
-        """ Processes a Server-Sent Event line stream from an HTTP request. """
-        current_event_type = None
-        data_lines: List[str] = []
+        """
+        Processes a Server-Sent Event stream from an HTTP request, parsing the raw
+        response bytes incrementally with `SSEParser`.
+
+        Yields dicts with 'event_type', 'data' (the raw JSON bytes, decoded and
+        validated by the caller) and 'id' (None if the event had no id).
+        If the connection drops after events with IDs were received, the request
+        is repeated with a `Last-Event-ID` header (up to `sse_max_reconnects` times
+        in a row, with exponential backoff) and processing continues.
+        """
         processed_event_count = 0
         log_context = f"{request_kwargs.get('method')} {request_kwargs.get('url')} (SSE Stream)"
+        last_event_id: Optional[str] = (request_kwargs.get("headers") or {}).get("Last-Event-ID")
+        server_retry_ms: Optional[int] = None
+        reconnect_attempt = 0
         logger.info(f"Starting SSE stream processing for: {log_context}")
 
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        parser = SSEParser(last_event_id=last_event_id)
+
         try:
-            # --- MODIFIED: Use httpx stream context manager ---
-            async with self._http_client.stream(**request_kwargs) as response:
-                # Check initial response status
-                if response.status_code // 100 != 2:
-                    await response.aread() # Consume body before raising
-                    logger.error(f"HTTP error on SSE stream request {log_context}: {response.status_code}")
-                    raise httpx.HTTPStatusError(f"Server returned {response.status_code}", request=response.request, response=response)
-
-                logger.info(f"SSE stream connection successful ({response.status_code}) for {log_context}. Reading lines...")
-
-                # Iterate over lines
-                async for line in response.aiter_lines():
-                    # --- ADDED: Log every line received ---
-                    logger.debug(f"SSE Line Received: {line!r}")
-                    # --- END ADDED ---
-
-                    if not line: # Empty line signifies end of an event
-                        if data_lines:
-                            event_type = current_event_type or "message"
-                            full_data_str = '\n'.join(data_lines)
-                            logger.debug(f"Dispatching SSE event: type='{event_type}', data_len={len(full_data_str)}")
-                            try:
-                                yield {"event_type": event_type, "data": json.loads(full_data_str)}
+            while True:
+                if parser.last_event_id is not None:
+                    request_kwargs = {**request_kwargs, "headers": {**(request_kwargs.get("headers") or {}), "Last-Event-ID": parser.last_event_id}}
+                try:
+                    # --- MODIFIED: Use httpx stream context manager ---
+                    async with self._http_client.stream(**request_kwargs) as response:
+                        # Check initial response status
+                        if response.status_code // 100 != 2:
+                            await response.aread() # Consume body before raising
+                            logger.error(f"HTTP error on SSE stream request {log_context}: {response.status_code}")
+                            raise httpx.HTTPStatusError(f"Server returned {response.status_code}", request=response.request, response=response)
+
+                        logger.info(f"SSE stream connection successful ({response.status_code}) for {log_context}. Reading events...")
+                        parser = SSEParser(last_event_id=parser.last_event_id) # Drop partial events of an interrupted connection; keep retry
+                        parser.retry = server_retry_ms
+
+                        # --- MODIFIED: Parse raw byte chunks incrementally ---
+                        async for chunk in response.aiter_bytes():
+                            if debug_enabled: logger.debug(f"SSE chunk received: {len(chunk)} bytes")
+                            for event in parser.feed(chunk):
+                                if debug_enabled: logger.debug(f"Dispatching SSE event: type='{event.event_type}', id={event.id}, data_len={len(event.data)}")
+                                yield {"event_type": event.event_type, "data": event.data, "id": event.id}
                                 processed_event_count += 1
-                            except json.JSONDecodeError as e: logger.error(f"Failed to decode JSON data for SSE event type '{event_type}': {e}. Data: {full_data_str[:200]}...")
-
-                        data_lines = []
-                        current_event_type = None
-                        continue
-
-                    if line.startswith(':'):
-                        logger.debug("Ignoring SSE comment line.")
-                        continue
-
-                    try:
-                        colon_pos = line.find(':')
-                        if colon_pos == -1: logger.warning(f"Ignoring malformed SSE line (no colon): {line!r}"); continue
-                        field = line[:colon_pos].strip()
-                        value_start = colon_pos + 1
-                        if value_start < len(line) and line[value_start] == ' ': value_start += 1
-                        value = line[value_start:]
-
-                        if field == "event": current_event_type = value
-                        elif field == "data": data_lines.append(value)
-                        else: logger.debug(f"Ignoring unknown SSE field: '{field}'")
-                    except Exception as line_err: logger.warning(f"Error processing SSE line '{line!r}': {line_err}")
-            # --- END MODIFIED ---
-
-            logger.debug("Finished iterating through SSE lines.")
-
-            if data_lines: # Check for buffered data after loop finishes (shouldn't normally happen with proper SSE)
-                 logger.warning(f"Stream ended with non-empty data buffer, attempting dispatch: {data_lines}")
-                 event_type = current_event_type or "message"; full_data_str = '\n'.join(data_lines)
-                 try: yield {"event_type": event_type, "data": json.loads(full_data_str)}; processed_event_count += 1
-                 except json.JSONDecodeError as e: logger.error(f"Failed to decode JSON data for final SSE event type '{event_type}': {e}. Data: {full_data_str[:200]}...")
+                                reconnect_attempt = 0
+                            server_retry_ms = parser.retry
+                    # --- END MODIFIED ---
+                except httpx.TransportError as e:
+                    if parser.last_event_id is None or reconnect_attempt >= self.sse_max_reconnects: raise
+                    reconnect_attempt += 1
+                    delay = self._sse_reconnect_delay(reconnect_attempt, server_retry_ms)
+                    logger.warning(f"SSE stream {log_context} interrupted ({type(e).__name__}: {e}). Resuming after event ID {parser.last_event_id} in {delay:.2f}s (attempt {reconnect_attempt}/{self.sse_max_reconnects}).")
+                    await asyncio.sleep(delay)
+                    continue
+
+                logger.debug("Finished reading SSE stream.")
+
+                if parser.has_pending_data: # Unterminated event at the end of the stream (shouldn't normally happen with proper SSE)
+                     logger.warning("Stream ended with an unterminated SSE event, attempting dispatch.")
+                     event = parser.flush()
+                     if event is not None: yield {"event_type": event.event_type, "data": event.data, "id": event.id}; processed_event_count += 1
+                return
 
         except httpx.HTTPStatusError as e: # Catch errors from initial response check
             logger.error(f"HTTP error establishing SSE stream {log_context}: {e.response.status_code}")
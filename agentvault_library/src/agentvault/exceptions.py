@@ -119,6 +119,22 @@ class A2ATimeoutError(A2AConnectionError):
     """Exception raised when an A2A operation times out."""
     pass
 
+class A2ACircuitOpenError(A2AConnectionError):
+    """
+    Exception raised without contacting the agent because the client's circuit
+    breaker for its endpoint is open after repeated failures.
+    """
+    def __init__(self, message: str, endpoint: str, retry_after: float):
+        """
+        Args:
+            message: The error message.
+            endpoint: The agent endpoint URL whose circuit is open.
+            retry_after: Seconds until the circuit lets a probe request through.
+        """
+        super().__init__(message)
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
 class A2AMessageError(A2AError):
     """Exception raised for errors related to A2A message formatting or content."""
     pass
@@ -0,0 +1,103 @@
+"""
+Request hedging for idempotent A2A calls made by AgentVaultClient.
+
+A hedged call sends a second copy of a slow request and uses whichever
+response arrives first. Extra requests are paid from a shared budget so that
+hedging cannot multiply the load on agents that are slow across the board.
+"""
+
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional, Deque, FrozenSet
+
+
+# Idempotent JSON-RPC methods worth hedging. Long polls (`tasks/wait`) are slow by design and never hedged.
+HEDGEABLE_METHODS: FrozenSet[str] = frozenset({"tasks/get", "tasks/cancel"})
+
+
+class HedgeBudget:
+    """
+    Token bucket limiting hedged requests to a fraction of all hedgeable calls.
+
+    Every hedgeable call deposits `ratio` tokens (up to `burst`); every extra
+    request costs one token. Share one budget (or one HedgingPolicy) between
+    clients to cap the extra load across all of them.
+    """
+    def __init__(self, ratio: float = 0.1, burst: float = 10.0):
+        if not 0 <= ratio <= 1: raise ValueError("Hedge budget ratio must be between 0 and 1.")
+        if burst < 1: raise ValueError("Hedge budget burst must be at least 1.")
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = burst
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+    def deposit(self) -> None:
+        self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        if self._tokens < 1: return False
+        self._tokens -= 1
+        return True
+
+
+@dataclass(frozen=True)
+class HedgingPolicy:
+    """
+    Opt-in hedging of idempotent requests (`tasks/get`, `tasks/cancel`).
+
+    Attributes:
+        delay: Seconds to wait for the first response before sending a hedged
+            request. None (default) uses the observed `delay_percentile` latency
+            of the endpoint.
+        delay_percentile: Latency percentile (0-1) used as adaptive delay.
+        initial_delay: Delay used until `min_samples` latencies were observed.
+        min_delay: Lower bound for the adaptive delay.
+        latency_window: Number of recent successful latencies kept per endpoint.
+        min_samples: Observed latencies needed before the adaptive delay is used.
+        max_hedges: Extra requests sent at most per call, each after another `delay`.
+        budget: Shared budget for the extra requests (default: 10% of hedgeable
+            calls, bursts of up to 10).
+    """
+    delay: Optional[float] = None
+    delay_percentile: float = 0.95
+    initial_delay: float = 0.1
+    min_delay: float = 0.005
+    latency_window: int = 200
+    min_samples: int = 20
+    max_hedges: int = 1
+    budget: HedgeBudget = field(default_factory=HedgeBudget, compare=False)
+
+    def __post_init__(self):
+        if self.delay is not None and self.delay < 0: raise ValueError("delay must not be negative.")
+        if not 0 < self.delay_percentile <= 1: raise ValueError("delay_percentile must be in (0, 1].")
+        if self.latency_window < 1 or self.min_samples < 1: raise ValueError("latency_window and min_samples must be at least 1.")
+        if self.max_hedges < 1: raise ValueError("max_hedges must be at least 1.")
+
+
+class LatencyTracker:
+    """Sliding window of successful request latencies for one endpoint."""
+    def __init__(self, window: int):
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, latency: float) -> None:
+        self._samples.append(latency)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        if not self._samples: return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def hedge_delay(policy: HedgingPolicy, tracker: LatencyTracker) -> float:
+    """Returns how long to wait for a response before hedging a request to the tracked endpoint."""
+    if policy.delay is not None: return policy.delay
+    if len(tracker) < policy.min_samples: return policy.initial_delay
+    observed = tracker.percentile(policy.delay_percentile)
+    return max(policy.min_delay, observed if observed is not None else policy.initial_delay)
@@ -0,0 +1,185 @@
+"""
+Process-wide pooled HTTP client shared by AgentVaultClient instances and the
+library's other network entry points.
+
+Reusing one `httpx.AsyncClient` keeps TCP/TLS connections (and multiplexed
+HTTP/2 connections) alive across calls instead of paying a new handshake for
+every short-lived client. httpx clients cannot be used across event loops, so
+one shared client is kept per running event loop.
+"""
+
+import asyncio
+import logging
+import weakref
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Callable
+
+import httpx
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class HttpPoolConfig:
+    """
+    Settings for the shared HTTP client.
+
+    Attributes:
+        max_connections: Total open connections across all hosts.
+        max_keepalive_connections: Idle connections kept open for reuse.
+        keepalive_expiry: Seconds an idle connection is kept before it is closed.
+        max_connections_per_host: Concurrent requests per host (scheme, host, port);
+            None for no per-host cap. With HTTP/2 many requests share one connection.
+        http2: Negotiate HTTP/2 so concurrent requests to one agent share a connection.
+        timeout: Default request timeout in seconds.
+        follow_redirects: Whether redirects are followed.
+    """
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    max_connections_per_host: Optional[int] = None
+    http2: bool = True
+    timeout: float = 30.0
+    follow_redirects: bool = True
+
+    def __post_init__(self):
+        if self.max_connections < 1: raise ValueError("max_connections must be at least 1.")
+        if self.max_keepalive_connections < 0: raise ValueError("max_keepalive_connections must not be negative.")
+        if self.keepalive_expiry < 0: raise ValueError("keepalive_expiry must not be negative.")
+        if self.max_connections_per_host is not None and self.max_connections_per_host < 1: raise ValueError("max_connections_per_host must be at least 1.")
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_keepalive_connections, keepalive_expiry=self.keepalive_expiry)
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that releases the per-host slot when it is closed."""
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class PooledTransport(httpx.AsyncBaseTransport):
+    """
+    HTTP transport of the shared client: an `httpx.AsyncHTTPTransport` with
+    optional per-host concurrency caps and request counters.
+    """
+    def __init__(self, config: HttpPoolConfig):
+        self.config = config
+        self._transport = httpx.AsyncHTTPTransport(http2=config.http2, limits=config.limits)
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._stats: Dict[str, int] = {"requests": 0, "active_requests": 0, "host_limit_waits": 0}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        slot = self._host_slot(request.url)
+        if slot is not None:
+            if slot.locked(): self._stats["host_limit_waits"] += 1
+            await slot.acquire()
+        released = False
+        def release() -> None:
+            nonlocal released
+            if released: return
+            released = True
+            self._stats["active_requests"] -= 1
+            if slot is not None: slot.release()
+
+        self._stats["requests"] += 1; self._stats["active_requests"] += 1
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+        # The slot is held until the body is read or the stream is closed
+        response.stream = _ReleasingStream(response.stream, release) # type: ignore[arg-type]
+        return response
+
+    def _host_slot(self, url: httpx.URL) -> Optional[asyncio.Semaphore]:
+        if self.config.max_connections_per_host is None: return None
+        key = f"{url.scheme}://{url.host}:{url.port or ''}"
+        slot = self._host_slots.get(key)
+        if slot is None: slot = self._host_slots[key] = asyncio.Semaphore(self.config.max_connections_per_host)
+        return slot
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Returns request counters and the state of the pooled connections."""
+        connections: Dict[str, Dict[str, int]] = {}
+        totals = {"connections": 0, "idle_connections": 0, "http2_connections": 0}
+        pool = getattr(self._transport, "_pool", None)
+        for connection in list(getattr(pool, "connections", [])):
+            origin = getattr(connection, "_origin", None)
+            key = f"{origin.scheme.decode('ascii')}://{origin.host.decode('ascii')}:{origin.port}" if origin is not None else "unknown"
+            entry = connections.setdefault(key, {"connections": 0, "idle_connections": 0, "http2_connections": 0})
+            idle = connection.is_idle(); http2 = "HTTP/2" in connection.info()
+            for counters in (entry, totals):
+                counters["connections"] += 1
+                counters["idle_connections"] += int(idle)
+                counters["http2_connections"] += int(http2)
+        return {**self._stats, **totals, "hosts": connections}
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+_config = HttpPoolConfig()
+_shared_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def configure_http_pool(config: HttpPoolConfig) -> None:
+    """
+    Sets the configuration of shared clients. Call at startup: shared clients
+    created before keep their settings until closed with `close_shared_http_client`.
+    """
+    global _config
+    if _shared_clients: logger.warning("configure_http_pool called after shared HTTP clients were created; they keep their old settings until closed.")
+    _config = config
+
+
+def get_http_pool_config() -> HttpPoolConfig:
+    return _config
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """
+    Returns the shared `httpx.AsyncClient` of the running event loop, creating it
+    on first use. Callers must not close it; use `close_shared_http_client`.
+    """
+    loop = asyncio.get_running_loop()
+    client = _shared_clients.get(loop)
+    if client is None or client.is_closed:
+        logger.debug(f"Creating shared httpx.AsyncClient ({_config}).")
+        client = httpx.AsyncClient(transport=PooledTransport(_config), timeout=_config.timeout, follow_redirects=_config.follow_redirects)
+        _shared_clients[loop] = client
+    return client
+
+
+async def close_shared_http_client() -> None:
+    """Closes the shared client of the running event loop and its connections (e.g. on application shutdown)."""
+    client = _shared_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None and not client.is_closed: await client.aclose()
+
+
+def get_http_pool_stats() -> Dict[str, Any]:
+    """
+    Returns statistics of the running event loop's shared client: request
+    counters, open/idle/HTTP/2 connections in total and per host. Empty if
+    no shared client exists yet.
+    """
+    try:
+        client = _shared_clients.get(asyncio.get_running_loop())
+    except RuntimeError:
+        return {}
+    if client is None or client.is_closed: return {}
+    transport = getattr(client, "_transport", None)
+    return transport.get_stats() if isinstance(transport, PooledTransport) else {}
@@ -0,0 +1,117 @@
+"""
+Pluggable JSON codec used for A2A payloads by the client, the Server SDK and
+related tooling.
+
+Uses `orjson` if installed, else `msgspec`, else the standard library `json`
+module. The backend can be chosen with the `AGENTVAULT_JSON_CODEC` environment
+variable (`orjson`, `msgspec` or `json`) or `set_json_codec()`. All backends
+produce compact UTF-8 `bytes` and raise `json.JSONDecodeError` (or a subclass)
+for invalid input.
+"""
+
+import os
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional, Union
+
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    orjson = None # type: ignore
+    _HAS_ORJSON = False
+
+try:
+    import msgspec
+    _HAS_MSGSPEC = True
+except ImportError:
+    msgspec = None # type: ignore
+    _HAS_MSGSPEC = False
+
+
+logger = logging.getLogger(__name__)
+
+JSON_CODEC_ENV_VAR = "AGENTVAULT_JSON_CODEC"
+
+JSONDecodeError = json.JSONDecodeError
+
+Default = Optional[Callable[[Any], Any]]
+
+
+def _stdlib_dumps(obj: Any, default: Default = None) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=default).encode("utf-8")
+
+def _stdlib_loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    try: return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+    except UnicodeDecodeError as e: raise JSONDecodeError(f"Invalid UTF-8: {e.reason}", "", e.start) from e
+
+
+def _orjson_dumps(obj: Any, default: Default = None) -> bytes:
+    try: return orjson.dumps(obj, default=default)
+    except TypeError: return _stdlib_dumps(obj, default) # e.g. integers beyond 64 bits or non-str dict keys
+
+def _orjson_loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    return orjson.loads(data)
+
+
+def _msgspec_dumps(obj: Any, default: Default = None) -> bytes:
+    try: return _msgspec_encoder.encode(obj) if default is None else msgspec.json.encode(obj, enc_hook=default)
+    except (TypeError, OverflowError): return _stdlib_dumps(obj, default)
+
+def _msgspec_loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    try: return _msgspec_decoder.decode(data)
+    except msgspec.DecodeError as e:
+        raise JSONDecodeError(str(e), data if isinstance(data, str) else bytes(data).decode("utf-8", "replace"), 0) from e
+
+
+_msgspec_encoder = msgspec.json.Encoder() if _HAS_MSGSPEC else None
+_msgspec_decoder = msgspec.json.Decoder() if _HAS_MSGSPEC else None
+
+_CODECS: Dict[str, Any] = {"json": (_stdlib_dumps, _stdlib_loads)}
+if _HAS_MSGSPEC: _CODECS["msgspec"] = (_msgspec_dumps, _msgspec_loads)
+if _HAS_ORJSON: _CODECS["orjson"] = (_orjson_dumps, _orjson_loads)
+
+_name = "json"
+_dumps, _loads = _CODECS["json"]
+
+
+def available_json_codecs() -> List[str]:
+    """Names of the installed backends, fastest first."""
+    return [name for name in ("orjson", "msgspec", "json") if name in _CODECS]
+
+
+def get_json_codec() -> str:
+    """Name of the backend in use."""
+    return _name
+
+
+def set_json_codec(name: Optional[str] = None) -> str:
+    """
+    Selects the backend by name, or the fastest installed one if `name` is None.
+    Raises ValueError for unknown or uninstalled backends. Returns the name in use.
+    """
+    global _name, _dumps, _loads
+    if name is None: name = available_json_codecs()[0]
+    if name not in _CODECS: raise ValueError(f"JSON codec '{name}' is not available (installed: {', '.join(available_json_codecs())}).")
+    _name = name
+    _dumps, _loads = _CODECS[name]
+    logger.debug(f"Using JSON codec '{name}'.")
+    return name
+
+
+def dumps(obj: Any, default: Default = None) -> bytes:
+    """Serializes `obj` to compact UTF-8 JSON bytes. `default` converts unsupported objects."""
+    return _dumps(obj, default)
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Deserializes JSON from bytes or str. Raises `json.JSONDecodeError` for invalid input."""
+    return _loads(data)
+
+
+_configured = os.environ.get(JSON_CODEC_ENV_VAR)
+try:
+    set_json_codec(_configured or None)
+except ValueError as e:
+    logger.warning(f"Ignoring {JSON_CODEC_ENV_VAR}={_configured!r}: {e}")
+    set_json_codec(None)
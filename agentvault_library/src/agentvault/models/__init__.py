@@ -25,12 +25,21 @@ from .a2a_protocol import (
     TaskSendParams,
     TaskSendResult,
     TaskGetParams,
+    TaskGetInclude,
     GetTaskResult,       # Alias for Task
+    TaskWaitParams,
+    TERMINAL_TASK_STATES,
     TaskCancelParams,
     TaskCancelResult,
     TaskStatusUpdateEvent,
     TaskMessageEvent,
     TaskArtifactUpdateEvent,
+    # Cached validators
+    PART_ADAPTER,
+    TASK_ADAPTER,
+    SSE_EVENT_ADAPTERS,
+    JSONRPCResponse,
+    jsonrpc_response_adapter,
 )
 
 # --- ADDED: Define A2AEvent Union ---
@@ -57,12 +66,20 @@ __all__ = [
     "TaskSendParams",
     "TaskSendResult",
     "TaskGetParams",
+    "TaskGetInclude",
     "GetTaskResult",
+    "TaskWaitParams",
+    "TERMINAL_TASK_STATES",
     "TaskCancelParams",
     "TaskCancelResult",
     "TaskStatusUpdateEvent",
     "TaskMessageEvent",
     "TaskArtifactUpdateEvent",
+    "PART_ADAPTER",
+    "TASK_ADAPTER",
+    "SSE_EVENT_ADAPTERS",
+    "JSONRPCResponse",
+    "jsonrpc_response_adapter",
     # --- ADDED: Export A2AEvent ---
     "A2AEvent",
     # --- END ADDED ---
@@ -7,9 +7,11 @@ Future versions may need adjustments based on standard evolution.
 """
 
 from enum import Enum
-from typing import List, Optional, Dict, Any, Union, Literal
-from pydantic import BaseModel, Field, HttpUrl, field_validator, ConfigDict
+from typing import List, Optional, Dict, Any, FrozenSet, Union, Literal, Generic, Sequence, TypeVar
+from typing_extensions import Annotated, TypedDict
+from pydantic import BaseModel, Field, HttpUrl, field_validator, ConfigDict, TypeAdapter, Discriminator, Tag
 import datetime
+import functools
 
 # --- Core Enumerations ---
 
@@ -57,8 +59,30 @@ class DataPart(BaseModel):
     content: Dict[str, Any] = Field(..., description="The structured data content (JSON object).")
     media_type: str = Field("application/json", alias="mediaType", description="MIME type of the data, defaults to application/json.")
 
-# Union type for message parts
-Part = Union[TextPart, FilePart, DataPart]
+def _part_type(value: Any) -> Optional[str]:
+    """
+    Returns the `type` tag of a message part.
+
+    Parts without a `type` key are resolved by shape, as the previous untagged
+    union did: a `url` means a file, object content means data, anything else text.
+    """
+    if isinstance(value, dict):
+        if "type" in value:
+            return value["type"]
+        if "url" in value:
+            return "file"
+        return "data" if isinstance(value.get("content"), dict) else "text"
+    return getattr(value, "type", None)
+
+# Union type for message parts, discriminated by the `type` field
+Part = Annotated[
+    Union[
+        Annotated[TextPart, Tag("text")],
+        Annotated[FilePart, Tag("file")],
+        Annotated[DataPart, Tag("data")],
+    ],
+    Discriminator(_part_type),
+]
 
 # --- Artifacts ---
 
@@ -103,6 +127,10 @@ class Task(BaseModel):
     messages: List[Message] = Field(default_factory=list, description="Chronological list of messages exchanged during the task.")
     artifacts: List[Artifact] = Field(default_factory=list, description="List of artifacts associated with the task.")
     metadata: Optional[Dict[str, Any]] = Field(None, description="Optional metadata associated with the task itself.")
+    message_count: Optional[int] = Field(None, alias="messageCount", description="Total number of messages of the task. Set when tasks/get returned only some of them (see TaskGetParams).")
+    next_cursor: Optional[int] = Field(None, alias="nextCursor", description="Value for `since` to fetch the next window of messages, or null if no further messages remain.")
+
+    model_config = ConfigDict(populate_by_name=True)
 
 # --- JSON-RPC Style Parameters & Results (for common methods) ---
 
@@ -120,13 +148,72 @@ class TaskSendResult(BaseModel):
     # Potentially add initial status or confirmation details
 
 # Parameters for tasks/get
+TaskGetInclude = Literal["messages", "artifacts"]
+
 class TaskGetParams(BaseModel):
-    """Parameters for retrieving task status."""
+    """
+    Parameters for retrieving task status.
+
+    Without the optional parameters the whole Task is returned. `include=[]`
+    returns only the state and timestamps, so status polls stay cheap however
+    long the task's history grows; `since` and `limit` page through messages.
+    A windowed result carries `messageCount` and `nextCursor`.
+    """
     id: str = Field(..., description="The ID of the task to retrieve.")
+    include: Optional[List[TaskGetInclude]] = Field(None, description="Collections to return ('messages', 'artifacts'). Omitted: all of them; empty list: state only.")
+    since: Optional[int] = Field(None, ge=0, description="Index of the first message to return, e.g. the number of messages already fetched or a previous `nextCursor`.")
+    limit: Optional[int] = Field(None, ge=1, description="Maximum number of messages to return.")
+
+    @property
+    def is_windowed(self) -> bool:
+        """True if the result is restricted in any way (i.e. not the full Task)."""
+        return self.include is not None or self.since is not None or self.limit is not None
+
+    def includes(self, collection: TaskGetInclude) -> bool:
+        return self.include is None or collection in self.include
+
+    def select(self, messages: Sequence["Message"], artifacts: Sequence["Artifact"]) -> Dict[str, Any]:
+        """
+        Returns the Task field values (by field name) these parameters select from
+        the task's full `messages` and `artifacts`. Slicing a sequence costs only
+        the size of the window, so agents can build the Task from their history directly.
+        """
+        if not self.is_windowed: return {"messages": list(messages), "artifacts": list(artifacts)}
+        selected: Dict[str, Any] = {"messages": [], "artifacts": list(artifacts) if self.includes("artifacts") else [], "message_count": len(messages), "next_cursor": None}
+        if self.includes("messages"):
+            start = min(self.since or 0, len(messages))
+            end = len(messages) if self.limit is None else min(start + self.limit, len(messages))
+            selected["messages"] = list(messages[start:end])
+            if end < len(messages): selected["next_cursor"] = end
+        return selected
+
+    def apply(self, task: "Task") -> "Task":
+        """Returns `task` restricted to these parameters (the task itself if nothing is restricted)."""
+        if not self.is_windowed: return task
+        return task.model_copy(update=self.select(task.messages, task.artifacts))
 
 # Result of tasks/get (is the full Task object)
 GetTaskResult = Task
 
+# States after which a task does not change anymore
+TERMINAL_TASK_STATES: FrozenSet[TaskState] = frozenset({TaskState.COMPLETED, TaskState.FAILED, TaskState.CANCELED})
+
+# Parameters for tasks/wait
+class TaskWaitParams(TaskGetParams):
+    """
+    Parameters for waiting until a task reaches one of `states` (long polling).
+
+    The agent responds as soon as the task is in one of the states, or with the
+    task's current state once `timeout` (capped by the agent) has passed. The
+    result is a Task selected like for tasks/get (`include`, `since`, `limit`).
+    """
+    states: Optional[List[TaskState]] = Field(None, description="States to wait for. Omitted: the terminal states (COMPLETED, FAILED, CANCELED).")
+    timeout: Optional[float] = Field(None, gt=0, description="Seconds to wait at most before returning the current state. Omitted: the agent's maximum.")
+
+    @property
+    def target_states(self) -> FrozenSet[TaskState]:
+        return TERMINAL_TASK_STATES if not self.states else frozenset(self.states)
+
 # Parameters for tasks/cancel
 class TaskCancelParams(BaseModel):
     """Parameters for requesting task cancellation."""
@@ -169,4 +256,41 @@ class TaskArtifactUpdateEvent(BaseModel):
     artifact: Artifact = Field(..., description="The artifact that was created or updated.")
     timestamp: datetime.datetime = Field(..., description="Timestamp of the artifact update.")
 
-#
+
+# --- Cached TypeAdapters ---
+# Building a TypeAdapter compiles a validator, so they are created once here.
+# `validate_json` validates raw bytes without an intermediate dict, which is fastest
+# for small payloads such as SSE events; for large results (e.g. a Task with a long
+# history) decoding with `agentvault.json_codec` and `validate_python` is faster.
+
+PART_ADAPTER: TypeAdapter[Part] = TypeAdapter(Part)
+TASK_ADAPTER: TypeAdapter[Task] = TypeAdapter(Task)
+TASK_SEND_RESULT_ADAPTER: TypeAdapter[TaskSendResult] = TypeAdapter(TaskSendResult)
+TASK_CANCEL_RESULT_ADAPTER: TypeAdapter[TaskCancelResult] = TypeAdapter(TaskCancelResult)
+
+# Adapters of the SSE event payloads, keyed by SSE event type
+SSE_EVENT_ADAPTERS: Dict[str, TypeAdapter] = {
+    "task_status": TypeAdapter(TaskStatusUpdateEvent),
+    "task_message": TypeAdapter(TaskMessageEvent),
+    "task_artifact": TypeAdapter(TaskArtifactUpdateEvent),
+}
+SSE_EVENT_ADAPTERS["message"] = SSE_EVENT_ADAPTERS["task_message"] # 'message' is an alias for task_message
+
+
+ResultT = TypeVar("ResultT")
+
+class JSONRPCResponse(TypedDict, Generic[ResultT], total=False):
+    """JSON-RPC 2.0 response object with a typed `result`."""
+    jsonrpc: str
+    id: Union[str, int, None]
+    result: ResultT
+    error: Any
+
+
+@functools.lru_cache(maxsize=None)
+def jsonrpc_response_adapter(result_type: Any) -> TypeAdapter:
+    """
+    Returns the cached adapter validating a whole JSON-RPC response whose
+    `result` is `result_type`, e.g. `jsonrpc_response_adapter(Task).validate_python(data)`.
+    """
+    return TypeAdapter(JSONRPCResponse[result_type])
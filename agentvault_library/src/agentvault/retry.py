@@ -0,0 +1,95 @@
+"""
+Retry policy used by AgentVaultClient for failed A2A requests.
+"""
+
+import time
+import random
+import datetime
+import email.utils
+from dataclasses import dataclass
+from typing import Optional, FrozenSet
+
+# JSON-RPC methods that can be repeated without side effects
+IDEMPOTENT_METHODS: FrozenSet[str] = frozenset({"tasks/get", "tasks/cancel", "tasks/wait"})
+# JSON-RPC methods that are repeated only when the request carries an idempotency key
+IDEMPOTENCY_KEY_METHODS: FrozenSet[str] = frozenset({"tasks/send"})
+DEFAULT_RETRYABLE_STATUS_CODES: FrozenSet[int] = frozenset({408, 429, 500, 502, 503, 504})
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Controls how often and when AgentVaultClient repeats a failed request.
+
+    Requests are retried on connection errors, timeouts and HTTP responses with a
+    status in `retryable_status_codes`. JSON-RPC errors returned by the agent are
+    never retried. Only idempotent methods (`tasks/get`, `tasks/cancel`, `tasks/wait`) are
+    retried after the request may have reached the agent; `tasks/send` is only
+    retried if it carries an idempotency key. Failures to connect are retried for
+    every method, as the agent cannot have seen the request.
+
+    Attributes:
+        max_attempts: Total attempts per request, including the first one (1 disables retries).
+        initial_delay: Delay in seconds before the first retry.
+        max_delay: Upper bound for the backoff delay.
+        backoff_multiplier: Factor applied to the delay after each attempt.
+        jitter: Fraction of the delay that is randomized (0 = fixed delays,
+            1 = anywhere between 0 and the full delay).
+        retryable_status_codes: HTTP status codes that are worth retrying.
+        total_timeout: Deadline in seconds for all attempts and delays together
+            (None = no deadline). Attempts still running at the deadline are cancelled.
+        respect_retry_after: Wait at least as long as a `Retry-After` response header asks.
+        max_retry_after: Do not retry if `Retry-After` asks for a longer wait than this.
+        generate_idempotency_keys: Generate an idempotency key for `tasks/send`
+            requests that were not given one, making them retryable. Only enable
+            this if the agents deduplicate requests by the `Idempotency-Key` header.
+    """
+    max_attempts: int = 3
+    initial_delay: float = 0.2
+    max_delay: float = 5.0
+    backoff_multiplier: float = 2.0
+    jitter: float = 0.5
+    retryable_status_codes: FrozenSet[int] = DEFAULT_RETRYABLE_STATUS_CODES
+    total_timeout: Optional[float] = None
+    respect_retry_after: bool = True
+    max_retry_after: float = 60.0
+    generate_idempotency_keys: bool = False
+
+    def __post_init__(self):
+        if self.max_attempts < 1: raise ValueError("max_attempts must be at least 1.")
+        if self.initial_delay < 0 or self.max_delay < 0: raise ValueError("Retry delays must not be negative.")
+        if self.backoff_multiplier < 1: raise ValueError("backoff_multiplier must be at least 1.")
+        if not 0 <= self.jitter <= 1: raise ValueError("jitter must be between 0 and 1.")
+        if self.total_timeout is not None and self.total_timeout <= 0: raise ValueError("total_timeout must be positive.")
+        object.__setattr__(self, "retryable_status_codes", frozenset(self.retryable_status_codes))
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Returns the delay before retrying after the given (1-based) failed attempt."""
+        delay = min(self.max_delay, self.initial_delay * self.backoff_multiplier ** (attempt - 1))
+        return delay * random.uniform(1.0 - self.jitter, 1.0)
+
+
+@dataclass(frozen=True)
+class RequestAttempt:
+    """Outcome of a single HTTP attempt of a non-streaming A2A request."""
+    rpc_method: Optional[str] # JSON-RPC method, "batch" for batch requests
+    url: str
+    attempt: int # 1-based
+    duration: float # Seconds
+    status_code: Optional[int] = None # HTTP status, None if no response was received
+    error: Optional[str] = None # Exception class name, None on success
+    retry_delay: Optional[float] = None # Seconds until the next attempt, None if not retried
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a `Retry-After` header (delay in seconds or HTTP date) into seconds from now."""
+    if not value: return None
+    value = value.strip()
+    if value.isdigit(): return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None: retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, retry_at.timestamp() - time.time())
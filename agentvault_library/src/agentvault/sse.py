@@ -0,0 +1,98 @@
+"""
+Incremental Server-Sent Events parser working on raw response bytes.
+
+`SSEParser` is fed the chunks of `httpx.Response.aiter_bytes()` as they arrive
+and returns the events completed by each chunk. Lines may end with LF, CRLF or
+CR and may be split across chunks at any byte. Field values stay `bytes` until
+an event is dispatched, so event data can be handed to a JSON decoder without
+an intermediate string.
+"""
+
+from typing import Optional, List, NamedTuple
+
+
+_BOM = b"\xef\xbb\xbf"
+
+
+class SSEEvent(NamedTuple):
+    """One dispatched event."""
+    event_type: str # `event:` field, "message" if absent
+    data: bytes # `data:` lines joined with LF
+    id: Optional[str] # `id:` field of this event, None if it had none
+
+
+class SSEParser:
+    """
+    Incremental SSE parser (see the WHATWG "event stream interpretation" rules).
+
+    Attributes:
+        last_event_id: ID of the most recent completed event that carried one.
+        retry: Reconnection time in milliseconds from the latest `retry:` field, or None.
+    """
+    def __init__(self, last_event_id: Optional[str] = None):
+        self.last_event_id = last_event_id
+        self.retry: Optional[int] = None
+        self._buffer = b""
+        self._started = False
+        self._after_cr = False
+        self._event_type: Optional[bytes] = None
+        self._event_id: Optional[str] = None
+        self._data: List[bytes] = []
+
+    def feed(self, chunk: bytes) -> List[SSEEvent]:
+        """Consumes a chunk of the stream and returns the events it completed."""
+        if not chunk: return []
+        if self._after_cr:
+            # A CR ending the previous chunk already terminated the line; skip the LF of a split CRLF
+            if chunk[:1] == b"\n": chunk = chunk[1:]
+            self._after_cr = False
+        buffer = self._buffer + chunk if self._buffer else chunk
+        if not self._started:
+            if len(buffer) < len(_BOM) and _BOM.startswith(buffer): self._buffer = buffer; return []
+            if buffer.startswith(_BOM): buffer = buffer[len(_BOM):]
+            self._started = True
+        if b"\r" in buffer:
+            self._after_cr = buffer.endswith(b"\r")
+            buffer = buffer.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        lines = buffer.split(b"\n")
+        self._buffer = lines.pop() # Incomplete last line (empty if the chunk ended with a line break)
+        events: List[SSEEvent] = []
+        for line in lines:
+            if not line:
+                event = self._dispatch()
+                if event is not None: events.append(event)
+            elif line[0] != 0x3A: # Lines starting with ':' are comments
+                self._process_field(line)
+        return events
+
+    def flush(self) -> Optional[SSEEvent]:
+        """
+        Processes a final unterminated line at the end of the stream and returns
+        the pending event, if it has data. Per the spec such an event would be
+        discarded; it is returned so that callers can decide.
+        """
+        line, self._buffer = self._buffer, b""
+        if line and line[0] != 0x3A: self._process_field(line)
+        return self._dispatch()
+
+    @property
+    def has_pending_data(self) -> bool:
+        return bool(self._data) or bool(self._buffer)
+
+    def _process_field(self, line: bytes) -> None:
+        field, colon, value = line.partition(b":")
+        if colon and value[:1] == b" ": value = value[1:]
+        if field == b"data": self._data.append(value)
+        elif field == b"event": self._event_type = value
+        elif field == b"id":
+            if b"\0" not in value: self._event_id = value.decode("utf-8", "replace")
+        elif field == b"retry":
+            if value.isdigit(): self.retry = int(value)
+
+    def _dispatch(self) -> Optional[SSEEvent]:
+        event_id, event_type, data = self._event_id, self._event_type, self._data
+        self._event_id = None; self._event_type = None
+        if event_id is not None: self.last_event_id = event_id
+        if not data: return None
+        self._data = []
+        return SSEEvent(event_type.decode("utf-8", "replace") if event_type else "message", data[0] if len(data) == 1 else b"\n".join(data), event_id)
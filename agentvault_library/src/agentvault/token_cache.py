@@ -0,0 +1,135 @@
+"""
+Optional on-disk cache of OAuth access tokens shared by AgentVaultClient
+instances and processes (e.g. successive CLI invocations).
+
+Tokens are stored in one JSON file readable only by the current user. Entries
+are keyed by service ID, token URL and scopes, and are only returned until
+their (buffered) expiry. Access is serialized with an advisory file lock.
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import pathlib
+import tempfile
+import contextlib
+from typing import Optional, Dict, Any, List, Iterator, Tuple
+
+try:
+    import fcntl
+    _HAS_FCNTL = True
+except ImportError: # Windows
+    fcntl = None # type: ignore
+    _HAS_FCNTL = False
+
+try:
+    import msvcrt
+    _HAS_MSVCRT = True
+except ImportError:
+    msvcrt = None # type: ignore
+    _HAS_MSVCRT = False
+
+
+logger = logging.getLogger(__name__)
+
+TOKEN_CACHE_ENV_VAR = "AGENTVAULT_TOKEN_CACHE"
+
+
+def default_token_cache_path() -> pathlib.Path:
+    """`$AGENTVAULT_TOKEN_CACHE`, else `$XDG_CACHE_HOME/agentvault/oauth_tokens.json` (default `~/.cache`)."""
+    configured = os.environ.get(TOKEN_CACHE_ENV_VAR)
+    if configured: return pathlib.Path(configured).expanduser()
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return pathlib.Path(cache_home) / "agentvault" / "oauth_tokens.json"
+
+
+def token_cache_key(service_id: str, token_url: str, scopes: Optional[List[str]]) -> str:
+    """Key of a token: digest of the service ID, token URL and (sorted) scopes."""
+    material = "\n".join([service_id, token_url, " ".join(sorted(scopes or []))])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class FileTokenCache:
+    """
+    OAuth token cache in a JSON file with mode 0600 (directory 0700).
+
+    Files that are accessible by other users are ignored and overwritten. Tokens
+    without an expiry are not persisted. All file access runs in a worker thread.
+    """
+    def __init__(self, path: Optional[os.PathLike] = None):
+        self.path = pathlib.Path(path) if path is not None else default_token_cache_path()
+        self._lock_path = self.path.with_name(self.path.name + ".lock")
+
+    async def get(self, service_id: str, token_url: str, scopes: Optional[List[str]]) -> Optional[Tuple[str, float]]:
+        """Returns `(access_token, expiry_timestamp)` if an unexpired token is cached."""
+        return await asyncio.to_thread(self._get_sync, token_cache_key(service_id, token_url, scopes))
+
+    async def put(self, service_id: str, token_url: str, scopes: Optional[List[str]], access_token: str, expiry: Optional[float]) -> None:
+        """Stores a token until `expiry` (epoch seconds). Tokens without expiry are skipped."""
+        if expiry is None:
+            logger.debug(f"Not persisting OAuth token for service '{service_id}': it has no expiry.")
+            return
+        await asyncio.to_thread(self._put_sync, token_cache_key(service_id, token_url, scopes), service_id, access_token, expiry)
+
+    async def remove(self, service_id: str, token_url: str, scopes: Optional[List[str]]) -> None:
+        await asyncio.to_thread(self._remove_sync, token_cache_key(service_id, token_url, scopes))
+
+    # --- Synchronous helpers (run in a thread) ---
+    def _get_sync(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._locked(exclusive=False):
+            entry = self._read_entries().get(key)
+        if not isinstance(entry, dict): return None
+        token, expiry = entry.get("access_token"), entry.get("expires_at")
+        if not isinstance(token, str) or not isinstance(expiry, (int, float)) or expiry <= time.time(): return None
+        return token, float(expiry)
+
+    def _put_sync(self, key: str, service_id: str, access_token: str, expiry: float) -> None:
+        with self._locked(exclusive=True):
+            entries = self._read_entries()
+            entries[key] = {"service_id": service_id, "access_token": access_token, "expires_at": expiry}
+            self._write_entries(entries)
+
+    def _remove_sync(self, key: str) -> None:
+        with self._locked(exclusive=True):
+            entries = self._read_entries()
+            if entries.pop(key, None) is not None: self._write_entries(entries)
+
+    def _read_entries(self) -> Dict[str, Any]:
+        try:
+            if os.name == "posix" and self.path.stat().st_mode & 0o077:
+                logger.warning(f"Ignoring OAuth token cache '{self.path}': it is accessible by other users.")
+                return {}
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not read OAuth token cache '{self.path}': {e}")
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write_entries(self, entries: Dict[str, Any]) -> None:
+        now = time.time()
+        entries = {key: entry for key, entry in entries.items() if isinstance(entry, dict) and isinstance(entry.get("expires_at"), (int, float)) and entry["expires_at"] > now}
+        fd, temp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp") # Created with mode 0600
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            with contextlib.suppress(OSError): os.unlink(temp_path)
+            raise
+
+    @contextlib.contextmanager
+    def _locked(self, exclusive: bool) -> Iterator[None]:
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if _HAS_FCNTL: fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            elif _HAS_MSVCRT: msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            yield
+        finally:
+            os.close(fd) # Closing releases the lock
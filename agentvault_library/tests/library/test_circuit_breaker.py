@@ -0,0 +1,67 @@
+import pytest
+
+from agentvault.circuit_breaker import CircuitBreaker, CircuitBreakerConfig, CircuitState
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> _FakeClock:
+    return _FakeClock()
+
+@pytest.fixture
+def breaker(clock) -> CircuitBreaker:
+    config = CircuitBreakerConfig(failure_rate_threshold=0.5, window_size=4, minimum_calls=4, probe_interval=10.0)
+    return CircuitBreaker("https://agent.test/a2a", config, clock=clock)
+
+
+def test_config_validation():
+    with pytest.raises(ValueError): CircuitBreakerConfig(failure_rate_threshold=0)
+    with pytest.raises(ValueError): CircuitBreakerConfig(window_size=5, minimum_calls=6)
+    with pytest.raises(ValueError): CircuitBreakerConfig(half_open_max_calls=0)
+
+def test_opens_at_failure_rate_threshold(breaker: CircuitBreaker):
+    breaker.record_failure(); breaker.record_failure(); breaker.record_success()
+    # Below minimum_calls the rate is not evaluated
+    assert breaker.state == CircuitState.CLOSED
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED # 2/4 failures, but the window only now reached minimum_calls
+    breaker.record_failure() # Window: fail, success, success, fail -> 50%
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.allow_request() is False
+    stats = breaker.get_stats()
+    assert stats["state"] == "open" and stats["rejected"] == 1 and stats["opened"] == 1
+    assert stats["retry_after"] == 10.0
+
+def test_half_open_probe_closes_or_reopens(breaker: CircuitBreaker, clock: _FakeClock):
+    for _ in range(4): breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+    clock.now += 10.0
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False # Only one probe at a time
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.retry_after() == 10.0
+
+    clock.now += 10.0
+    assert breaker.allow_request() is True
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.get_stats()["window_calls"] == 0
+
+def test_ignored_probe_releases_slot(breaker: CircuitBreaker, clock: _FakeClock):
+    for _ in range(4): breaker.record_failure()
+    clock.now += 10.0
+    assert breaker.allow_request() is True
+    breaker.record_ignored() # e.g. the probe request was cancelled
+    assert breaker.allow_request() is True
+    breaker.reset()
+    assert breaker.state == CircuitState.CLOSED
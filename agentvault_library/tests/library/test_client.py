@@ -8,6 +8,8 @@ import asyncio
 # --- ADDED: Import re ---
 import re
 # --- END ADDED ---
+import time
+import email.utils
 from unittest.mock import MagicMock, call, patch, AsyncMock
 from typing import Optional, Dict, Any, Union, Tuple, List, AsyncGenerator
 
@@ -15,6 +17,10 @@ from typing import Optional, Dict, Any, Union, Tuple, List, AsyncGenerator
 # Import client, models, exceptions, and KeyManager
 from agentvault.client import AgentVaultClient, A2AEvent, CACHE_EXPIRY_BUFFER_SECONDS
 from agentvault.key_manager import KeyManager
+from agentvault.retry import RetryPolicy, RequestAttempt, parse_retry_after
+from agentvault.circuit_breaker import CircuitBreakerConfig, CircuitState
+from agentvault.hedging import HedgingPolicy, HedgeBudget, LatencyTracker, hedge_delay
+from agentvault.token_cache import FileTokenCache
 from agentvault.models import (
     AgentCard, AgentProvider, AgentCapabilities, AgentAuthentication, Message, TextPart,
     Task, TaskState, TaskSendResult, TaskCancelResult,
@@ -22,7 +28,7 @@ from agentvault.models import (
 )
 from agentvault.exceptions import (
     A2AError, A2AConnectionError, A2AAuthenticationError, A2ARemoteAgentError,
-    A2ATimeoutError, A2AMessageError
+    A2ATimeoutError, A2AMessageError, A2ACircuitOpenError
 )
 # --- ADDED: Import testing utils ---
 from agentvault_testing_utils.fixtures import mock_a2a_server, MockServerInfo
@@ -33,6 +39,7 @@ from agentvault_testing_utils.mock_server import (
     JSONRPC_APP_ERROR,
     JSONRPC_INVALID_PARAMS,
     JSONRPC_INTERNAL_ERROR,
+    JSONRPC_METHOD_NOT_FOUND,
     # --- ADDED: Import default task creator ---
     create_default_mock_task
     # --- END ADDED ---
@@ -135,6 +142,139 @@ async def test_get_task_status_success(
     # --- END MODIFIED ---
 
 
+@pytest.mark.asyncio
+async def test_get_task_status_parses_discriminated_parts(agent_card_apikey: AgentCard, mock_key_manager, respx_mock):
+    task_data = create_default_mock_task("t-parts")
+    task_data["messages"] = [{"role": "assistant", "parts": [{"type": "text", "content": "hi"}, {"type": "data", "content": {"n": 1}}]}]
+    respx_mock.post(str(agent_card_apikey.url)).mock(side_effect=lambda request: httpx.Response(200, json=create_jsonrpc_success_response(json.loads(request.content)["id"], task_data)))
+
+    async with AgentVaultClient() as client:
+        task = await client.get_task_status(agent_card_apikey, "t-parts", mock_key_manager)
+
+    assert isinstance(task, Task) and task.state == TaskState.COMPLETED
+    assert [type(part).__name__ for part in task.messages[0].parts] == ["TextPart", "DataPart"]
+    assert task == Task.model_validate(task_data)
+
+@pytest.mark.asyncio
+async def test_get_task_status_windows(mock_a2a_server: MockServerInfo, agent_card_apikey: AgentCard, mock_key_manager, respx_mock):
+    task_id = "long-history-task"
+    mock_a2a_server.task_store[task_id] = {"state": TaskState.WORKING, "messages": [{"role": "user", "parts": [{"type": "text", "content": f"m{i}"}]} for i in range(30)]}
+    async with AgentVaultClient() as client:
+        state_only = await client.get_task_status(agent_card_apikey, task_id, mock_key_manager, include=[])
+        page = await client.get_task_status(agent_card_apikey, task_id, mock_key_manager, include=["messages"], since=10, limit=5)
+        full = await client.get_task_status(agent_card_apikey, task_id, mock_key_manager)
+        assert json.loads(respx_mock.calls.last.request.content)["params"] == {"id": task_id} # Default requests are unchanged
+        with pytest.raises(ValueError, match="Invalid tasks/get parameters"):
+            await client.get_task_status(agent_card_apikey, task_id, mock_key_manager, since=-1)
+
+    assert state_only.state == TaskState.WORKING and state_only.messages == [] and state_only.message_count == 30
+    assert [m.parts[0].content for m in page.messages] == ["m10", "m11", "m12", "m13", "m14"] and page.next_cursor == 15
+    assert len(full.messages) == 30 and full.message_count is None
+
+@pytest.mark.asyncio
+async def test_get_task_status_invalid_result_raises_message_error(agent_card_apikey: AgentCard, mock_key_manager, respx_mock):
+    respx_mock.post(str(agent_card_apikey.url)).mock(side_effect=lambda request: httpx.Response(200, json=create_jsonrpc_success_response(json.loads(request.content)["id"], {"id": "t-bad", "state": "NOT_A_STATE"})))
+    async with AgentVaultClient() as client:
+        with pytest.raises(A2AMessageError, match="Failed to validate Task result"):
+            await client.get_task_status(agent_card_apikey, "t-bad", mock_key_manager)
+
+
+# --- Test wait_for_terminal_state ---
+@pytest.mark.asyncio
+async def test_wait_for_terminal_state_long_poll(mock_a2a_server: MockServerInfo, agent_card_apikey: AgentCard, mock_key_manager, respx_mock):
+    mock_a2a_server.task_store["wait-task"] = {"state": TaskState.COMPLETED}
+    async with AgentVaultClient() as client:
+        task = await client.wait_for_terminal_state(agent_card_apikey, "wait-task", mock_key_manager, poll_timeout=5, include=[])
+    assert task.state == TaskState.COMPLETED
+    request = json.loads(respx_mock.calls.last.request.content)
+    assert request["method"] == "tasks/wait" and request["params"] == {"id": "wait-task", "include": [], "timeout": 5.0}
+
+@pytest.mark.asyncio
+async def test_wait_for_terminal_state_falls_back_to_polling(agent_card_apikey: AgentCard, mock_key_manager, respx_mock):
+    states = iter(["WORKING", "WORKING", "FAILED", "FAILED"])
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        if payload["method"] == "tasks/wait": return httpx.Response(200, json=create_jsonrpc_error_response(payload["id"], JSONRPC_METHOD_NOT_FOUND, "Method not found"))
+        return httpx.Response(200, json=create_jsonrpc_success_response(payload["id"], create_default_mock_task("wait-task", state=next(states))))
+    route = respx_mock.post(str(agent_card_apikey.url)).mock(side_effect=handler)
+    async with AgentVaultClient() as client:
+        task = await client.wait_for_terminal_state(agent_card_apikey, "wait-task", mock_key_manager, poll_interval=0.01)
+    assert task.state == TaskState.FAILED
+    methods = [json.loads(c.request.content)["method"] for c in route.calls]
+    assert methods == ["tasks/wait", "tasks/get", "tasks/get", "tasks/get", "tasks/get"] # State-only polls, then the full task
+    assert json.loads(route.calls[1].request.content)["params"] == {"id": "wait-task", "include": []}
+
+@pytest.mark.asyncio
+async def test_wait_for_terminal_state_timeout(mock_a2a_server: MockServerInfo, agent_card_apikey: AgentCard, mock_key_manager):
+    mock_a2a_server.task_store["wait-task"] = {"state": TaskState.WORKING}
+    async with AgentVaultClient() as client:
+        with pytest.raises(A2ATimeoutError, match="terminal state"):
+            await client.wait_for_terminal_state(agent_card_apikey, "wait-task", mock_key_manager, timeout=0.05)
+        with pytest.raises(ValueError):
+            await client.wait_for_terminal_state(agent_card_apikey, "wait-task", mock_key_manager, poll_timeout=0)
+
+
+# --- Test get_task_statuses ---
+@pytest.mark.asyncio
+async def test_get_task_statuses_mixed_results(
+    mock_a2a_server: MockServerInfo,
+    agent_card_apikey: AgentCard,
+    mock_key_manager,
+    respx_mock
+):
+    mock_a2a_server.task_store["batch-task-1"] = {"state": TaskState.WORKING}
+    mock_a2a_server.task_store["batch-task-2"] = {"state": TaskState.COMPLETED}
+    async with AgentVaultClient() as client:
+        results = await client.get_task_statuses(
+            agent_card_apikey, ["batch-task-1", "missing-task", "batch-task-2", "batch-task-1"], mock_key_manager
+        )
+
+    # One HTTP round-trip for the whole batch
+    a2a_calls = [c for c in respx_mock.calls if c.request.url.path == "/a2a"]
+    assert len(a2a_calls) == 1
+    sent_batch = json.loads(a2a_calls[0].request.content)
+    assert isinstance(sent_batch, list) and len(sent_batch) == 3 # Duplicate ID requested once
+    assert all(entry["method"] == "tasks/get" for entry in sent_batch)
+
+    assert list(results.keys()) == ["batch-task-1", "missing-task", "batch-task-2"]
+    assert isinstance(results["batch-task-1"], Task) and results["batch-task-1"].state == TaskState.WORKING
+    assert isinstance(results["batch-task-2"], Task) and results["batch-task-2"].state == TaskState.COMPLETED
+    assert isinstance(results["missing-task"], A2ARemoteAgentError)
+    assert results["missing-task"].status_code == -32001
+
+@pytest.mark.asyncio
+async def test_get_task_statuses_missing_and_invalid_entries(agent_card_apikey: AgentCard, mock_key_manager, respx_mock):
+    def batch_handler(request: httpx.Request) -> httpx.Response:
+        batch = json.loads(request.content)
+        # Valid task for the first entry, malformed result for the second, nothing for the third
+        return httpx.Response(200, json=[
+            create_jsonrpc_success_response(batch[0]["id"], create_default_mock_task("t-1")),
+            create_jsonrpc_success_response(batch[1]["id"], {"unexpected": True}),
+        ])
+
+    respx_mock.post(str(agent_card_apikey.url)).mock(side_effect=batch_handler)
+    async with AgentVaultClient() as client:
+        results = await client.get_task_statuses(agent_card_apikey, ["t-1", "t-2", "t-3"], mock_key_manager)
+
+    assert isinstance(results["t-1"], Task)
+    assert isinstance(results["t-2"], A2AMessageError)
+    assert isinstance(results["t-3"], A2AMessageError)
+
+@pytest.mark.asyncio
+async def test_get_task_statuses_batch_rejected(agent_card_apikey: AgentCard, mock_key_manager, respx_mock):
+    respx_mock.post(str(agent_card_apikey.url)).mock(return_value=httpx.Response(
+        200, json=create_jsonrpc_error_response(None, -32600, "Invalid Request: Payload must be a JSON object.")
+    ))
+    async with AgentVaultClient() as client:
+        with pytest.raises(A2ARemoteAgentError, match="Payload must be a JSON object"):
+            await client.get_task_statuses(agent_card_apikey, ["t-1"], mock_key_manager)
+
+@pytest.mark.asyncio
+async def test_get_task_statuses_empty(agent_card_apikey: AgentCard, mock_key_manager):
+    async with AgentVaultClient() as client:
+        assert await client.get_task_statuses(agent_card_apikey, [], mock_key_manager) == {}
+
+
 # --- Test terminate_task ---
 # (Keep existing test)
 # ...
@@ -177,6 +317,19 @@ async def test_receive_messages_success(
     assert isinstance(received_events[1], TaskMessageEvent)
     assert received_events[1].message.parts[0].content == "SSE Message" # type: ignore
 
+@pytest.mark.asyncio
+async def test_receive_messages_skips_invalid_event(agent_card_apikey: AgentCard, mock_key_manager, respx_mock):
+    task_id = "invalid-event-task"
+    now = datetime.datetime.now(datetime.timezone.utc)
+    message_event = TaskMessageEvent(taskId=task_id, message=Message(role="assistant", parts=[TextPart(content="hi")]), timestamp=now)
+    body = b"event: task_status\ndata: {\"taskId\": 1}\n\n" + _sse_block(None, message_event, "task_message")
+    respx_mock.post(str(agent_card_apikey.url)).mock(return_value=httpx.Response(200, headers={"content-type": "text/event-stream"}, content=body))
+
+    async with AgentVaultClient() as client:
+        received = [event async for event in client.receive_messages(agent_card_apikey, task_id, mock_key_manager)]
+
+    assert received == [message_event]
+
 @pytest.mark.asyncio
 async def test_receive_messages_stream_error(
     mock_a2a_server: MockServerInfo,
@@ -220,3 +373,373 @@ async def test_receive_messages_stream_error(
     # --- MODIFIED: Assert the correct mock was called ---
     mock_process_lines.assert_called_once() # Check the new mock
     # --- END MODIFIED ---
+
+class _InterruptedSSEStream(httpx.AsyncByteStream):
+    """Response body that sends some SSE bytes and then fails like a dropped connection."""
+    def __init__(self, chunks: List[bytes]):
+        self._chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self._chunks:
+            yield chunk
+        raise httpx.ReadError("connection dropped")
+
+def _sse_block(event_id: Optional[str], event: Union[TaskStatusUpdateEvent, TaskMessageEvent], event_type: str) -> bytes:
+    id_line = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{id_line}event: {event_type}\ndata: {event.model_dump_json(by_alias=True)}\n\n".encode("utf-8")
+
+@pytest.mark.asyncio
+async def test_receive_messages_resumes_after_disconnect(agent_card_apikey: AgentCard, mock_key_manager, respx_mock, mocker):
+    task_id = "resume-task"
+    now = datetime.datetime.now(datetime.timezone.utc)
+    working = TaskStatusUpdateEvent(taskId=task_id, state=TaskState.WORKING, timestamp=now)
+    completed = TaskStatusUpdateEvent(taskId=task_id, state=TaskState.COMPLETED, timestamp=now)
+    sse_headers = {"content-type": "text/event-stream"}
+    route = respx_mock.post(str(agent_card_apikey.url)).mock(side_effect=[
+        httpx.Response(200, headers=sse_headers, stream=_InterruptedSSEStream([b"retry: 10\n\n", _sse_block("1", working, "task_status")])),
+        httpx.Response(200, headers=sse_headers, content=_sse_block("2", completed, "task_status")),
+    ])
+    mock_sleep = mocker.patch("agentvault.client.asyncio.sleep", new_callable=AsyncMock)
+
+    async with AgentVaultClient() as client:
+        received = [event async for event in client.receive_messages(agent_card_apikey, task_id, mock_key_manager)]
+
+    assert [event.state for event in received] == [TaskState.WORKING, TaskState.COMPLETED]
+    assert route.call_count == 2
+    assert "last-event-id" not in route.calls[0].request.headers
+    assert route.calls[1].request.headers["last-event-id"] == "1"
+    # Server-provided retry (10 ms) is the base delay, with jitter
+    assert 0.005 <= mock_sleep.await_args.args[0] <= 0.01
+
+@pytest.mark.asyncio
+async def test_receive_messages_parses_split_chunks(agent_card_apikey: AgentCard, mock_key_manager, respx_mock, mocker):
+    task_id = "chunked-task"
+    now = datetime.datetime.now(datetime.timezone.utc)
+    working = _sse_block("1", TaskStatusUpdateEvent(taskId=task_id, state=TaskState.WORKING, timestamp=now), "task_status").replace(b"\n", b"\r\n")
+    completed = _sse_block("2", TaskStatusUpdateEvent(taskId=task_id, state=TaskState.COMPLETED, timestamp=now), "task_status")
+    route = respx_mock.post(str(agent_card_apikey.url)).mock(side_effect=[
+        # Events split at arbitrary bytes; the partial second event is discarded when the connection drops
+        httpx.Response(200, headers={"content-type": "text/event-stream"}, stream=_InterruptedSSEStream([working[:5], working[5:-1], working[-1:] + completed[:20]])),
+        httpx.Response(200, headers={"content-type": "text/event-stream"}, content=completed),
+    ])
+    mocker.patch("agentvault.client.asyncio.sleep", new_callable=AsyncMock)
+
+    async with AgentVaultClient() as client:
+        received = [event async for event in client.receive_messages(agent_card_apikey, task_id, mock_key_manager)]
+
+    assert [event.state for event in received] == [TaskState.WORKING, TaskState.COMPLETED]
+    assert route.calls[1].request.headers["last-event-id"] == "1"
+
+@pytest.mark.asyncio
+async def test_receive_messages_gives_up_after_max_reconnects(agent_card_apikey: AgentCard, mock_key_manager, respx_mock, mocker):
+    task_id = "resume-task"
+    working = TaskStatusUpdateEvent(taskId=task_id, state=TaskState.WORKING, timestamp=datetime.datetime.now(datetime.timezone.utc))
+    route = respx_mock.post(str(agent_card_apikey.url)).mock(side_effect=[
+        httpx.Response(200, headers={"content-type": "text/event-stream"}, stream=_InterruptedSSEStream([_sse_block("7", working, "task_status")])),
+        httpx.ConnectError("agent down"),
+        httpx.ConnectError("agent down"),
+    ])
+    mocker.patch("agentvault.client.asyncio.sleep", new_callable=AsyncMock)
+
+    received = []
+    async with AgentVaultClient(sse_max_reconnects=2) as client:
+        with pytest.raises(A2AConnectionError):
+            async for event in client.receive_messages(agent_card_apikey, task_id, mock_key_manager):
+                received.append(event)
+
+    assert len(received) == 1
+    assert route.call_count == 3
+    assert all(call.request.headers["last-event-id"] == "7" for call in route.calls[1:])
+
+@pytest.mark.asyncio
+async def test_receive_messages_without_event_ids_does_not_reconnect(agent_card_apikey: AgentCard, mock_key_manager, respx_mock):
+    task_id = "no-ids-task"
+    working = TaskStatusUpdateEvent(taskId=task_id, state=TaskState.WORKING, timestamp=datetime.datetime.now(datetime.timezone.utc))
+    route = respx_mock.post(str(agent_card_apikey.url)).mock(return_value=httpx.Response(
+        200, headers={"content-type": "text/event-stream"}, stream=_InterruptedSSEStream([_sse_block(None, working, "task_status")])
+    ))
+
+    async with AgentVaultClient() as client:
+        with pytest.raises(A2AConnectionError):
+            async for _ in client.receive_messages(agent_card_apikey, task_id, mock_key_manager): pass
+    assert route.call_count == 1
+
+@pytest.mark.asyncio
+async def test_receive_messages_initial_last_event_id(agent_card_apikey: AgentCard, mock_key_manager, respx_mock):
+    route = respx_mock.post(str(agent_card_apikey.url)).mock(return_value=httpx.Response(
+        200, headers={"content-type": "text/event-stream"}, content=b""
+    ))
+    async with AgentVaultClient() as client:
+        async for _ in client.receive_messages(agent_card_apikey, "t-1", mock_key_manager, last_event_id="42"): pass
+    assert route.calls[0].request.headers["last-event-id"] == "42"
+
+
+# --- Test retries ---
+def _task_success(request: httpx.Request) -> httpx.Response:
+    payload = json.loads(request.content)
+    if payload["method"] == "tasks/send": return httpx.Response(200, json=create_jsonrpc_success_response(payload["id"], {"id": "new-task"}))
+    return httpx.Response(200, json=create_jsonrpc_success_response(payload["id"], create_default_mock_task(payload["params"]["id"])))
+
+def test_retry_policy_validation_and_backoff():
+    with pytest.raises(ValueError): RetryPolicy(max_attempts=0)
+    with pytest.raises(ValueError): RetryPolicy(jitter=1.5)
+    policy = RetryPolicy(initial_delay=1.0, max_delay=3.0, jitter=0.0)
+    assert [policy.backoff_delay(attempt) for attempt in (1, 2, 3, 4)] == [1.0, 2.0, 3.0, 3.0]
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("not a date") is None
+    assert 0 < parse_retry_after(email.utils.formatdate(time.time() + 30, usegmt=True)) <= 30
+
+@pytest.mark.asyncio
+async def test_get_task_status_retries_transient_errors(agent_card_apikey: AgentCard, mock_key_manager, respx_mock, mocker):
+    route = respx_mock.post(str(agent_card_apikey.url)).mock(side_effect=[
+        httpx.Response(503), httpx.ReadTimeout("slow agent"), _task_success,
+    ])
+    mock_sleep = mocker.patch("agentvault.client.asyncio.sleep", new_callable=AsyncMock)
+    attempts: List[RequestAttempt] = []
+
+    async with AgentVaultClient(retry_policy=RetryPolicy(max_attempts=3, jitter=0.0), on_request_attempt=attempts.append) as client:
+        task = await client.get_task_status(agent_card_apikey, "retry-task", mock_key_manager)
+        stats = client.get_request_stats()
+
+    assert task.id == "retry-task"
+    assert route.call_count == 3
+    assert [call.args[0] for call in mock_sleep.await_args_list] == [0.2, 0.4]
+    assert [(a.attempt, a.status_code, a.error) for a in attempts] == [(1, 503, "A2ARemoteAgentError"), (2, None, "A2ATimeoutError"), (3, 200, None)]
+    assert all(a.rpc_method == "tasks/get" for a in attempts)
+    assert {key: stats[key] for key in ("requests", "attempts", "retries", "failed_requests", "retry_after_waits")} == {"requests": 1, "attempts": 3, "retries": 2, "failed_requests": 0, "retry_after_waits": 0}
+
+@pytest.mark.asyncio
+async def test_retry_gives_up_after_max_attempts_and_on_jsonrpc_errors(agent_card_apikey: AgentCard, mock_key_manager, respx_mock, mocker):
+    route = respx_mock.post(str(agent_card_apikey.url)).mock(return_value=httpx.Response(502))
+    mocker.patch("agentvault.client.asyncio.sleep", new_callable=AsyncMock)
+    async with AgentVaultClient(retry_policy=RetryPolicy(max_attempts=2)) as client:
+        with pytest.raises(A2ARemoteAgentError):
+            await client.get_task_status(agent_card_apikey, "t-1", mock_key_manager)
+        assert route.call_count == 2
+
+        route.mock(return_value=httpx.Response(200, json=create_jsonrpc_error_response("x", JSONRPC_APP_ERROR, "Task not found")))
+        with pytest.raises(A2ARemoteAgentError, match="Task not found"):
+            await client.get_task_status(agent_card_apikey, "t-1", mock_key_manager)
+        assert route.call_count == 3
+        assert client.get_request_stats()["failed_requests"] == 2
+
+@pytest.mark.asyncio
+async def test_tasks_send_retried_only_with_idempotency_key(agent_card_apikey: AgentCard, mock_key_manager, sample_message, respx_mock, mocker):
+    mocker.patch("agentvault.client.asyncio.sleep", new_callable=AsyncMock)
+    route = respx_mock.post(str(agent_card_apikey.url)).mock(side_effect=[httpx.Response(503), _task_success])
+    async with AgentVaultClient(retry_policy=RetryPolicy()) as client:
+        with pytest.raises(A2ARemoteAgentError):
+            await client.initiate_task(agent_card_apikey, sample_message, mock_key_manager)
+        assert route.call_count == 1
+
+        route.mock(side_effect=[httpx.Response(503), _task_success])
+        assert await client.initiate_task(agent_card_apikey, sample_message, mock_key_manager, idempotency_key="key-1") == "new-task"
+    assert route.call_count == 3
+    assert [call.request.headers["idempotency-key"] for call in route.calls[1:]] == ["key-1", "key-1"]
+
+@pytest.mark.asyncio
+async def test_tasks_send_generated_idempotency_key_and_connect_errors(agent_card_apikey: AgentCard, mock_key_manager, sample_message, respx_mock, mocker):
+    mocker.patch("agentvault.client.asyncio.sleep", new_callable=AsyncMock)
+    # Connection failures are retried even without a key: the agent never received the request
+    route = respx_mock.post(str(agent_card_apikey.url)).mock(side_effect=[httpx.ConnectError("refused"), _task_success])
+    async with AgentVaultClient(retry_policy=RetryPolicy()) as client:
+        assert await client.initiate_task(agent_card_apikey, sample_message, mock_key_manager) == "new-task"
+    assert route.call_count == 2
+    assert "idempotency-key" not in route.calls[1].request.headers
+
+    route.mock(side_effect=[httpx.ReadTimeout("lost response"), _task_success])
+    async with AgentVaultClient(retry_policy=RetryPolicy(generate_idempotency_keys=True)) as client:
+        assert await client.initiate_task(agent_card_apikey, sample_message, mock_key_manager) == "new-task"
+    keys = [call.request.headers["idempotency-key"] for call in route.calls[2:]]
+    assert len(keys) == 2 and keys[0] == keys[1]
+
+@pytest.mark.asyncio
+async def test_retry_honours_retry_after_and_deadline(agent_card_apikey: AgentCard, mock_key_manager, respx_mock, mocker):
+    mock_sleep = mocker.patch("agentvault.client.asyncio.sleep", new_callable=AsyncMock)
+    route = respx_mock.post(str(agent_card_apikey.url)).mock(side_effect=[httpx.Response(429, headers={"Retry-After": "3"}), _task_success])
+    async with AgentVaultClient(retry_policy=RetryPolicy(jitter=0.0)) as client:
+        await client.get_task_status(agent_card_apikey, "t-1", mock_key_manager)
+        assert mock_sleep.await_args.args[0] == 3.0
+        assert client.get_request_stats()["retry_after_waits"] == 1
+
+    # Waiting would exceed the total deadline: fail right away
+    route.mock(side_effect=[httpx.Response(503, headers={"Retry-After": "10"}), _task_success])
+    async with AgentVaultClient(retry_policy=RetryPolicy(total_timeout=5.0)) as client:
+        with pytest.raises(A2ARemoteAgentError):
+            await client.terminate_task(agent_card_apikey, "t-1", mock_key_manager)
+    assert route.call_count == 3
+
+
+# --- Test circuit breaker ---
+@pytest.mark.asyncio
+async def test_circuit_opens_and_fails_fast(agent_card_apikey: AgentCard, mock_key_manager, respx_mock):
+    route = respx_mock.post(str(agent_card_apikey.url)).mock(side_effect=httpx.ConnectError("agent down"))
+    config = CircuitBreakerConfig(window_size=3, minimum_calls=3, probe_interval=60.0)
+    async with AgentVaultClient(circuit_breaker=config) as client:
+        for _ in range(3):
+            with pytest.raises(A2AConnectionError):
+                await client.get_task_status(agent_card_apikey, "t-1", mock_key_manager)
+        assert client.get_circuit_state(agent_card_apikey) == CircuitState.OPEN
+
+        with pytest.raises(A2ACircuitOpenError) as exc_info:
+            await client.get_task_status(agent_card_apikey, "t-1", mock_key_manager)
+        assert route.call_count == 3 # Rejected without contacting the agent
+        assert exc_info.value.endpoint == str(agent_card_apikey.url)
+        assert 0 < exc_info.value.retry_after <= 60.0
+        stats = client.get_circuit_breaker_stats()[str(agent_card_apikey.url)]
+        assert stats["state"] == "open" and stats["rejected"] == 1
+        assert client.get_circuit_state("https://other-agent.test/a2a") == CircuitState.CLOSED
+
+        client.reset_circuit(agent_card_apikey)
+        assert client.get_circuit_state(agent_card_apikey) == CircuitState.CLOSED
+
+@pytest.mark.asyncio
+async def test_circuit_half_open_probe_and_jsonrpc_errors(agent_card_apikey: AgentCard, mock_key_manager, respx_mock):
+    route = respx_mock.post(str(agent_card_apikey.url)).mock(return_value=httpx.Response(503))
+    config = CircuitBreakerConfig(window_size=2, minimum_calls=2, probe_interval=0.05)
+    async with AgentVaultClient(circuit_breaker=config) as client:
+        for _ in range(2):
+            with pytest.raises(A2ARemoteAgentError):
+                await client.get_task_status(agent_card_apikey, "t-1", mock_key_manager)
+        assert client.get_circuit_state(agent_card_apikey) == CircuitState.OPEN
+
+        await asyncio.sleep(0.06)
+        assert client.get_circuit_state(agent_card_apikey) == CircuitState.HALF_OPEN
+        # A JSON-RPC error means the agent is reachable: the probe succeeds
+        route.mock(return_value=httpx.Response(200, json=create_jsonrpc_error_response("x", JSONRPC_APP_ERROR, "Task not found")))
+        with pytest.raises(A2ARemoteAgentError, match="Task not found"):
+            await client.get_task_status(agent_card_apikey, "t-1", mock_key_manager)
+        assert client.get_circuit_state(agent_card_apikey) == CircuitState.CLOSED
+
+
+# --- Test request hedging ---
+class _DelayedTaskResponses:
+    """respx side effect answering tasks/get after the given delay per call. Counts calls, including cancelled ones."""
+    def __init__(self, delays: List[float]):
+        self._delays = iter(delays)
+        self.calls = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        await asyncio.sleep(next(self._delays))
+        return _task_success(request)
+
+@pytest.mark.asyncio
+async def test_hedged_request_wins_against_straggler(agent_card_apikey: AgentCard, mock_key_manager, respx_mock):
+    responses = _DelayedTaskResponses([5.0, 0.0])
+    respx_mock.post(str(agent_card_apikey.url)).mock(side_effect=responses)
+    async with AgentVaultClient(hedging_policy=HedgingPolicy(delay=0.02)) as client:
+        started = time.monotonic()
+        task = await client.get_task_status(agent_card_apikey, "hedge-task", mock_key_manager)
+        elapsed = time.monotonic() - started
+        stats = client.get_request_stats()
+    assert task.id == "hedge-task"
+    assert responses.calls == 2
+    assert elapsed < 1.0 # The straggler was cancelled, not awaited
+    assert stats["hedged_requests"] == 1 and stats["hedge_wins"] == 1 and stats["attempts"] == 1
+
+@pytest.mark.asyncio
+async def test_hedging_skips_fast_and_non_idempotent_calls(agent_card_apikey: AgentCard, mock_key_manager, sample_message, respx_mock):
+    route = respx_mock.post(str(agent_card_apikey.url)).mock(side_effect=_task_success)
+    async with AgentVaultClient(hedging_policy=HedgingPolicy(delay=0.0)) as client:
+        await client.initiate_task(agent_card_apikey, sample_message, mock_key_manager)
+        assert route.call_count == 1 # tasks/send is never hedged
+
+    route.mock(side_effect=_DelayedTaskResponses([0.0]))
+    async with AgentVaultClient(hedging_policy=HedgingPolicy(delay=1.0)) as client:
+        await client.get_task_status(agent_card_apikey, "t-1", mock_key_manager)
+        assert client.get_request_stats()["hedged_requests"] == 0
+    assert route.call_count == 2
+
+@pytest.mark.asyncio
+async def test_hedging_budget_limits_extra_requests(agent_card_apikey: AgentCard, mock_key_manager, respx_mock):
+    responses = _DelayedTaskResponses([0.05] * 10)
+    respx_mock.post(str(agent_card_apikey.url)).mock(side_effect=responses)
+    policy = HedgingPolicy(delay=0.01, budget=HedgeBudget(ratio=0.0, burst=1.0))
+    async with AgentVaultClient(hedging_policy=policy) as client:
+        await client.get_task_status(agent_card_apikey, "t-1", mock_key_manager)
+        await client.get_task_status(agent_card_apikey, "t-1", mock_key_manager)
+        stats = client.get_request_stats()
+    assert stats["hedged_requests"] == 1 and stats["hedges_denied"] == 1
+    assert responses.calls == 3
+
+def test_hedge_delay_adapts_to_observed_latency():
+    policy = HedgingPolicy(initial_delay=0.5, min_samples=10, delay_percentile=0.9)
+    tracker = LatencyTracker(window=100)
+    assert hedge_delay(policy, tracker) == 0.5
+    for latency in range(1, 11): tracker.record(latency / 100)
+    assert hedge_delay(policy, tracker) == pytest.approx(0.09)
+    assert hedge_delay(HedgingPolicy(delay=0.2), tracker) == 0.2
+
+
+# --- Test OAuth token refresh ---
+class _CountingTokenEndpoint:
+    """respx side effect for the token endpoint that counts requests and can delay or fail them."""
+    def __init__(self, delay: float = 0.0, status_code: int = 200):
+        self.delay = delay
+        self.status_code = status_code
+        self.calls = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.status_code != 200: return httpx.Response(self.status_code, json={"error": "server_error"})
+        return httpx.Response(200, json={"access_token": f"token-{self.calls}", "token_type": "Bearer", "expires_in": 3600})
+
+@pytest.mark.asyncio
+async def test_oauth_token_requests_are_coalesced(agent_card_oauth2: AgentCard, mock_key_manager, respx_mock):
+    token_endpoint = _CountingTokenEndpoint(delay=0.02)
+    respx_mock.post(str(agent_card_oauth2.auth_schemes[0].token_url)).mock(side_effect=token_endpoint)
+    async with AgentVaultClient() as client:
+        headers = await asyncio.gather(*(client._get_auth_headers(agent_card_oauth2, mock_key_manager) for _ in range(50)))
+        assert token_endpoint.calls == 1
+        assert all(h == {"Authorization": "Bearer token-1"} for h in headers)
+        # Cached afterwards
+        await client._get_auth_headers(agent_card_oauth2, mock_key_manager)
+        assert token_endpoint.calls == 1
+
+@pytest.mark.asyncio
+async def test_oauth_token_refreshed_in_background_before_expiry(agent_card_oauth2: AgentCard, mock_key_manager, respx_mock):
+    token_endpoint = _CountingTokenEndpoint()
+    respx_mock.post(str(agent_card_oauth2.auth_schemes[0].token_url)).mock(side_effect=token_endpoint)
+    async with AgentVaultClient(oauth_refresh_ahead=30.0) as client:
+        client._token_cache["test-service-oauth"] = ("old-token", time.time() + 10)
+        # Still valid: returned immediately while a refresh runs in the background
+        assert await client._get_auth_headers(agent_card_oauth2, mock_key_manager) == {"Authorization": "Bearer old-token"}
+        refresh = client._token_refreshes["test-service-oauth"]
+        assert await client._get_auth_headers(agent_card_oauth2, mock_key_manager) == {"Authorization": "Bearer old-token"}
+        assert await refresh == "token-1"
+        assert token_endpoint.calls == 1
+        assert await client._get_auth_headers(agent_card_oauth2, mock_key_manager) == {"Authorization": "Bearer token-1"}
+        assert client._token_refreshes == {}
+
+@pytest.mark.asyncio
+async def test_oauth_token_failures_back_off(agent_card_oauth2: AgentCard, mock_key_manager, respx_mock):
+    token_endpoint = _CountingTokenEndpoint(status_code=503)
+    respx_mock.post(str(agent_card_oauth2.auth_schemes[0].token_url)).mock(side_effect=token_endpoint)
+    async with AgentVaultClient(oauth_retry_backoff=30.0) as client:
+        with pytest.raises(A2AAuthenticationError, match="server error"):
+            await client._get_auth_headers(agent_card_oauth2, mock_key_manager)
+        with pytest.raises(A2AAuthenticationError, match="next attempt in"):
+            await client._get_auth_headers(agent_card_oauth2, mock_key_manager)
+        assert token_endpoint.calls == 1
+
+        # Once the backoff has passed the endpoint is tried again; success clears the failure count
+        client._token_failures["test-service-oauth"] = (1, 0.0)
+        token_endpoint.status_code = 200
+        assert await client._get_auth_headers(agent_card_oauth2, mock_key_manager) == {"Authorization": "Bearer token-2"}
+        assert client._token_failures == {}
+
+@pytest.mark.asyncio
+async def test_oauth_token_shared_through_disk_cache(agent_card_oauth2: AgentCard, mock_key_manager, respx_mock, tmp_path):
+    token_endpoint = _CountingTokenEndpoint()
+    respx_mock.post(str(agent_card_oauth2.auth_schemes[0].token_url)).mock(side_effect=token_endpoint)
+    token_cache = FileTokenCache(tmp_path / "oauth_tokens.json")
+
+    async with AgentVaultClient(token_cache=token_cache) as client:
+        assert await client._get_auth_headers(agent_card_oauth2, mock_key_manager) == {"Authorization": "Bearer token-1"}
+    # A new client (e.g. the next CLI invocation) reuses the stored token
+    async with AgentVaultClient(token_cache=FileTokenCache(tmp_path / "oauth_tokens.json")) as client:
+        assert await client._get_auth_headers(agent_card_oauth2, mock_key_manager) == {"Authorization": "Bearer token-1"}
+    assert token_endpoint.calls == 1
+    mock_key_manager.get_oauth_client_id.assert_called_once()
@@ -0,0 +1,73 @@
+import pytest
+import asyncio
+import httpx
+
+from agentvault import http_pool
+from agentvault.client import AgentVaultClient
+from agentvault.http_pool import (
+    HttpPoolConfig, PooledTransport, configure_http_pool, get_shared_http_client,
+    close_shared_http_client, get_http_pool_stats
+)
+
+TEST_URL = "https://pooled-agent.test/a2a"
+
+
+@pytest.fixture(autouse=True)
+async def reset_http_pool():
+    original_config = http_pool.get_http_pool_config()
+    yield
+    await close_shared_http_client()
+    http_pool._config = original_config
+
+
+def test_config_validation():
+    with pytest.raises(ValueError): HttpPoolConfig(max_connections=0)
+    with pytest.raises(ValueError): HttpPoolConfig(max_connections_per_host=0)
+    limits = HttpPoolConfig(max_connections=7, max_keepalive_connections=3, keepalive_expiry=12.0).limits
+    assert (limits.max_connections, limits.max_keepalive_connections, limits.keepalive_expiry) == (7, 3, 12.0)
+
+def test_one_shared_client_per_event_loop():
+    async def get_client() -> httpx.AsyncClient:
+        client = get_shared_http_client()
+        assert get_shared_http_client() is client
+        await close_shared_http_client()
+        return client
+    assert asyncio.run(get_client()) is not asyncio.run(get_client())
+
+@pytest.mark.asyncio
+async def test_agentvault_clients_share_pool(respx_mock):
+    respx_mock.get(TEST_URL).mock(return_value=httpx.Response(200))
+    async with AgentVaultClient() as first, AgentVaultClient() as second:
+        assert first._http_client is second._http_client is get_shared_http_client()
+    # Closing the AgentVaultClients leaves the shared client open
+    assert not get_shared_http_client().is_closed
+
+    async with AgentVaultClient(use_shared_pool=False) as private:
+        assert private._http_client is not get_shared_http_client()
+    assert private._http_client.is_closed
+
+    await get_shared_http_client().get(TEST_URL)
+    stats = get_http_pool_stats()
+    assert stats["requests"] == 1 and stats["active_requests"] == 0
+    assert set(stats) >= {"connections", "idle_connections", "http2_connections", "hosts"}
+
+@pytest.mark.asyncio
+async def test_per_host_limit(respx_mock):
+    in_flight = 0; max_in_flight = 0
+    async def slow_response(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1; max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={"ok": True})
+    respx_mock.get(TEST_URL).mock(side_effect=slow_response)
+
+    configure_http_pool(HttpPoolConfig(max_connections_per_host=1))
+    client = get_shared_http_client()
+    assert isinstance(client._transport, PooledTransport)
+    responses = await asyncio.gather(*(client.get(TEST_URL) for _ in range(3)))
+
+    assert all(response.json() == {"ok": True} for response in responses)
+    assert max_in_flight == 1
+    stats = get_http_pool_stats()
+    assert stats["host_limit_waits"] == 2 and stats["active_requests"] == 0
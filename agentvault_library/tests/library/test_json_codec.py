@@ -0,0 +1,37 @@
+import json
+import datetime
+
+import pytest
+
+from agentvault import json_codec
+
+
+@pytest.fixture(params=json_codec.available_json_codecs())
+def codec(request):
+    previous = json_codec.get_json_codec()
+    json_codec.set_json_codec(request.param)
+    yield request.param
+    json_codec.set_json_codec(previous)
+
+
+def test_round_trip(codec: str):
+    payload = {"jsonrpc": "2.0", "id": 1, "result": {"text": "héllo", "parts": [1, 2.5, None, True]}}
+    encoded = json_codec.dumps(payload)
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == payload
+    assert json_codec.loads(encoded) == payload
+    assert json_codec.loads(encoded.decode("utf-8")) == payload
+
+def test_invalid_input_raises_json_decode_error(codec: str):
+    for data in (b"{not json", b'"\xff\xfe"', b""):
+        with pytest.raises(json.JSONDecodeError): json_codec.loads(data)
+
+def test_unsupported_values_fall_back_or_use_default(codec: str):
+    assert json.loads(json_codec.dumps({"big": 2 ** 70, 1: "x"})) == {"big": 2 ** 70, "1": "x"}
+    when = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+    assert json_codec.loads(json_codec.dumps({"at": when}, default=lambda value: value.isoformat()))["at"].startswith("2025-01-01T00:00:00")
+    with pytest.raises(TypeError): json_codec.dumps({"obj": object()})
+
+def test_set_unknown_codec_raises():
+    with pytest.raises(ValueError): json_codec.set_json_codec("simplejson")
+    assert json_codec.get_json_codec() in json_codec.available_json_codecs()
@@ -0,0 +1,83 @@
+import datetime
+
+import pytest
+from pydantic import ValidationError
+
+from agentvault import json_codec
+from agentvault.models import (
+    TextPart, FilePart, DataPart, Message, Task, TaskSendResult, TaskGetParams,
+    TaskMessageEvent, PART_ADAPTER, TASK_ADAPTER, SSE_EVENT_ADAPTERS,
+    jsonrpc_response_adapter, TaskWaitParams, TaskState, TERMINAL_TASK_STATES
+)
+
+
+TASK_DATA = {
+    "id": "task-1",
+    "state": "WORKING",
+    "createdAt": "2024-05-01T12:00:00Z",
+    "updatedAt": "2024-05-01T12:00:01.500000+00:00",
+    "messages": [
+        {"role": "user", "parts": [{"type": "text", "content": "hello"}], "metadata": {"k": "v"}},
+        {"role": "assistant", "parts": [
+            {"type": "file", "url": "https://files.example.com/a.txt", "mediaType": "text/plain", "filename": "a.txt"},
+            {"type": "data", "content": {"n": [1, 2]}, "mediaType": "application/json"},
+        ]},
+    ],
+    "artifacts": [{"id": "art-1", "type": "log", "content": "line", "url": "https://files.example.com/log"}],
+    "metadata": None,
+}
+
+
+def test_part_is_discriminated_by_type():
+    assert isinstance(PART_ADAPTER.validate_python({"type": "data", "content": {}}), DataPart)
+    assert isinstance(PART_ADAPTER.validate_json(b'{"type": "file", "url": "https://x.example/f"}'), FilePart)
+    with pytest.raises(ValidationError) as exc_info:
+        PART_ADAPTER.validate_python({"type": "audio", "content": "x"})
+    assert exc_info.value.errors()[0]["type"] == "union_tag_invalid"
+
+def test_part_without_type_is_resolved_by_shape():
+    message = Message.model_validate({"role": "user", "parts": [{"content": "hi"}]})
+    assert message.parts == [TextPart(content="hi")]
+    assert isinstance(PART_ADAPTER.validate_python({"content": {"k": 1}}), DataPart)
+    assert isinstance(PART_ADAPTER.validate_json(b'{"url": "https://x.example/f"}'), FilePart)
+
+def test_task_adapter_validate_json_matches_model_validate():
+    raw = json_codec.dumps(TASK_DATA)
+    assert TASK_ADAPTER.validate_json(raw) == Task.model_validate(TASK_DATA)
+
+def test_jsonrpc_response_adapter_is_cached_and_validates_result():
+    adapter = jsonrpc_response_adapter(TaskSendResult)
+    assert jsonrpc_response_adapter(TaskSendResult) is adapter
+    response = adapter.validate_json(b'{"jsonrpc": "2.0", "id": "r1", "result": {"id": "task-1"}}')
+    assert isinstance(response["result"], TaskSendResult) and response["result"].id == "task-1"
+    error = adapter.validate_json(b'{"jsonrpc": "2.0", "id": "r1", "error": {"code": -32000, "message": "boom"}}')
+    assert "result" not in error and error["error"]["code"] == -32000
+    with pytest.raises(ValidationError) as exc_info:
+        adapter.validate_json(b'{"jsonrpc": "2.0", "id": "r1", "result": {"taskId": 1}}')
+    assert all(err["loc"][0] == "result" for err in exc_info.value.errors())
+
+def test_sse_event_adapters():
+    data = {"taskId": "task-1", "message": {"role": "assistant", "parts": [{"type": "text", "content": "hi"}]}, "timestamp": "2024-05-01T12:00:00Z"}
+    event = SSE_EVENT_ADAPTERS["task_message"].validate_json(json_codec.dumps(data))
+    assert event == TaskMessageEvent.model_validate(data)
+    assert event.timestamp == datetime.datetime(2024, 5, 1, 12, tzinfo=datetime.timezone.utc)
+    assert SSE_EVENT_ADAPTERS["message"] is SSE_EVENT_ADAPTERS["task_message"]
+    assert isinstance(event.message, Message) and isinstance(event.message.parts[0], TextPart)
+
+def test_task_get_params_windows():
+    task = Task.model_validate({**TASK_DATA, "messages": [{"role": "user", "parts": [{"type": "text", "content": str(i)}]} for i in range(5)]})
+    assert TaskGetParams(id="task-1").apply(task) is task
+    state_only = TaskGetParams(id="task-1", include=[]).apply(task)
+    assert (state_only.messages, state_only.artifacts, state_only.message_count, state_only.next_cursor) == ([], [], 5, None)
+    window = TaskGetParams(id="task-1", since=3, limit=1).apply(task)
+    assert [m.parts[0].content for m in window.messages] == ["3"] and window.next_cursor == 4 and len(window.artifacts) == 1
+    assert TaskGetParams(id="task-1", since=10).apply(task).messages == []
+    with pytest.raises(ValidationError):
+        TaskGetParams(id="task-1", include=["history"])
+
+def test_task_wait_params():
+    assert TaskWaitParams(id="task-1").target_states == TERMINAL_TASK_STATES == {TaskState.COMPLETED, TaskState.FAILED, TaskState.CANCELED}
+    assert TaskWaitParams(id="task-1", states=["INPUT_REQUIRED"]).target_states == {TaskState.INPUT_REQUIRED}
+    assert TaskWaitParams(id="task-1", include=[]).apply(Task.model_validate(TASK_DATA)).artifacts == []
+    with pytest.raises(ValidationError):
+        TaskWaitParams(id="task-1", timeout=0)
@@ -0,0 +1,64 @@
+import pytest
+
+from agentvault.sse import SSEParser, SSEEvent
+
+
+STREAM = (
+    b"\xef\xbb\xbf: keep-alive comment\r\n"
+    b"retry: 2500\r\n"
+    b"event: task_status\r\n"
+    b"id: 1\r\n"
+    b"data: {\"state\":\r\n"
+    b"data: \"WORKING\"}\r\n"
+    b"\r\n"
+    b"data:{\"n\": 2}\n"
+    b"\n"
+    b"id: 3\r"
+    b"\r"
+)
+
+EXPECTED = [
+    SSEEvent("task_status", b"{\"state\":\n\"WORKING\"}", "1"),
+    SSEEvent("message", b"{\"n\": 2}", None),
+]
+
+
+def _feed_all(parser: SSEParser, chunks) -> list:
+    events = []
+    for chunk in chunks: events.extend(parser.feed(chunk))
+    return events
+
+
+def test_parses_whole_stream():
+    parser = SSEParser()
+    assert _feed_all(parser, [STREAM]) == EXPECTED
+    assert parser.retry == 2500
+    assert parser.last_event_id == "3" # Set by an event without data
+    assert parser.has_pending_data is False
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 16])
+def test_chunk_boundaries_do_not_change_events(chunk_size: int):
+    chunks = [STREAM[i:i + chunk_size] for i in range(0, len(STREAM), chunk_size)]
+    parser = SSEParser()
+    assert _feed_all(parser, chunks) == EXPECTED
+    assert parser.last_event_id == "3"
+
+def test_split_crlf_does_not_dispatch_twice():
+    parser = SSEParser()
+    assert parser.feed(b"data: 1\r") == []
+    assert parser.feed(b"\n\r") == [SSEEvent("message", b"1", None)]
+    assert parser.feed(b"\ndata: 2\n\n") == [SSEEvent("message", b"2", None)]
+
+def test_field_edge_cases():
+    parser = SSEParser(last_event_id="0")
+    events = parser.feed(b"data\nid: a\0b\nretry: soon\nunknown: x\ndata:  two spaces\n\n")
+    assert events == [SSEEvent("message", b"\n two spaces", None)]
+    assert parser.last_event_id == "0" # IDs containing NUL are ignored
+    assert parser.retry is None
+
+def test_flush_returns_unterminated_event():
+    parser = SSEParser()
+    assert parser.feed(b"event: task_message\ndata: {}\ndata: []") == []
+    assert parser.has_pending_data is True
+    assert parser.flush() == SSEEvent("task_message", b"{}\n[]", None)
+    assert parser.flush() is None
@@ -0,0 +1,58 @@
+import os
+import json
+import stat
+import time
+import pytest
+
+from agentvault.token_cache import FileTokenCache, default_token_cache_path, TOKEN_CACHE_ENV_VAR
+
+TOKEN_URL = "https://idp.test/token"
+
+
+@pytest.fixture
+def cache(tmp_path) -> FileTokenCache:
+    return FileTokenCache(tmp_path / "tokens" / "oauth_tokens.json")
+
+
+def test_default_path(monkeypatch, tmp_path):
+    monkeypatch.setenv(TOKEN_CACHE_ENV_VAR, str(tmp_path / "custom.json"))
+    assert default_token_cache_path() == tmp_path / "custom.json"
+    monkeypatch.delenv(TOKEN_CACHE_ENV_VAR)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert default_token_cache_path() == tmp_path / "agentvault" / "oauth_tokens.json"
+
+@pytest.mark.asyncio
+async def test_round_trip_and_permissions(cache: FileTokenCache):
+    expiry = time.time() + 600
+    await cache.put("svc", TOKEN_URL, ["b", "a"], "token-1", expiry)
+    assert await cache.get("svc", TOKEN_URL, ["a", "b"]) == ("token-1", expiry) # Scope order does not matter
+    assert await cache.get("svc", TOKEN_URL, ["a"]) is None
+    assert await cache.get("svc", "https://other-idp.test/token", ["a", "b"]) is None
+    if os.name == "posix":
+        assert stat.S_IMODE(cache.path.stat().st_mode) == 0o600
+        assert stat.S_IMODE(cache.path.parent.stat().st_mode) == 0o700
+    assert "token-1" in cache.path.read_text()
+
+    await cache.remove("svc", TOKEN_URL, ["a", "b"])
+    assert await cache.get("svc", TOKEN_URL, ["a", "b"]) is None
+
+@pytest.mark.asyncio
+async def test_expiry_honoured(cache: FileTokenCache):
+    await cache.put("svc", TOKEN_URL, None, "no-expiry", None)
+    assert not cache.path.exists() # Tokens without expiry are not persisted
+    await cache.put("expired", TOKEN_URL, None, "old", time.time() - 1)
+    assert await cache.get("expired", TOKEN_URL, None) is None
+    await cache.put("svc", TOKEN_URL, None, "fresh", time.time() + 60)
+    # Expired entries are pruned on write
+    assert [entry["service_id"] for entry in json.loads(cache.path.read_text()).values()] == ["svc"]
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permissions")
+@pytest.mark.asyncio
+async def test_file_readable_by_others_is_ignored(cache: FileTokenCache):
+    await cache.put("svc", TOKEN_URL, None, "token-1", time.time() + 600)
+    os.chmod(cache.path, 0o644)
+    assert await cache.get("svc", TOKEN_URL, None) is None
+    await cache.put("svc2", TOKEN_URL, None, "token-2", time.time() + 600)
+    assert stat.S_IMODE(cache.path.stat().st_mode) == 0o600
+    assert await cache.get("svc", TOKEN_URL, None) is None # Untrusted content was discarded
+    assert (await cache.get("svc2", TOKEN_URL, None))[0] == "token-2"
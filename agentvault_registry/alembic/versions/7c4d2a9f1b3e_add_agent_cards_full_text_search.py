@@ -0,0 +1,59 @@
+"""add full-text search vector and trigram indexes to agent cards
+
+Revision ID: 7c4d2a9f1b3e
+Revises: 3b8f1c2d4e6a
+Create Date: 2026-10-16 18:42:10.518204
+
+`search=` on GET /api/v1/agent-cards used `name ILIKE '%term%' OR description
+ILIKE '%term%'`, which the btree indexes on those columns cannot serve. This
+adds a stored, generated `search_vector` (name and tags weighted A, description
+and skill names B, skill descriptions C) with a GIN index for full-text
+matching and ranking, and pg_trgm GIN indexes so the remaining ILIKE substring
+matches are index scans as well. Adding the stored column rewrites the table.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c4d2a9f1b3e'
+down_revision: Union[str, None] = '3b8f1c2d4e6a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match models.AGENT_CARD_SEARCH_VECTOR_SQL
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(jsonb_to_tsvector('english', coalesce(card_data -> 'tags', '[]'::jsonb), '[\"string\"]'), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(jsonb_to_tsvector('english', jsonb_path_query_array(card_data, '$.skills[*].name'), '[\"string\"]'), 'B') || "
+    "setweight(jsonb_to_tsvector('english', jsonb_path_query_array(card_data, '$.skills[*].description'), '[\"string\"]'), 'C')"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column(
+        'agent_cards',
+        sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR_SQL, persisted=True), nullable=True)
+    )
+    op.create_index('ix_agent_cards_search_vector', 'agent_cards', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index(
+        'ix_agent_cards_name_trgm', 'agent_cards', ['name'], unique=False,
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_agent_cards_description_trgm', 'agent_cards', ['description'], unique=False,
+        postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_agent_cards_description_trgm', table_name='agent_cards', postgresql_using='gin')
+    op.drop_index('ix_agent_cards_name_trgm', table_name='agent_cards', postgresql_using='gin')
+    op.drop_index('ix_agent_cards_search_vector', table_name='agent_cards', postgresql_using='gin')
+    op.drop_column('agent_cards', 'search_vector')
+    # pg_trgm is left installed; other objects in the database may use it
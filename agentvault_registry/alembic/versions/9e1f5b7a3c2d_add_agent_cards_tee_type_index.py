@@ -0,0 +1,36 @@
+"""add expression index for the TEE filters of agent cards
+
+Revision ID: 9e1f5b7a3c2d
+Revises: 7c4d2a9f1b3e
+Create Date: 2026-10-16 20:11:38.640517
+
+`has_tee` and `tee_type` on GET /api/v1/agent-cards filter on
+`lower(card_data #>> '{capabilities,teeDetails,type}')`. A btree on that
+expression serves equality and IS [NOT] NULL. The tag filter needs no new index:
+it now queries `card_data @> '{"tags": [...]}'`, which the existing
+`jsonb_path_ops` GIN index `ix_agent_cards_card_data_tags_gin` serves.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e1f5b7a3c2d'
+down_revision: Union[str, None] = '7c4d2a9f1b3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Same expression as the TEE filters of this revision; replaced by the
+    # tee_type column index in c5a8e2f4d6b1
+    op.create_index(
+        'ix_agent_cards_tee_type', 'agent_cards',
+        [sa.text("lower(card_data #>> '{capabilities,teeDetails,type}')")], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_agent_cards_tee_type', table_name='agent_cards')
@@ -0,0 +1,66 @@
+"""add indexed discovery facet columns extracted from agent card data
+
+Revision ID: c5a8e2f4d6b1
+Revises: 9e1f5b7a3c2d
+Create Date: 2026-10-16 21:47:03.118452
+
+The list filters on humanReadableId, tags, TEE type, authentication schemes,
+skills and A2A/MCP versions read typed columns instead of card_data. The
+columns are maintained on write by crud.agent_card.extract_card_facets and
+backfilled here with the equivalent SQL. Scalar columns get btree indexes and
+array columns GIN indexes, so combined filters are answered by BitmapAnd over
+the indexes. The tee_type column index replaces the expression index of the
+same name.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a8e2f4d6b1'
+down_revision: Union[str, None] = '9e1f5b7a3c2d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ARRAY_COLUMNS = ('tags', 'auth_schemes', 'skills')
+SCALAR_COLUMNS = ('human_readable_id', 'tee_type', 'a2a_version', 'mcp_version')
+
+# Must match crud.agent_card.extract_card_facets
+BACKFILL_SQL = """
+UPDATE agent_cards SET
+    human_readable_id = card_data ->> 'humanReadableId',
+    tags = ARRAY(SELECT value #>> '{}' FROM jsonb_path_query(card_data, '$.tags[*] ? (@.type() == "string")') AS value),
+    tee_type = lower(card_data #>> '{capabilities,teeDetails,type}'),
+    auth_schemes = ARRAY(SELECT value #>> '{}' FROM jsonb_path_query(card_data, '$.authSchemes[*].scheme ? (@.type() == "string")') AS value),
+    skills = ARRAY(SELECT value #>> '{}' FROM jsonb_path_query(card_data, '$.skills[*].id ? (@.type() == "string")') AS value),
+    a2a_version = card_data #>> '{capabilities,a2aVersion}',
+    mcp_version = card_data #>> '{capabilities,mcpVersion}'
+"""
+
+
+def upgrade() -> None:
+    for column in SCALAR_COLUMNS:
+        op.add_column('agent_cards', sa.Column(column, sa.String(), nullable=True))
+    for column in ARRAY_COLUMNS:
+        op.add_column('agent_cards', sa.Column(column, postgresql.ARRAY(sa.String()), server_default='{}', nullable=False))
+
+    op.execute(BACKFILL_SQL)
+
+    op.drop_index('ix_agent_cards_tee_type', table_name='agent_cards')
+    for column in SCALAR_COLUMNS:
+        op.create_index(f'ix_agent_cards_{column}', 'agent_cards', [column], unique=False)
+    for column in ARRAY_COLUMNS:
+        op.create_index(f'ix_agent_cards_{column}', 'agent_cards', [column], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    for column in ARRAY_COLUMNS + SCALAR_COLUMNS:
+        op.drop_index(f'ix_agent_cards_{column}', table_name='agent_cards')
+        op.drop_column('agent_cards', column)
+    op.create_index(
+        'ix_agent_cards_tee_type', 'agent_cards',
+        [sa.text("lower(card_data #>> '{capabilities,teeDetails,type}')")], unique=False
+    )
@@ -0,0 +1,151 @@
+"""
+Benchmark for `search=` on the agent card list.
+
+Inserts N synthetic cards for a throwaway developer into the database named by
+DATABASE_URL (migrated to the latest revision), runs ANALYZE, then times
+several search terms two ways:
+
+- legacy: the previous `name ILIKE '%term%' OR description ILIKE '%term%'`
+  query ordered by `updated_at`, with index scans disabled so that it runs as
+  the sequential scan it was before the trigram indexes existed;
+- ranked: `crud.agent_card.list_agent_cards` (full-text match on the GIN
+  indexed search vector or trigram-indexed substring match, ordered by rank).
+
+Both include the exact COUNT(*) of a first page (the count cache is disabled).
+The synthetic cards are deleted afterwards unless --keep is given.
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://... API_KEY_SECRET=... python benchmarks/bench_search.py --cards 100000
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from typing import Any, Dict, List
+
+from sqlalchemy import delete, func, insert, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from agentvault_registry import models, security # Import order avoids the crud <-> security cycle
+from agentvault_registry.config import settings
+from agentvault_registry.crud import agent_card
+
+TERMS = [
+    "weather", # Name word of ~1% of cards
+    "forecast", # Skill name only, ~0.5% of cards
+    "quantum", # Rare description word, ~0.05% of cards
+    "translation agent", # Two words anywhere in the document
+    "weath", # Substring only (trigram match)
+]
+
+BATCH_SIZE = 2000
+
+
+def _words(rng: random.Random, count: int) -> List[str]:
+    syllables = ["ka", "lo", "mi", "ne", "ro", "ta", "vi", "su", "de", "pa", "zo", "gu", "fe", "ri", "no"]
+    return ["".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(count)]
+
+
+def _card(rng: random.Random, vocab: List[str], tag_pool: List[str], index: int) -> Dict[str, Any]:
+    name_words = rng.sample(vocab, 2)
+    if rng.random() < 0.01: name_words.append("weather")
+    if rng.random() < 0.02: name_words.append("translation")
+    description = rng.sample(vocab, rng.randint(12, 25))
+    if rng.random() < 0.0005: description.append("quantum")
+    if rng.random() < 0.02: description.append("agent")
+    skills = [
+        {"id": f"skill-{i}", "name": " ".join(rng.sample(vocab, 2) + (["forecast"] if rng.random() < 0.002 else [])), "description": " ".join(rng.sample(vocab, 8))}
+        for i in range(rng.randint(1, 3))
+    ]
+    name, description = " ".join(name_words).title(), " ".join(description).capitalize() + "."
+    return {
+        "name": name,
+        "description": description,
+        "card_data": {
+            "schemaVersion": "1.0", "humanReadableId": f"bench/agent-{index}", "agentVersion": "1.0.0",
+            "name": name, "description": description, "url": f"https://agents.example.com/{index}/a2a",
+            "provider": {"name": "Bench"}, "capabilities": {"a2aVersion": "1.0"},
+            "authSchemes": [{"scheme": "none"}], "tags": rng.sample(tag_pool, rng.randint(1, 4)), "skills": skills,
+        },
+    }
+
+
+async def _populate(session: AsyncSession, developer_id: int, cards: int, seed: int) -> None:
+    rng = random.Random(seed)
+    vocab, tag_pool = _words(rng, 5000), _words(rng, 200)
+    started = time.perf_counter()
+    for offset in range(0, cards, BATCH_SIZE):
+        rows = [
+            {"developer_id": developer_id, "is_active": True, **card, **agent_card.extract_card_facets(card["card_data"])}
+            for card in (_card(rng, vocab, tag_pool, i) for i in range(offset, min(offset + BATCH_SIZE, cards)))
+        ]
+        await session.execute(insert(models.AgentCard), rows)
+        await session.commit()
+    await session.execute(text("ANALYZE agent_cards"))
+    await session.commit()
+    print(f"Inserted {cards} cards in {time.perf_counter() - started:.1f}s")
+
+
+async def _legacy_search(session: AsyncSession, term: str, limit: int) -> int:
+    await session.execute(text("SET LOCAL enable_indexscan = off"))
+    await session.execute(text("SET LOCAL enable_bitmapscan = off"))
+    pattern = f"%{term}%"
+    base_stmt = select(models.AgentCard).where(
+        models.AgentCard.is_active == True,
+        or_(models.AgentCard.name.ilike(pattern), models.AgentCard.description.ilike(pattern)),
+    )
+    total = (await session.execute(select(func.count()).select_from(base_stmt.subquery()))).scalar_one()
+    await session.execute(base_stmt.order_by(models.AgentCard.updated_at.desc(), models.AgentCard.id.desc()).limit(limit))
+    await session.rollback() # Ends the transaction and the SET LOCALs
+    return total
+
+
+async def _ranked_search(session: AsyncSession, term: str, limit: int) -> int:
+    _, total, _ = await agent_card.list_agent_cards(session, limit=limit, search=term)
+    await session.rollback()
+    return total
+
+
+async def _time(fn, session: AsyncSession, term: str, limit: int, repeat: int):
+    timings, total = [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        total = await fn(session, term, limit)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), total
+
+
+async def main(args: argparse.Namespace) -> None:
+    engine = create_async_engine(settings.DATABASE_URL)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    agent_card.count_cache = agent_card.AgentCardCountCache(max_size=0) # Time every COUNT(*)
+    async with sessionmaker() as session:
+        developer = models.Developer(name=f"bench-{uuid.uuid4().hex[:8]}", api_key_hash="!")
+        session.add(developer)
+        await session.commit()
+        try:
+            await _populate(session, developer.id, args.cards, args.seed)
+            print(f"{'term':<20} {'legacy ms':>10} {'ranked ms':>10} {'legacy hits':>12} {'ranked hits':>12}")
+            for term in TERMS:
+                legacy_ms, legacy_total = await _time(_legacy_search, session, term, args.limit, args.repeat)
+                ranked_ms, ranked_total = await _time(_ranked_search, session, term, args.limit, args.repeat)
+                print(f"{term:<20} {legacy_ms:>10.1f} {ranked_ms:>10.1f} {legacy_total:>12} {ranked_total:>12}")
+        finally:
+            if not args.keep:
+                await session.execute(delete(models.AgentCard).where(models.AgentCard.developer_id == developer.id))
+                await session.execute(delete(models.Developer).where(models.Developer.id == developer.id))
+                await session.commit()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cards", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--keep", action="store_true", help="Keep the synthetic cards afterwards.")
+    asyncio.run(main(parser.parse_args()))
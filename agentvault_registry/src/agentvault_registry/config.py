@@ -42,6 +42,22 @@ class Settings(BaseSettings):
     # Loaded from API_KEY_SECRET environment variable or .env file
     API_KEY_SECRET: str
 
+    # Verified API key cache (per process). Successful key verifications are
+    # remembered for up to API_KEY_CACHE_TTL_SECONDS so repeated requests skip
+    # the bcrypt check and database lookup. Key changes committed by a worker
+    # invalidate only that worker's cache: with several workers, a deactivated
+    # or rotated key keeps authenticating on the others for up to the TTL.
+    # Set either value to 0 to disable.
+    API_KEY_CACHE_TTL_SECONDS: int = 30
+    API_KEY_CACHE_MAX_SIZE: int = 1024
+
+    # Agent card count cache (per process). Exact totals of list requests are
+    # reused for up to AGENT_CARD_COUNT_CACHE_TTL_SECONDS per filter
+    # combination instead of running COUNT(*) for every page. Set either value
+    # to 0 to disable.
+    AGENT_CARD_COUNT_CACHE_TTL_SECONDS: int = 30
+    AGENT_CARD_COUNT_CACHE_MAX_SIZE: int = 512
+
     # --- CORS Settings ---
     # List of allowed origins. Use ["*"] for development, but restrict in production.
     ALLOWED_ORIGINS: List[Union[AnyHttpUrl, str]] = ["*"] # Default to allow all for dev
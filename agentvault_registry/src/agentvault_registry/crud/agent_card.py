@@ -3,19 +3,22 @@ import uuid
 import math
 import datetime
 import os
-from typing import Optional, List, Dict, Any, Tuple
-
-from sqlalchemy import select, func, or_
-# --- MODIFIED: Import JSONB and cast ---
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy import cast, Text
-# --- END MODIFIED ---
+import base64
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Tuple, Hashable
+
+from sqlalchemy import select, func, or_, tuple_, Select, text, event, literal_column
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, with_expression
 
 # Import local models and schemas with absolute imports
 from agentvault_registry import models, schemas
+from agentvault_registry.config import settings
 from pydantic import ValidationError as PydanticValidationError
 
 
@@ -133,7 +136,8 @@ async def create_agent_card(
         card_data=validated_data, # Store the full (validated) JSON
         name=name,
         description=description,
-        is_active=True # Default to active on creation
+        is_active=True, # Default to active on creation
+        **extract_card_facets(validated_data) # Indexed discovery columns
     )
 
     # 4. Add, commit, refresh
@@ -198,131 +202,435 @@ async def get_agent_card(db: AsyncSession, card_id: uuid.UUID) -> Optional[model
         return None
 
 
-async def list_agent_cards(
-    db: AsyncSession, skip: int = 0, limit: int = 100, active_only: bool = True,
-    search: Optional[str] = None, tags: Optional[List[str]] = None,
-    developer_id: Optional[int] = None,
-    # --- ADDED: Parameters from previous step ---
-    has_tee: Optional[bool] = None,
-    tee_type: Optional[str] = None
-    # --- END ADDED ---
-) -> Tuple[List[models.AgentCard], int]:
+# --- Keyset Cursors ---
+def encode_cursor(updated_at: datetime.datetime, card_id: uuid.UUID) -> str:
     """
-    Retrieves a list of Agent Cards with pagination and optional filtering.
+    Encodes the position after an agent card as an opaque, URL-safe cursor.
+
+    Lists are ordered by (updated_at, id) descending, so the pair identifies
+    where the next page starts regardless of inserts or deletes before it.
     """
-    # --- MODIFIED: Updated logging ---
-    logger.debug(f"Listing Agent Cards: skip={skip}, limit={limit}, active_only={active_only}, search='{search}', tags={tags}, developer_id={developer_id}, has_tee={has_tee}, tee_type='{tee_type}'")
-    # --- END MODIFIED ---
+    raw = f"{updated_at.isoformat()}|{card_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
 
-    if os.environ.get("AGENTVAULT_USE_PLACEHOLDERS", "false").lower() == "true":
-        logger.warning("!!! RETURNING PLACEHOLDER DATA FOR list_agent_cards !!!")
-        placeholder_items_dict = _get_placeholder_items()
-        placeholder_items = list(placeholder_items_dict.values())
-
-        # Basic filtering for placeholders
-        filtered_items = placeholder_items
-        if active_only:
-            filtered_items = [item for item in filtered_items if item.is_active]
-        if search:
-            search_lower = search.lower()
-            filtered_items = [
-                item for item in filtered_items
-                if search_lower in item.name.lower() or (item.description and search_lower in item.description.lower())
-            ]
-        if tags:
-            tags_set = set(tags)
-            filtered_items = [
-                item for item in filtered_items
-                if isinstance(item.card_data.get("tags"), list) and tags_set.issubset(set(item.card_data["tags"]))
-            ]
-        if developer_id is not None:
-            filtered_items = [item for item in filtered_items if item.developer_id == developer_id]
-        # --- ADDED: Placeholder TEE filtering ---
-        if has_tee is True:
-            filtered_items = [item for item in filtered_items if item.card_data.get("capabilities", {}).get("teeDetails") is not None]
-        elif has_tee is False:
-            filtered_items = [item for item in filtered_items if item.card_data.get("capabilities", {}).get("teeDetails") is None]
-        if tee_type:
-            tee_type_lower = tee_type.lower()
-            filtered_items = [
-                item for item in filtered_items
-                if item.card_data.get("capabilities", {}).get("teeDetails", {}).get("type", "").lower() == tee_type_lower
-            ]
-        # --- END ADDED ---
 
-        total_items = len(filtered_items)
-        paginated_items = filtered_items[skip : skip + limit]
-        return paginated_items, total_items
+def decode_cursor(cursor: str) -> Tuple[datetime.datetime, uuid.UUID]:
+    """Decodes a cursor created by `encode_cursor`. Raises ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        updated_at_str, card_id_str = raw.split("|", 1)
+        updated_at = datetime.datetime.fromisoformat(updated_at_str)
+        card_id = uuid.UUID(card_id_str)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if updated_at.tzinfo is None:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return updated_at, card_id
+
+
+# --- ADDED: Discovery facets ---
+def extract_card_facets(card_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extracts the indexed discovery columns of `models.AgentCard` from (validated)
+    card data. Called on every create/update; migration c5a8e2f4d6b1 backfills
+    existing rows with the equivalent SQL.
+    """
+    capabilities = card_data.get("capabilities") or {}
+    tee_details = capabilities.get("teeDetails") or {}
+    tee_type = tee_details.get("type")
+    return {
+        "human_readable_id": card_data.get("humanReadableId"),
+        "tags": [tag for tag in card_data.get("tags") or [] if isinstance(tag, str)],
+        "tee_type": tee_type.lower() if isinstance(tee_type, str) else None, # Lower-cased for case-insensitive matching
+        "auth_schemes": [auth.get("scheme") for auth in card_data.get("authSchemes") or [] if isinstance(auth, dict) and isinstance(auth.get("scheme"), str)],
+        "skills": [skill.get("id") for skill in card_data.get("skills") or [] if isinstance(skill, dict) and isinstance(skill.get("id"), str)],
+        "a2a_version": capabilities.get("a2aVersion"),
+        "mcp_version": capabilities.get("mcpVersion"),
+    }
+
+
+# Facet filters of the list endpoint: name -> (column, kind). "all" filters
+# require every given value in an array column, "any" filters one value in it,
+# "eq" filters compare a scalar column.
+_FACET_FILTERS: Dict[str, Tuple[str, str]] = {
+    "human_readable_id": ("human_readable_id", "eq"),
+    "auth_scheme": ("auth_schemes", "any"),
+    "skills": ("skills", "all"),
+    "a2a_version": ("a2a_version", "eq"),
+    "mcp_version": ("mcp_version", "eq"),
+}
+
+
+def _active_facets(facets: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Drops unset facet filters."""
+    return {name: value for name, value in (facets or {}).items() if value}
+# --- END ADDED ---
+
+
+# --- Filtering Helpers ---
+def _filter_placeholder_items(
+    items: List[models.AgentCard], active_only: bool, search: Optional[str], tags: Optional[List[str]],
+    developer_id: Optional[int], has_tee: Optional[bool], tee_type: Optional[str],
+    facets: Optional[Dict[str, Any]] = None
+) -> List[models.AgentCard]:
+    """Applies the list filters to placeholder items in memory."""
+    filtered_items = items
+    if active_only:
+        filtered_items = [item for item in filtered_items if item.is_active]
+    if search:
+        search_lower = search.lower()
+        filtered_items = [
+            item for item in filtered_items
+            if search_lower in item.name.lower() or (item.description and search_lower in item.description.lower())
+        ]
+    if tags:
+        tags_set = set(tags)
+        filtered_items = [
+            item for item in filtered_items
+            if isinstance(item.card_data.get("tags"), list) and tags_set.issubset(set(item.card_data["tags"]))
+        ]
+    if developer_id is not None:
+        filtered_items = [item for item in filtered_items if item.developer_id == developer_id]
+    # --- ADDED: Placeholder TEE filtering ---
+    if has_tee is True:
+        filtered_items = [item for item in filtered_items if item.card_data.get("capabilities", {}).get("teeDetails") is not None]
+    elif has_tee is False:
+        filtered_items = [item for item in filtered_items if item.card_data.get("capabilities", {}).get("teeDetails") is None]
+    if tee_type:
+        tee_type_lower = tee_type.lower()
+        filtered_items = [
+            item for item in filtered_items
+            if item.card_data.get("capabilities", {}).get("teeDetails", {}).get("type", "").lower() == tee_type_lower
+        ]
+    # --- END ADDED ---
+    # --- ADDED: Placeholder facet filtering ---
+    for name, value in _active_facets(facets).items():
+        column, kind = _FACET_FILTERS[name]
+        if kind == "eq":
+            filtered_items = [item for item in filtered_items if extract_card_facets(item.card_data)[column] == value]
+        else:
+            wanted = set(value) if kind == "all" else {value}
+            filtered_items = [item for item in filtered_items if wanted.issubset(extract_card_facets(item.card_data)[column])]
+    # --- END ADDED ---
+    # Same order as the database queries: newest first, ID as tie-breaker
+    return sorted(filtered_items, key=lambda item: (item.updated_at, item.id), reverse=True)
 
 
-    # Base statement
-    base_stmt = select(models.AgentCard)
+# --- ADDED: Full-text search helpers ---
+def _search_query(search: str):
+    """Parses a `search` term into a tsquery (web search syntax: "quoted phrases", or, -exclusion)."""
+    return func.websearch_to_tsquery(literal_column(f"'{models.AGENT_CARD_SEARCH_CONFIG}'::regconfig"), search)
 
-    # Apply filters
+
+def _search_rank(search: str):
+    """
+    Relevance of a card for a `search` term: the full-text rank of the
+    weighted search vector (normalized to 0..1), plus the trigram similarity
+    of the name, so that close name matches and pure substring matches still
+    rank.
+    """
+    return (
+        func.ts_rank_cd(models.AgentCard.search_vector, _search_query(search), 32)
+        + func.similarity(models.AgentCard.name, search)
+    )
+# --- END ADDED ---
+
+
+def _apply_list_filters(
+    base_stmt: Select, active_only: bool, search: Optional[str], tags: Optional[List[str]],
+    developer_id: Optional[int], has_tee: Optional[bool], tee_type: Optional[str],
+    facets: Optional[Dict[str, Any]] = None
+) -> Select:
+    """
+    Adds the WHERE clauses of the list filters to a select over AgentCard.
+    Tags, TEE and `facets` filters use the indexed columns extracted from
+    card_data, so combined filters are answered from their indexes.
+    """
     if active_only:
         base_stmt = base_stmt.where(models.AgentCard.is_active == True)
     if search:
+        # --- MODIFIED: Full-text match on the GIN-indexed search vector, or a substring match served by the trigram indexes ---
         search_term = f"%{search}%"
         base_stmt = base_stmt.where(
             or_(
+                models.AgentCard.search_vector.bool_op("@@")(_search_query(search)),
                 models.AgentCard.name.ilike(search_term),
                 models.AgentCard.description.ilike(search_term)
             )
         )
+        # --- END MODIFIED ---
     if tags:
         if isinstance(tags, list) and tags:
-            try:
-                # Ensure tags are treated as strings for the JSONB contains operator
-                base_stmt = base_stmt.where(models.AgentCard.card_data['tags'].astext.cast(JSONB).contains(tags))
-                logger.debug(f"Applied tag filter using JSONB contains: {tags}")
-            except Exception as json_err:
-                logger.warning(f"Could not apply JSONB @> operator for tag filtering (maybe not JSONB or data format issue?): {json_err}. Skipping tag filter.")
+            # --- MODIFIED: Array containment on the GIN-indexed tags column ---
+            base_stmt = base_stmt.where(models.AgentCard.tags.contains(tags))
+            logger.debug(f"Applied tag filter using array contains: {tags}")
+            # --- END MODIFIED ---
     if developer_id is not None:
         base_stmt = base_stmt.where(models.AgentCard.developer_id == developer_id)
         logger.debug(f"Applied developer ID filter: {developer_id}")
 
     # --- ADDED: TEE Filtering Logic ---
+    # --- MODIFIED: Filter on the indexed, lower-cased tee_type column (`type` is required in teeDetails) ---
     if has_tee is True:
         logger.debug("Applying filter: has_tee = True")
-        # Check if the path exists and is not JSON null
-        base_stmt = base_stmt.where(models.AgentCard.card_data['capabilities']['teeDetails'].isnot(None))
+        base_stmt = base_stmt.where(models.AgentCard.tee_type.isnot(None))
     elif has_tee is False:
         logger.debug("Applying filter: has_tee = False")
-        # Check if the path does not exist OR is JSON null
-        # Using `is_(None)` should handle both cases correctly with JSONB path operators
-        base_stmt = base_stmt.where(models.AgentCard.card_data['capabilities']['teeDetails'].is_(None))
+        # Matches cards without teeDetails as well as those where it is JSON null
+        base_stmt = base_stmt.where(models.AgentCard.tee_type.is_(None))
 
     if tee_type:
         logger.debug(f"Applying filter: tee_type = '{tee_type}'")
-        # Use the ->> operator to get the value as text for direct comparison
-        # This assumes the 'type' field exists if 'teeDetails' exists.
-        # Add path existence check if needed: .where(models.AgentCard.card_data['capabilities']['teeDetails'].isnot(None))
-        base_stmt = base_stmt.where(
-            models.AgentCard.card_data['capabilities']['teeDetails']['type'].astext == tee_type
-        )
-        # Alternative using cast, might be slightly less efficient:
-        # base_stmt = base_stmt.where(
-        #     cast(models.AgentCard.card_data['capabilities']['teeDetails']['type'], Text) == tee_type
-        # )
+        # Case-insensitive, like the placeholder filter
+        base_stmt = base_stmt.where(models.AgentCard.tee_type == tee_type.lower())
+    # --- END MODIFIED ---
+    # --- END ADDED ---
+
+    # --- ADDED: Facet filters on the extracted columns ---
+    for name, value in _active_facets(facets).items():
+        column_name, kind = _FACET_FILTERS[name]
+        column = getattr(models.AgentCard, column_name)
+        if kind == "eq":
+            base_stmt = base_stmt.where(column == value)
+        else:
+            base_stmt = base_stmt.where(column.contains(list(value) if kind == "all" else [value]))
+        logger.debug(f"Applied facet filter {name}={value!r}")
     # --- END ADDED ---
+    return base_stmt
 
 
-    # Get total count matching filters *before* applying limit/offset
+# --- Counting ---
+class AgentCardCountCache:
+    """
+    Bounded, in-process TTL/LRU cache of exact agent card counts per filter key.
+
+    Paging through a list repeats the same COUNT(*) for every page; with a
+    cache the count runs once per filter combination and TTL. Any AgentCard
+    insert, update or delete in this process clears the cache; changes made by
+    other processes are picked up once the TTL expires.
+    """
+    def __init__(self, max_size: int = 512, ttl_seconds: float = 30.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, key: Hashable) -> Optional[int]:
+        """Returns the cached count for the filter key, or None on a miss/expiry."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, count: int) -> None:
+        """Remembers the exact count for a filter key."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (count, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Removes all entries (counters are kept)."""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns cache size and hit/miss/eviction/invalidation counters."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+count_cache = AgentCardCountCache(
+    max_size=settings.AGENT_CARD_COUNT_CACHE_MAX_SIZE,
+    ttl_seconds=settings.AGENT_CARD_COUNT_CACHE_TTL_SECONDS,
+)
+
+@event.listens_for(models.AgentCard, "after_insert")
+@event.listens_for(models.AgentCard, "after_update")
+@event.listens_for(models.AgentCard, "after_delete")
+def _invalidate_cached_counts(mapper, connection, target: models.AgentCard) -> None:
+    """Drops cached counts when a card is added, changed or removed."""
+    count_cache.clear()
+
+
+def _count_cache_key(
+    active_only: bool, search: Optional[str], tags: Optional[List[str]],
+    developer_id: Optional[int], has_tee: Optional[bool], tee_type: Optional[str],
+    facets: Optional[Dict[str, Any]] = None
+) -> Hashable:
+    """Normalizes the list filters so that equivalent requests share a cached count."""
+    return (
+        active_only,
+        search.lower() if search else None, # ILIKE is case-insensitive
+        tuple(sorted(set(tags))) if tags else None, # Containment ignores order and duplicates
+        developer_id, has_tee, tee_type.lower() if tee_type else None,
+        tuple(sorted(
+            (name, tuple(sorted(set(value))) if _FACET_FILTERS[name][1] == "all" else value)
+            for name, value in _active_facets(facets).items()
+        )),
+    )
+
+
+async def _count_agent_cards(db: AsyncSession, base_stmt: Select) -> Optional[int]:
+    """Counts the rows matching a filtered select. Returns None if the query fails."""
     try:
         count_stmt = select(func.count()).select_from(base_stmt.subquery())
         count_result = await db.execute(count_stmt)
         total_items = count_result.scalar_one_or_none() or 0
     except Exception as e:
         logger.error(f"Error counting agent cards: {e}", exc_info=True)
-        return [], 0
-
+        return None
     logger.debug(f"Total matching agent cards found: {total_items}")
+    return total_items
+
+
+async def _estimate_agent_cards(db: AsyncSession, base_stmt: Select, whole_table: bool) -> Optional[int]:
+    """
+    Estimates the rows matching a select from PostgreSQL statistics, without
+    scanning: `pg_class.reltuples` for the whole table, otherwise the row
+    estimate of the query plan. Returns None if no estimate is available
+    (e.g. the table was never analyzed).
+    """
+    try:
+        if whole_table:
+            result = await db.execute(text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'agent_cards'::regclass"))
+            estimate = result.scalar_one_or_none()
+        else:
+            # Only boolean/integer filters reach this point, so they can be inlined safely
+            compiled = base_stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+            result = await db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+            plan = result.scalar_one_or_none()
+            if isinstance(plan, (str, bytes)):
+                plan = json.loads(plan)
+            estimate = plan[0]["Plan"]["Plan Rows"] if plan else None
+    except Exception as e:
+        logger.warning(f"Could not estimate agent card count, counting exactly instead: {e}")
+        return None
+    if estimate is None or estimate < 0: # reltuples is -1 before the first ANALYZE
+        return None
+    return int(estimate)
+
+
+async def _total_agent_cards(
+    db: AsyncSession, base_stmt: Select, count_mode: schemas.CountMode,
+    active_only: bool, search: Optional[str], tags: Optional[List[str]],
+    developer_id: Optional[int], has_tee: Optional[bool], tee_type: Optional[str],
+    facets: Optional[Dict[str, Any]] = None
+) -> Tuple[Optional[int], bool, bool]:
+    """
+    Computes the total for a list request according to `count_mode`.
+
+    Returns (total, total_is_estimate, failed). Estimates are only used when no
+    search, tag, TEE or facet filter is set, because planner estimates for
+    those predicates are guesses; such requests are counted exactly instead.
+    Exact counts are served from `count_cache` when possible.
+    """
+    if count_mode == "none":
+        return None, False, False
+    if count_mode == "estimate" and not (search or tags or has_tee is not None or tee_type or _active_facets(facets)):
+        estimate = await _estimate_agent_cards(db, base_stmt, whole_table=not active_only and developer_id is None)
+        if estimate is not None:
+            logger.debug(f"Estimated matching agent cards: {estimate}")
+            return estimate, True, False
+    cache_key = _count_cache_key(active_only, search, tags, developer_id, has_tee, tee_type, facets)
+    total_items = count_cache.get(cache_key)
+    if total_items is not None:
+        logger.debug(f"Using cached agent card count: {total_items}")
+        return total_items, False, False
+    total_items = await _count_agent_cards(db, base_stmt)
+    if total_items is None:
+        return None, False, True
+    count_cache.put(cache_key, total_items)
+    return total_items, False, False
+
+
+async def list_agent_cards(
+    db: AsyncSession, skip: int = 0, limit: int = 100, active_only: bool = True,
+    search: Optional[str] = None, tags: Optional[List[str]] = None,
+    developer_id: Optional[int] = None,
+    # --- ADDED: Parameters from previous step ---
+    has_tee: Optional[bool] = None,
+    tee_type: Optional[str] = None,
+    # --- END ADDED ---
+    human_readable_id: Optional[str] = None,
+    auth_scheme: Optional[str] = None,
+    skills: Optional[List[str]] = None,
+    a2a_version: Optional[str] = None,
+    mcp_version: Optional[str] = None,
+    count_mode: schemas.CountMode = "exact"
+) -> Tuple[List[models.AgentCard], Optional[int], bool]:
+    """
+    Retrieves a list of Agent Cards with offset pagination and optional filtering.
+
+    Returns the page, the total number of matching cards computed according
+    to `count_mode` (None for "none") and whether that total is an estimate.
+    With `search`, cards are ordered by relevance and carry `search_rank`.
+    `human_readable_id`, `auth_scheme`, `skills` (skill IDs, all required),
+    `a2a_version` and `mcp_version` filter on the extracted facet columns.
+    Deep offsets get slower and concurrent updates can shift rows between
+    pages; use `list_agent_cards_by_cursor` to iterate over large lists.
+    """
+    # --- MODIFIED: Updated logging ---
+    facets = {"human_readable_id": human_readable_id, "auth_scheme": auth_scheme, "skills": skills, "a2a_version": a2a_version, "mcp_version": mcp_version}
+    logger.debug(f"Listing Agent Cards: skip={skip}, limit={limit}, active_only={active_only}, search='{search}', tags={tags}, developer_id={developer_id}, has_tee={has_tee}, tee_type='{tee_type}', facets={_active_facets(facets)}")
+    # --- END MODIFIED ---
+
+    if os.environ.get("AGENTVAULT_USE_PLACEHOLDERS", "false").lower() == "true":
+        logger.warning("!!! RETURNING PLACEHOLDER DATA FOR list_agent_cards !!!")
+        filtered_items = _filter_placeholder_items(
+            list(_get_placeholder_items().values()), active_only, search, tags, developer_id, has_tee, tee_type, facets
+        )
+        total_items = len(filtered_items) if count_mode != "none" else None
+        paginated_items = filtered_items[skip : skip + limit]
+        return paginated_items, total_items, False
+
+    base_stmt = _apply_list_filters(select(models.AgentCard), active_only, search, tags, developer_id, has_tee, tee_type, facets)
+
+    # Get total count matching filters *before* applying limit/offset
+    total_items, total_is_estimate, count_failed = await _total_agent_cards(
+        db, base_stmt, count_mode, active_only, search, tags, developer_id, has_tee, tee_type, facets
+    )
+    if count_failed:
+        return [], 0, False
 
     # Apply ordering, offset, and limit for the final result set
+    final_stmt = base_stmt.options(selectinload(models.AgentCard.developer))
+    if search:
+        # Best matches first
+        rank = _search_rank(search)
+        final_stmt = final_stmt.options(with_expression(models.AgentCard.search_rank, rank)).order_by(rank.desc())
     final_stmt = (
-        base_stmt
-        .options(selectinload(models.AgentCard.developer))
-        .order_by(models.AgentCard.updated_at.desc())
+        final_stmt
+        .order_by(models.AgentCard.updated_at.desc(), models.AgentCard.id.desc())
         .offset(skip)
         .limit(limit)
     )
@@ -331,10 +639,89 @@ async def list_agent_cards(
         result = await db.execute(final_stmt)
         items = list(result.scalars().all())
         logger.debug(f"Returning {len(items)} agent cards for the current page.")
-        return items, total_items
+        return items, total_items, total_is_estimate
     except Exception as e:
         logger.error(f"Error executing agent card list query: {e}", exc_info=True)
-        return [], total_items
+        return [], total_items, total_is_estimate
+
+
+async def list_agent_cards_by_cursor(
+    db: AsyncSession, cursor: Optional[str] = None, limit: int = 100, active_only: bool = True,
+    search: Optional[str] = None, tags: Optional[List[str]] = None,
+    developer_id: Optional[int] = None,
+    has_tee: Optional[bool] = None,
+    tee_type: Optional[str] = None,
+    human_readable_id: Optional[str] = None,
+    auth_scheme: Optional[str] = None,
+    skills: Optional[List[str]] = None,
+    a2a_version: Optional[str] = None,
+    mcp_version: Optional[str] = None,
+    count_mode: schemas.CountMode = "none"
+) -> Tuple[List[models.AgentCard], Optional[int], bool, Optional[str]]:
+    """
+    Retrieves a page of Agent Cards using keyset pagination.
+
+    Returns the cards after `cursor` (from the start if None) ordered by
+    (updated_at, id) descending, the total number of matching cards according
+    to `count_mode` (not counted by default), whether that total is an
+    estimate, and the cursor of the next page (None on the last page). The
+    page is read with
+    `WHERE (updated_at, id) < (:updated_at, :id)` on the composite index
+    `ix_agent_cards_updated_at_id`, so every page costs the same however deep
+    it is, and rows are never returned twice. With `search`, cards carry
+    `search_rank` but keep this order.
+
+    Raises:
+        ValueError: If `cursor` is malformed.
+    """
+    facets = {"human_readable_id": human_readable_id, "auth_scheme": auth_scheme, "skills": skills, "a2a_version": a2a_version, "mcp_version": mcp_version}
+    logger.debug(f"Listing Agent Cards by cursor: cursor={cursor!r}, limit={limit}, active_only={active_only}, search='{search}', tags={tags}, developer_id={developer_id}, has_tee={has_tee}, tee_type='{tee_type}', facets={_active_facets(facets)}")
+    position = decode_cursor(cursor) if cursor else None
+
+    if os.environ.get("AGENTVAULT_USE_PLACEHOLDERS", "false").lower() == "true":
+        logger.warning("!!! RETURNING PLACEHOLDER DATA FOR list_agent_cards_by_cursor !!!")
+        filtered_items = _filter_placeholder_items(
+            list(_get_placeholder_items().values()), active_only, search, tags, developer_id, has_tee, tee_type, facets
+        )
+        remaining = [item for item in filtered_items if position is None or (item.updated_at, item.id) < position]
+        page = remaining[:limit]
+        next_cursor = encode_cursor(page[-1].updated_at, page[-1].id) if len(remaining) > limit else None
+        return page, len(filtered_items) if count_mode != "none" else None, False, next_cursor
+
+    base_stmt = _apply_list_filters(select(models.AgentCard), active_only, search, tags, developer_id, has_tee, tee_type, facets)
+    total_items, total_is_estimate, count_failed = await _total_agent_cards(
+        db, base_stmt, count_mode, active_only, search, tags, developer_id, has_tee, tee_type, facets
+    )
+    if count_failed:
+        return [], 0, False, None
+
+    page_stmt = base_stmt
+    if search:
+        # Ranks are reported, but cursor pages keep the stable (updated_at, id) order
+        page_stmt = page_stmt.options(with_expression(models.AgentCard.search_rank, _search_rank(search)))
+    if position is not None:
+        page_stmt = page_stmt.where(tuple_(models.AgentCard.updated_at, models.AgentCard.id) < tuple_(*position))
+    # One extra row tells whether there is a next page
+    page_stmt = (
+        page_stmt
+        .options(selectinload(models.AgentCard.developer))
+        .order_by(models.AgentCard.updated_at.desc(), models.AgentCard.id.desc())
+        .limit(limit + 1)
+    )
+
+    try:
+        result = await db.execute(page_stmt)
+        items = list(result.scalars().all())
+    except Exception as e:
+        logger.error(f"Error executing agent card keyset query: {e}", exc_info=True)
+        return [], total_items, total_is_estimate, None
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1].updated_at, items[-1].id)
+    logger.debug(f"Returning {len(items)} agent cards for the current page (next cursor: {next_cursor}).")
+    return items, total_items, total_is_estimate, next_cursor
 
 
 async def update_agent_card(
@@ -390,6 +777,8 @@ async def update_agent_card(
         try:
             db_card.name = validated_data.get("name")
             db_card.description = validated_data.get("description")
+            for column, value in extract_card_facets(validated_data).items():
+                setattr(db_card, column, value)
             if not db_card.name:
                  raise ValueError("Validated card data for update is missing the required 'name' field.")
         except Exception as e:
@@ -1,9 +1,10 @@
 import logging
 from typing import Optional, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import select, exists
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 # Import models and security utils using absolute imports
 from agentvault_registry import models
@@ -11,6 +12,11 @@ from agentvault_registry import security
 
 logger = logging.getLogger(__name__)
 
+# False once a legacy scan found no developer without a key record. New developers
+# always get one, so the legacy scan (bcrypt over every remaining legacy hash) is
+# skipped from then on in this process.
+_legacy_keys_remaining = True
+
 async def create_developer(db: AsyncSession, name: str) -> Tuple[Optional[models.Developer], Optional[str]]:
     """
     Creates a new developer record and generates their initial API key.
@@ -38,8 +44,13 @@ async def create_developer(db: AsyncSession, name: str) -> Tuple[Optional[models
         logger.error(f"Failed to hash API key: {e}", exc_info=True)
         return None, None # Cannot proceed without a valid hash
 
-    # 3. Create the Developer model instance
+    # 3. Create the Developer model instance and its indexed key record
     db_developer = models.Developer(name=name, api_key_hash=hashed_key)
+    key_prefix = security.get_api_key_prefix(plain_api_key)
+    if key_prefix:
+        db_developer.api_keys.append(
+            models.DeveloperApiKey(key_prefix=key_prefix, key_hash=hashed_key, is_active=True)
+        )
 
     # 4. Add to session and attempt to commit
     db.add(db_developer)
@@ -63,12 +74,13 @@ async def create_developer(db: AsyncSession, name: str) -> Tuple[Optional[models
 
 async def get_developer_by_plain_api_key(db: AsyncSession, plain_key: str) -> Optional[models.Developer]:
     """
-    Retrieves a developer by verifying a plain text API key against stored hashes.
+    Retrieves a developer by verifying a plain text API key.
 
-    NOTE: This iterates through all developers and performs hash verification for each.
-          This is INEFFICIENT for large numbers of developers and should be
-          revisited with a better strategy (e.g., key prefixes, dedicated key table)
-          in a production system. Suitable for Phase 1 demonstration.
+    The public prefix of the key is used for a single indexed lookup in the
+    developer_api_keys table, followed by one hash verification. Keys issued
+    before the key table existed have no row there; for those, the remaining
+    legacy developers are checked and the key is migrated on first successful
+    use (see _migrate_legacy_api_key).
 
     Args:
         db: The SQLAlchemy async session.
@@ -77,30 +89,158 @@ async def get_developer_by_plain_api_key(db: AsyncSession, plain_key: str) -> Op
     Returns:
         The matching Developer object if found and verified, otherwise None.
     """
-    logger.debug("Attempting to find developer by plain API key (iterative check).")
     if not plain_key:
         return None
 
-    all_developers: list[models.Developer] = [] # Define type hint
+    key_prefix = security.get_api_key_prefix(plain_key)
+    if key_prefix is None:
+        logger.debug("Provided API key does not have the expected 'avreg_' format.")
+        return None
+
     try:
-        stmt = select(models.Developer)
+        stmt = (
+            select(models.DeveloperApiKey)
+            .where(models.DeveloperApiKey.key_prefix == key_prefix)
+            .options(selectinload(models.DeveloperApiKey.developer))
+        )
         result = await db.execute(stmt)
-        # --- MODIFIED: Use .scalars().all() ---
-        all_developers = list(result.scalars().all())
-        # --- END MODIFIED ---
+        db_key = result.scalar_one_or_none()
     except Exception as e:
-        logger.error(f"Failed to query developers for API key check: {e}", exc_info=True)
+        logger.error(f"Failed to query API key by prefix: {e}", exc_info=True)
         return None
 
-    logger.debug(f"Checking plain key against {len(all_developers)} developer hashes.")
-    for developer in all_developers:
-        # --- ADDED: Ensure hash comparison happens ---
+    if db_key is not None:
+        if not db_key.is_active:
+            logger.info(f"API key with prefix '{key_prefix}' is inactive.")
+            return None
+        if security.verify_api_key(plain_key, db_key.key_hash):
+            logger.info(f"API key verified for developer ID: {db_key.developer_id}")
+            return db_key.developer
+        logger.debug(f"API key hash mismatch for prefix '{key_prefix}'.")
+        return None
+
+    return await _get_developer_by_legacy_api_key(db, plain_key, key_prefix)
+
+
+async def _get_developer_by_legacy_api_key(
+    db: AsyncSession, plain_key: str, key_prefix: str
+) -> Optional[models.Developer]:
+    """
+    Fallback for API keys issued before the developer_api_keys table existed.
+
+    Only developers without any key record are checked, so this scan shrinks
+    as legacy keys are used (and migrated) and is empty for new installations.
+    Once it finds none, it is not run again.
+    """
+    global _legacy_keys_remaining
+    if not _legacy_keys_remaining:
+        logger.debug("No legacy API keys remain; skipping legacy key check.")
+        return None
+    try:
+        stmt = select(models.Developer).where(
+            ~exists().where(models.DeveloperApiKey.developer_id == models.Developer.id)
+        )
+        result = await db.execute(stmt)
+        legacy_developers = list(result.scalars().all())
+    except Exception as e:
+        logger.error(f"Failed to query legacy developers for API key check: {e}", exc_info=True)
+        return None
+
+    if not legacy_developers:
+        _legacy_keys_remaining = False
+        logger.info("All legacy API keys are migrated; the legacy key check is disabled.")
+        return None
+
+    logger.debug(f"Checking plain key against {len(legacy_developers)} legacy developer hashes.")
+    for developer in legacy_developers:
         if developer.api_key_hash and security.verify_api_key(plain_key, developer.api_key_hash):
-        # --- END ADDED ---
-            logger.info(f"API key verified for developer ID: {developer.id}, Name: {developer.name}")
+            logger.info(f"Legacy API key verified for developer ID: {developer.id}, Name: {developer.name}")
+            await _migrate_legacy_api_key(db, developer, key_prefix)
             return developer
 
     logger.debug("No matching developer found for the provided API key.")
     return None
 
+
+async def _migrate_legacy_api_key(db: AsyncSession, developer: models.Developer, key_prefix: str) -> None:
+    """
+    Creates the indexed key record for a verified legacy key so that later
+    requests take the prefix lookup path. Failures are logged and ignored;
+    authentication has already succeeded at this point.
+
+    The record is committed in a separate session on the same engine, so pending
+    work of the request's session is neither committed nor rolled back here.
+    """
+    developer_id = developer.id
+    db_key = models.DeveloperApiKey(
+        developer_id=developer_id, key_prefix=key_prefix,
+        key_hash=developer.api_key_hash, is_active=True
+    )
+    try:
+        async with AsyncSession(bind=db.bind, expire_on_commit=False) as migration_db:
+            migration_db.add(db_key)
+            await migration_db.commit()
+        logger.info(f"Migrated legacy API key for developer ID {developer_id} to prefix '{key_prefix}'.")
+    except Exception as e:
+        # E.g. a concurrent migration of the same key
+        logger.warning(f"Failed to migrate legacy API key for developer ID {developer_id}: {e}")
+
+async def rotate_developer_api_key(db: AsyncSession, developer_id: int) -> Optional[str]:
+    """
+    Replaces a developer's API key(s) with a newly generated key.
+
+    All existing key records of the developer are deactivated and a new record is
+    created. Cached verifications for the developer are dropped by the ORM event
+    hooks in `security`.
+
+    Args:
+        db: The SQLAlchemy async session.
+        developer_id: The ID of the developer whose key should be rotated.
+
+    Returns:
+        The new plain text API key, or None if the developer does not exist or
+        the rotation failed.
+    """
+    logger.info(f"Rotating API key for developer ID: {developer_id}")
+    try:
+        stmt = (
+            select(models.Developer)
+            .where(models.Developer.id == developer_id)
+            .options(selectinload(models.Developer.api_keys))
+        )
+        result = await db.execute(stmt)
+        db_developer = result.scalar_one_or_none()
+    except Exception as e:
+        logger.error(f"Failed to load developer {developer_id} for key rotation: {e}", exc_info=True)
+        return None
+
+    if db_developer is None:
+        logger.warning(f"Developer {developer_id} not found for key rotation.")
+        return None
+
+    plain_api_key = security.generate_secure_api_key()
+    try:
+        hashed_key = security.hash_api_key(plain_api_key)
+    except Exception as e:
+        logger.error(f"Failed to hash API key: {e}", exc_info=True)
+        return None
+
+    for db_key in db_developer.api_keys:
+        db_key.is_active = False
+    db_developer.api_key_hash = hashed_key
+    db_developer.api_keys.append(
+        models.DeveloperApiKey(
+            key_prefix=security.get_api_key_prefix(plain_api_key), key_hash=hashed_key, is_active=True
+        )
+    )
+
+    try:
+        await db.commit()
+        logger.info(f"Successfully rotated API key for developer ID: {developer_id}")
+        return plain_api_key
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Failed to rotate API key for developer {developer_id}: {e}", exc_info=True)
+        return None
+
 # Add other developer CRUD functions as needed (e.g., get_developer_by_id, get_developer_by_name, update, delete)
@@ -19,6 +19,9 @@ from slowapi.middleware import SlowAPIMiddleware
 from agentvault_registry.config import settings
 # Import the router
 from agentvault_registry.routers import agent_cards, utils
+from agentvault_registry.security import api_key_cache
+from agentvault_registry.crud.agent_card import count_cache as agent_card_count_cache
+from agentvault_registry.responses import RegistryJSONResponse
 
 
 # --- Logging Setup ---
@@ -43,7 +46,8 @@ app = FastAPI(
     version="0.1.0", # Consider linking this to pyproject.toml version later
     openapi_url=f"{settings.API_V1_STR}/openapi.json", # Standard OpenAPI endpoint
     docs_url="/docs", # Swagger UI
-    redoc_url="/redoc" # ReDoc UI
+    redoc_url="/redoc", # ReDoc UI
+    default_response_class=RegistryJSONResponse # orjson rendering when installed
 )
 
 # --- Apply Rate Limiting Middleware ---
@@ -146,6 +150,6 @@ async def read_developer_ui():
 async def health_check(request: Request): # Inject Request
     """Simple health check endpoint."""
     # In the future, this could check database connectivity etc.
-    return {"status": "ok"}
+    return {"status": "ok", "api_key_cache": api_key_cache.stats(), "agent_card_count_cache": agent_card_count_cache.stats()}
 
 logger.info(f"{settings.PROJECT_NAME} application initialized.")
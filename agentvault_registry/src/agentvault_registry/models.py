@@ -1,13 +1,14 @@
 import uuid
 import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from sqlalchemy import (
     Column, Integer, String, Boolean, DateTime, ForeignKey, JSON, Index,
-    UUID as SQLUUID, func
+    UUID as SQLUUID, func, Computed
 )
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR
 # --- MODIFIED: Import mapped_column and relationship directly if not already ---
-from sqlalchemy.orm import relationship, Mapped, mapped_column, selectinload # Added selectinload
+from sqlalchemy.orm import relationship, Mapped, mapped_column, selectinload, query_expression # Added selectinload
 # --- END MODIFIED ---
 
 
@@ -38,13 +39,65 @@ class Developer(Base):
         "AgentCard", back_populates="developer", cascade="all, delete-orphan"
     )
 
+    # Relationship to DeveloperApiKey (one-to-many)
+    api_keys: Mapped[List["DeveloperApiKey"]] = relationship(
+        "DeveloperApiKey", back_populates="developer", cascade="all, delete-orphan"
+    )
+
     def __repr__(self):
         # --- MODIFIED: Add is_verified to repr ---
         return f"<Developer(id={self.id}, name='{self.name}', verified={self.is_verified})>"
         # --- END MODIFIED ---
 
 
+# --- DeveloperApiKey Model ---
+class DeveloperApiKey(Base):
+    """
+    SQLAlchemy model for developer API keys.
+
+    Each key is identified by its public prefix (the leading characters of the
+    plain key, e.g. 'avreg_AbCdEfGhIjKl'), which is stored in plain text and
+    indexed. Authentication looks up the single row for the presented prefix
+    and verifies the bcrypt hash of the full key, instead of checking every
+    developer's hash.
+    """
+    __tablename__ = "developer_api_keys"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    developer_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("developers.id"), nullable=False, index=True
+    )
+    # Public, non-secret identifier of the key (unique lookup column)
+    key_prefix: Mapped[str] = mapped_column(String, unique=True, index=True, nullable=False)
+    # Hash of the full plain text key
+    key_hash: Mapped[str] = mapped_column(String, nullable=False)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    # Relationship back to Developer (many-to-one)
+    developer: Mapped["Developer"] = relationship("Developer", back_populates="api_keys")
+
+    def __repr__(self):
+        return f"<DeveloperApiKey(id={self.id}, prefix='{self.key_prefix}', developer_id={self.developer_id}, active={self.is_active})>"
+
+
 # --- AgentCard Model ---
+
+# Weighted full-text document for `search=` queries: name and tags rank
+# highest, then description and skill names, then skill descriptions.
+# Generated columns need immutable expressions, hence the explicit text search
+# configuration and the non-"_tz" jsonpath function.
+AGENT_CARD_SEARCH_CONFIG = "english"
+AGENT_CARD_SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{AGENT_CARD_SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+    f"setweight(jsonb_to_tsvector('{AGENT_CARD_SEARCH_CONFIG}', coalesce(card_data -> 'tags', '[]'::jsonb), '[\"string\"]'), 'A') || "
+    f"setweight(to_tsvector('{AGENT_CARD_SEARCH_CONFIG}', coalesce(description, '')), 'B') || "
+    f"setweight(jsonb_to_tsvector('{AGENT_CARD_SEARCH_CONFIG}', jsonb_path_query_array(card_data, '$.skills[*].name'), '[\"string\"]'), 'B') || "
+    f"setweight(jsonb_to_tsvector('{AGENT_CARD_SEARCH_CONFIG}', jsonb_path_query_array(card_data, '$.skills[*].description'), '[\"string\"]'), 'C')"
+)
+
 class AgentCard(Base):
     """SQLAlchemy model for storing Agent Card metadata."""
     __tablename__ = "agent_cards"
@@ -58,9 +111,8 @@ class AgentCard(Base):
         Integer, ForeignKey("developers.id"), nullable=False, index=True
     )
     # Store the full Agent Card JSON data
-    # JSONB is generally preferred in PostgreSQL for performance if available
-    # SQLAlchemy's JSON type maps appropriately based on dialect
-    card_data: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+    # JSONB (see migration 495a40fce45f), so that containment queries (`@>`) can use the GIN index
+    card_data: Mapped[Dict[str, Any]] = mapped_column(JSONB, nullable=False)
 
     # Extracted fields for easier querying and indexing
     # Ensure these fields are populated correctly in CRUD operations
@@ -68,6 +120,23 @@ class AgentCard(Base):
     description: Mapped[str] = mapped_column(String, index=True, nullable=True) # Allow nullable description
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, index=True, nullable=False)
 
+    # Discovery facets extracted from card_data on every write (crud.agent_card.extract_card_facets)
+    human_readable_id: Mapped[Optional[str]] = mapped_column(String, index=True, nullable=True)
+    tags: Mapped[List[str]] = mapped_column(ARRAY(String), default=list, server_default="{}", nullable=False)
+    tee_type: Mapped[Optional[str]] = mapped_column(String, index=True, nullable=True) # Lower-cased, NULL without teeDetails
+    auth_schemes: Mapped[List[str]] = mapped_column(ARRAY(String), default=list, server_default="{}", nullable=False)
+    skills: Mapped[List[str]] = mapped_column(ARRAY(String), default=list, server_default="{}", nullable=False) # Skill IDs
+    a2a_version: Mapped[Optional[str]] = mapped_column(String, index=True, nullable=True)
+    mcp_version: Mapped[Optional[str]] = mapped_column(String, index=True, nullable=True)
+
+    # Full-text search document, generated by PostgreSQL from the columns above
+    # (deferred: only used in WHERE/ORDER BY clauses, never loaded)
+    search_vector: Mapped[Optional[Any]] = mapped_column(
+        TSVECTOR, Computed(AGENT_CARD_SEARCH_VECTOR_SQL, persisted=True), deferred=True
+    )
+    # Relevance for the current `search` term, populated by list queries via with_expression()
+    search_rank: Mapped[Optional[float]] = query_expression()
+
     created_at: Mapped[datetime.datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -81,14 +150,24 @@ class AgentCard(Base):
     # Explicit indexes (optional if index=True used on columns, but good for clarity)
     # Note: Indexes on `name` and `description` might benefit from specific types
     # like `text_pattern_ops` in PostgreSQL for LIKE queries, configured via postgresql_using='gin' or similar.
-    # A GIN index on `card_data` could be useful for deep JSON searches later.
     __table_args__ = (
         Index("ix_agent_cards_name", "name"),
         Index("ix_agent_cards_description", "description"), # Indexing description
         Index("ix_agent_cards_is_active", "is_active"),
-        # Example GIN index for PostgreSQL (requires specific dialect setup):
-        # Index('ix_agent_cards_card_data_gin', card_data, postgresql_using='gin'),
+        # Keyset pagination order: (updated_at, id) descending, scanned backwards
+        Index("ix_agent_cards_updated_at_id", "updated_at", "id"),
+        # Full-text and substring search (`search=`); trigram indexes require pg_trgm
+        Index("ix_agent_cards_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_agent_cards_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_agent_cards_description_trgm", "description", postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"}),
+        # Containment (`card_data @> ...`) queries on the full card (migration ed219e8077fc)
+        Index("ix_agent_cards_card_data_tags_gin", "card_data", postgresql_using="gin", postgresql_ops={"card_data": "jsonb_path_ops"}),
+        # Containment (`@>`) filters on the array facets
+        Index("ix_agent_cards_tags", "tags", postgresql_using="gin"),
+        Index("ix_agent_cards_auth_schemes", "auth_schemes", postgresql_using="gin"),
+        Index("ix_agent_cards_skills", "skills", postgresql_using="gin"),
     )
 
     def __repr__(self):
         return f"<AgentCard(id={self.id}, name='{self.name}', developer_id={self.developer_id})>"
+
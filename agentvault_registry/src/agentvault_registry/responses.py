@@ -0,0 +1,31 @@
+"""
+JSON response class of the registry API.
+
+Responses are rendered with `orjson`, a registry dependency (several times faster
+for large Agent Card listings). The standard library is used if it is missing
+or cannot encode a value.
+"""
+
+import logging
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    orjson = None # type: ignore
+    _HAS_ORJSON = False
+
+
+logger = logging.getLogger(__name__)
+
+
+class RegistryJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson if available (compact output either way)."""
+    def render(self, content: Any) -> bytes:
+        if _HAS_ORJSON:
+            try: return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+            except TypeError as e: logger.debug(f"orjson could not render response ({e}); falling back to json.")
+        return super().render(content)
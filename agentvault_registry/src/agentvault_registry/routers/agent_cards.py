@@ -105,17 +105,22 @@ async def submit_agent_card(
     "/",
     response_model=schemas.AgentCardListResponse,
     summary="List Agent Cards",
-    description="Retrieves a paginated list of active Agent Cards, optionally filtered by search query, tags, TEE status, or ownership.",
+    description="Retrieves a paginated list of active Agent Cards, optionally filtered by search query, tags, TEE status, ID, authentication scheme, skills, protocol versions, or ownership.",
 )
 async def list_agent_cards(
     # --- MODIFIED: Added has_tee and tee_type parameters ---
-    skip: int = Query(0, ge=0, description="Number of records to skip for pagination."),
+    skip: int = Query(0, ge=0, description="Number of records to skip for pagination (offset mode)."),
+    cursor: Optional[str] = Query(
+        None,
+        max_length=200,
+        description="Opaque cursor from a previous response's `next_cursor`. Selects cursor mode, which returns stable pages; cannot be combined with `skip`."
+    ),
     limit: int = Query(100, ge=1, le=250, description="Maximum number of records to return."),
     active_only: bool = Query(True, description="Filter for active agent cards only."),
     search: Optional[str] = Query(
         None,
         max_length=100,
-        description="Search term to filter by name or description (case-insensitive, max 100 chars)."
+        description="Search term matched against name, description, tags and skills (full-text, web search syntax) or as a substring of name or description. Results are ranked by relevance in offset mode (max 100 chars)."
     ),
     tags: Optional[List[str]] = Query(
         None,
@@ -124,6 +129,15 @@ async def list_agent_cards(
     has_tee: Optional[bool] = Query(None, description="Filter for agents that have TEE details declared."),
     tee_type: Optional[str] = Query(None, max_length=50, description="Filter by the specific TEE type string (e.g., 'Intel SGX', max 50 chars)."),
     owned_only: bool = Query(False, description="If true, only return cards owned by the authenticated developer (requires authentication)."),
+    human_readable_id: Optional[str] = Query(None, max_length=200, description="Filter by the exact `humanReadableId` (e.g., 'my-org/weather-reporter')."),
+    auth_scheme: Optional[str] = Query(None, max_length=50, description="Filter for agents that accept this authentication scheme (e.g., 'oauth2')."),
+    skills: Optional[List[str]] = Query(None, description="List of skill IDs to filter by (agents must declare ALL specified skills)."),
+    a2a_version: Optional[str] = Query(None, max_length=50, description="Filter by the exact A2A protocol version (`capabilities.a2aVersion`)."),
+    mcp_version: Optional[str] = Query(None, max_length=50, description="Filter by the exact MCP version (`capabilities.mcpVersion`)."),
+    count: Optional[schemas.CountMode] = Query(
+        None,
+        description="How to compute `pagination.total_items`: 'exact' (default in offset mode), 'estimate' (from database statistics, unfiltered lists only) or 'none' (default in cursor mode)."
+    ),
     # Depends parameters must come after Query/Path/Body parameters
     db: AsyncSession = Depends(database.get_db),
     current_developer: Optional[models.Developer] = Depends(security.get_current_developer_optional)
@@ -133,7 +147,13 @@ async def list_agent_cards(
     Public endpoint to list and search for Agent Cards.
     Can optionally filter by owned cards if authenticated.
     Can filter by TEE presence and type.
+    Every response carries `next_cursor`; following it pages through the list
+    by keyset instead of offset.
+    Totals are skipped in cursor mode unless `count` asks for them; exact
+    totals are cached briefly per filter combination.
     """
+    if cursor is not None and skip:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="'cursor' and 'skip' cannot be combined.")
     developer_id_filter: Optional[int] = None
     if owned_only:
         if current_developer is None:
@@ -143,40 +163,60 @@ async def list_agent_cards(
             )
         developer_id_filter = current_developer.id
         # --- MODIFIED: Updated logging ---
-        logger.info(f"Listing agent cards for owner ID: {developer_id_filter}, skip={skip}, limit={limit}, active_only={active_only}, search='{search}', tags={tags}, has_tee={has_tee}, tee_type='{tee_type}'")
+        logger.info(f"Listing agent cards for owner ID: {developer_id_filter}, skip={skip}, limit={limit}, active_only={active_only}, search='{search}', tags={tags}, has_tee={has_tee}, tee_type='{tee_type}', human_readable_id='{human_readable_id}', auth_scheme='{auth_scheme}', skills={skills}, a2a_version='{a2a_version}', mcp_version='{mcp_version}'")
         # --- END MODIFIED ---
     else:
         # --- MODIFIED: Updated logging ---
-        logger.info(f"Listing public agent cards with skip={skip}, limit={limit}, active_only={active_only}, search='{search}', tags={tags}, has_tee={has_tee}, tee_type='{tee_type}'")
+        logger.info(f"Listing public agent cards with skip={skip}, limit={limit}, active_only={active_only}, search='{search}', tags={tags}, has_tee={has_tee}, tee_type='{tee_type}', human_readable_id='{human_readable_id}', auth_scheme='{auth_scheme}', skills={skills}, a2a_version='{a2a_version}', mcp_version='{mcp_version}'")
         # --- END MODIFIED ---
 
     try:
-        # --- MODIFIED: Pass new parameters to CRUD function ---
-        items, total_items = await agent_card.list_agent_cards(
-            db=db, skip=skip, limit=limit, active_only=active_only, search=search, tags=tags,
-            developer_id=developer_id_filter,
-            has_tee=has_tee, # Pass has_tee
-            tee_type=tee_type # Pass tee_type
-        )
-        # --- END MODIFIED ---
+        if cursor is not None:
+            items, total_items, total_is_estimate, next_cursor = await agent_card.list_agent_cards_by_cursor(
+                db=db, cursor=cursor, limit=limit, active_only=active_only, search=search, tags=tags,
+                developer_id=developer_id_filter, has_tee=has_tee, tee_type=tee_type,
+                human_readable_id=human_readable_id, auth_scheme=auth_scheme, skills=skills,
+                a2a_version=a2a_version, mcp_version=mcp_version, count_mode=count or "none"
+            )
+            offset, current_page = None, None # Positions are not known in cursor mode
+        else:
+            # --- MODIFIED: Pass new parameters to CRUD function ---
+            items, total_items, total_is_estimate = await agent_card.list_agent_cards(
+                db=db, skip=skip, limit=limit, active_only=active_only, search=search, tags=tags,
+                developer_id=developer_id_filter,
+                has_tee=has_tee, # Pass has_tee
+                tee_type=tee_type, # Pass tee_type
+                human_readable_id=human_readable_id, auth_scheme=auth_scheme, skills=skills,
+                a2a_version=a2a_version, mcp_version=mcp_version,
+                count_mode=count or "exact"
+            )
+            # --- END MODIFIED ---
+            offset, current_page = skip, (skip // limit) + 1
+            # Lets clients continue any offset page in cursor mode; without an exact total a full page implies more may follow.
+            # Searches are ordered by relevance, which a (updated_at, id) cursor cannot continue.
+            has_more = skip + len(items) < total_items if total_items is not None and not total_is_estimate else len(items) == limit
+            next_cursor = agent_card.encode_cursor(items[-1].updated_at, items[-1].id) if items and has_more and not search else None
 
         # Calculate pagination details
-        current_page = (skip // limit) + 1
-        total_pages = math.ceil(total_items / limit) if limit > 0 else 0
+        total_pages = (math.ceil(total_items / limit) if limit > 0 else 0) if total_items is not None else None
 
         pagination_info = schemas.PaginationInfo(
             total_items=total_items,
             limit=limit,
-            offset=skip,
+            offset=offset,
             total_pages=total_pages,
             current_page=current_page,
+            total_is_estimate=total_is_estimate,
         )
 
         # Convert DB models to summary schemas for response
         summaries = [schemas.AgentCardSummary.model_validate(item) for item in items]
 
-        return schemas.AgentCardListResponse(items=summaries, pagination=pagination_info)
+        return schemas.AgentCardListResponse(items=summaries, pagination=pagination_info, next_cursor=next_cursor)
 
+    except ValueError as e:
+        logger.warning(f"Rejected agent card list request: {e}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.exception("Error listing agent cards")
         raise HTTPException(
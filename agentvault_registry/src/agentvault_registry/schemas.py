@@ -1,6 +1,6 @@
 import uuid
 import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Literal
 # --- MODIFIED: Removed computed_field ---
 from pydantic import BaseModel, Field, ConfigDict
 # --- END MODIFIED ---
@@ -69,19 +69,24 @@ class AgentCardSummary(BaseModel):
     id: uuid.UUID = Field(..., description="Unique identifier for the Agent Card record.")
     name: str = Field(..., description="Human-readable display name of the agent.")
     description: Optional[str] = Field(None, description="Detailed description of the agent's purpose.")
+    search_rank: Optional[float] = Field(None, description="Relevance for the `search` term (higher is better; null without `search`).")
 
     model_config = ConfigDict(from_attributes=True)
 
 
 # --- Pagination Schemas ---
 
+# How list endpoints compute `total_items`
+CountMode = Literal["exact", "estimate", "none"]
+
 class PaginationInfo(BaseModel):
     """Schema for pagination details in list responses."""
-    total_items: int = Field(..., description="Total number of items available.")
+    total_items: Optional[int] = Field(..., description="Total number of items available (null if not counted).")
     limit: int = Field(..., description="Number of items requested per page.")
-    offset: int = Field(..., description="Offset of the current page.")
-    total_pages: int = Field(..., description="Total number of pages available.")
-    current_page: int = Field(..., description="The current page number (1-based).")
+    offset: Optional[int] = Field(..., description="Offset of the current page (null in cursor mode).")
+    total_pages: Optional[int] = Field(..., description="Total number of pages available (null if not counted).")
+    current_page: Optional[int] = Field(..., description="The current page number (1-based, null in cursor mode).")
+    total_is_estimate: bool = Field(False, description="True if `total_items` is a planner estimate rather than an exact count.")
 
 
 # --- List Response Schemas ---
@@ -90,6 +95,7 @@ class AgentCardListResponse(BaseModel):
     """Schema for the response when listing Agent Cards."""
     items: List[AgentCardSummary] = Field(..., description="List of agent card summaries for the current page.")
     pagination: PaginationInfo = Field(..., description="Pagination details.")
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page (pass as `cursor`), or null on the last page.")
 
 
 # --- Developer Schemas (Moved earlier) ---
@@ -1,18 +1,25 @@
 import secrets
 import logging
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from passlib.context import CryptContext
-from typing import Optional # Added Optional
+from typing import Optional, Dict, Any, Tuple # Added Optional
 
 # --- FastAPI Imports ---
 from fastapi import Depends, HTTPException, status
 from fastapi.security import APIKeyHeader
 
 # --- SQLAlchemy Imports ---
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
 
 # --- Local Imports ---
 # Fix the imports to use absolute paths instead of relative
 from agentvault_registry import models
+from agentvault_registry.config import settings
 from agentvault_registry.database import get_db
 from agentvault_registry.crud.developer import get_developer_by_plain_api_key
 
@@ -56,6 +63,31 @@ def hash_api_key(api_key: str) -> str:
     """
     return pwd_context.hash(api_key)
 
+# --- API Key Format ---
+# Keys look like 'avreg_<random>'. The first API_KEY_ID_LENGTH characters of the
+# random part, together with the 'avreg_' marker, form the public key prefix that
+# is stored unhashed in the developer_api_keys table for indexed lookup.
+API_KEY_MARKER = "avreg_"
+API_KEY_ID_LENGTH = 12
+
+def get_api_key_prefix(plain_api_key: str) -> Optional[str]:
+    """
+    Extracts the public lookup prefix from a plain API key.
+
+    Args:
+        plain_api_key: The API key provided by the user/client.
+
+    Returns:
+        The prefix (e.g. 'avreg_AbCdEfGhIjKl'), or None if the key does not
+        follow the 'avreg_' format or is too short to contain a prefix.
+    """
+    if not plain_api_key or not plain_api_key.startswith(API_KEY_MARKER):
+        return None
+    prefix_length = len(API_KEY_MARKER) + API_KEY_ID_LENGTH
+    if len(plain_api_key) <= prefix_length:
+        return None
+    return plain_api_key[:prefix_length]
+
 # --- Secure API Key Generation ---
 def generate_secure_api_key(length: int = 32) -> str:
     """
@@ -72,10 +104,187 @@ def generate_secure_api_key(length: int = 32) -> str:
         logger.warning(f"Requested API key length ({length}) is short; using minimum of 24 bytes.")
         length = 24
     random_part = secrets.token_urlsafe(length)
-    api_key = f"avreg_{random_part}"
+    api_key = f"{API_KEY_MARKER}{random_part}"
     logger.info(f"Generated new secure API key (prefix added).")
     return api_key
 
+# --- Verified API Key Cache ---
+class VerifiedApiKeyCache:
+    """
+    Bounded, in-process TTL/LRU cache of successfully verified API keys.
+
+    Entries are keyed by the SHA-256 digest of the presented key (the plain key
+    itself is never stored) and hold a detached snapshot of the authenticated
+    Developer, so cached objects are never expired or refreshed by the session
+    that originally loaded them. A hit skips both the database lookup and the
+    bcrypt verification.
+
+    Invalidation happens when the TTL expires, when the entry is evicted (LRU),
+    or explicitly via `invalidate_developer` / `invalidate_key`. Developer and
+    DeveloperApiKey ORM changes in this process trigger `invalidate_developer`
+    when their transaction commits. Changes made by other processes (e.g. other
+    workers) are only picked up once the TTL expires, so a revoked or rotated
+    key can keep authenticating there for up to `ttl_seconds`.
+
+    Every invalidation bumps `generation`. Callers read it before looking a key
+    up in the database and pass it to `put`, which skips the entry if an
+    invalidation happened meanwhile, so a lookup racing with a commit cannot
+    re-cache the old state.
+    """
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 30.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[models.Developer, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.generation = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    @staticmethod
+    def _digest(plain_api_key: str) -> str:
+        return hashlib.sha256(plain_api_key.encode("utf-8")).hexdigest()
+
+    def get(self, plain_api_key: str) -> Optional[models.Developer]:
+        """Returns the cached developer for the key, or None on a miss/expiry."""
+        if not self.enabled:
+            return None
+        digest = self._digest(plain_api_key)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            developer, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[digest]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return developer
+
+    def put(self, plain_api_key: str, developer: models.Developer, generation: Optional[int] = None) -> None:
+        """Remembers a successfully verified key, unless the cache was invalidated since `generation`."""
+        if not self.enabled:
+            return
+        digest = self._digest(plain_api_key)
+        snapshot = models.Developer(
+            id=developer.id, name=developer.name, api_key_hash=developer.api_key_hash,
+            is_verified=developer.is_verified, created_at=developer.created_at,
+            updated_at=developer.updated_at,
+        )
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[digest] = (snapshot, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_key(self, plain_api_key: str) -> None:
+        """Removes the entry for a specific plain key, if cached."""
+        with self._lock:
+            self.generation += 1
+            if self._entries.pop(self._digest(plain_api_key), None) is not None:
+                self.invalidations += 1
+
+    def invalidate_developer(self, developer_id: int) -> None:
+        """Removes all cached keys belonging to a developer."""
+        with self._lock:
+            self.generation += 1
+            stale = [digest for digest, (developer, _) in self._entries.items() if developer.id == developer_id]
+            for digest in stale:
+                del self._entries[digest]
+            self.invalidations += len(stale)
+        if stale:
+            logger.debug(f"Invalidated {len(stale)} cached API key(s) for developer ID: {developer_id}")
+
+    def clear(self) -> None:
+        """Removes all entries (counters are kept)."""
+        with self._lock:
+            self.generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns cache size and hit/miss/eviction/invalidation counters."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+api_key_cache = VerifiedApiKeyCache(
+    max_size=settings.API_KEY_CACHE_MAX_SIZE,
+    ttl_seconds=settings.API_KEY_CACHE_TTL_SECONDS,
+)
+
+# Session.info key collecting developer IDs whose cached keys are dropped on commit
+_PENDING_INVALIDATIONS_KEY = "agentvault_registry.api_key_cache.pending_developer_ids"
+
+def _schedule_invalidation(target: Any, developer_id: Optional[int]) -> None:
+    """Remembers a flushed developer change; the cache is invalidated once its transaction commits."""
+    if developer_id is None:
+        return
+    session = object_session(target)
+    if session is None:
+        api_key_cache.invalidate_developer(developer_id)
+        return
+    session.info.setdefault(_PENDING_INVALIDATIONS_KEY, set()).add(developer_id)
+
+@event.listens_for(models.Developer, "after_update")
+@event.listens_for(models.Developer, "after_delete")
+def _invalidate_cached_developer(mapper, connection, target: models.Developer) -> None:
+    """Schedules dropping cached keys when a developer record is modified or deleted."""
+    _schedule_invalidation(target, target.id)
+
+@event.listens_for(models.DeveloperApiKey, "after_insert")
+@event.listens_for(models.DeveloperApiKey, "after_update")
+@event.listens_for(models.DeveloperApiKey, "after_delete")
+def _invalidate_cached_developer_key(mapper, connection, target: models.DeveloperApiKey) -> None:
+    """Schedules dropping cached keys when a developer's keys are added, rotated or revoked."""
+    _schedule_invalidation(target, target.developer_id)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_developers(session: Session) -> None:
+    """Drops cached keys of developers changed in the committed transaction."""
+    for developer_id in session.info.pop(_PENDING_INVALIDATIONS_KEY, ()):
+        api_key_cache.invalidate_developer(developer_id)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_invalidations(session: Session) -> None:
+    """Rolled back changes never reached the database; nothing to invalidate."""
+    session.info.pop(_PENDING_INVALIDATIONS_KEY, None)
+
+
+async def _authenticate_api_key(db: AsyncSession, api_key: str) -> Optional[models.Developer]:
+    """Resolves a plain API key to a developer, consulting the verified key cache first."""
+    developer = api_key_cache.get(api_key)
+    if developer is not None:
+        logger.debug(f"API key cache hit for developer ID: {developer.id}")
+        return developer
+
+    # Taken before the lookup so a concurrent commit's invalidation wins over this result
+    generation = api_key_cache.generation
+    developer = await get_developer_by_plain_api_key(db=db, plain_key=api_key)
+    if developer is not None:
+        api_key_cache.put(api_key, developer, generation=generation)
+    return developer
+
+
 # --- FastAPI API Key Authentication Dependency ---
 
 # Define the header scheme we expect for the API key
@@ -103,9 +312,9 @@ async def get_current_developer(
             detail="Not authenticated: X-Api-Key header missing or empty"
         )
 
-    # Use the CRUD function to find the developer by the plain key
-    # (Remembering the inefficiency note for production)
-    developer = await get_developer_by_plain_api_key(db=db, plain_key=api_key)
+    # Use the verified key cache, falling back to the CRUD lookup by the plain key
+    # (indexed prefix lookup plus a single hash verification)
+    developer = await _authenticate_api_key(db=db, api_key=api_key)
 
     if developer is None:
         logger.warning(f"Authentication attempt failed: Invalid API Key provided (Key starts with: {api_key[:6]}...).")
@@ -132,7 +341,7 @@ async def get_current_developer_optional(
         logger.debug("Optional authentication: X-Api-Key header missing.")
         return None
 
-    developer = await get_developer_by_plain_api_key(db=db, plain_key=api_key)
+    developer = await _authenticate_api_key(db=db, api_key=api_key)
 
     if developer is None:
         logger.debug(f"Optional authentication: Invalid API Key provided (Key starts with: {api_key[:6]}...).")
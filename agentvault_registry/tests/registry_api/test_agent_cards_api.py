@@ -1,6 +1,7 @@
 import pytest
 import uuid
 import datetime
+import json
 import os
 # --- ADDED: Import mocker ---
 from unittest.mock import patch, MagicMock, ANY, AsyncMock, call
@@ -10,6 +11,7 @@ from typing import Optional, List, Dict, Any, Tuple, AsyncGenerator
 from fastapi.testclient import TestClient
 from fastapi import status
 import pydantic
+from sqlalchemy.dialects import postgresql
 
 # Imports are now relative to the src dir added to path by pytest.ini
 from agentvault_registry import schemas, models, security
@@ -130,7 +132,7 @@ def test_list_agent_cards_success(
     total_items = 15
     mock_list = mocker.patch(
         "agentvault_registry.crud.agent_card.list_agent_cards",
-        new_callable=AsyncMock, return_value=(mock_cards, total_items)
+        new_callable=AsyncMock, return_value=(mock_cards, total_items, False)
     )
 
     response = sync_test_client.get(API_BASE_URL + "/")
@@ -147,7 +149,7 @@ def test_list_agent_cards_success(
     mock_list.assert_awaited_once_with(
         db=mock_db_session, skip=0, limit=100, active_only=True, search=None, tags=None, developer_id=None,
         # --- ADDED: Assert default None for TEE params ---
-        has_tee=None, tee_type=None
+        has_tee=None, tee_type=None, human_readable_id=None, auth_scheme=None, skills=None, a2a_version=None, mcp_version=None, count_mode="exact"
         # --- END ADDED ---
     )
 
@@ -170,7 +172,7 @@ def test_list_agent_cards_with_params(
     """Test listing with various query parameters (excluding TEE)."""
     mock_list = mocker.patch(
         "agentvault_registry.crud.agent_card.list_agent_cards",
-        new_callable=AsyncMock, return_value=([], 0)
+        new_callable=AsyncMock, return_value=([], 0, False)
     )
 
     query_params = {"skip": skip, "limit": limit, "active_only": active_only}
@@ -185,34 +187,34 @@ def test_list_agent_cards_with_params(
     mock_list.assert_awaited_once_with(
         db=mock_db_session, skip=skip, limit=limit, active_only=active_only, search=search, tags=tags, developer_id=None,
         # --- ADDED: Assert default None for TEE params ---
-        has_tee=None, tee_type=None
+        has_tee=None, tee_type=None, human_readable_id=None, auth_scheme=None, skills=None, a2a_version=None, mcp_version=None, count_mode="exact"
         # --- END ADDED ---
     )
 
 # --- Tag Filtering Tests ---
 def test_list_agent_cards_filter_single_tag(sync_test_client: TestClient, mock_db_session: MagicMock, mocker):
     """Test filtering by a single tag."""
-    mock_list = mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards", new_callable=AsyncMock, return_value=([], 0))
+    mock_list = mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards", new_callable=AsyncMock, return_value=([], 0, False))
     tag_to_filter = "weather"
 
     response = sync_test_client.get(API_BASE_URL + "/", params={"tags": tag_to_filter})
 
     assert response.status_code == status.HTTP_200_OK
-    mock_list.assert_awaited_once_with(db=mock_db_session, skip=0, limit=100, active_only=True, search=None, tags=[tag_to_filter], developer_id=None, has_tee=None, tee_type=None)
+    mock_list.assert_awaited_once_with(db=mock_db_session, skip=0, limit=100, active_only=True, search=None, tags=[tag_to_filter], developer_id=None, has_tee=None, tee_type=None, human_readable_id=None, auth_scheme=None, skills=None, a2a_version=None, mcp_version=None, count_mode="exact")
 
 def test_list_agent_cards_filter_multiple_tags(sync_test_client: TestClient, mock_db_session: MagicMock, mocker):
     """Test filtering by multiple tags."""
-    mock_list = mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards", new_callable=AsyncMock, return_value=([], 0))
+    mock_list = mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards", new_callable=AsyncMock, return_value=([], 0, False))
     tags_to_filter = ["tool", "internal"]
 
     response = sync_test_client.get(API_BASE_URL + "/", params={"tags": tags_to_filter})
 
     assert response.status_code == status.HTTP_200_OK
-    mock_list.assert_awaited_once_with(db=mock_db_session, skip=0, limit=100, active_only=True, search=None, tags=tags_to_filter, developer_id=None, has_tee=None, tee_type=None)
+    mock_list.assert_awaited_once_with(db=mock_db_session, skip=0, limit=100, active_only=True, search=None, tags=tags_to_filter, developer_id=None, has_tee=None, tee_type=None, human_readable_id=None, auth_scheme=None, skills=None, a2a_version=None, mcp_version=None, count_mode="exact")
 
 def test_list_agent_cards_filter_tag_no_match(sync_test_client: TestClient, mock_db_session: MagicMock, mocker):
     """Test filtering by a tag that returns no results."""
-    mock_list = mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards", new_callable=AsyncMock, return_value=([], 0))
+    mock_list = mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards", new_callable=AsyncMock, return_value=([], 0, False))
     tag_to_filter = "nonexistent-tag"
 
     response = sync_test_client.get(API_BASE_URL + "/", params={"tags": tag_to_filter})
@@ -221,18 +223,18 @@ def test_list_agent_cards_filter_tag_no_match(sync_test_client: TestClient, mock
     resp_data = response.json()
     assert resp_data["items"] == []
     assert resp_data["pagination"]["total_items"] == 0
-    mock_list.assert_awaited_once_with(db=mock_db_session, skip=0, limit=100, active_only=True, search=None, tags=[tag_to_filter], developer_id=None, has_tee=None, tee_type=None)
+    mock_list.assert_awaited_once_with(db=mock_db_session, skip=0, limit=100, active_only=True, search=None, tags=[tag_to_filter], developer_id=None, has_tee=None, tee_type=None, human_readable_id=None, auth_scheme=None, skills=None, a2a_version=None, mcp_version=None, count_mode="exact")
 
 def test_list_agent_cards_filter_tags_and_search(sync_test_client: TestClient, mock_db_session: MagicMock, mocker):
     """Test filtering by both tags and search term."""
-    mock_list = mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards", new_callable=AsyncMock, return_value=([], 0))
+    mock_list = mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards", new_callable=AsyncMock, return_value=([], 0, False))
     tags_to_filter = ["nlp"]
     search_term = "summary"
 
     response = sync_test_client.get(API_BASE_URL + "/", params={"tags": tags_to_filter, "search": search_term})
 
     assert response.status_code == status.HTTP_200_OK
-    mock_list.assert_awaited_once_with(db=mock_db_session, skip=0, limit=100, active_only=True, search=search_term, tags=tags_to_filter, developer_id=None, has_tee=None, tee_type=None)
+    mock_list.assert_awaited_once_with(db=mock_db_session, skip=0, limit=100, active_only=True, search=search_term, tags=tags_to_filter, developer_id=None, has_tee=None, tee_type=None, human_readable_id=None, auth_scheme=None, skills=None, a2a_version=None, mcp_version=None, count_mode="exact")
 
 # --- Tests for owned_only filter ---
 def test_list_agent_cards_owned_only_success(
@@ -241,7 +243,7 @@ def test_list_agent_cards_owned_only_success(
     mocker
 ):
     """Test filtering by owned_only=true with valid authentication."""
-    mock_list = mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards", new_callable=AsyncMock, return_value=([], 0))
+    mock_list = mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards", new_callable=AsyncMock, return_value=([], 0, False))
 
     async def mock_dev_scalar_gen(): yield mock_developer
     mock_db_session.execute.return_value.scalars.return_value = mock_dev_scalar_gen()
@@ -252,7 +254,7 @@ def test_list_agent_cards_owned_only_success(
     mock_list.assert_awaited_once_with(
         db=mock_db_session, skip=0, limit=100, active_only=True, search=None, tags=None, developer_id=mock_developer.id,
         # --- ADDED: Assert default None for TEE params ---
-        has_tee=None, tee_type=None
+        has_tee=None, tee_type=None, human_readable_id=None, auth_scheme=None, skills=None, a2a_version=None, mcp_version=None, count_mode="exact"
         # --- END ADDED ---
     )
 
@@ -276,7 +278,7 @@ def test_list_agent_cards_owned_only_false_with_auth(
     mocker
 ):
     """Test owned_only=false with authentication (should ignore auth)."""
-    mock_list = mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards", new_callable=AsyncMock, return_value=([], 0))
+    mock_list = mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards", new_callable=AsyncMock, return_value=([], 0, False))
 
     async def mock_dev_scalar_gen(): yield mock_developer
     mock_db_session.execute.return_value.scalars.return_value = mock_dev_scalar_gen()
@@ -287,43 +289,354 @@ def test_list_agent_cards_owned_only_false_with_auth(
     mock_list.assert_awaited_once_with(
         db=mock_db_session, skip=0, limit=100, active_only=True, search=None, tags=None, developer_id=None,
         # --- ADDED: Assert default None for TEE params ---
-        has_tee=None, tee_type=None
+        has_tee=None, tee_type=None, human_readable_id=None, auth_scheme=None, skills=None, a2a_version=None, mcp_version=None, count_mode="exact"
         # --- END ADDED ---
     )
 
 # --- ADDED: Tests for TEE Filtering ---
 def test_list_agent_cards_filter_has_tee_true(sync_test_client: TestClient, mock_db_session: MagicMock, mocker):
     """Test filtering by has_tee=true."""
-    mock_list = mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards", new_callable=AsyncMock, return_value=([], 0))
+    mock_list = mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards", new_callable=AsyncMock, return_value=([], 0, False))
     response = sync_test_client.get(API_BASE_URL + "/", params={"has_tee": True})
     assert response.status_code == status.HTTP_200_OK
-    mock_list.assert_awaited_once_with(db=mock_db_session, skip=0, limit=100, active_only=True, search=None, tags=None, developer_id=None, has_tee=True, tee_type=None)
+    mock_list.assert_awaited_once_with(db=mock_db_session, skip=0, limit=100, active_only=True, search=None, tags=None, developer_id=None, has_tee=True, tee_type=None, human_readable_id=None, auth_scheme=None, skills=None, a2a_version=None, mcp_version=None, count_mode="exact")
 
 def test_list_agent_cards_filter_has_tee_false(sync_test_client: TestClient, mock_db_session: MagicMock, mocker):
     """Test filtering by has_tee=false."""
-    mock_list = mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards", new_callable=AsyncMock, return_value=([], 0))
+    mock_list = mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards", new_callable=AsyncMock, return_value=([], 0, False))
     response = sync_test_client.get(API_BASE_URL + "/", params={"has_tee": False})
     assert response.status_code == status.HTTP_200_OK
-    mock_list.assert_awaited_once_with(db=mock_db_session, skip=0, limit=100, active_only=True, search=None, tags=None, developer_id=None, has_tee=False, tee_type=None)
+    mock_list.assert_awaited_once_with(db=mock_db_session, skip=0, limit=100, active_only=True, search=None, tags=None, developer_id=None, has_tee=False, tee_type=None, human_readable_id=None, auth_scheme=None, skills=None, a2a_version=None, mcp_version=None, count_mode="exact")
 
 def test_list_agent_cards_filter_tee_type(sync_test_client: TestClient, mock_db_session: MagicMock, mocker):
     """Test filtering by tee_type."""
-    mock_list = mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards", new_callable=AsyncMock, return_value=([], 0))
+    mock_list = mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards", new_callable=AsyncMock, return_value=([], 0, False))
     tee_type_filter = "Intel SGX"
     response = sync_test_client.get(API_BASE_URL + "/", params={"tee_type": tee_type_filter})
     assert response.status_code == status.HTTP_200_OK
-    mock_list.assert_awaited_once_with(db=mock_db_session, skip=0, limit=100, active_only=True, search=None, tags=None, developer_id=None, has_tee=None, tee_type=tee_type_filter)
+    mock_list.assert_awaited_once_with(db=mock_db_session, skip=0, limit=100, active_only=True, search=None, tags=None, developer_id=None, has_tee=None, tee_type=tee_type_filter, human_readable_id=None, auth_scheme=None, skills=None, a2a_version=None, mcp_version=None, count_mode="exact")
 
 def test_list_agent_cards_filter_has_tee_and_type(sync_test_client: TestClient, mock_db_session: MagicMock, mocker):
     """Test filtering by both has_tee and tee_type."""
-    mock_list = mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards", new_callable=AsyncMock, return_value=([], 0))
+    mock_list = mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards", new_callable=AsyncMock, return_value=([], 0, False))
     tee_type_filter = "AMD SEV"
     response = sync_test_client.get(API_BASE_URL + "/", params={"has_tee": True, "tee_type": tee_type_filter})
     assert response.status_code == status.HTTP_200_OK
-    mock_list.assert_awaited_once_with(db=mock_db_session, skip=0, limit=100, active_only=True, search=None, tags=None, developer_id=None, has_tee=True, tee_type=tee_type_filter)
+    mock_list.assert_awaited_once_with(db=mock_db_session, skip=0, limit=100, active_only=True, search=None, tags=None, developer_id=None, has_tee=True, tee_type=tee_type_filter, human_readable_id=None, auth_scheme=None, skills=None, a2a_version=None, mcp_version=None, count_mode="exact")
 # --- END ADDED ---
 
 
+# --- Cursor (keyset) pagination ---
+def _make_cards(count: int, developer: models.Developer) -> List[models.AgentCard]:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return [
+        models.AgentCard(
+            id=uuid.uuid4(), developer_id=developer.id, card_data={}, name=f"Agent {i}", description=None,
+            is_active=True, created_at=now, updated_at=now - datetime.timedelta(seconds=i), developer=developer
+        )
+        for i in range(count)
+    ]
+
+def test_cursor_encoding_round_trip():
+    updated_at = datetime.datetime(2026, 10, 16, 12, 30, 45, 123456, tzinfo=datetime.timezone.utc)
+    card_id = uuid.uuid4()
+    cursor = agent_card.encode_cursor(updated_at, card_id)
+    assert "=" not in cursor and "|" not in cursor
+    assert agent_card.decode_cursor(cursor) == (updated_at, card_id)
+    for invalid in ("not-a-cursor", "", agent_card.encode_cursor(updated_at.replace(tzinfo=None), card_id)):
+        with pytest.raises(ValueError):
+            agent_card.decode_cursor(invalid)
+
+def test_list_agent_cards_offset_mode_returns_next_cursor(sync_test_client: TestClient, mock_db_session: MagicMock, mock_developer: models.Developer, mocker):
+    cards = _make_cards(2, mock_developer)
+    mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards", new_callable=AsyncMock, side_effect=[(cards, 5, False), (cards, 2, False)])
+
+    response_data = sync_test_client.get(API_BASE_URL + "/", params={"limit": 2}).json()
+    assert agent_card.decode_cursor(response_data["next_cursor"]) == (cards[-1].updated_at, cards[-1].id)
+    assert sync_test_client.get(API_BASE_URL + "/", params={"limit": 2}).json()["next_cursor"] is None # Last page
+
+def test_list_agent_cards_cursor_mode(sync_test_client: TestClient, mock_db_session: MagicMock, mock_developer: models.Developer, mocker):
+    cards = _make_cards(3, mock_developer)
+    cursor = agent_card.encode_cursor(cards[0].updated_at, cards[0].id)
+    mock_offset_list = mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards", new_callable=AsyncMock)
+    mock_list = mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards_by_cursor", new_callable=AsyncMock, return_value=(cards, 10, False, "next-page"))
+
+    response = sync_test_client.get(API_BASE_URL + "/", params={"cursor": cursor, "limit": 3, "tags": ["weather"], "count": "exact"})
+
+    assert response.status_code == status.HTTP_200_OK
+    response_data = response.json()
+    assert len(response_data["items"]) == 3 and response_data["next_cursor"] == "next-page"
+    assert response_data["pagination"] == {"total_items": 10, "limit": 3, "offset": None, "total_pages": 4, "current_page": None, "total_is_estimate": False}
+    mock_list.assert_awaited_once_with(
+        db=mock_db_session, cursor=cursor, limit=3, active_only=True, search=None, tags=["weather"], developer_id=None, has_tee=None, tee_type=None, human_readable_id=None, auth_scheme=None, skills=None, a2a_version=None, mcp_version=None, count_mode="exact"
+    )
+    mock_offset_list.assert_not_awaited()
+
+def test_list_agent_cards_cursor_mode_rejects_bad_requests(sync_test_client: TestClient, mock_db_session: MagicMock):
+    response = sync_test_client.get(API_BASE_URL + "/", params={"cursor": "garbage"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "Invalid cursor" in response.json()["detail"]
+
+    cursor = agent_card.encode_cursor(datetime.datetime.now(datetime.timezone.utc), uuid.uuid4())
+    response = sync_test_client.get(API_BASE_URL + "/", params={"cursor": cursor, "skip": 10})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    mock_db_session.execute.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_list_agent_cards_by_cursor_keyset_query(mock_developer: models.Developer):
+    cards = _make_cards(3, mock_developer)
+    count_result, page_result = MagicMock(), MagicMock()
+    count_result.scalar_one_or_none.return_value = 7
+    page_result.scalars.return_value.all.return_value = cards # limit + 1 rows: there is a next page
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=[count_result, page_result])
+    position = (cards[0].updated_at + datetime.timedelta(seconds=1), uuid.uuid4())
+    agent_card.count_cache.clear()
+
+    items, total_items, total_is_estimate, next_cursor = await agent_card.list_agent_cards_by_cursor(
+        session, cursor=agent_card.encode_cursor(*position), limit=2, count_mode="exact"
+    )
+
+    assert items == cards[:2] and total_items == 7 and total_is_estimate is False
+    assert agent_card.decode_cursor(next_cursor) == (cards[1].updated_at, cards[1].id)
+    page_sql = str(session.execute.await_args_list[1].args[0].compile(dialect=postgresql.dialect()))
+    assert "(agent_cards.updated_at, agent_cards.id) < (" in page_sql
+    assert "ORDER BY agent_cards.updated_at DESC, agent_cards.id DESC" in page_sql
+    assert "LIMIT" in page_sql and "OFFSET" not in page_sql
+
+@pytest.mark.asyncio
+async def test_list_agent_cards_search_is_ranked_full_text(mock_developer: models.Developer):
+    cards = _make_cards(2, mock_developer)
+    session = MagicMock()
+    page_result = _result(None)
+    page_result.scalars.return_value.all.return_value = cards
+    session.execute = AsyncMock(side_effect=[_result(2), page_result])
+
+    items, total_items, _ = await agent_card.list_agent_cards(session, search="weather forecast", count_mode="exact")
+
+    assert items == cards and total_items == 2
+    count_sql, page_sql = (str(c.args[0].compile(dialect=postgresql.dialect())) for c in session.execute.await_args_list[:2])
+    for sql in (count_sql, page_sql):
+        assert "agent_cards.search_vector @@ websearch_to_tsquery('english'::regconfig" in sql
+        assert "agent_cards.name ILIKE" in sql and "agent_cards.description ILIKE" in sql
+    assert "ORDER BY ts_rank_cd(agent_cards.search_vector" in page_sql and "similarity(agent_cards.name" in page_sql
+    assert page_sql.index("ts_rank_cd") < page_sql.index("agent_cards.id") # Rank is selected into search_rank
+
+    session.execute = AsyncMock(return_value=_result(None))
+    await agent_card.list_agent_cards_by_cursor(session, search="weather")
+    cursor_sql = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "ts_rank_cd" in cursor_sql and "ORDER BY agent_cards.updated_at DESC, agent_cards.id DESC" in cursor_sql
+
+def test_search_vector_is_generated_column():
+    from sqlalchemy.schema import CreateTable
+    ddl = str(CreateTable(models.AgentCard.__table__).compile(dialect=postgresql.dialect()))
+    assert "search_vector TSVECTOR GENERATED ALWAYS AS (setweight(to_tsvector('english', coalesce(name, '')), 'A')" in ddl
+    assert "jsonb_path_query_array(card_data, '$.skills[*].description')" in ddl and ") STORED" in ddl
+    index_ops = {index.name: index.dialect_options["postgresql"] for index in models.AgentCard.__table__.indexes}
+    assert index_ops["ix_agent_cards_search_vector"]["using"] == "gin"
+    assert index_ops["ix_agent_cards_name_trgm"]["ops"] == {"name": "gin_trgm_ops"}
+
+def test_list_agent_cards_search_returns_rank(sync_test_client: TestClient, mock_db_session: MagicMock, mock_developer: models.Developer, mocker):
+    cards = _make_cards(2, mock_developer)
+    cards[0].search_rank, cards[1].search_rank = 0.9, 0.25
+    mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards", new_callable=AsyncMock, return_value=(cards, 5, False))
+
+    response_data = sync_test_client.get(API_BASE_URL + "/", params={"search": "weather", "limit": 2}).json()
+
+    assert [item["search_rank"] for item in response_data["items"]] == [0.9, 0.25]
+    assert response_data["next_cursor"] is None # Ranked pages cannot be continued by keyset
+
+def test_extract_card_facets():
+    card_data = {
+        "humanReadableId": "acme/weather", "tags": ["weather", 3, "eu"],
+        "capabilities": {"a2aVersion": "1.0", "mcpVersion": None, "teeDetails": {"type": "Intel SGX"}},
+        "authSchemes": [{"scheme": "oauth2", "tokenUrl": "https://auth.example/token"}, {"scheme": "apiKey"}],
+        "skills": [{"id": "forecast", "name": "Forecast"}, {"name": "no id"}],
+    }
+    assert agent_card.extract_card_facets(card_data) == {
+        "human_readable_id": "acme/weather", "tags": ["weather", "eu"], "tee_type": "intel sgx",
+        "auth_schemes": ["oauth2", "apiKey"], "skills": ["forecast"], "a2a_version": "1.0", "mcp_version": None,
+    }
+    assert agent_card.extract_card_facets({"capabilities": {"teeDetails": None}}) == {
+        "human_readable_id": None, "tags": [], "tee_type": None, "auth_schemes": [], "skills": [], "a2a_version": None, "mcp_version": None,
+    }
+
+@pytest.mark.asyncio
+async def test_create_and_update_agent_card_maintain_facets(valid_agent_card_data_dict: Dict[str, Any]):
+    session = MagicMock()
+    session.commit, session.refresh = AsyncMock(), AsyncMock()
+    card_data = {**valid_agent_card_data_dict, "tags": ["weather"], "skills": [{"id": "forecast", "name": "Forecast", "description": "Forecasts."}]}
+
+    db_card = await agent_card.create_agent_card(session, developer_id=1, card_create=schemas.AgentCardCreate(card_data=card_data))
+
+    assert (db_card.human_readable_id, db_card.tags, db_card.skills, db_card.auth_schemes) == ("test-org/test-api-agent", ["weather"], ["forecast"], ["apiKey"])
+    assert (db_card.tee_type, db_card.a2a_version) == (None, "1.0")
+
+    update = {"tags": ["weather", "eu"], "capabilities": {"a2aVersion": "1.1", "teeDetails": {"type": "AWS Nitro Enclaves"}}}
+    db_card = await agent_card.update_agent_card(session, db_card, schemas.AgentCardUpdate(card_data=update))
+
+    assert (db_card.tags, db_card.tee_type, db_card.a2a_version) == (["weather", "eu"], "aws nitro enclaves", "1.1")
+
+def test_list_filters_use_indexed_columns():
+    from sqlalchemy import select
+    dialect = postgresql.dialect()
+    table = models.AgentCard.__table__
+    gin_columns = {index.columns.keys()[0] for index in table.indexes if index.dialect_options["postgresql"]["using"] == "gin" and index.columns}
+    btree_columns = {index.columns.keys()[0] for index in table.indexes if not index.dialect_options["postgresql"]["using"] and index.columns}
+    assert {"tags", "auth_schemes", "skills"} <= gin_columns
+    assert {"human_readable_id", "tee_type", "a2a_version", "mcp_version"} <= btree_columns
+
+    facets = {"human_readable_id": "acme/weather", "auth_scheme": "oauth2", "skills": ["forecast", "alerts"], "a2a_version": "1.0", "mcp_version": None}
+    stmt = agent_card._apply_list_filters(select(models.AgentCard.id), False, None, ["weather", "eu"], None, True, "Intel SGX", facets)
+    compiled = stmt.compile(dialect=dialect)
+    where_sql = str(compiled).split("WHERE", 1)[1]
+    assert "card_data" not in where_sql # No JSON digging at query time
+    assert "agent_cards.tags @> %(tags_1)s::VARCHAR[]" in where_sql and compiled.params["tags_1"] == ["weather", "eu"]
+    assert "agent_cards.tee_type IS NOT NULL" in where_sql and compiled.params["tee_type_1"] == "intel sgx"
+    assert "agent_cards.auth_schemes @> %(auth_schemes_1)s::VARCHAR[]" in where_sql and compiled.params["auth_schemes_1"] == ["oauth2"]
+    assert "agent_cards.skills @> %(skills_1)s::VARCHAR[]" in where_sql and compiled.params["skills_1"] == ["forecast", "alerts"]
+    assert "agent_cards.human_readable_id = " in where_sql and "agent_cards.a2a_version = " in where_sql
+    assert "mcp_version" not in where_sql # Unset facets add no condition
+    assert isinstance(table.c.card_data.type, postgresql.JSONB)
+
+def test_list_filters_facets_on_placeholders(mock_developer: models.Developer):
+    cards = _make_cards(3, mock_developer)
+    cards[0].card_data = {"humanReadableId": "acme/a", "skills": [{"id": "forecast"}, {"id": "alerts"}], "authSchemes": [{"scheme": "none"}]}
+    cards[1].card_data = {"humanReadableId": "acme/b", "skills": [{"id": "forecast"}], "capabilities": {"a2aVersion": "1.0"}}
+    filtered = lambda **facets: [card.card_data.get("humanReadableId") for card in agent_card._filter_placeholder_items(cards, True, None, None, None, None, None, facets)]
+    assert filtered(skills=["forecast"]) == ["acme/a", "acme/b"]
+    assert filtered(skills=["forecast", "alerts"], auth_scheme="none") == ["acme/a"]
+    assert filtered(a2a_version="1.0") == ["acme/b"] and filtered(human_readable_id="acme/c") == []
+    assert agent_card._count_cache_key(True, None, None, None, None, None, {"skills": ["b", "a"], "mcp_version": None}) == \
+        agent_card._count_cache_key(True, None, None, None, None, None, {"skills": ["a", "b", "a"]})
+
+def test_list_agent_cards_facet_params(sync_test_client: TestClient, mock_db_session: MagicMock, mocker):
+    mock_list = mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards", new_callable=AsyncMock, return_value=([], 0, False))
+    params = {"human_readable_id": "acme/weather", "auth_scheme": "oauth2", "skills": ["forecast", "alerts"], "a2a_version": "1.0", "mcp_version": "0.5"}
+    response = sync_test_client.get(API_BASE_URL + "/", params=params)
+    assert response.status_code == status.HTTP_200_OK
+    mock_list.assert_awaited_once_with(
+        db=mock_db_session, skip=0, limit=100, active_only=True, search=None, tags=None, developer_id=None, has_tee=None, tee_type=None,
+        human_readable_id="acme/weather", auth_scheme="oauth2", skills=["forecast", "alerts"], a2a_version="1.0", mcp_version="0.5", count_mode="exact"
+    )
+
+@pytest.mark.skipif(not os.environ.get("REGISTRY_TEST_DATABASE_URL"), reason="Needs a migrated PostgreSQL database (REGISTRY_TEST_DATABASE_URL)")
+@pytest.mark.asyncio
+@pytest.mark.parametrize("filters, index_name", [
+    ({"tags": ["weather"]}, "ix_agent_cards_tags"),
+    ({"has_tee": True}, "ix_agent_cards_tee_type"),
+    ({"tee_type": "Intel SGX"}, "ix_agent_cards_tee_type"),
+    ({"search": "weather"}, "ix_agent_cards_search_vector"),
+    ({"facets": {"skills": ["forecast"]}}, "ix_agent_cards_skills"),
+    ({"facets": {"auth_scheme": "oauth2"}}, "ix_agent_cards_auth_schemes"),
+    ({"facets": {"human_readable_id": "acme/weather"}}, "ix_agent_cards_human_readable_id"),
+    ({"facets": {"a2a_version": "1.0"}}, "ix_agent_cards_a2a_version"),
+])
+async def test_list_filters_use_indexes_explain(filters: Dict[str, Any], index_name: str):
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import create_async_engine
+    filters = {"search": None, "tags": None, "has_tee": None, "tee_type": None, "facets": None, **filters}
+    stmt = agent_card._apply_list_filters(
+        select(models.AgentCard.id), False, filters["search"], filters["tags"], None, filters["has_tee"], filters["tee_type"], filters["facets"]
+    )
+    engine = create_async_engine(os.environ["REGISTRY_TEST_DATABASE_URL"])
+    try:
+        async with engine.connect() as conn:
+            await conn.exec_driver_sql("SET enable_seqscan = off") # Reports whether an index *can* serve the filter, whatever the table size
+            compiled = stmt.compile(dialect=conn.dialect)
+            params = compiled.construct_params()
+            args = []
+            for name in compiled.positiontup:
+                processor = compiled.binds[name].type.bind_processor(conn.dialect)
+                args.append(processor(params[name]) if processor else params[name])
+            result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", tuple(args))
+            plan = result.scalar()
+    finally:
+        await engine.dispose()
+    assert index_name in (plan if isinstance(plan, str) else json.dumps(plan))
+
+def test_count_cache_keys_ttl_and_eviction(mocker):
+    cache = agent_card.AgentCardCountCache(max_size=2, ttl_seconds=30)
+    mock_time = mocker.patch("agentvault_registry.crud.agent_card.time.monotonic", return_value=1000.0)
+    key = agent_card._count_cache_key(True, "Weather", ["b", "a", "a"], None, None, None)
+    assert key == agent_card._count_cache_key(True, "weather", ["a", "b"], None, None, None)
+    assert cache.get(key) is None
+    cache.put(key, 42)
+    cache.put("other", 1)
+    assert cache.get(key) == 42 # 'key' becomes most recently used
+    cache.put("third", 2)
+    assert cache.get("other") is None # Least recently used entry evicted
+    mock_time.return_value = 1031.0
+    assert cache.get(key) is None
+    assert cache.stats() == {"size": 1, "max_size": 2, "ttl_seconds": 30, "hits": 1, "misses": 3, "evictions": 1, "invalidations": 0}
+
+def test_count_cache_orm_hooks_clear(mocker):
+    cache = agent_card.AgentCardCountCache(max_size=10, ttl_seconds=30)
+    mocker.patch.object(agent_card, "count_cache", cache)
+    cache.put("key", 3)
+    agent_card._invalidate_cached_counts(None, None, models.AgentCard())
+    assert cache.get("key") is None and cache.stats()["invalidations"] == 1
+    assert agent_card.AgentCardCountCache(max_size=10, ttl_seconds=0).enabled is False
+
+def _result(value) -> MagicMock:
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = value
+    result.scalars.return_value.all.return_value = []
+    return result
+
+@pytest.mark.asyncio
+async def test_list_agent_cards_count_modes(mocker):
+    mocker.patch.object(agent_card, "count_cache", agent_card.AgentCardCountCache(max_size=10, ttl_seconds=30))
+    session = MagicMock()
+
+    session.execute = AsyncMock(side_effect=[_result(None)])
+    assert await agent_card.list_agent_cards(session, count_mode="none") == ([], None, False)
+    assert session.execute.await_count == 1 # Page query only
+
+    session.execute = AsyncMock(side_effect=[_result(12), _result(None), _result(None)])
+    assert await agent_card.list_agent_cards(session, count_mode="exact") == ([], 12, False)
+    assert await agent_card.list_agent_cards(session, count_mode="exact") == ([], 12, False)
+    assert session.execute.await_count == 3 # Second count served from the cache
+
+    session.execute = AsyncMock(side_effect=[_result(1000), _result(None)])
+    assert await agent_card.list_agent_cards(session, active_only=False, count_mode="estimate") == ([], 1000, True)
+    assert "reltuples" in str(session.execute.await_args_list[0].args[0])
+
+    plan = [{"Plan": {"Node Type": "Seq Scan", "Plan Rows": 640}}]
+    session.execute = AsyncMock(side_effect=[_result(json.dumps(plan)), _result(None)])
+    assert await agent_card.list_agent_cards(session, developer_id=5, count_mode="estimate") == ([], 640, True)
+    explain_sql = str(session.execute.await_args_list[0].args[0])
+    assert explain_sql.startswith("EXPLAIN (FORMAT JSON) SELECT") and "agent_cards.developer_id = 5" in explain_sql
+
+    # Filters the planner cannot estimate well, and unanalyzed tables, are counted exactly
+    session.execute = AsyncMock(side_effect=[_result(7), _result(None)])
+    assert await agent_card.list_agent_cards(session, tags=["weather"], count_mode="estimate") == ([], 7, False)
+    session.execute = AsyncMock(side_effect=[_result(3), _result(None)])
+    assert await agent_card.list_agent_cards(session, active_only=False, search="x", count_mode="estimate") == ([], 3, False)
+    session.execute = AsyncMock(side_effect=[_result(-1), _result(4), _result(None)])
+    assert await agent_card.list_agent_cards(session, active_only=False, count_mode="estimate") == ([], 4, False)
+
+def test_list_agent_cards_count_param(sync_test_client: TestClient, mock_db_session: MagicMock, mock_developer: models.Developer, mocker):
+    cards = _make_cards(2, mock_developer)
+    mock_list = mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards", new_callable=AsyncMock, side_effect=[(cards, None, False), (cards, 90, True)])
+
+    response_data = sync_test_client.get(API_BASE_URL + "/", params={"limit": 2, "count": "none"}).json()
+    assert response_data["pagination"]["total_items"] is None and response_data["pagination"]["total_pages"] is None
+    assert response_data["next_cursor"] is not None # A full page may be followed by more
+    assert mock_list.await_args.kwargs["count_mode"] == "none"
+
+    response_data = sync_test_client.get(API_BASE_URL + "/", params={"limit": 2, "count": "estimate"}).json()
+    assert response_data["pagination"]["total_items"] == 90 and response_data["pagination"]["total_is_estimate"] is True
+    assert sync_test_client.get(API_BASE_URL + "/", params={"count": "approximate"}).status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+def test_list_agent_cards_cursor_mode_skips_count_by_default(sync_test_client: TestClient, mock_db_session: MagicMock, mocker):
+    mock_list = mocker.patch("agentvault_registry.crud.agent_card.list_agent_cards_by_cursor", new_callable=AsyncMock, return_value=([], None, False, None))
+    cursor = agent_card.encode_cursor(datetime.datetime.now(datetime.timezone.utc), uuid.uuid4())
+    response_data = sync_test_client.get(API_BASE_URL + "/", params={"cursor": cursor}).json()
+    assert response_data["pagination"]["total_items"] is None
+    assert mock_list.await_args.kwargs["count_mode"] == "none"
+
+
 # --- Test GET /agent-cards/{card_id} (Read) ---
 def test_get_agent_card_success(
     sync_test_client: TestClient,
@@ -0,0 +1,354 @@
+import pytest
+import datetime
+from unittest.mock import MagicMock, AsyncMock
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+
+from agentvault_registry import models, security
+from agentvault_registry.crud import developer as developer_crud
+
+
+# --- Helpers ---
+def _make_session(*results) -> MagicMock:
+    """Creates a mock AsyncSession whose execute() returns the given results in order."""
+    session = MagicMock(spec=AsyncSession)
+    session.execute = AsyncMock(side_effect=list(results))
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+    session.add = MagicMock()
+    nested = MagicMock()
+    nested.__aenter__ = AsyncMock(return_value=None)
+    nested.__aexit__ = AsyncMock(return_value=False)
+    session.begin_nested = MagicMock(return_value=nested)
+    return session
+
+def _scalar_result(value) -> MagicMock:
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = value
+    return result
+
+def _scalars_result(values) -> MagicMock:
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = values
+    return result
+
+@pytest.fixture(autouse=True)
+def reset_legacy_key_flag():
+    developer_crud._legacy_keys_remaining = True
+    yield
+    developer_crud._legacy_keys_remaining = True
+
+@pytest.fixture
+async def sqlite_session_factory(tmp_path):
+    """Session factory for a SQLite database file, so flushes, commits and ORM hooks really run."""
+    pytest.importorskip("aiosqlite")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'registry.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            models.Base.metadata.create_all,
+            tables=[models.Developer.__table__, models.DeveloperApiKey.__table__]
+        )
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+def _make_developer(plain_key: str, dev_id: int = 1) -> models.Developer:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return models.Developer(
+        id=dev_id, name=f"Dev {dev_id}", api_key_hash=security.hash_api_key(plain_key),
+        is_verified=False, created_at=now, updated_at=now
+    )
+
+
+# --- Tests for key prefix extraction ---
+def test_get_api_key_prefix_generated_key():
+    plain_key = security.generate_secure_api_key()
+    prefix = security.get_api_key_prefix(plain_key)
+    assert prefix is not None
+    assert prefix.startswith("avreg_")
+    assert len(prefix) == len("avreg_") + security.API_KEY_ID_LENGTH
+    assert plain_key.startswith(prefix)
+
+@pytest.mark.parametrize("bad_key", ["", "fake-key", "avreg_short", "other_AbCdEfGhIjKlMnOp"])
+def test_get_api_key_prefix_invalid_format(bad_key):
+    assert security.get_api_key_prefix(bad_key) is None
+
+
+# --- Tests for get_developer_by_plain_api_key ---
+@pytest.mark.asyncio
+async def test_lookup_by_prefix_success():
+    plain_key = security.generate_secure_api_key()
+    developer = _make_developer(plain_key)
+    db_key = models.DeveloperApiKey(
+        id=1, developer_id=developer.id, key_prefix=security.get_api_key_prefix(plain_key),
+        key_hash=developer.api_key_hash, is_active=True, developer=developer
+    )
+    session = _make_session(_scalar_result(db_key))
+
+    result = await developer_crud.get_developer_by_plain_api_key(session, plain_key)
+
+    assert result is developer
+    # Only the indexed lookup is executed, no scan over developers
+    assert session.execute.await_count == 1
+
+@pytest.mark.asyncio
+async def test_lookup_by_prefix_wrong_secret():
+    plain_key = security.generate_secure_api_key()
+    developer = _make_developer(plain_key)
+    # Same prefix, different secret part
+    forged_key = plain_key[:len("avreg_") + security.API_KEY_ID_LENGTH] + "X" * 30
+    db_key = models.DeveloperApiKey(
+        id=1, developer_id=developer.id, key_prefix=security.get_api_key_prefix(plain_key),
+        key_hash=developer.api_key_hash, is_active=True, developer=developer
+    )
+    session = _make_session(_scalar_result(db_key))
+
+    assert await developer_crud.get_developer_by_plain_api_key(session, forged_key) is None
+    assert session.execute.await_count == 1
+
+@pytest.mark.asyncio
+async def test_lookup_by_prefix_inactive_key():
+    plain_key = security.generate_secure_api_key()
+    developer = _make_developer(plain_key)
+    db_key = models.DeveloperApiKey(
+        id=1, developer_id=developer.id, key_prefix=security.get_api_key_prefix(plain_key),
+        key_hash=developer.api_key_hash, is_active=False, developer=developer
+    )
+    session = _make_session(_scalar_result(db_key))
+
+    assert await developer_crud.get_developer_by_plain_api_key(session, plain_key) is None
+
+@pytest.mark.asyncio
+async def test_lookup_malformed_key_skips_db():
+    session = _make_session()
+    assert await developer_crud.get_developer_by_plain_api_key(session, "not-an-avreg-key") is None
+    session.execute.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_legacy_key_verified_and_migrated(sqlite_session_factory, mocker):
+    plain_key = security.generate_secure_api_key()
+    async with sqlite_session_factory() as session:
+        # Developers created before the key table have only api_key_hash
+        session.add(models.Developer(name="Legacy Dev", api_key_hash=security.hash_api_key(plain_key)))
+        await session.commit()
+
+    async with sqlite_session_factory() as session:
+        session.add(models.Developer(name="Pending Dev", api_key_hash="unrelated")) # Endpoint work in progress
+        commit_spy = mocker.spy(session, "commit")
+        with session.no_autoflush:
+            result = await developer_crud.get_developer_by_plain_api_key(session, plain_key)
+        commit_spy.assert_not_called()
+        assert result is not None and result.name == "Legacy Dev"
+        developer_id, key_hash = result.id, result.api_key_hash
+        await session.rollback()
+
+    async with sqlite_session_factory() as session:
+        db_key = (await session.execute(select(models.DeveloperApiKey))).scalar_one()
+        assert db_key.developer_id == developer_id
+        assert db_key.key_prefix == security.get_api_key_prefix(plain_key)
+        assert db_key.key_hash == key_hash
+        # The migration did not commit the request session's pending work
+        names = (await session.execute(select(models.Developer.name))).scalars().all()
+        assert names == ["Legacy Dev"]
+        # The migrated key now takes the prefix lookup path
+        migrated = await developer_crud.get_developer_by_plain_api_key(session, plain_key)
+        assert migrated is not None and migrated.id == developer_id
+
+@pytest.mark.asyncio
+async def test_legacy_key_no_match():
+    plain_key = security.generate_secure_api_key()
+    other_developer = _make_developer(security.generate_secure_api_key(), dev_id=8)
+    session = _make_session(_scalar_result(None), _scalars_result([other_developer]))
+
+    assert await developer_crud.get_developer_by_plain_api_key(session, plain_key) is None
+    session.add.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_legacy_scan_skipped_once_no_legacy_keys_remain():
+    session = _make_session(_scalar_result(None), _scalars_result([]), _scalar_result(None))
+    assert await developer_crud.get_developer_by_plain_api_key(session, security.generate_secure_api_key()) is None
+    assert session.execute.await_count == 2
+    # Unknown prefixes no longer trigger the legacy scan
+    assert await developer_crud.get_developer_by_plain_api_key(session, security.generate_secure_api_key()) is None
+    assert session.execute.await_count == 3
+
+
+# --- Tests for create_developer ---
+@pytest.mark.asyncio
+async def test_create_developer_creates_key_record():
+    session = _make_session()
+    session.refresh = AsyncMock()
+
+    db_developer, plain_key = await developer_crud.create_developer(session, "New Dev")
+
+    assert db_developer is not None and plain_key is not None
+    assert len(db_developer.api_keys) == 1
+    db_key = db_developer.api_keys[0]
+    assert db_key.key_prefix == security.get_api_key_prefix(plain_key)
+    assert security.verify_api_key(plain_key, db_key.key_hash)
+
+
+# --- Tests for the verified API key cache ---
+def test_api_key_cache_hit_and_miss_counters():
+    cache = security.VerifiedApiKeyCache(max_size=10, ttl_seconds=60)
+    developer = _make_developer("irrelevant")
+    assert cache.get("avreg_key-one") is None
+    cache.put("avreg_key-one", developer)
+    cached = cache.get("avreg_key-one")
+    assert cached is not None and cached.id == developer.id
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
+
+def test_api_key_cache_ttl_expiry(mocker):
+    cache = security.VerifiedApiKeyCache(max_size=10, ttl_seconds=60)
+    mock_time = mocker.patch("agentvault_registry.security.time.monotonic", return_value=1000.0)
+    cache.put("avreg_key-one", _make_developer("irrelevant"))
+    mock_time.return_value = 1061.0
+    assert cache.get("avreg_key-one") is None
+    assert cache.stats()["size"] == 0
+
+def test_api_key_cache_lru_eviction():
+    cache = security.VerifiedApiKeyCache(max_size=2, ttl_seconds=60)
+    cache.put("avreg_key-a", _make_developer("irrelevant", dev_id=1))
+    cache.put("avreg_key-b", _make_developer("irrelevant", dev_id=2))
+    assert cache.get("avreg_key-a") is not None # 'a' becomes most recently used
+    cache.put("avreg_key-c", _make_developer("irrelevant", dev_id=3))
+    assert cache.get("avreg_key-b") is None
+    assert cache.get("avreg_key-a") is not None
+    assert cache.stats()["evictions"] == 1
+
+def test_api_key_cache_invalidate_developer():
+    cache = security.VerifiedApiKeyCache(max_size=10, ttl_seconds=60)
+    cache.put("avreg_key-a", _make_developer("irrelevant", dev_id=1))
+    cache.put("avreg_key-b", _make_developer("irrelevant", dev_id=2))
+    cache.invalidate_developer(1)
+    assert cache.get("avreg_key-a") is None
+    assert cache.get("avreg_key-b") is not None
+    assert cache.stats()["invalidations"] == 1
+
+def test_api_key_cache_disabled():
+    cache = security.VerifiedApiKeyCache(max_size=10, ttl_seconds=0)
+    cache.put("avreg_key-a", _make_developer("irrelevant"))
+    assert cache.get("avreg_key-a") is None
+    assert cache.stats()["size"] == 0
+
+def test_api_key_cache_orm_update_hook_invalidates():
+    cache = security.VerifiedApiKeyCache(max_size=10, ttl_seconds=60)
+    developer = _make_developer("irrelevant", dev_id=5)
+    cache.put("avreg_key-a", developer)
+    original_cache = security.api_key_cache
+    security.api_key_cache = cache
+    try:
+        security._invalidate_cached_developer_key(None, None, models.DeveloperApiKey(developer_id=5))
+    finally:
+        security.api_key_cache = original_cache
+    assert cache.get("avreg_key-a") is None
+
+def test_api_key_cache_put_skipped_after_invalidation():
+    cache = security.VerifiedApiKeyCache(max_size=10, ttl_seconds=60)
+    generation = cache.generation # Taken before a (slow) database lookup
+    cache.invalidate_developer(1) # A concurrent commit changes the developer's keys
+    cache.put("avreg_key-a", _make_developer("irrelevant", dev_id=1), generation=generation)
+    assert cache.get("avreg_key-a") is None
+    cache.put("avreg_key-a", _make_developer("irrelevant", dev_id=1), generation=cache.generation)
+    assert cache.get("avreg_key-a") is not None
+
+@pytest.mark.asyncio
+async def test_get_current_developer_uses_cache(mocker):
+    cache = security.VerifiedApiKeyCache(max_size=10, ttl_seconds=60)
+    mocker.patch.object(security, "api_key_cache", cache)
+    developer = _make_developer("irrelevant", dev_id=3)
+    mock_lookup = mocker.patch(
+        "agentvault_registry.security.get_developer_by_plain_api_key",
+        new_callable=AsyncMock, return_value=developer
+    )
+    session = _make_session()
+
+    first = await security.get_current_developer(api_key="avreg_cached-key", db=session)
+    second = await security.get_current_developer(api_key="avreg_cached-key", db=session)
+    third = await security.get_current_developer_optional(api_key="avreg_cached-key", db=session)
+
+    assert first.id == second.id == third.id == 3
+    mock_lookup.assert_awaited_once()
+    assert cache.stats()["hits"] == 2
+
+
+# --- Tests for API key rotation ---
+@pytest.mark.asyncio
+async def test_rotate_developer_api_key_invalidates_old_key(mocker):
+    pytest.importorskip("aiosqlite")
+    cache = security.VerifiedApiKeyCache(max_size=10, ttl_seconds=60)
+    mocker.patch.object(security, "api_key_cache", cache)
+    # Real session on SQLite so the ORM event hooks run on commit
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            models.Base.metadata.create_all,
+            tables=[models.Developer.__table__, models.DeveloperApiKey.__table__]
+        )
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    try:
+        async with session_factory() as session:
+            db_developer, old_key = await developer_crud.create_developer(session, "Rotating Dev")
+            assert db_developer is not None
+            developer_id = db_developer.id
+            authenticated = await security.get_current_developer(api_key=old_key, db=session)
+            assert authenticated.id == developer_id
+            assert cache.get(old_key) is not None
+
+            new_key = await developer_crud.rotate_developer_api_key(session, developer_id)
+
+            assert new_key is not None and new_key != old_key
+            # The cached verification of the old key is evicted by the ORM hooks
+            assert cache.get(old_key) is None
+
+        async with session_factory() as session:
+            result = await session.execute(
+                select(models.DeveloperApiKey).where(models.DeveloperApiKey.developer_id == developer_id)
+            )
+            keys = {db_key.key_prefix: db_key.is_active for db_key in result.scalars().all()}
+            assert keys == {
+                security.get_api_key_prefix(old_key): False,
+                security.get_api_key_prefix(new_key): True,
+            }
+            assert await developer_crud.get_developer_by_plain_api_key(session, old_key) is None
+            rotated = await developer_crud.get_developer_by_plain_api_key(session, new_key)
+            assert rotated is not None and rotated.id == developer_id
+    finally:
+        await engine.dispose()
+
+@pytest.mark.asyncio
+async def test_api_key_cache_invalidated_on_commit_only(mocker):
+    pytest.importorskip("aiosqlite")
+    cache = security.VerifiedApiKeyCache(max_size=10, ttl_seconds=60)
+    mocker.patch.object(security, "api_key_cache", cache)
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            models.Base.metadata.create_all,
+            tables=[models.Developer.__table__, models.DeveloperApiKey.__table__]
+        )
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    try:
+        async with session_factory() as session:
+            db_developer, plain_key = await developer_crud.create_developer(session, "Committing Dev")
+            await security.get_current_developer(api_key=plain_key, db=session)
+            db_key = (await session.execute(select(models.DeveloperApiKey))).scalar_one()
+
+            # Flushed but uncommitted (then rolled back) changes keep the cache
+            db_key.is_active = False
+            await session.flush()
+            assert cache.get(plain_key) is not None
+            await session.rollback()
+            assert cache.get(plain_key) is not None
+
+            db_key = (await session.execute(select(models.DeveloperApiKey))).scalar_one()
+            db_key.is_active = False
+            await session.flush()
+            assert cache.get(plain_key) is not None
+            await session.commit()
+            assert cache.get(plain_key) is None
+    finally:
+        await engine.dispose()
@@ -113,3 +113,13 @@ def test_validate_card_library_unavailable(sync_test_client: TestClient):
     assert resp_data["is_valid"] is True # Treats as valid because check is skipped
     assert resp_data["detail"] == "Validation skipped: Core library not available."
     assert resp_data["validated_card_data"] == SAMPLE_VALID_CARD_DATA
+
+def test_responses_use_registry_json_response(sync_test_client: TestClient):
+    """JSON responses are rendered compactly by RegistryJSONResponse."""
+    from agentvault_registry.main import app
+    from agentvault_registry.responses import RegistryJSONResponse
+    assert app.router.default_response_class is RegistryJSONResponse
+    assert RegistryJSONResponse(content={"a": [1, "ü"], 2: None}).body == '{"a":[1,"ü"],"2":null}'.encode("utf-8")
+    response = sync_test_client.post(f"{UTILS_API_BASE_URL}/validate-card", json={"card_data": {}})
+    assert response.headers["content-type"] == "application/json"
+    assert b": " not in response.content
@@ -0,0 +1,124 @@
+"""
+Benchmark for SharedSQLiteTaskStore with several worker processes.
+
+N worker processes share one database. Each worker creates tasks and drives them
+through WORKING -> COMPLETED; a separate subscriber process listens to every
+task, the way an SSE stream served by another worker would. Reports write
+throughput and the latency from event publication to delivery in the
+subscriber.
+
+Usage:
+    python benchmarks/bench_shared_task_store.py --workers 1 2 4 8 --tasks-per-worker 500
+"""
+
+import argparse
+import asyncio
+import datetime
+import multiprocessing
+import statistics
+import tempfile
+import time
+import os
+from typing import List
+
+from agentvault.models import TaskState
+from agentvault_server_sdk.shared_store import SharedSQLiteTaskStore
+
+EVENTS_PER_TASK = 2 # WORKING and COMPLETED status updates
+
+
+def _task_ids(worker: int, tasks_per_worker: int) -> List[str]:
+    return [f"w{worker}-t{i}" for i in range(tasks_per_worker)]
+
+
+def _run_worker(db_path: str, worker: int, tasks_per_worker: int, concurrency: int, start, results) -> None:
+    async def main() -> float:
+        store = SharedSQLiteTaskStore(db_path, poll_interval=0.5)
+        await store._ensure_open()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def drive(task_id: str) -> None:
+            async with semaphore:
+                await store.create_task(task_id)
+                await store.update_task_state(task_id, TaskState.WORKING)
+                await store.update_task_state(task_id, TaskState.COMPLETED)
+
+        start.wait()
+        started = time.perf_counter()
+        await asyncio.gather(*(drive(task_id) for task_id in _task_ids(worker, tasks_per_worker)))
+        elapsed = time.perf_counter() - started
+        await store.close()
+        return elapsed
+
+    results.put(("worker", asyncio.run(main())))
+
+
+def _run_subscriber(db_path: str, workers: int, tasks_per_worker: int, ready, results) -> None:
+    async def main() -> List[float]:
+        store = SharedSQLiteTaskStore(db_path, poll_interval=0.5)
+        queue: asyncio.Queue = asyncio.Queue()
+        for worker in range(workers):
+            for task_id in _task_ids(worker, tasks_per_worker):
+                await store.add_listener(task_id, queue)
+        ready.set()
+
+        expected = workers * tasks_per_worker * EVENTS_PER_TASK
+        latencies: List[float] = []
+        try:
+            while len(latencies) < expected:
+                event = await asyncio.wait_for(queue.get(), timeout=30)
+                latencies.append((datetime.datetime.now(datetime.timezone.utc) - event.timestamp).total_seconds())
+        except asyncio.TimeoutError:
+            print(f"Subscriber timed out after {len(latencies)}/{expected} events.")
+        await store.close()
+        return latencies
+
+    results.put(("subscriber", asyncio.run(main())))
+
+
+def run(workers: int, tasks_per_worker: int, concurrency: int) -> None:
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory(prefix="avbench-") as tmp_dir:
+        db_path = os.path.join(tmp_dir, "tasks.db")
+        ready, start, results = ctx.Event(), ctx.Event(), ctx.Queue()
+        subscriber = ctx.Process(target=_run_subscriber, args=(db_path, workers, tasks_per_worker, ready, results))
+        subscriber.start()
+        ready.wait()
+        processes = [
+            ctx.Process(target=_run_worker, args=(db_path, worker, tasks_per_worker, concurrency, start, results))
+            for worker in range(workers)
+        ]
+        for process in processes: process.start()
+        time.sleep(1.0) # Let workers open the database and bind their sockets
+        start.set()
+
+        worker_times: List[float] = []
+        latencies: List[float] = []
+        for _ in range(workers + 1):
+            kind, value = results.get()
+            if kind == "worker": worker_times.append(value)
+            else: latencies = value
+        for process in [*processes, subscriber]: process.join()
+
+    total_tasks = workers * tasks_per_worker
+    wall = max(worker_times)
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    def percentile(p: float) -> float:
+        return latencies_ms[min(len(latencies_ms) - 1, int(len(latencies_ms) * p))] if latencies_ms else float("nan")
+    print(
+        f"{workers:>7} | {total_tasks:>6} | {total_tasks * 3 / wall:>10.0f} | "
+        f"{len(latencies):>6}/{total_tasks * EVENTS_PER_TASK:<6} | "
+        f"{statistics.median(latencies_ms) if latencies_ms else float('nan'):>7.2f} | {percentile(0.95):>7.2f} | {percentile(0.99):>7.2f}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--tasks-per-worker", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=50, help="Tasks driven concurrently per worker.")
+    args = parser.parse_args()
+
+    print("workers |  tasks | writes/sec |   events      | p50 ms  | p95 ms  | p99 ms")
+    for worker_count in args.workers:
+        run(worker_count, args.tasks_per_worker, args.concurrency)
@@ -7,13 +7,15 @@ __version__ = "0.1.0"
 try:
     from .agent import BaseA2AAgent
     # --- MODIFIED: Import create_a2a_router and a2a_method ---
-    from .fastapi_integration import create_a2a_router, a2a_method
+    from .fastapi_integration import create_a2a_router, a2a_method, A2AJSONResponse
     # --- END MODIFIED ---
     # --- ADDED: Import exceptions ---
     from .exceptions import AgentServerError, TaskNotFoundError, InvalidStateTransitionError, AgentProcessingError, ConfigurationError
     # --- END ADDED ---
     # --- ADDED: Import state management ---
-    from .state import BaseTaskStore, InMemoryTaskStore, TaskContext
+    from .state import BaseTaskStore, LocalListenerTaskStore, InMemoryTaskStore, TaskContext, ListenerQueue, ListenerOverflowPolicy, LISTENER_DISCONNECTED
+    from .sqlite_store import SQLiteTaskStore
+    from .shared_store import SharedSQLiteTaskStore
     # --- END ADDED ---
 except ImportError as e:
     # Allow init to load even if submodules aren't fully created yet
@@ -23,14 +25,21 @@ except ImportError as e:
     BaseA2AAgent = None # type: ignore
     create_a2a_router = None # type: ignore
     a2a_method = None # type: ignore
+    A2AJSONResponse = None # type: ignore
     AgentServerError = Exception # type: ignore
     TaskNotFoundError = Exception # type: ignore
     InvalidStateTransitionError = Exception # type: ignore
     AgentProcessingError = Exception # type: ignore
     ConfigurationError = Exception # type: ignore
     BaseTaskStore = None # type: ignore
+    LocalListenerTaskStore = None # type: ignore
     InMemoryTaskStore = None # type: ignore
+    SQLiteTaskStore = None # type: ignore
+    SharedSQLiteTaskStore = None # type: ignore
     TaskContext = None # type: ignore
+    ListenerQueue = None # type: ignore
+    ListenerOverflowPolicy = None # type: ignore
+    LISTENER_DISCONNECTED = None # type: ignore
     pass
 
 # --- MODIFIED: Update __all__ ---
@@ -38,13 +47,20 @@ __all__ = [
     "BaseA2AAgent",
     "create_a2a_router",
     "a2a_method",
+    "A2AJSONResponse",
     "AgentServerError",
     "TaskNotFoundError",
     "InvalidStateTransitionError",
     "AgentProcessingError",
     "ConfigurationError",
     "BaseTaskStore",
+    "LocalListenerTaskStore",
     "InMemoryTaskStore",
+    "SQLiteTaskStore",
+    "SharedSQLiteTaskStore",
     "TaskContext",
+    "ListenerQueue",
+    "ListenerOverflowPolicy",
+    "LISTENER_DISCONNECTED",
 ]
 # --- END MODIFIED ---
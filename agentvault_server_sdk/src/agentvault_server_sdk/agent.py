@@ -7,7 +7,7 @@ from typing import AsyncGenerator, Optional, Dict, Any, Union # Added Union
 
 # Import core types from the agentvault library
 try:
-    from agentvault.models import Message, Task, TaskState
+    from agentvault.models import Message, Task, TaskState, TaskGetParams
     # Import the Union type for events if defined, otherwise import individual events
     try:
         from agentvault.models import A2AEvent
@@ -22,6 +22,7 @@ except ImportError as e:
     class Message: pass # type: ignore
     class Task: pass # type: ignore
     class TaskState: pass # type: ignore
+    class TaskGetParams: pass # type: ignore
     A2AEvent = Any # type: ignore
     _agentvault_models_imported = False
 
@@ -74,7 +75,7 @@ class BaseA2AAgent:
         """
         raise NotImplementedError("Subclasses must implement handle_task_send")
 
-    async def handle_task_get(self, task_id: str) -> Task:
+    async def handle_task_get(self, task_id: str, params: Optional[TaskGetParams] = None) -> Task:
         """
         Handle a request to retrieve the current state of a task.
 
@@ -82,8 +83,17 @@ class BaseA2AAgent:
         Implementations should fetch the current status, message history, and
         artifacts for the specified task ID and return them as a Task object.
 
+        The `params` argument is optional for implementations. If an override
+        accepts it, it receives the request's `include`/`since`/`limit` and should
+        return only the selected part of the task, e.g. by building the Task with
+        `**params.select(history, artifacts)`; this keeps state-only polls cheap for
+        long histories. Overrides without `params` return the whole Task, and the
+        router restricts it before sending.
+
         Args:
             task_id: The ID of the task to retrieve.
+            params: The validated tasks/get parameters (only passed to overrides
+                    that declare this argument).
 
         Returns:
             A Task object representing the current state of the task.
@@ -130,6 +140,11 @@ class BaseA2AAgent:
         terminal state or the client disconnects. The framework handles formatting
         these events into the SSE protocol.
 
+        A task store may hand a listener queue `LISTENER_DISCONNECTED` (e.g. under
+        `ListenerOverflowPolicy.DISCONNECT`) and deregister it; no further events
+        arrive on that queue. The generator must stop when it receives the
+        sentinel (yielding it first ends the SSE stream as well).
+
         Args:
             task_id: The ID of the task to subscribe to.
 
@@ -7,10 +7,11 @@ import logging
 import json
 import inspect
 import asyncio
-from typing import Any, Dict, Optional, Union, AsyncGenerator, Callable, TypeVar, List
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Union, AsyncGenerator, Callable, TypeVar, List, Tuple, Type
 
 import pydantic
-from pydantic import RootModel, create_model
+from pydantic import TypeAdapter, create_model
 
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
@@ -18,7 +19,7 @@ from fastapi.responses import StreamingResponse, JSONResponse
 
 # Import the base agent class and state management
 from .agent import BaseA2AAgent
-from .state import BaseTaskStore, InMemoryTaskStore, TaskContext
+from .state import BaseTaskStore, InMemoryTaskStore, TaskContext, LISTENER_DISCONNECTED
 from agentvault_server_sdk.exceptions import AgentServerError, TaskNotFoundError
 
 
@@ -26,11 +27,12 @@ from agentvault_server_sdk.exceptions import AgentServerError, TaskNotFoundError
 try:
     from agentvault.models import (
         Message, Task, TaskState, A2AEvent,
-        TaskSendParams, TaskSendResult, TaskGetParams, GetTaskResult,
+        TaskSendParams, TaskSendResult, TaskGetParams, GetTaskResult, TaskWaitParams,
         TaskCancelParams, TaskCancelResult,
         TaskStatusUpdateEvent, TaskMessageEvent, TaskArtifactUpdateEvent, Artifact
     )
     from agentvault.exceptions import A2AError, A2ARemoteAgentError, A2AMessageError
+    from agentvault import json_codec
     _AGENTVAULT_IMPORTED = True
 except ImportError:
     logging.getLogger(__name__).error("Failed to import from 'agentvault' library. FastAPI integration may not function correctly.")
@@ -43,6 +45,7 @@ except ImportError:
     class TaskSendResult: pass # type: ignore
     class TaskGetParams: pass # type: ignore
     class GetTaskResult: pass # type: ignore
+    class TaskWaitParams: pass # type: ignore
     class TaskCancelParams: pass # type: ignore
     class TaskCancelResult: pass # type: ignore
     class A2AError(Exception): pass # type: ignore
@@ -52,6 +55,11 @@ except ImportError:
     class TaskMessageEvent: pass # type: ignore
     class TaskArtifactUpdateEvent: pass # type: ignore
     class Artifact: pass # type: ignore
+    class json_codec: # type: ignore
+        @staticmethod
+        def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes: return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=default).encode("utf-8")
+        @staticmethod
+        def loads(data: Union[bytes, str]) -> Any: return json.loads(data)
     _AGENTVAULT_IMPORTED = False
 
 
@@ -94,6 +102,70 @@ def a2a_method(method_name: str) -> Callable[[F], F]:
         return func
     return _decorator
 
+# Precompiled Dispatch Information for Decorated Methods
+@dataclass(frozen=True)
+class _A2AMethodSpec:
+    """
+    Everything needed to dispatch a request to an @a2a_method handler,
+    computed once when the router is created.
+    """
+    handler: Callable[..., Any]
+    params_model: Type[pydantic.BaseModel]
+    accepts_task_id: bool # JSON "id" param is mapped to Python "task_id"
+    task_store_param: Optional[str] # Name of the parameter receiving the task store, if any
+    return_adapter: Optional[TypeAdapter] # None when the return type is not validated
+
+
+def _accepts_parameter(func: Callable[..., Any], name: str) -> bool:
+    """True if `func` can be called with the keyword argument `name`."""
+    try: parameters = inspect.signature(func).parameters
+    except (TypeError, ValueError): return False
+    return name in parameters or any(p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters.values())
+
+
+def _compile_a2a_method(handler_func: Callable[..., Any]) -> _A2AMethodSpec:
+    """
+    Inspects a decorated handler and builds its params model and return-type adapter.
+
+    Raises:
+        TypeError / pydantic errors: If the signature cannot be turned into a model.
+    """
+    sig = inspect.signature(handler_func)
+    param_fields: Dict[str, Any] = {}
+    task_store_param: Optional[str] = None
+    accepts_task_id = False
+
+    for param_name, param in sig.parameters.items():
+        if param_name in ('self', 'cls'): continue
+        if param_name == 'task_id': accepts_task_id = True
+        if param.annotation is BaseTaskStore or \
+           (isinstance(param.annotation, type) and issubclass(param.annotation, BaseTaskStore)):
+            task_store_param = param_name
+            continue # Don't add task store to the dynamic model
+
+        default_value = ... if param.default is inspect.Parameter.empty else param.default
+        annotation_to_use = Any if param.annotation is inspect.Parameter.empty else param.annotation
+        param_fields[param_name] = (annotation_to_use, default_value)
+
+    params_model = create_model(f'{handler_func.__name__}Params', **param_fields) # type: ignore
+
+    return_adapter: Optional[TypeAdapter] = None
+    return_annotation = sig.return_annotation
+    if return_annotation is not inspect.Signature.empty and return_annotation is not type(None) and return_annotation is not None:
+        try:
+            return_adapter = TypeAdapter(return_annotation)
+        except Exception as e:
+            logger.warning(f"Cannot build return type validator for handler '{handler_func.__name__}' ({return_annotation!r}): {e}. Return values will not be validated.")
+
+    return _A2AMethodSpec(
+        handler=handler_func,
+        params_model=params_model,
+        accepts_task_id=accepts_task_id,
+        task_store_param=task_store_param,
+        return_adapter=return_adapter,
+    )
+
+
 # JSON-RPC Response Helpers
 def create_jsonrpc_error_response(req_id: Union[str, int, None], code: int, message: str, data: Optional[Any] = None) -> Dict[str, Any]:
     error_obj: Dict[str, Any] = {"code": code, "message": message}
@@ -105,19 +177,31 @@ def create_jsonrpc_success_response(req_id: Union[str, int, None], result: Any)
 
 # SSE Response Class
 class SSEResponse(StreamingResponse):
-    """ Custom FastAPI response class for Server-Sent Events (SSE). """
+    """
+    Custom FastAPI response class for Server-Sent Events (SSE).
+
+    The content generator yields A2AEvent objects, or `(event_id, event)` tuples
+    to send the event with an SSE `id:` field (used by clients for `Last-Event-ID`).
+    The stream ends when it yields `LISTENER_DISCONNECTED`.
+    """
     media_type = "text/event-stream"
 
     def __init__(
         self,
-        content: AsyncGenerator[A2AEvent, None],
+        content: AsyncGenerator[Union[A2AEvent, Tuple[Optional[int], A2AEvent]], None],
         status_code: int = 200,
         headers: Optional[Dict[str, str]] = None,
         **kwargs: Any,
     ) -> None:
-        async def event_publisher(event_generator: AsyncGenerator[A2AEvent, None]) -> AsyncGenerator[bytes, None]:
+        async def event_publisher(event_generator: AsyncGenerator[Union[A2AEvent, Tuple[Optional[int], A2AEvent]], None]) -> AsyncGenerator[bytes, None]:
             try:
-                async for event in event_generator: # This is where the error occurred
+                async for item in event_generator: # This is where the error occurred
+                    event_id: Optional[int] = None
+                    if isinstance(item, tuple): event_id, event = item
+                    else: event = item
+                    if event is LISTENER_DISCONNECTED:
+                        logger.warning("Listener was disconnected by the task store (slow consumer or task removed). Ending SSE stream.")
+                        break
                     event_type: Optional[str] = None
                     if _AGENTVAULT_IMPORTED:
                         if isinstance(event, TaskStatusUpdateEvent): event_type = "task_status"
@@ -129,12 +213,13 @@ class SSEResponse(StreamingResponse):
                         continue
 
                     try:
-                        if _AGENTVAULT_IMPORTED and hasattr(event, 'model_dump_json'):
-                             json_data = event.model_dump_json(by_alias=True)
+                        # Serialize straight to bytes (model_dump_json would decode to str first)
+                        if _AGENTVAULT_IMPORTED and isinstance(event, pydantic.BaseModel):
+                             json_data = event.__pydantic_serializer__.to_json(event, by_alias=True)
                         else:
-                             json_data = json.dumps(event if isinstance(event, dict) else {"data": str(event)})
-                        sse_message = f"event: {event_type}\ndata: {json_data}\n\n"
-                        yield sse_message.encode("utf-8")
+                             json_data = json_codec.dumps(event if isinstance(event, dict) else {"data": str(event)})
+                        id_line = b"id: %d\n" % event_id if event_id is not None else b""
+                        yield b"%sevent: %s\ndata: %s\n\n" % (id_line, event_type.encode("ascii"), json_data)
                     except Exception as e:
                         logger.error(f"Failed to serialize or format SSE event (type: {event_type}): {e}", exc_info=True)
                         try:
@@ -154,31 +239,58 @@ class SSEResponse(StreamingResponse):
         super().__init__(content=event_publisher(content), status_code=status_code, headers=headers, media_type=self.media_type, **kwargs)
 
 
+class A2AJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with the `agentvault.json_codec` backend (orjson or
+    msgspec when installed). Used for all JSON-RPC responses of the A2A router;
+    can also be set as `default_response_class` of an app.
+    """
+    def render(self, content: Any) -> bytes:
+        return json_codec.dumps(content)
+
+
 # Exception Handler Definitions
-async def task_not_found_handler(request: Request, exc: TaskNotFoundError) -> JSONResponse:
+async def task_not_found_handler(request: Request, exc: TaskNotFoundError) -> A2AJSONResponse:
     logger.warning(f"Task not found error: {exc}")
     req_id = getattr(request.state, 'json_rpc_request_id', None)
     error_resp = create_jsonrpc_error_response(req_id, JSONRPC_TASK_NOT_FOUND, str(exc))
-    return JSONResponse(status_code=status.HTTP_200_OK, content=error_resp) # Return 200 OK for JSON-RPC errors
+    return A2AJSONResponse(status_code=status.HTTP_200_OK, content=error_resp) # Return 200 OK for JSON-RPC errors
 
-async def validation_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def validation_exception_handler(request: Request, exc: Exception) -> A2AJSONResponse:
     logger.warning(f"Validation error (ValueError/TypeError/Pydantic): {exc}", exc_info=False)
     req_id = getattr(request.state, 'json_rpc_request_id', None)
     error_resp = create_jsonrpc_error_response(req_id, JSONRPC_INVALID_PARAMS, f"Invalid parameters: {exc}")
-    return JSONResponse(status_code=status.HTTP_200_OK, content=error_resp)
+    return A2AJSONResponse(status_code=status.HTTP_200_OK, content=error_resp)
 
-async def agent_server_error_handler(request: Request, exc: AgentServerError) -> JSONResponse:
+async def agent_server_error_handler(request: Request, exc: AgentServerError) -> A2AJSONResponse:
     logger.error(f"Agent server error: {exc}", exc_info=True)
     req_id = getattr(request.state, 'json_rpc_request_id', None)
     error_resp = create_jsonrpc_error_response(req_id, JSONRPC_APP_ERROR, f"Agent error: {exc}")
-    return JSONResponse(status_code=status.HTTP_200_OK, content=error_resp)
+    return A2AJSONResponse(status_code=status.HTTP_200_OK, content=error_resp)
 
-async def generic_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def generic_exception_handler(request: Request, exc: Exception) -> A2AJSONResponse:
     logger.exception(f"Unhandled internal server error: {exc}")
     req_id = getattr(request.state, 'json_rpc_request_id', None)
     error_resp = create_jsonrpc_error_response(req_id, JSONRPC_INTERNAL_ERROR, f"Internal server error: {type(exc).__name__}")
     # Keep 500 for truly unexpected internal server errors
-    return JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content=error_resp)
+    return A2AJSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content=error_resp)
+
+def _create_jsonrpc_error_from_exception(req_id: Union[str, int, None], exc: Exception) -> Dict[str, Any]:
+    """
+    Maps an exception raised while handling one entry of a batch to a JSON-RPC
+    error object, using the same codes as the registered exception handlers.
+    """
+    if isinstance(exc, TaskNotFoundError):
+        logger.warning(f"Task not found error in batch entry (id: {req_id}): {exc}")
+        return create_jsonrpc_error_response(req_id, JSONRPC_TASK_NOT_FOUND, str(exc))
+    if isinstance(exc, (ValueError, TypeError, pydantic.ValidationError)):
+        logger.warning(f"Validation error in batch entry (id: {req_id}): {exc}")
+        return create_jsonrpc_error_response(req_id, JSONRPC_INVALID_PARAMS, f"Invalid parameters: {exc}")
+    if isinstance(exc, AgentServerError):
+        logger.error(f"Agent server error in batch entry (id: {req_id}): {exc}", exc_info=True)
+        return create_jsonrpc_error_response(req_id, JSONRPC_APP_ERROR, f"Agent error: {exc}")
+    logger.exception(f"Unhandled internal server error in batch entry (id: {req_id}): {exc}")
+    return create_jsonrpc_error_response(req_id, JSONRPC_INTERNAL_ERROR, f"Internal server error: {type(exc).__name__}")
 
 
 def create_a2a_router(
@@ -186,15 +298,35 @@ def create_a2a_router(
     prefix: str = "",
     tags: Optional[list[str]] = None,
     task_store: Optional[BaseTaskStore] = None,
+    batch_concurrency: int = 10,
+    max_batch_size: Optional[int] = 100,
+    max_wait_timeout: float = 60.0,
 ) -> APIRouter:
-    """ Creates a FastAPI APIRouter that exposes A2A methods... """
+    """
+    Creates a FastAPI APIRouter that exposes A2A methods...
+
+    The endpoint also accepts JSON-RPC 2.0 batch requests (a JSON array of
+    request objects). Entries are executed concurrently, at most
+    `batch_concurrency` at a time, and the response array contains one
+    response object per entry (matched by `id`). Batches larger than
+    `max_batch_size` are rejected; streaming methods (`tasks/sendSubscribe`)
+    cannot be batched.
+
+    `tasks/wait` long-polls the task store until the task reaches one of the
+    requested states (terminal states by default) and then answers like
+    `tasks/get`. Client-supplied timeouts are capped at `max_wait_timeout`
+    seconds; on timeout the current task is returned.
+    """
+    if batch_concurrency < 1: raise ValueError("batch_concurrency must be at least 1.")
+    if max_batch_size is not None and max_batch_size < 1: raise ValueError("max_batch_size must be at least 1 or None.")
+    if max_wait_timeout <= 0: raise ValueError("max_wait_timeout must be positive.")
     if tags is None: tags = ["A2A Protocol"]
     if task_store is None:
         logger.info("No task store provided, using default InMemoryTaskStore.")
         task_store = InMemoryTaskStore()
     final_task_store = task_store
 
-    router = APIRouter(prefix=prefix, tags=tags)
+    router = APIRouter(prefix=prefix, tags=tags, default_response_class=A2AJSONResponse)
     logger.info(f"Creating A2A router for agent: {agent.__class__.__name__} with prefix '{prefix}' using task store: {final_task_store.__class__.__name__}")
 
     # Inspect agent for decorated methods
@@ -219,100 +351,79 @@ def create_a2a_router(
         logger.error(f"Error during inspection of agent methods: {inspect_err}", exc_info=True)
     logger.debug(f"Finished inspection. Found {len(decorated_methods)} decorated methods.")
 
-    def get_task_store_dependency() -> BaseTaskStore: return final_task_store
+    # Precompile params models, return adapters and task store injection per method
+    dispatch_table: Dict[str, _A2AMethodSpec] = {}
+    for a2a_name, method_func in decorated_methods.items():
+        try:
+            dispatch_table[a2a_name] = _compile_a2a_method(method_func)
+        except Exception as compile_err:
+            logger.error(f"Failed to prepare handler '{method_func.__name__}' for A2A method '{a2a_name}'; it will not be routed: {compile_err}", exc_info=True)
+
+    # Whether the agent's handle_task_get applies tasks/get windows itself (else the router trims the full Task)
+    task_get_accepts_params = _accepts_parameter(agent.handle_task_get, "params")
+
+    async def get_task_result(agent_instance: BaseA2AAgent, get_params: TaskGetParams) -> Task:
+        """Calls handle_task_get and applies the requested windows (tasks/get and tasks/wait)."""
+        if task_get_accepts_params:
+            task_result = await agent_instance.handle_task_get(task_id=get_params.id, params=get_params)
+        else:
+            task_result = await agent_instance.handle_task_get(task_id=get_params.id)
+        if not isinstance(task_result, Task): raise TypeError("Agent handler must return a Task object for tasks/get")
+        return task_result if task_get_accepts_params else get_params.apply(task_result)
 
-    @router.post("/", summary="A2A JSON-RPC Endpoint", description="Handles all A2A JSON-RPC requests (tasks/send, tasks/get, etc.).")
-    async def handle_a2a_request(
-        request: Request,
-        agent_instance: BaseA2AAgent = Depends(lambda: agent),
-        task_store_dep: BaseTaskStore = Depends(get_task_store_dependency)
-    ) -> Response:
-        """Handles incoming A2A JSON-RPC requests over POST."""
-        req_id: Union[str, int, None] = None; payload: Optional[Dict[str, Any]] = None
-        try: payload = await request.json()
-        except json.JSONDecodeError as e: logger.warning(f"Failed to parse request body as JSON: {e}"); error_resp = create_jsonrpc_error_response(None, JSONRPC_PARSE_ERROR, "Parse error"); return JSONResponse(content=error_resp, status_code=status.HTTP_200_OK)
+    def get_task_store_dependency() -> BaseTaskStore: return final_task_store
 
-        if not isinstance(payload, dict): logger.warning("Invalid request: Payload is not a dictionary."); error_resp = create_jsonrpc_error_response(None, JSONRPC_INVALID_REQUEST, "Invalid Request: Payload must be a JSON object."); return JSONResponse(content=error_resp, status_code=status.HTTP_200_OK)
+    async def process_rpc_call(
+        payload: Any,
+        agent_instance: BaseA2AAgent,
+        task_store_dep: BaseTaskStore,
+        last_event_id: Optional[int] = None,
+    ) -> Union[Response, Tuple[Dict[str, Any], int]]:
+        """
+        Handles a single JSON-RPC request object.
+
+        Returns the response body and HTTP status code, or a streaming Response
+        for tasks/sendSubscribe (resumed after `last_event_id` if given). Agent
+        and validation exceptions are raised to the caller.
+        """
+        if not isinstance(payload, dict): logger.warning("Invalid request: Payload is not a dictionary."); return create_jsonrpc_error_response(None, JSONRPC_INVALID_REQUEST, "Invalid Request: Payload must be a JSON object."), status.HTTP_200_OK
         jsonrpc_version = payload.get("jsonrpc"); method = payload.get("method"); params = payload.get("params"); req_id = payload.get("id")
-        request.state.json_rpc_request_id = req_id
 
-        if not isinstance(method, str) or not method: logger.warning("Invalid request: 'method' field is missing or not a string."); error_resp = create_jsonrpc_error_response(req_id, JSONRPC_INVALID_REQUEST, "Invalid Request: 'method' is required and must be a string."); return JSONResponse(content=error_resp, status_code=status.HTTP_200_OK)
-        if jsonrpc_version != "2.0": logger.warning(f"Invalid request: 'jsonrpc' field is not '2.0' (got: {jsonrpc_version})."); error_resp = create_jsonrpc_error_response(req_id, JSONRPC_INVALID_REQUEST, "Invalid Request: 'jsonrpc' must be '2.0'."); return JSONResponse(content=error_resp, status_code=status.HTTP_200_OK)
+        if not isinstance(method, str) or not method: logger.warning("Invalid request: 'method' field is missing or not a string."); return create_jsonrpc_error_response(req_id, JSONRPC_INVALID_REQUEST, "Invalid Request: 'method' is required and must be a string."), status.HTTP_200_OK
+        if jsonrpc_version != "2.0": logger.warning(f"Invalid request: 'jsonrpc' field is not '2.0' (got: {jsonrpc_version})."); return create_jsonrpc_error_response(req_id, JSONRPC_INVALID_REQUEST, "Invalid Request: 'jsonrpc' must be '2.0'."), status.HTTP_200_OK
 
         logger.info(f"Received valid JSON-RPC request: method='{method}', id='{req_id}'")
 
-        handler_func = decorated_methods.get(method)
-
-        if handler_func:
-            logger.info(f"Routing request for method '{method}' to decorated handler '{handler_func.__name__}'")
-            sig = inspect.signature(handler_func)
-            param_fields: Dict[str, Any] = {}
-            handler_needs_task_store = False
-            python_param_names = [] # Store expected python names
-
-            # --- MODIFIED: Build dynamic model fields ---
-            for param_name, param in sig.parameters.items():
-                if param_name in ('self', 'cls'): continue
-                python_param_names.append(param_name) # Store python name
-                if param.annotation is BaseTaskStore or \
-                   (isinstance(param.annotation, type) and issubclass(param.annotation, BaseTaskStore)):
-                    handler_needs_task_store = True
-                    continue # Don't add task store to the dynamic model
-
-                param_annotation = param.annotation
-                param_default = param.default
-                default_value = ... if param_default is inspect.Parameter.empty else param_default
-                annotation_to_use = Any if param_annotation is inspect.Parameter.empty else param_annotation
-                param_fields[param_name] = (annotation_to_use, default_value)
-            # --- END MODIFIED ---
-
-            # --- MODIFIED: Map common aliases before validation ---
-            params_dict = params if isinstance(params, dict) else {}
-            mapped_params_dict = params_dict.copy() # Start with original params
-
-            # Example mapping: JSON "id" -> Python "task_id"
-            if "task_id" in python_param_names and "id" in params_dict:
-                logger.debug(f"Mapping incoming param 'id' to 'task_id' for validation.")
-                mapped_params_dict['task_id'] = params_dict.get('id')
-            # Add other mappings here if needed (e.g., "message" -> "input_message")
+        method_spec = dispatch_table.get(method)
 
-            # Create and validate using the *mapped* dictionary
-            ParamsModel = create_model(f'{handler_func.__name__}Params', **param_fields) # type: ignore
-            validated_params_model = ParamsModel.model_validate(mapped_params_dict)
-            # --- END MODIFIED ---
+        if method_spec:
+            logger.info(f"Routing request for method '{method}' to decorated handler '{method_spec.handler.__name__}'")
+            params_dict = params if isinstance(params, dict) else {}
 
-            # Dump validated data - keys will match Python param names
-            validated_params_dict = validated_params_model.model_dump()
+            # Map JSON "id" -> Python "task_id" before validation
+            if method_spec.accepts_task_id and "id" in params_dict:
+                params_dict = {**params_dict, "task_id": params_dict["id"]}
 
-            # Prepare arguments for the handler function
-            call_kwargs = validated_params_dict
-            if handler_needs_task_store:
-                call_kwargs['task_store'] = task_store_dep # Inject the store dependency
+            # Validate and dump - keys will match Python param names
+            call_kwargs = method_spec.params_model.model_validate(params_dict).model_dump()
+            if method_spec.task_store_param:
+                call_kwargs[method_spec.task_store_param] = task_store_dep # Inject the store dependency
 
             # Call the decorated agent method
-            result = await handler_func(**call_kwargs)
-
-            # Optional: Validate return type if specified
-            return_annotation = sig.return_annotation
-            if return_annotation is not inspect.Parameter.empty and return_annotation is not type(None):
-                is_pydantic_model = False
-                if inspect.isclass(return_annotation) and issubclass(return_annotation, pydantic.BaseModel):
-                    is_pydantic_model = True
+            result = await method_spec.handler(**call_kwargs)
 
+            # Validate return type if specified
+            if method_spec.return_adapter is not None:
                 try:
-                    if is_pydantic_model:
-                        return_annotation.model_validate(result) # type: ignore
-                    else:
-                        ReturnTypeModel = RootModel[return_annotation] # type: ignore
-                        ReturnTypeModel.model_validate(result)
+                    method_spec.return_adapter.validate_python(result)
                 except pydantic.ValidationError as e:
                     logger.error(f"Return value validation failed for method '{method}': {e}", exc_info=True)
                     error_resp = create_jsonrpc_error_response(req_id, JSONRPC_INTERNAL_ERROR, f"Internal Error: Invalid return type from handler for method '{method}'.")
-                    return JSONResponse(content=error_resp, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                    return error_resp, status.HTTP_500_INTERNAL_SERVER_ERROR
 
             # Return success response
             success_resp = create_jsonrpc_success_response(req_id, result)
-            return JSONResponse(content=success_resp, status_code=status.HTTP_200_OK)
+            return success_resp, status.HTTP_200_OK
 
         # Fallback to standard handle_... methods
         elif method == "tasks/send":
@@ -320,21 +431,29 @@ def create_a2a_router(
             task_id_result: str = await agent_instance.handle_task_send(task_id=validated_params.id, message=validated_params.message)
             send_result = TaskSendResult(id=task_id_result)
             success_resp = create_jsonrpc_success_response(req_id, send_result.model_dump(mode='json'))
-            return JSONResponse(content=success_resp, status_code=status.HTTP_200_OK)
+            return success_resp, status.HTTP_200_OK
 
         elif method == "tasks/get":
             validated_params = TaskGetParams.model_validate(params or {})
-            task_result: Task = await agent_instance.handle_task_get(task_id=validated_params.id)
-            if not isinstance(task_result, Task): raise TypeError("Agent handler must return a Task object for tasks/get")
+            task_result = await get_task_result(agent_instance, validated_params)
+            success_resp = create_jsonrpc_success_response(req_id, task_result.model_dump(mode='json', by_alias=True))
+            return success_resp, status.HTTP_200_OK
+
+        elif method == "tasks/wait":
+            wait_params = TaskWaitParams.model_validate(params or {})
+            wait_timeout = max_wait_timeout if wait_params.timeout is None else min(wait_params.timeout, max_wait_timeout)
+            task_context = await task_store_dep.wait_for_state(wait_params.id, wait_params.target_states, wait_timeout)
+            if task_context is None: raise TaskNotFoundError(task_id=wait_params.id)
+            task_result = await get_task_result(agent_instance, wait_params)
             success_resp = create_jsonrpc_success_response(req_id, task_result.model_dump(mode='json', by_alias=True))
-            return JSONResponse(content=success_resp, status_code=status.HTTP_200_OK)
+            return success_resp, status.HTTP_200_OK
 
         elif method == "tasks/cancel":
             validated_params = TaskCancelParams.model_validate(params or {})
             cancel_accepted: bool = await agent_instance.handle_task_cancel(task_id=validated_params.id)
             cancel_result = TaskCancelResult(success=cancel_accepted)
             success_resp = create_jsonrpc_success_response(req_id, cancel_result.model_dump(mode='json'))
-            return JSONResponse(content=success_resp, status_code=status.HTTP_200_OK)
+            return success_resp, status.HTTP_200_OK
 
         elif method == "tasks/sendSubscribe":
             if not isinstance(params, dict): raise ValueError("Params must be a dictionary.")
@@ -344,18 +463,95 @@ def create_a2a_router(
             task_context = await task_store_dep.get_task(task_id)
             if task_context is None: raise TaskNotFoundError(task_id=task_id)
 
-            async def stream_wrapper() -> AsyncGenerator[A2AEvent, None]:
+            async def stream_wrapper() -> AsyncGenerator[Tuple[Optional[int], A2AEvent], None]:
+                last_sent_id = last_event_id
+                if last_event_id is not None:
+                    replayed = await task_store_dep.get_events_since(task_id, last_event_id)
+                    logger.info(f"Replaying {len(replayed)} events after event ID {last_event_id} for task {task_id}.")
+                    for replay_id, replay_event in replayed:
+                        last_sent_id = replay_id
+                        yield replay_id, replay_event
+                gap_checked = last_event_id is None
                 agent_event_generator = agent_instance.handle_subscribe_request(task_id=task_id)
                 async for event in agent_event_generator:
-                    yield event
-
-            logger.info(f"Subscription request successful for task {task_id}. Starting SSE stream.")
+                    if event is LISTENER_DISCONNECTED:
+                        # The store dropped the agent's listener queue; nothing more will arrive
+                        logger.warning(f"Listener for task {task_id} was disconnected by the task store. Ending SSE stream.")
+                        await agent_event_generator.aclose()
+                        return
+                    event_id = task_store_dep.get_event_id(task_id, event)
+                    if event_id is not None and last_sent_id is not None:
+                        if event_id <= last_sent_id: continue # Already sent during replay
+                        if not gap_checked:
+                            # Events published between the replay and the agent's subscription
+                            gap_checked = True
+                            for missed_id, missed_event in await task_store_dep.get_events_since(task_id, last_sent_id):
+                                if missed_id >= event_id: break
+                                last_sent_id = missed_id
+                                yield missed_id, missed_event
+                    if event_id is not None: last_sent_id = event_id
+                    yield event_id, event
+
+            logger.info(f"Subscription request successful for task {task_id}{f' (resuming after event ID {last_event_id})' if last_event_id is not None else ''}. Starting SSE stream.")
             return SSEResponse(content=stream_wrapper())
 
         # Final fallback for unknown methods
         else:
             logger.warning(f"Method not found: '{method}'")
             error_resp = create_jsonrpc_error_response(req_id, JSONRPC_METHOD_NOT_FOUND, "Method not found")
-            return JSONResponse(content=error_resp, status_code=status.HTTP_200_OK)
+            return error_resp, status.HTTP_200_OK
+
+    async def process_batch_entry(
+        entry: Any,
+        semaphore: asyncio.Semaphore,
+        agent_instance: BaseA2AAgent,
+        task_store_dep: BaseTaskStore,
+    ) -> Dict[str, Any]:
+        """Handles one entry of a batch request, converting any error into its JSON-RPC error object."""
+        entry_id = entry.get("id") if isinstance(entry, dict) else None
+        if isinstance(entry, dict) and entry.get("method") == "tasks/sendSubscribe" and "tasks/sendSubscribe" not in dispatch_table:
+            logger.warning(f"Invalid batch entry (id: {entry_id}): streaming method 'tasks/sendSubscribe' cannot be batched.")
+            return create_jsonrpc_error_response(entry_id, JSONRPC_INVALID_REQUEST, "Invalid Request: 'tasks/sendSubscribe' cannot be used in a batch.")
+        async with semaphore:
+            try:
+                outcome = await process_rpc_call(entry, agent_instance, task_store_dep)
+            except Exception as exc:
+                return _create_jsonrpc_error_from_exception(entry_id, exc)
+        if isinstance(outcome, Response):
+            logger.error(f"Batch entry (id: {entry_id}) produced a streaming response, which cannot be batched.")
+            return create_jsonrpc_error_response(entry_id, JSONRPC_INTERNAL_ERROR, "Internal Error: Streaming responses cannot be batched.")
+        return outcome[0]
+
+    @router.post("/", summary="A2A JSON-RPC Endpoint", description="Handles all A2A JSON-RPC requests (tasks/send, tasks/get, etc.), including batch requests.")
+    async def handle_a2a_request(
+        request: Request,
+        agent_instance: BaseA2AAgent = Depends(lambda: agent),
+        task_store_dep: BaseTaskStore = Depends(get_task_store_dependency)
+    ) -> Response:
+        """Handles incoming A2A JSON-RPC requests over POST."""
+        payload: Any = None
+        try: payload = json_codec.loads(await request.body())
+        except json.JSONDecodeError as e: logger.warning(f"Failed to parse request body as JSON: {e}"); error_resp = create_jsonrpc_error_response(None, JSONRPC_PARSE_ERROR, "Parse error"); return A2AJSONResponse(content=error_resp, status_code=status.HTTP_200_OK)
+
+        if isinstance(payload, list):
+            if not payload: logger.warning("Invalid request: Batch is empty."); error_resp = create_jsonrpc_error_response(None, JSONRPC_INVALID_REQUEST, "Invalid Request: Batch must not be empty."); return A2AJSONResponse(content=error_resp, status_code=status.HTTP_200_OK)
+            if max_batch_size is not None and len(payload) > max_batch_size: logger.warning(f"Invalid request: Batch of {len(payload)} entries exceeds limit of {max_batch_size}."); error_resp = create_jsonrpc_error_response(None, JSONRPC_INVALID_REQUEST, f"Invalid Request: Batch size {len(payload)} exceeds the maximum of {max_batch_size}."); return A2AJSONResponse(content=error_resp, status_code=status.HTTP_200_OK)
+            logger.info(f"Received JSON-RPC batch with {len(payload)} entries (concurrency: {batch_concurrency}).")
+            semaphore = asyncio.Semaphore(batch_concurrency)
+            batch_responses = await asyncio.gather(*(
+                process_batch_entry(entry, semaphore, agent_instance, task_store_dep) for entry in payload
+            ))
+            return A2AJSONResponse(content=list(batch_responses), status_code=status.HTTP_200_OK)
+
+        request.state.json_rpc_request_id = payload.get("id") if isinstance(payload, dict) else None
+        last_event_id: Optional[int] = None
+        last_event_id_header = request.headers.get("last-event-id")
+        if last_event_id_header:
+            try: last_event_id = int(last_event_id_header)
+            except ValueError: logger.warning(f"Ignoring invalid Last-Event-ID header: {last_event_id_header!r}")
+        outcome = await process_rpc_call(payload, agent_instance, task_store_dep, last_event_id)
+        if isinstance(outcome, Response): return outcome
+        response_body, status_code = outcome
+        return A2AJSONResponse(content=response_body, status_code=status_code)
 
     return router
@@ -0,0 +1,355 @@
+"""
+Task store shared by several worker processes on one host (e.g. `uvicorn --workers N`).
+
+Task state and events live in one SQLite database (see SQLiteTaskStore). Every
+event is committed to the `task_events` table before it is announced; each
+worker then delivers new events of the tasks it has subscribers for from the
+database. Announcements are small Unix-domain datagrams sent to every worker
+socket found in a shared directory; task IDs announced in the same event loop
+iteration are batched into one datagram per peer. A periodic poll catches
+events whose announcement was lost (worker started late, peer unresponsive,
+or no AF_UNIX support on the platform).
+"""
+
+import logging
+import os
+import time
+import socket
+import secrets
+import asyncio
+from typing import Optional, Dict, Any, Union, List, Set, Iterable
+
+from .state import BaseTaskStore, LocalListenerTaskStore, TaskContext, TaskState, A2AEvent, ListenerOverflowPolicy
+from .sqlite_store import SQLiteTaskStore
+from .exceptions import ConfigurationError
+
+
+logger = logging.getLogger(__name__)
+
+_MAX_SOCKET_PATH_LENGTH = 100 # sockaddr_un.sun_path is 104-108 bytes depending on the platform
+_MAX_ANNOUNCEMENT_SIZE = 8192 # Bytes of newline-separated task IDs per datagram
+_MAX_ANNOUNCE_RETRY_DELAY = 0.1
+
+
+def _pack_task_ids(task_ids: Iterable[str]) -> List[List[str]]:
+    """Splits task IDs into groups that each fit into one announcement datagram."""
+    chunks: List[List[str]] = [[]]
+    size = 0
+    for task_id in task_ids:
+        length = len(task_id.encode("utf-8")) + 1
+        if chunks[-1] and size + length > _MAX_ANNOUNCEMENT_SIZE:
+            chunks.append([]); size = 0
+        chunks[-1].append(task_id); size += length
+    return chunks if chunks[0] else []
+
+
+class _PeerProtocol(asyncio.DatagramProtocol):
+    """Receives event announcements (newline-separated task IDs) from other workers."""
+    def __init__(self, store: "SharedSQLiteTaskStore"):
+        self._store = store
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        self._store._on_announcement(data)
+
+    def error_received(self, exc: Exception) -> None:
+        logger.warning(f"Error on task store peer socket: {exc}")
+
+
+class SharedSQLiteTaskStore(SQLiteTaskStore):
+    """
+    SQLiteTaskStore whose tasks and event streams are shared by all worker
+    processes using the same `db_path`.
+
+    Any worker can serve any task and its SSE subscriptions: task contexts are
+    read from the database (the context cache is disabled by default), state
+    updates only apply if the state was not changed by another worker in the
+    meantime, and events published by any worker reach the listeners of all
+    workers in publication order.
+
+    `notify_*` calls return once the event is committed and delivered to this
+    worker's listeners; other workers are notified right after. Call `close()` on shutdown to remove this worker's socket.
+    """
+    def __init__(
+        self,
+        db_path: str,
+        socket_dir: Optional[str] = None,
+        poll_interval: float = 1.0,
+        cache_size: int = 0,
+        commit_interval: float = 0.002,
+        max_batch_size: int = 500,
+        synchronous: str = "NORMAL",
+        listener_queue_size: int = 100,
+        listener_overflow_policy: Union[ListenerOverflowPolicy, str] = ListenerOverflowPolicy.BLOCK,
+        listener_block_timeout: float = 1.0,
+        event_log_size: int = 100,
+    ):
+        """
+        Args:
+            db_path: Path of the SQLite database file shared by all workers.
+            socket_dir: Directory holding one announcement socket per worker
+                (default: `<db_path>.peers`). Must be the same for all workers.
+            poll_interval: Seconds between database polls for events of subscribed
+                tasks whose announcement was missed (0 disables polling).
+            cache_size: Task contexts cached per worker. Cached contexts may be stale
+                when other workers update the same tasks; keep 0 unless tasks are
+                only ever updated by the worker that created them.
+            commit_interval, max_batch_size, synchronous: See SQLiteTaskStore.
+            listener_queue_size, listener_overflow_policy, listener_block_timeout:
+                See LocalListenerTaskStore.
+            event_log_size: Number of most recent stored events of a task returned
+                for replay by `get_events_since`. Event IDs are the `task_events`
+                row IDs, so they are the same in every worker.
+        """
+        if poll_interval < 0: raise ValueError("poll_interval must not be negative.")
+        super().__init__(
+            db_path,
+            cache_size=cache_size,
+            commit_interval=commit_interval,
+            max_batch_size=max_batch_size,
+            synchronous=synchronous,
+            persist_events=True,
+            listener_queue_size=listener_queue_size,
+            listener_overflow_policy=listener_overflow_policy,
+            listener_block_timeout=listener_block_timeout,
+            event_log_size=event_log_size,
+        )
+        self.socket_dir = socket_dir or f"{db_path}.peers"
+        self.poll_interval = poll_interval
+        self._socket_path: Optional[str] = None
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._send_sock: Optional[socket.socket] = None
+        self._peer_paths: List[str] = []
+        self._peers_refreshed_at = float("-inf")
+        self._pending_announcements: Set[str] = set()
+        self._peer_backlogs: Dict[str, Set[str]] = {} # peer socket path -> task IDs not yet announced to it
+        self._announce_handle: Optional[asyncio.Handle] = None
+        self._announce_retry_delay = 0.001
+        self._fanout_started = False
+        self._poll_task: Optional[asyncio.Task] = None
+        self._delivery_task: Optional[asyncio.Task] = None
+        self._delivery_lock: Optional[asyncio.Lock] = None
+        self._dirty_tasks: Set[str] = set() # Subscribed tasks that may have undelivered events
+        self._last_event_ids: Dict[str, int] = {} # task_id -> last event id delivered by this worker
+        self._fanout_stats: Dict[str, int] = {
+            "published": 0, "announcements_sent": 0, "announcements_received": 0,
+            "announcements_failed": 0, "stale_peers_removed": 0, "events_delivered": 0, "polls": 0,
+        }
+
+    # --- Setup / Teardown ---
+    async def _ensure_open(self) -> None:
+        await super()._ensure_open()
+        if not self._fanout_started:
+            self._fanout_started = True
+            await self._start_fanout()
+
+    async def _start_fanout(self) -> None:
+        loop = asyncio.get_running_loop()
+        os.makedirs(self.socket_dir, mode=0o700, exist_ok=True)
+        if hasattr(socket, "AF_UNIX"):
+            socket_path = os.path.join(self.socket_dir, f"{os.getpid()}-{secrets.token_hex(4)}.sock")
+            if len(socket_path) > _MAX_SOCKET_PATH_LENGTH:
+                raise ConfigurationError(f"Task store socket path '{socket_path}' is too long; configure a shorter socket_dir.")
+            self._transport, _ = await loop.create_datagram_endpoint(
+                lambda: _PeerProtocol(self), local_addr=socket_path, family=socket.AF_UNIX
+            )
+            self._socket_path = socket_path
+            self._send_sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self._send_sock.setblocking(False)
+            logger.info(f"SharedSQLiteTaskStore worker socket bound at '{socket_path}'.")
+        else:
+            logger.warning("AF_UNIX sockets are not available; SharedSQLiteTaskStore relies on polling for cross-worker events.")
+        if self.poll_interval > 0:
+            self._poll_task = loop.create_task(self._poll_loop())
+
+    async def close(self) -> None:
+        """Stops event fan-out, removes this worker's socket and closes the database."""
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            try: await self._poll_task
+            except asyncio.CancelledError: pass
+            self._poll_task = None
+        if self._delivery_task is not None: self._delivery_task.cancel()
+        if self._announce_handle is not None:
+            self._announce_handle.cancel()
+            self._announce_handle = None
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        if self._send_sock is not None:
+            self._send_sock.close()
+            self._send_sock = None
+        if self._socket_path is not None:
+            try: os.unlink(self._socket_path)
+            except FileNotFoundError: pass
+            self._socket_path = None
+        await super().close()
+
+    def get_fanout_stats(self) -> Dict[str, Any]:
+        """Returns counters of published, announced and delivered events plus the number of known peers."""
+        return {**self._fanout_stats, "peers": len(self._peer_paths), "subscribed_tasks": len(self._last_event_ids)}
+
+    # --- Listener Management ---
+    async def add_listener(self, task_id: str, listener_queue: asyncio.Queue):
+        await self._ensure_open()
+        if task_id not in self._last_event_ids:
+            # New subscriptions only receive events published from now on
+            rows = await self._read("SELECT COALESCE(MAX(id), 0) FROM task_events WHERE task_id = ?", (task_id,))
+            self._last_event_ids.setdefault(task_id, rows[0][0])
+        await super().add_listener(task_id, listener_queue)
+
+    async def remove_listener(self, task_id: str, listener_queue: asyncio.Queue):
+        await super().remove_listener(task_id, listener_queue)
+        if not self._listeners.get(task_id):
+            self._last_event_ids.pop(task_id, None)
+
+    async def delete_task(self, task_id: str) -> bool:
+        existed = await super().delete_task(task_id)
+        self._last_event_ids.pop(task_id, None)
+        return existed
+
+    async def wait_for_state(
+        self, task_id: str, states: Iterable[Union[TaskState, str]], timeout: Optional[float] = None
+    ) -> Optional[TaskContext]:
+        # Other workers' status events are only fetched for tasks with listeners, so wait on a listener queue
+        return await BaseTaskStore.wait_for_state(self, task_id, states, timeout)
+
+    # --- Event Fan-out ---
+    async def _notify_listeners(self, task_id: str, event: A2AEvent, event_id: Optional[int] = None):
+        if not hasattr(event, "model_dump_json"):
+            logger.error(f"Cannot share event of type {type(event).__name__} for task '{task_id}' across workers.")
+            return
+        await self._submit_writes([self._event_write_op(task_id, event)])
+        self._fanout_stats["published"] += 1
+        self._announce(task_id)
+        self._dirty_tasks.add(task_id)
+        await self._deliver_new_events()
+
+    def _refresh_peers(self) -> None:
+        try:
+            names = os.listdir(self.socket_dir)
+        except FileNotFoundError:
+            names = []
+        self._peer_paths = [
+            os.path.join(self.socket_dir, name) for name in names
+            if name.endswith(".sock") and os.path.join(self.socket_dir, name) != self._socket_path
+        ]
+        self._peers_refreshed_at = time.monotonic()
+
+    def _announce(self, task_id: str) -> None:
+        """Schedules telling the other workers that the task has new events."""
+        if self._send_sock is None: return
+        self._pending_announcements.add(task_id)
+        if self._announce_handle is None:
+            self._announce_handle = asyncio.get_running_loop().call_soon(self._flush_announcements)
+
+    def _remove_stale_peer(self, peer_path: str) -> None:
+        # Nobody is bound to this socket anymore (worker exited without cleanup)
+        if peer_path in self._peer_paths: self._peer_paths.remove(peer_path)
+        try:
+            os.unlink(peer_path)
+            self._fanout_stats["stale_peers_removed"] += 1
+            logger.info(f"Removed stale task store peer socket '{peer_path}'.")
+        except OSError: pass
+
+    def _flush_announcements(self) -> None:
+        self._announce_handle = None
+        if self._send_sock is None: return
+        if time.monotonic() - self._peers_refreshed_at > max(self.poll_interval, 0.5): self._refresh_peers()
+        if self._pending_announcements:
+            for peer_path in self._peer_paths:
+                self._peer_backlogs.setdefault(peer_path, set()).update(self._pending_announcements)
+            self._pending_announcements = set()
+
+        peers_busy = False
+        for peer_path, backlog in list(self._peer_backlogs.items()):
+            if peer_path not in self._peer_paths:
+                del self._peer_backlogs[peer_path]; continue
+            for chunk in _pack_task_ids(backlog):
+                try:
+                    self._send_sock.sendto("\n".join(chunk).encode("utf-8"), peer_path)
+                    self._fanout_stats["announcements_sent"] += 1
+                    backlog.difference_update(chunk)
+                except BlockingIOError:
+                    peers_busy = True # Peer's receive queue is full; retry shortly
+                    break
+                except (ConnectionRefusedError, FileNotFoundError):
+                    self._remove_stale_peer(peer_path)
+                    backlog.clear()
+                    break
+                except OSError as e:
+                    # The peer's poll picks the events up
+                    self._fanout_stats["announcements_failed"] += 1
+                    logger.debug(f"Could not announce events to '{peer_path}': {e}")
+                    backlog.clear()
+                    break
+            if not backlog: self._peer_backlogs.pop(peer_path, None)
+
+        if peers_busy:
+            self._announce_handle = asyncio.get_running_loop().call_later(self._announce_retry_delay, self._flush_announcements)
+            self._announce_retry_delay = min(self._announce_retry_delay * 2, _MAX_ANNOUNCE_RETRY_DELAY)
+        else:
+            self._announce_retry_delay = 0.001
+
+    def _on_announcement(self, data: bytes) -> None:
+        self._fanout_stats["announcements_received"] += 1
+        task_ids = [task_id for task_id in data.decode("utf-8", errors="replace").split("\n") if task_id in self._last_event_ids]
+        if not task_ids: return
+        self._dirty_tasks.update(task_ids)
+        if self._delivery_task is None or self._delivery_task.done():
+            self._delivery_task = asyncio.get_running_loop().create_task(self._deliver_new_events())
+
+    async def _deliver_new_events(self) -> None:
+        """Delivers committed events of all dirty tasks that this worker's listeners have not seen yet."""
+        if self._delivery_lock is None: self._delivery_lock = asyncio.Lock()
+        async with self._delivery_lock:
+            while self._dirty_tasks:
+                task_ids = [task_id for task_id in self._dirty_tasks if task_id in self._last_event_ids]
+                self._dirty_tasks.clear()
+                for start in range(0, len(task_ids), 500): # Stay below SQLite's host parameter limit
+                    chunk = task_ids[start:start + 500]
+                    rows = await self._read(
+                        f"SELECT id, task_id, event_type, payload FROM task_events "
+                        f"WHERE task_id IN ({', '.join('?' for _ in chunk)}) AND id > ? ORDER BY id",
+                        (*chunk, min(self._last_event_ids.get(task_id, 0) for task_id in chunk)),
+                    )
+                    events_by_task: Dict[str, List[Any]] = {}
+                    for row in rows: events_by_task.setdefault(row[1], []).append(row)
+                    # Tasks are delivered concurrently so one slow listener does not hold up the others
+                    await asyncio.gather(*(self._deliver_task_events(task_id, task_rows) for task_id, task_rows in events_by_task.items()))
+
+    async def _deliver_task_events(self, task_id: str, rows: List[Any]) -> None:
+        for event_id, _, event_type, payload in rows:
+            last_event_id = self._last_event_ids.get(task_id)
+            if last_event_id is None: return # Unsubscribed or deleted meanwhile
+            if event_id <= last_event_id: continue
+            self._last_event_ids[task_id] = event_id
+            event = self._decode_event(task_id, event_id, event_type, payload)
+            if event is None: continue
+            await LocalListenerTaskStore._notify_listeners(self, task_id, event, event_id)
+            self._fanout_stats["events_delivered"] += 1
+
+    async def _poll_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.poll_events()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error while polling shared task events: {e}", exc_info=True)
+
+    async def poll_events(self) -> None:
+        """Delivers any missed events for the tasks this worker has listeners for."""
+        self._fanout_stats["polls"] += 1
+        self._refresh_peers()
+        task_ids = list(self._last_event_ids)
+        for start in range(0, len(task_ids), 500): # Stay below SQLite's host parameter limit
+            chunk = task_ids[start:start + 500]
+            rows = await self._read(
+                f"SELECT task_id, MAX(id) FROM task_events WHERE task_id IN ({', '.join('?' for _ in chunk)}) GROUP BY task_id",
+                chunk,
+            )
+            for task_id, max_event_id in rows:
+                if max_event_id > self._last_event_ids.get(task_id, max_event_id):
+                    self._dirty_tasks.add(task_id)
+        await self._deliver_new_events()
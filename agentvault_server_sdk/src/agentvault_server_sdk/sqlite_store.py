@@ -0,0 +1,456 @@
+"""
+Durable, file-backed task store for the AgentVault Server SDK using SQLite.
+
+All database access runs on dedicated worker threads (one writer, one reader)
+so the event loop is never blocked. Writes are group-committed: state changes
+and events issued while a transaction is in flight are collected and written
+together in the next transaction, so throughput is not limited to one fsync
+per `update_task_state` call.
+"""
+
+import logging
+import datetime
+import sqlite3
+import asyncio
+import dataclasses
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Union, List, Tuple, Iterable, Sequence
+
+from .state import (
+    LocalListenerTaskStore, TaskContext, TaskState, A2AEvent, ListenerOverflowPolicy,
+    TERMINAL_STATES, _MODELS_AVAILABLE
+)
+from .exceptions import InvalidStateTransitionError
+
+try:
+    from agentvault.models import TaskStatusUpdateEvent, TaskMessageEvent, TaskArtifactUpdateEvent
+    _EVENT_MODELS: Dict[str, Any] = {
+        model.__name__: model for model in (TaskStatusUpdateEvent, TaskMessageEvent, TaskArtifactUpdateEvent)
+    }
+except ImportError:
+    logging.getLogger(__name__).warning("Could not import event models from agentvault.models. Stored events cannot be replayed.")
+    _EVENT_MODELS = {}
+
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA_STATEMENTS = (
+    """
+    CREATE TABLE IF NOT EXISTS tasks (
+        task_id TEXT PRIMARY KEY,
+        state TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_tasks_state ON tasks (state)",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_updated_at ON tasks (updated_at)",
+    """
+    CREATE TABLE IF NOT EXISTS task_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        task_id TEXT NOT NULL,
+        event_type TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        created_at TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_task_events_task_id ON task_events (task_id, id)",
+)
+
+# A single write operation: SQL statement and its parameters
+_WriteOp = Tuple[str, Sequence[Any]]
+# Result of a committed write operation: affected row count and last inserted row ID
+_WriteResult = Tuple[int, Optional[int]]
+
+
+def _state_value(state: Union[TaskState, str]) -> str:
+    return state.value if hasattr(state, "value") else str(state)
+
+
+def _parse_state(value: str) -> Union[TaskState, str]:
+    if _MODELS_AVAILABLE:
+        try: return TaskState(value)
+        except ValueError: logger.warning(f"Unknown task state '{value}' found in SQLite task store.")
+    return value
+
+
+def _to_db_timestamp(value: datetime.datetime) -> str:
+    if value.tzinfo is None: value = value.replace(tzinfo=datetime.timezone.utc)
+    return value.astimezone(datetime.timezone.utc).isoformat()
+
+
+class SQLiteTaskStore(LocalListenerTaskStore):
+    """
+    BaseTaskStore implementation persisting task state and events in a SQLite file.
+
+    - The database runs in WAL mode; `tasks.state` and `tasks.updated_at` are indexed.
+    - Task contexts are loaded on demand and kept in a bounded LRU cache
+      (`cache_size`, 0 disables caching).
+    - Writes are group-committed. `create_task`, `update_task_state` and
+      `delete_task` return once their transaction is committed. Events
+      published through the notify_* methods are delivered once committed,
+      with their `task_events` row ID as event ID, so IDs keep increasing
+      across restarts and `get_events_since` replays from the database.
+    - Listeners are local to this process (see LocalListenerTaskStore).
+
+    Only the base TaskContext fields are persisted; agent-specific subclasses
+    of TaskContext must keep their extra data elsewhere. State changes must go
+    through `update_task_state` to be persisted.
+
+    Call `close()` on shutdown to flush pending writes.
+    """
+    def __init__(
+        self,
+        db_path: str,
+        cache_size: int = 1024,
+        commit_interval: float = 0.002,
+        max_batch_size: int = 500,
+        synchronous: str = "NORMAL",
+        persist_events: bool = True,
+        listener_queue_size: int = 100,
+        listener_overflow_policy: Union[ListenerOverflowPolicy, str] = ListenerOverflowPolicy.BLOCK,
+        listener_block_timeout: float = 1.0,
+        event_log_size: int = 100,
+    ):
+        """
+        Args:
+            db_path: Path of the SQLite database file (created if missing).
+            cache_size: Maximum number of task contexts kept in memory.
+            commit_interval: Seconds to wait for more writes before starting a new transaction.
+            max_batch_size: Maximum number of write operations per transaction.
+            synchronous: SQLite `PRAGMA synchronous` level ("OFF", "NORMAL", "FULL").
+            persist_events: Whether events published via notify_* are stored in `task_events`.
+                Without it, event IDs are per-process sequence numbers that start
+                over after a restart, so clients cannot resume across restarts.
+            listener_queue_size, listener_overflow_policy, listener_block_timeout, event_log_size:
+                See LocalListenerTaskStore.
+        """
+        if cache_size < 0: raise ValueError("cache_size must not be negative.")
+        if max_batch_size < 1: raise ValueError("max_batch_size must be at least 1.")
+        if synchronous.upper() not in ("OFF", "NORMAL", "FULL", "EXTRA"): raise ValueError(f"Invalid synchronous level: {synchronous}")
+        super().__init__(
+            listener_queue_size=listener_queue_size,
+            listener_overflow_policy=listener_overflow_policy,
+            listener_block_timeout=listener_block_timeout,
+            event_log_size=event_log_size,
+        )
+        self.db_path = db_path
+        self.cache_size = cache_size
+        self.commit_interval = commit_interval
+        self.max_batch_size = max_batch_size
+        self.synchronous = synchronous.upper()
+        self.persist_events = persist_events
+
+        self._cache: "OrderedDict[str, TaskContext]" = OrderedDict()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-task-store-writer")
+        self._reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-task-store-reader")
+        self._write_conn: Optional[sqlite3.Connection] = None
+        self._read_conn: Optional[sqlite3.Connection] = None
+        self._open_lock: Optional[asyncio.Lock] = None
+        self._pending_writes: List[Tuple[_WriteOp, Optional[asyncio.Future]]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._closed = False
+        self._write_stats: Dict[str, int] = {"transactions": 0, "operations": 0, "failed_transactions": 0, "max_batch": 0}
+        logger.info(f"Initialized SQLiteTaskStore with database '{db_path}'.")
+
+    # --- Connection Management ---
+    def _connect_sync(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False, timeout=30.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        return conn
+
+    def _open_writer_sync(self) -> None:
+        self._write_conn = self._connect_sync()
+        for statement in _SCHEMA_STATEMENTS: self._write_conn.execute(statement)
+
+    def _open_reader_sync(self) -> None:
+        self._read_conn = self._connect_sync()
+
+    async def _ensure_open(self) -> None:
+        if self._read_conn is not None: return
+        if self._closed: raise RuntimeError("SQLiteTaskStore is closed.")
+        if self._open_lock is None: self._open_lock = asyncio.Lock()
+        async with self._open_lock:
+            if self._read_conn is not None: return
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._writer, self._open_writer_sync)
+            await loop.run_in_executor(self._reader, self._open_reader_sync)
+            logger.debug(f"Opened SQLite task store database '{self.db_path}' (WAL, synchronous={self.synchronous}).")
+
+    async def close(self) -> None:
+        """Flushes pending writes, closes the database connections and stops the worker threads."""
+        if self._closed: return
+        await self.flush()
+        self._closed = True
+        loop = asyncio.get_running_loop()
+        if self._write_conn is not None:
+            await loop.run_in_executor(self._writer, self._write_conn.close)
+            self._write_conn = None
+        if self._read_conn is not None:
+            await loop.run_in_executor(self._reader, self._read_conn.close)
+            self._read_conn = None
+        self._writer.shutdown(wait=True)
+        self._reader.shutdown(wait=True)
+        logger.info(f"Closed SQLiteTaskStore database '{self.db_path}'.")
+
+    # --- Group Commit ---
+    def _write_batch_sync(self, ops: List[_WriteOp]) -> List[_WriteResult]:
+        conn = self._write_conn
+        assert conn is not None
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            results = []
+            for sql, params in ops:
+                cursor = conn.execute(sql, params)
+                results.append((cursor.rowcount, cursor.lastrowid))
+            conn.execute("COMMIT")
+            return results
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    async def _submit_writes(self, ops: Iterable[_WriteOp], wait: bool = True) -> List[_WriteResult]:
+        """
+        Queues write operations for the next transaction.
+
+        With `wait`, returns the affected row count and last inserted row ID of each
+        operation once committed; otherwise returns an empty list immediately.
+        """
+        await self._ensure_open()
+        loop = asyncio.get_running_loop()
+        futures = []
+        for op in ops:
+            future = loop.create_future() if wait else None
+            self._pending_writes.append((op, future))
+            if future is not None: futures.append(future)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush_loop())
+        return list(await asyncio.gather(*futures)) if futures else []
+
+    async def _flush_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self.commit_interval > 0: await asyncio.sleep(self.commit_interval) # Let concurrent writers join the batch
+        while self._pending_writes:
+            batch = self._pending_writes[:self.max_batch_size]
+            del self._pending_writes[:self.max_batch_size]
+            ops = [op for op, _ in batch]
+            try:
+                results: List[Union[_WriteResult, BaseException]] = await loop.run_in_executor(self._writer, self._write_batch_sync, ops)
+                self._write_stats["transactions"] += 1
+            except Exception as batch_err:
+                # Retry individually so one bad operation does not fail the others
+                logger.error(f"SQLite task store batch of {len(ops)} writes failed ({batch_err}); retrying individually.")
+                self._write_stats["failed_transactions"] += 1
+                results = []
+                for op in ops:
+                    try:
+                        results.extend(await loop.run_in_executor(self._writer, self._write_batch_sync, [op]))
+                        self._write_stats["transactions"] += 1
+                    except Exception as op_err:
+                        logger.error(f"SQLite task store write failed: {op_err} (SQL: {op[0].split()[0]} ...)")
+                        self._write_stats["failed_transactions"] += 1
+                        results.append(op_err)
+            self._write_stats["operations"] += len(ops)
+            self._write_stats["max_batch"] = max(self._write_stats["max_batch"], len(ops))
+            for (_, future), result in zip(batch, results):
+                if future is None or future.done(): continue
+                if isinstance(result, BaseException): future.set_exception(result)
+                else: future.set_result(result)
+
+    async def flush(self) -> None:
+        """Waits until all queued writes (including fire-and-forget event writes) are committed."""
+        while self._flush_task is not None and not self._flush_task.done():
+            await asyncio.shield(self._flush_task)
+
+    def get_write_stats(self) -> Dict[str, int]:
+        """Returns counters of committed transactions, written operations, failures and the largest batch."""
+        return {**self._write_stats, "pending": len(self._pending_writes)}
+
+    # --- Reads ---
+    async def _read(self, sql: str, params: Sequence[Any]) -> List[Tuple[Any, ...]]:
+        await self._ensure_open()
+        def _query() -> List[Tuple[Any, ...]]:
+            assert self._read_conn is not None
+            return self._read_conn.execute(sql, params).fetchall()
+        return await asyncio.get_running_loop().run_in_executor(self._reader, _query)
+
+    @staticmethod
+    def _row_to_context(row: Tuple[Any, ...]) -> TaskContext:
+        task_id, state, created_at, updated_at = row
+        return TaskContext(
+            task_id=task_id,
+            current_state=_parse_state(state),
+            created_at=datetime.datetime.fromisoformat(created_at),
+            updated_at=datetime.datetime.fromisoformat(updated_at),
+        )
+
+    def _cache_put(self, task_context: TaskContext) -> None:
+        if self.cache_size == 0: return
+        self._cache[task_context.task_id] = task_context
+        self._cache.move_to_end(task_context.task_id)
+        while len(self._cache) > self.cache_size: self._cache.popitem(last=False)
+
+    # --- BaseTaskStore Implementation ---
+    async def get_task(self, task_id: str) -> Optional[TaskContext]:
+        task_context = self._cache.get(task_id)
+        if task_context is not None:
+            self._cache.move_to_end(task_id)
+            return task_context
+        logger.debug(f"Loading task '{task_id}' from SQLite task store.")
+        rows = await self._read("SELECT task_id, state, created_at, updated_at FROM tasks WHERE task_id = ?", (task_id,))
+        if not rows: return None
+        # Another coroutine may have loaded it while we were reading
+        task_context = self._cache.get(task_id) or self._row_to_context(rows[0])
+        self._cache_put(task_context)
+        return task_context
+
+    async def create_task(self, task_id: str) -> TaskContext:
+        existing = await self.get_task(task_id)
+        if existing is not None:
+            logger.warning(f"Task '{task_id}' already exists in SQLiteTaskStore. Returning existing.")
+            return existing
+
+        logger.info(f"Creating new task '{task_id}' in SQLiteTaskStore.")
+        new_task_context = TaskContext(task_id=task_id, current_state=TaskState.SUBMITTED)
+        await self._submit_writes([(
+            "INSERT OR IGNORE INTO tasks (task_id, state, created_at, updated_at) VALUES (?, ?, ?, ?)",
+            (task_id, _state_value(new_task_context.current_state), _to_db_timestamp(new_task_context.created_at), _to_db_timestamp(new_task_context.updated_at)),
+        )])
+        self._cache_put(new_task_context)
+        self._listeners.setdefault(task_id, [])
+        return new_task_context
+
+    async def update_task_state(self, task_id: str, new_state: Union[TaskState, str]) -> Optional[TaskContext]:
+        task_context = await self.get_task(task_id)
+        if task_context is None:
+            logger.warning(f"Task '{task_id}' not found for state update.")
+            return None
+
+        # Validate and apply the transition on a copy so readers never see an uncommitted state
+        original_state = task_context.current_state
+        updated_context = dataclasses.replace(task_context)
+        try:
+            updated_context.update_state(new_state)
+        except InvalidStateTransitionError:
+            return None
+        except ValueError:
+            logger.error(f"Invalid state value '{new_state}' provided for task '{task_id}'.")
+            return None
+
+        # Only applies if nobody else changed the state since it was read
+        results = await self._submit_writes([(
+            "UPDATE tasks SET state = ?, updated_at = ? WHERE task_id = ? AND state = ?",
+            (_state_value(updated_context.current_state), _to_db_timestamp(updated_context.updated_at), task_id, _state_value(original_state)),
+        )])
+        if results[0][0] == 0:
+            logger.warning(f"Task '{task_id}' was changed or deleted concurrently; state update from {original_state} to {new_state} rejected.")
+            # The cached context is stale; drop it unless a newer one already replaced it
+            if self._cache.get(task_id) is task_context: self._cache.pop(task_id, None)
+            return None
+        task_context = updated_context
+        self._cache_put(task_context)
+
+        try:
+            await self.notify_status_update(task_id, task_context.current_state)
+        except Exception as notify_err:
+            logger.error(f"Failed to notify listeners for task '{task_id}' state change from {original_state} to {new_state}: {notify_err}", exc_info=True)
+        return task_context
+
+    async def delete_task(self, task_id: str) -> bool:
+        existed = await self.get_task(task_id) is not None
+        await self._submit_writes([
+            ("DELETE FROM task_events WHERE task_id = ?", (task_id,)),
+            ("DELETE FROM tasks WHERE task_id = ?", (task_id,)),
+        ])
+        self._cache.pop(task_id, None)
+        self._listeners.pop(task_id, None)
+        self._discard_event_log(task_id)
+        if existed: logger.info(f"Deleted task '{task_id}' from SQLiteTaskStore.")
+        else: logger.warning(f"Task '{task_id}' not found for deletion.")
+        return existed
+
+    # --- Queries Using the Indexed Columns ---
+    async def list_tasks(
+        self,
+        states: Optional[Iterable[Union[TaskState, str]]] = None,
+        updated_before: Optional[datetime.datetime] = None,
+        limit: int = 100,
+    ) -> List[TaskContext]:
+        """Lists tasks (least recently updated first), optionally filtered by state and last update time."""
+        await self.flush()
+        clauses: List[str] = []; params: List[Any] = []
+        state_values = [_state_value(state) for state in states] if states is not None else None
+        if state_values is not None:
+            if not state_values: return []
+            clauses.append(f"state IN ({', '.join('?' for _ in state_values)})"); params.extend(state_values)
+        if updated_before is not None:
+            clauses.append("updated_at < ?"); params.append(_to_db_timestamp(updated_before))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = await self._read(f"SELECT task_id, state, created_at, updated_at FROM tasks {where} ORDER BY updated_at LIMIT ?", (*params, limit))
+        return [self._cache.get(row[0]) or self._row_to_context(row) for row in rows]
+
+    async def delete_terminal_tasks(self, older_than: datetime.timedelta) -> int:
+        """Deletes tasks in a terminal state whose last update is older than `older_than`. Returns the count."""
+        cutoff = datetime.datetime.now(datetime.timezone.utc) - older_than
+        expired = await self.list_tasks(states=TERMINAL_STATES, updated_before=cutoff, limit=-1)
+        ops: List[_WriteOp] = []
+        for task_context in expired:
+            ops.append(("DELETE FROM task_events WHERE task_id = ?", (task_context.task_id,)))
+            ops.append(("DELETE FROM tasks WHERE task_id = ?", (task_context.task_id,)))
+            self._cache.pop(task_context.task_id, None)
+            self._listeners.pop(task_context.task_id, None)
+            self._discard_event_log(task_context.task_id)
+        if ops: await self._submit_writes(ops)
+        if expired: logger.info(f"Deleted {len(expired)} terminal tasks older than {older_than} from SQLiteTaskStore.")
+        return len(expired)
+
+    async def get_events(self, task_id: str) -> List[Dict[str, Any]]:
+        """Returns the persisted events of a task in publication order, as dicts with 'event_type' and 'payload' (JSON string)."""
+        await self.flush()
+        rows = await self._read("SELECT event_type, payload FROM task_events WHERE task_id = ? ORDER BY id", (task_id,))
+        return [{"event_type": event_type, "payload": payload} for event_type, payload in rows]
+
+    # --- Event Persistence ---
+    @staticmethod
+    def _event_write_op(task_id: str, event: A2AEvent) -> _WriteOp:
+        return (
+            "INSERT INTO task_events (task_id, event_type, payload, created_at) VALUES (?, ?, ?, ?)",
+            (task_id, type(event).__name__, event.model_dump_json(by_alias=True), _to_db_timestamp(datetime.datetime.now(datetime.timezone.utc))),
+        )
+
+    @staticmethod
+    def _decode_event(task_id: str, event_id: int, event_type: str, payload: str) -> Optional[A2AEvent]:
+        model = _EVENT_MODELS.get(event_type)
+        if model is None:
+            logger.error(f"Unknown event type '{event_type}' stored for task '{task_id}'; skipping.")
+            return None
+        try:
+            return model.model_validate_json(payload)
+        except Exception as e:
+            logger.error(f"Failed to decode stored {event_type} {event_id} for task '{task_id}': {e}")
+            return None
+
+    async def _notify_listeners(self, task_id: str, event: A2AEvent, event_id: Optional[int] = None):
+        if event_id is None and self.persist_events and hasattr(event, "model_dump_json"):
+            try:
+                # The row ID is the event ID, so IDs survive restarts
+                event_id = (await self._submit_writes([self._event_write_op(task_id, event)]))[0][1]
+            except Exception as e:
+                logger.error(f"Failed to persist event {type(event).__name__} for task '{task_id}': {e}", exc_info=True)
+        await super()._notify_listeners(task_id, event, event_id)
+
+    async def get_events_since(self, task_id: str, last_event_id: int) -> List[Tuple[int, A2AEvent]]:
+        """Returns stored events of the task after `last_event_id` (at most the last `event_log_size`)."""
+        if not self.persist_events: return await super().get_events_since(task_id, last_event_id)
+        if self.event_log_size == 0: return []
+        rows = await self._read(
+            "SELECT id, event_type, payload FROM task_events WHERE task_id = ? AND id > ? ORDER BY id DESC LIMIT ?",
+            (task_id, last_event_id, self.event_log_size),
+        )
+        events: List[Tuple[int, A2AEvent]] = []
+        for event_id, event_type, payload in reversed(rows):
+            event = self._decode_event(task_id, event_id, event_type, payload)
+            if event is not None: events.append((event_id, event))
+        return events
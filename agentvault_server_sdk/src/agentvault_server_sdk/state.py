@@ -5,10 +5,14 @@ within the AgentVault Server SDK.
 
 import logging
 import datetime
+import time
+import inspect
 import asyncio # Import asyncio directly
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Any, Union, List
+from enum import Enum
+from collections import deque
+from typing import Optional, Dict, Any, Union, List, Callable, Awaitable, Tuple, Deque, Iterable
 
 from .exceptions import InvalidStateTransitionError
 
@@ -65,6 +69,71 @@ else:
     TERMINAL_STATES = {"COMPLETED", "FAILED", "CANCELED"}
 
 
+# Listener Queue Overflow Handling
+class ListenerOverflowPolicy(str, Enum):
+    """What to do when an event is delivered to a listener queue that is full."""
+    BLOCK = "block"                       # Wait up to the block timeout for space, then drop the new event
+    DROP_OLDEST = "drop_oldest"           # Discard the oldest queued event to make room
+    DROP_NEWEST = "drop_newest"           # Discard the new event
+    COALESCE_STATUS = "coalesce_status"   # Keep only the latest queued status event; drop oldest if still full
+    DISCONNECT = "disconnect"             # Remove the listener and hand it LISTENER_DISCONNECTED
+
+
+class _ListenerDisconnected:
+    """Type of the LISTENER_DISCONNECTED sentinel."""
+    def __repr__(self) -> str:
+        return "LISTENER_DISCONNECTED"
+
+# Put on a listener queue (after discarding its pending events) when the store
+# disconnects a slow consumer under ListenerOverflowPolicy.DISCONNECT.
+# Consumers should stop reading when they receive it.
+LISTENER_DISCONNECTED = _ListenerDisconnected()
+
+
+class ListenerQueue(asyncio.Queue):
+    """
+    asyncio.Queue carrying its own overflow policy and delivery counters.
+
+    Created via the task store's `create_listener_queue`. Plain asyncio.Queue
+    instances can still be registered as listeners; they use the store's
+    default policy, and stay unbounded unless created with a maxsize.
+    """
+    def __init__(
+        self,
+        maxsize: int = 0,
+        policy: ListenerOverflowPolicy = ListenerOverflowPolicy.BLOCK,
+        block_timeout: float = 1.0,
+    ):
+        super().__init__(maxsize=maxsize)
+        self.policy = ListenerOverflowPolicy(policy)
+        self.block_timeout = block_timeout
+        self.dropped_events = 0
+        self.coalesced_events = 0
+        self.disconnected = False
+
+
+def _is_status_event(event: Any) -> bool:
+    return _MODELS_AVAILABLE and isinstance(event, TaskStatusUpdateEvent)
+
+
+def _take_queued_item(queue: asyncio.Queue) -> Any:
+    """Removes the next item from a queue on the consumer's behalf, marking it done so `Queue.join()` is not blocked."""
+    item = queue.get_nowait()
+    queue.task_done()
+    return item
+
+
+def _discard_queued_status_events(queue: asyncio.Queue) -> int:
+    """Removes pending status events from a queue, keeping the order of the rest. Returns the number removed."""
+    pending = []
+    while True:
+        try: pending.append(_take_queued_item(queue))
+        except asyncio.QueueEmpty: break
+    kept = [item for item in pending if not _is_status_event(item)]
+    for item in kept: queue.put_nowait(item)
+    return len(pending) - len(kept)
+
+
 @dataclass
 class TaskContext:
     """Holds the basic context and state for a single task."""
@@ -186,65 +255,133 @@ class BaseTaskStore(ABC):
         """Notify listeners about a new or updated artifact."""
         pass
 
+    # --- Event Log Methods ---
+    async def get_events_since(self, task_id: str, last_event_id: int) -> List[Tuple[int, A2AEvent]]:
+        """
+        Returns logged events of a task with an event ID greater than `last_event_id`, oldest first.
 
-class InMemoryTaskStore(BaseTaskStore):
-    """
-    Simple in-memory implementation of the task store using a dictionary.
-    Suitable for single-process development and testing. Not persistent.
-    """
-    def __init__(self):
-        self._tasks: Dict[str, TaskContext] = {}
-        self._listeners: Dict[str, List[asyncio.Queue]] = {} # task_id -> list of queues
-        logger.info("Initialized InMemoryTaskStore.")
+        Used to replay missed events to SSE subscribers resuming with `Last-Event-ID`.
+        Stores without an event log return an empty list.
+        """
+        return []
 
-    async def get_task(self, task_id: str) -> Optional[TaskContext]:
-        logger.debug(f"Getting task '{task_id}' from InMemoryTaskStore.")
-        return self._tasks.get(task_id)
+    def get_event_id(self, task_id: str, event: A2AEvent) -> Optional[int]:
+        """Returns the event ID assigned to a published event while it is still logged, otherwise None."""
+        return None
 
-    async def create_task(self, task_id: str) -> TaskContext:
-        if task_id in self._tasks:
-            logger.warning(f"Task '{task_id}' already exists in InMemoryTaskStore. Returning existing.")
-            return self._tasks[task_id]
+    # --- Waiting ---
+    async def wait_for_state(
+        self, task_id: str, states: Iterable[Union[TaskState, str]], timeout: Optional[float] = None
+    ) -> Optional[TaskContext]:
+        """
+        Waits until the task's state is one of `states`, without polling.
 
-        logger.info(f"Creating new task '{task_id}' in InMemoryTaskStore.")
-        new_task_context = TaskContext(task_id=task_id, current_state=TaskState.SUBMITTED)
-        self._tasks[task_id] = new_task_context
-        self._listeners[task_id] = [] # Initialize listener list
-        return new_task_context
+        Returns the task's context as soon as its state matches (immediately if it
+        already does), or its current context once `timeout` seconds have passed
+        (None = wait indefinitely); check `current_state` to tell the two apart.
+        Returns None if the task does not exist or is deleted while waiting.
+        Only changes published through `update_task_state`/`notify_status_update`
+        are noticed.
 
-    async def update_task_state(self, task_id: str, new_state: Union[TaskState, str]) -> Optional[TaskContext]:
-        task_context = self._tasks.get(task_id)
-        if task_context:
-            try:
-                original_state = task_context.current_state
-                task_context.update_state(new_state) # Calls context update (which includes validation)
-                try:
-                    await self.notify_status_update(task_id, task_context.current_state)
-                except Exception as notify_err:
-                    logger.error(f"Failed to notify listeners for task '{task_id}' state change from {original_state} to {new_state}: {notify_err}", exc_info=True)
-                return task_context
-            except InvalidStateTransitionError as e:
-                 return None
-            except ValueError as e:
-                 logger.error(f"Invalid state value '{new_state}' provided for task '{task_id}'.")
-                 return None
-        else:
-            logger.warning(f"Task '{task_id}' not found for state update.")
-            return None
+        This default waits for status events on a listener queue; stores may
+        override it with a cheaper mechanism.
+        """
+        wanted = frozenset(states)
+        deadline = None if timeout is None else asyncio.get_running_loop().time() + timeout
+        queue: asyncio.Queue = asyncio.Queue()
+        await self.add_listener(task_id, queue) # Before reading the state, so no change is missed
+        try:
+            while True:
+                task_context = await self.get_task(task_id)
+                if task_context is None or task_context.current_state in wanted: return task_context
+                while True:
+                    remaining = None if deadline is None else deadline - asyncio.get_running_loop().time()
+                    if remaining is not None and remaining <= 0: return task_context
+                    try: event = await asyncio.wait_for(queue.get(), remaining)
+                    except asyncio.TimeoutError: return await self.get_task(task_id)
+                    if event is LISTENER_DISCONNECTED: await self.add_listener(task_id, queue); break
+                    if _is_status_event(event): break
+        finally:
+            await self.remove_listener(task_id, queue)
+
+
+class LocalListenerTaskStore(BaseTaskStore):
+    """
+    Partial BaseTaskStore implementation that keeps listener queues in this
+    process and delivers events to them with bounded-queue overflow handling.
 
-    async def delete_task(self, task_id: str) -> bool:
-        # --- MODIFIED: Correctly remove from both dicts ---
-        task_deleted = self._tasks.pop(task_id, None) is not None
-        listeners_deleted = self._listeners.pop(task_id, None) is not None
-        if task_deleted:
-            logger.info(f"Deleted task '{task_id}' from InMemoryTaskStore.")
-            if listeners_deleted:
-                logger.debug(f"Also removed listener list for deleted task '{task_id}'.")
-            return True
-        else:
-            logger.warning(f"Task '{task_id}' not found for deletion.")
-            return False
-        # --- END MODIFIED ---
+    Every published event is also assigned a per-task sequence number and kept
+    in a bounded per-task event log (the last `event_log_size` events), so that
+    subscribers can resume after a dropped connection (see `get_events_since`).
+
+    Subclasses implement task storage (get_task, create_task, update_task_state,
+    delete_task), call `_discard_event_log` when a task is removed, and may
+    override `_accepts_events` to skip notifications for tasks that no longer exist.
+    """
+    def __init__(
+        self,
+        listener_queue_size: int = 100,
+        listener_overflow_policy: Union[ListenerOverflowPolicy, str] = ListenerOverflowPolicy.BLOCK,
+        listener_block_timeout: float = 1.0,
+        event_log_size: int = 100,
+    ):
+        """
+        Args:
+            listener_queue_size: Default maxsize of queues made by `create_listener_queue` (0 = unbounded).
+            listener_overflow_policy: Policy for full listener queues that do not carry their own
+                (i.e. plain asyncio.Queue listeners) and default for `create_listener_queue`.
+            listener_block_timeout: Seconds to wait for space under ListenerOverflowPolicy.BLOCK.
+            event_log_size: Number of recent events kept per task for replay (0 disables the log).
+        """
+        if event_log_size < 0: raise ValueError("event_log_size must not be negative.")
+        self._listeners: Dict[str, List[asyncio.Queue]] = {} # task_id -> list of queues
+        self.listener_queue_size = listener_queue_size
+        self.listener_overflow_policy = ListenerOverflowPolicy(listener_overflow_policy)
+        self.listener_block_timeout = listener_block_timeout
+        self._listener_stats: Dict[str, int] = {"delivered": 0, "dropped": 0, "coalesced": 0, "disconnected": 0}
+        self.event_log_size = event_log_size
+        self._event_logs: Dict[str, Deque[Tuple[int, A2AEvent]]] = {} # task_id -> (event_id, event), oldest first
+        self._event_log_ids: Dict[str, Dict[int, int]] = {} # task_id -> id(event) -> event_id, for logged events
+        self._last_event_seqs: Dict[str, int] = {}
+        self._state_changed: Dict[str, asyncio.Event] = {} # task_id -> set on the task's next status event or removal
+        self._state_waiters: Dict[str, int] = {} # task_id -> number of wait_for_state calls
+
+    def _accepts_events(self, task_id: str) -> bool:
+        """Whether events for the task should still be delivered."""
+        return True
+
+    # --- Waiting Implementation ---
+    def _signal_state_change(self, task_id: str) -> None:
+        """Wakes the wait_for_state calls of a task; they re-read its state."""
+        state_changed = self._state_changed.pop(task_id, None)
+        if state_changed is not None: state_changed.set()
+
+    async def wait_for_state(
+        self, task_id: str, states: Iterable[Union[TaskState, str]], timeout: Optional[float] = None
+    ) -> Optional[TaskContext]:
+        """
+        See BaseTaskStore.wait_for_state. Waiters of a task share one asyncio.Event
+        that is set by the task's next status event (or its removal) and then
+        replaced, so waiting needs no listener queue and no polling.
+        """
+        wanted = frozenset(states)
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        self._state_waiters[task_id] = self._state_waiters.get(task_id, 0) + 1
+        try:
+            while True:
+                state_changed = self._state_changed.get(task_id)
+                if state_changed is None: state_changed = self._state_changed[task_id] = asyncio.Event()
+                task_context = await self.get_task(task_id) # Read after taking the event, so no change is missed
+                if task_context is None or task_context.current_state in wanted: return task_context
+                remaining = None if deadline is None else deadline - loop.time()
+                if remaining is not None and remaining <= 0: return task_context
+                try: await asyncio.wait_for(state_changed.wait(), remaining)
+                except asyncio.TimeoutError: return await self.get_task(task_id)
+        finally:
+            waiters = self._state_waiters.pop(task_id) - 1
+            if waiters: self._state_waiters[task_id] = waiters
+            else: self._state_changed.pop(task_id, None)
 
     # --- Listener Management Implementation ---
     async def add_listener(self, task_id: str, listener_queue: asyncio.Queue):
@@ -273,12 +410,63 @@ class InMemoryTaskStore(BaseTaskStore):
         logger.debug(f"Retrieved {len(listeners)} listeners for task '{task_id}'.")
         return list(listeners) # Return a copy
 
+    def create_listener_queue(
+        self,
+        maxsize: Optional[int] = None,
+        policy: Optional[Union[ListenerOverflowPolicy, str]] = None,
+        block_timeout: Optional[float] = None,
+    ) -> ListenerQueue:
+        """Creates a bounded listener queue, using the store defaults for unspecified settings."""
+        return ListenerQueue(
+            maxsize=self.listener_queue_size if maxsize is None else maxsize,
+            policy=self.listener_overflow_policy if policy is None else ListenerOverflowPolicy(policy),
+            block_timeout=self.listener_block_timeout if block_timeout is None else block_timeout,
+        )
+
+    def get_listener_stats(self) -> Dict[str, int]:
+        """Returns store-wide counters of delivered, dropped and coalesced events and disconnected listeners."""
+        return dict(self._listener_stats)
+
+    # --- Event Log Implementation ---
+    def _record_event(self, task_id: str, event: A2AEvent, event_id: Optional[int] = None) -> Optional[int]:
+        """Appends an event to the task's log, assigning the next sequence number unless `event_id` is given."""
+        if self.event_log_size == 0: return None
+        if event_id is None: event_id = self._last_event_seqs.get(task_id, 0) + 1
+        self._last_event_seqs[task_id] = event_id
+        event_log = self._event_logs.setdefault(task_id, deque())
+        logged_ids = self._event_log_ids.setdefault(task_id, {})
+        if len(event_log) >= self.event_log_size:
+            _, oldest_event = event_log.popleft()
+            logged_ids.pop(id(oldest_event), None)
+        event_log.append((event_id, event))
+        logged_ids[id(event)] = event_id
+        return event_id
+
+    def _discard_event_log(self, task_id: str) -> None:
+        self._signal_state_change(task_id) # The task is being removed
+        self._event_logs.pop(task_id, None)
+        self._event_log_ids.pop(task_id, None)
+        self._last_event_seqs.pop(task_id, None)
+
+    async def get_events_since(self, task_id: str, last_event_id: int) -> List[Tuple[int, A2AEvent]]:
+        event_log = self._event_logs.get(task_id)
+        if not event_log: return []
+        if event_log[0][0] > last_event_id + 1:
+            logger.warning(f"Events {last_event_id + 1}-{event_log[0][0] - 1} of task '{task_id}' are no longer in the event log and cannot be replayed.")
+        return [(event_id, event) for event_id, event in event_log if event_id > last_event_id]
+
+    def get_event_id(self, task_id: str, event: A2AEvent) -> Optional[int]:
+        logged_ids = self._event_log_ids.get(task_id)
+        return logged_ids.get(id(event)) if logged_ids else None
+
     # --- Event Notification Implementation ---
-    async def _notify_listeners(self, task_id: str, event: A2AEvent):
-        """Internal helper to send an event to all listeners for a task."""
-        if task_id not in self._tasks:
+    async def _notify_listeners(self, task_id: str, event: A2AEvent, event_id: Optional[int] = None):
+        """Internal helper to log an event and send it to all listeners for a task."""
+        if not self._accepts_events(task_id):
             logger.debug(f"Task '{task_id}' deleted before notification could be sent for event {type(event).__name__}.")
             return
+        self._record_event(task_id, event, event_id)
+        if _is_status_event(event): self._signal_state_change(task_id)
 
         listeners = await self.get_listeners(task_id)
         if not listeners:
@@ -286,13 +474,73 @@ class InMemoryTaskStore(BaseTaskStore):
             return
 
         logger.info(f"Notifying {len(listeners)} listeners for task '{task_id}' with event: {type(event).__name__}")
-        put_tasks = [listener.put(event) for listener in listeners]
+        put_tasks = [self._deliver_to_listener(task_id, listener, event) for listener in listeners]
         results = await asyncio.gather(*put_tasks, return_exceptions=True)
 
         for i, result in enumerate(results):
             if isinstance(result, Exception):
                 logger.error(f"Failed to put event onto listener queue {i} for task '{task_id}': {result}", exc_info=result)
 
+    def _disconnect_listeners(self, task_id: str) -> None:
+        """Deregisters all listeners of a task, handing each `LISTENER_DISCONNECTED` so subscribers stop."""
+        for listener in self._listeners.pop(task_id, None) or []:
+            if listener.full():
+                _take_queued_item(listener) # Make room for the sentinel
+                self._count_listener_event(listener, "dropped")
+            listener.put_nowait(LISTENER_DISCONNECTED)
+            if isinstance(listener, ListenerQueue): listener.disconnected = True
+            self._listener_stats["disconnected"] += 1
+
+    def _count_listener_event(self, listener: asyncio.Queue, counter: str, amount: int = 1) -> None:
+        self._listener_stats[counter] += amount
+        if isinstance(listener, ListenerQueue):
+            if counter == "dropped": listener.dropped_events += amount
+            elif counter == "coalesced": listener.coalesced_events += amount
+
+    async def _deliver_to_listener(self, task_id: str, listener: asyncio.Queue, event: A2AEvent):
+        """Puts an event onto one listener queue, applying its overflow policy if the queue is full."""
+        if isinstance(listener, ListenerQueue): policy, block_timeout = listener.policy, listener.block_timeout
+        else: policy, block_timeout = self.listener_overflow_policy, self.listener_block_timeout
+
+        if policy is ListenerOverflowPolicy.COALESCE_STATUS and _is_status_event(event):
+            coalesced = _discard_queued_status_events(listener)
+            if coalesced: self._count_listener_event(listener, "coalesced", coalesced)
+
+        try:
+            listener.put_nowait(event)
+            self._listener_stats["delivered"] += 1
+            return
+        except asyncio.QueueFull:
+            pass
+
+        if policy is ListenerOverflowPolicy.BLOCK:
+            try:
+                await asyncio.wait_for(listener.put(event), timeout=block_timeout)
+                self._listener_stats["delivered"] += 1
+            except asyncio.TimeoutError:
+                logger.warning(f"Listener queue for task '{task_id}' still full after {block_timeout}s. Dropping {type(event).__name__}.")
+                self._count_listener_event(listener, "dropped")
+        elif policy is ListenerOverflowPolicy.DROP_NEWEST:
+            logger.debug(f"Listener queue for task '{task_id}' full. Dropping new {type(event).__name__}.")
+            self._count_listener_event(listener, "dropped")
+        elif policy in (ListenerOverflowPolicy.DROP_OLDEST, ListenerOverflowPolicy.COALESCE_STATUS):
+            dropped_event = _take_queued_item(listener)
+            listener.put_nowait(event)
+            logger.debug(f"Listener queue for task '{task_id}' full. Dropped oldest {type(dropped_event).__name__}.")
+            self._count_listener_event(listener, "dropped")
+            self._listener_stats["delivered"] += 1
+        elif policy is ListenerOverflowPolicy.DISCONNECT:
+            logger.warning(f"Listener queue for task '{task_id}' full. Disconnecting slow consumer.")
+            await self.remove_listener(task_id, listener)
+            discarded = 0
+            while True:
+                try: _take_queued_item(listener); discarded += 1
+                except asyncio.QueueEmpty: break
+            listener.put_nowait(LISTENER_DISCONNECTED)
+            if isinstance(listener, ListenerQueue): listener.disconnected = True
+            self._count_listener_event(listener, "dropped", discarded + 1)
+            self._listener_stats["disconnected"] += 1
+
     async def notify_status_update(
         self,
         task_id: str,
@@ -374,3 +622,220 @@ class InMemoryTaskStore(BaseTaskStore):
 
         if event:
             await self._notify_listeners(task_id, event)
+
+
+# Called with the task context and the eviction reason ("ttl" or "capacity") before a task is evicted
+EvictionCallback = Callable[[TaskContext, str], Union[Awaitable[None], None]]
+
+
+class InMemoryTaskStore(LocalListenerTaskStore):
+    """
+    Simple in-memory implementation of the task store using a dictionary.
+    Suitable for single-process development and testing. Not persistent.
+
+    Retention is optional: tasks that reached a terminal state through
+    `update_task_state` can be evicted `terminal_task_ttl` seconds later, and
+    `max_tasks` caps the number of stored tasks by evicting terminal tasks,
+    earliest finished first. Tasks still in progress are only evicted (least
+    recently used first) with `evict_active_tasks`; otherwise the store grows
+    past `max_tasks` while all tasks are in progress. Listeners of an evicted
+    task receive `LISTENER_DISCONNECTED`.
+    Expired tasks are removed by `evict_expired_tasks`, which the background
+    sweeper started with `start_sweeper` runs every `sweep_interval` seconds.
+
+    Bounding listener queues is opt-in: only queues made by `create_listener_queue`
+    (or other queues with a maxsize) are bounded. A plain `asyncio.Queue()` passed
+    to `add_listener` grows without limit when its consumer falls behind.
+    """
+    def __init__(
+        self,
+        listener_queue_size: int = 100,
+        listener_overflow_policy: Union[ListenerOverflowPolicy, str] = ListenerOverflowPolicy.BLOCK,
+        listener_block_timeout: float = 1.0,
+        terminal_task_ttl: Optional[float] = None,
+        max_tasks: Optional[int] = None,
+        sweep_interval: float = 60.0,
+        event_log_size: int = 100,
+        evict_active_tasks: bool = False,
+    ):
+        """
+        Args:
+            listener_queue_size, listener_overflow_policy, listener_block_timeout, event_log_size:
+                See LocalListenerTaskStore.
+            terminal_task_ttl: Seconds to keep a task after it reaches a terminal state (None = forever).
+            max_tasks: Maximum number of stored tasks (None = unlimited).
+            evict_active_tasks: Whether `max_tasks` may evict tasks that have not reached a terminal state.
+            sweep_interval: Seconds between runs of the background sweeper.
+        """
+        if max_tasks is not None and max_tasks < 1: raise ValueError("max_tasks must be at least 1 or None.")
+        if sweep_interval <= 0: raise ValueError("sweep_interval must be positive.")
+        super().__init__(
+            listener_queue_size=listener_queue_size,
+            listener_overflow_policy=listener_overflow_policy,
+            listener_block_timeout=listener_block_timeout,
+            event_log_size=event_log_size,
+        )
+        self._tasks: Dict[str, TaskContext] = {} # Insertion order doubles as LRU order (see _touch)
+        self.terminal_task_ttl = terminal_task_ttl
+        self.max_tasks = max_tasks
+        self.evict_active_tasks = evict_active_tasks
+        self.sweep_interval = sweep_interval
+        self._terminal_since: Dict[str, float] = {} # task_id -> monotonic time it became terminal, in that order
+        self._eviction_callbacks: List[EvictionCallback] = []
+        self._eviction_stats: Dict[str, int] = {"evicted_ttl": 0, "evicted_capacity": 0, "callback_errors": 0, "sweeps": 0}
+        self._sweeper_task: Optional[asyncio.Task] = None
+        logger.info("Initialized InMemoryTaskStore.")
+
+    def _accepts_events(self, task_id: str) -> bool:
+        return task_id in self._tasks
+
+    def _touch(self, task_id: str) -> None:
+        """Marks a task as most recently used by moving it to the end of the dict."""
+        task_context = self._tasks.pop(task_id, None)
+        if task_context is not None: self._tasks[task_id] = task_context
+
+    async def get_task(self, task_id: str) -> Optional[TaskContext]:
+        logger.debug(f"Getting task '{task_id}' from InMemoryTaskStore.")
+        if self.max_tasks is not None: self._touch(task_id)
+        return self._tasks.get(task_id)
+
+    async def create_task(self, task_id: str) -> TaskContext:
+        if task_id in self._tasks:
+            logger.warning(f"Task '{task_id}' already exists in InMemoryTaskStore. Returning existing.")
+            return self._tasks[task_id]
+
+        logger.info(f"Creating new task '{task_id}' in InMemoryTaskStore.")
+        new_task_context = TaskContext(task_id=task_id, current_state=TaskState.SUBMITTED)
+        self._tasks[task_id] = new_task_context
+        self._listeners[task_id] = [] # Initialize listener list
+        if self.max_tasks is not None and len(self._tasks) > self.max_tasks:
+            await self._evict_over_capacity(keep_task_id=task_id)
+        return new_task_context
+
+    async def update_task_state(self, task_id: str, new_state: Union[TaskState, str]) -> Optional[TaskContext]:
+        task_context = self._tasks.get(task_id)
+        if task_context:
+            try:
+                original_state = task_context.current_state
+                task_context.update_state(new_state) # Calls context update (which includes validation)
+                if self.max_tasks is not None: self._touch(task_id)
+                if task_context.current_state in TERMINAL_STATES and task_id not in self._terminal_since:
+                    self._terminal_since[task_id] = time.monotonic()
+                try:
+                    await self.notify_status_update(task_id, task_context.current_state)
+                except Exception as notify_err:
+                    logger.error(f"Failed to notify listeners for task '{task_id}' state change from {original_state} to {new_state}: {notify_err}", exc_info=True)
+                return task_context
+            except InvalidStateTransitionError as e:
+                 return None
+            except ValueError as e:
+                 logger.error(f"Invalid state value '{new_state}' provided for task '{task_id}'.")
+                 return None
+        else:
+            logger.warning(f"Task '{task_id}' not found for state update.")
+            return None
+
+    async def delete_task(self, task_id: str) -> bool:
+        # --- MODIFIED: Correctly remove from both dicts ---
+        task_deleted = self._tasks.pop(task_id, None) is not None
+        listeners_deleted = self._listeners.pop(task_id, None) is not None
+        self._terminal_since.pop(task_id, None)
+        self._discard_event_log(task_id)
+        if task_deleted:
+            logger.info(f"Deleted task '{task_id}' from InMemoryTaskStore.")
+            if listeners_deleted:
+                logger.debug(f"Also removed listener list for deleted task '{task_id}'.")
+            return True
+        else:
+            logger.warning(f"Task '{task_id}' not found for deletion.")
+            return False
+        # --- END MODIFIED ---
+
+    # --- Retention / Eviction ---
+    def add_eviction_callback(self, callback: EvictionCallback) -> None:
+        """
+        Registers a callback run before a task is evicted (sync or async).
+
+        It receives the TaskContext and the reason ("ttl" or "capacity"), e.g. to
+        persist results. Exceptions are logged and do not prevent eviction.
+        """
+        self._eviction_callbacks.append(callback)
+
+    def remove_eviction_callback(self, callback: EvictionCallback) -> None:
+        """Unregisters a previously added eviction callback."""
+        try: self._eviction_callbacks.remove(callback)
+        except ValueError: logger.warning("Attempted to remove an eviction callback that is not registered.")
+
+    def get_eviction_stats(self) -> Dict[str, int]:
+        """Returns eviction counters plus the current number of stored and terminal (expiring) tasks."""
+        return {**self._eviction_stats, "tasks": len(self._tasks), "terminal_tasks": len(self._terminal_since)}
+
+    async def _evict_task(self, task_id: str, reason: str) -> None:
+        task_context = self._tasks.get(task_id)
+        if task_context is not None:
+            for callback in list(self._eviction_callbacks):
+                try:
+                    result = callback(task_context, reason)
+                    if inspect.isawaitable(result): await result
+                except Exception as e:
+                    self._eviction_stats["callback_errors"] += 1
+                    logger.error(f"Eviction callback failed for task '{task_id}' (reason: {reason}): {e}", exc_info=True)
+        self._tasks.pop(task_id, None)
+        self._disconnect_listeners(task_id)
+        self._terminal_since.pop(task_id, None)
+        self._discard_event_log(task_id)
+        if task_context is not None:
+            self._eviction_stats[f"evicted_{reason}"] += 1
+            logger.debug(f"Evicted task '{task_id}' from InMemoryTaskStore (reason: {reason}).")
+
+    async def _evict_over_capacity(self, keep_task_id: Optional[str] = None) -> None:
+        """Evicts tasks until the store is within max_tasks: terminal tasks first, then (if enabled) least recently used ones."""
+        if self.max_tasks is None: return
+        for task_id in list(self._terminal_since):
+            if len(self._tasks) <= self.max_tasks: return
+            if task_id != keep_task_id: await self._evict_task(task_id, "capacity")
+        if len(self._tasks) <= self.max_tasks: return
+        if not self.evict_active_tasks:
+            logger.warning(f"InMemoryTaskStore exceeds max_tasks={self.max_tasks} ({len(self._tasks)} tasks) with tasks still in progress; not evicting them (evict_active_tasks=False).")
+            return
+        logger.warning(f"InMemoryTaskStore exceeds max_tasks={self.max_tasks} with non-terminal tasks only. Evicting least recently used tasks.")
+        for task_id in list(self._tasks):
+            if len(self._tasks) <= self.max_tasks: return
+            if task_id != keep_task_id: await self._evict_task(task_id, "capacity")
+
+    async def evict_expired_tasks(self) -> int:
+        """Evicts terminal tasks whose TTL has passed. Returns the number of evicted tasks."""
+        self._eviction_stats["sweeps"] += 1
+        if self.terminal_task_ttl is None: return 0
+        cutoff = time.monotonic() - self.terminal_task_ttl
+        expired = []
+        for task_id, terminal_since in self._terminal_since.items(): # Ordered by terminal time
+            if terminal_since > cutoff: break
+            expired.append(task_id)
+        for task_id in expired:
+            await self._evict_task(task_id, "ttl")
+        if expired: logger.info(f"Evicted {len(expired)} expired terminal tasks from InMemoryTaskStore.")
+        return len(expired)
+
+    async def _run_sweeper(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try: await self.evict_expired_tasks()
+            except Exception as e: logger.error(f"InMemoryTaskStore sweeper failed: {e}", exc_info=True)
+
+    def start_sweeper(self) -> None:
+        """Starts the background task that periodically evicts expired tasks (requires a running event loop)."""
+        if self._sweeper_task is not None and not self._sweeper_task.done():
+            logger.debug("InMemoryTaskStore sweeper already running.")
+            return
+        self._sweeper_task = asyncio.get_running_loop().create_task(self._run_sweeper())
+        logger.info(f"Started InMemoryTaskStore sweeper (interval: {self.sweep_interval}s, ttl: {self.terminal_task_ttl}s).")
+
+    async def stop_sweeper(self) -> None:
+        """Stops the background sweeper, if running."""
+        if self._sweeper_task is None: return
+        self._sweeper_task.cancel()
+        try: await self._sweeper_task
+        except asyncio.CancelledError: pass
+        self._sweeper_task = None
+        logger.info("Stopped InMemoryTaskStore sweeper.")
@@ -24,11 +24,11 @@ from agentvault_server_sdk.agent import BaseA2AAgent
 from agentvault_server_sdk.fastapi_integration import (
     create_a2a_router, SSEResponse, a2a_method,
     task_not_found_handler, validation_exception_handler,
-    agent_server_error_handler, generic_exception_handler
+    agent_server_error_handler, generic_exception_handler, A2AJSONResponse
 )
 from agentvault_server_sdk.exceptions import AgentServerError, TaskNotFoundError
 from agentvault_server_sdk.fastapi_integration import JSONRPC_INVALID_PARAMS, JSONRPC_METHOD_NOT_FOUND, JSONRPC_PARSE_ERROR, JSONRPC_INVALID_REQUEST, JSONRPC_APP_ERROR, JSONRPC_INTERNAL_ERROR, JSONRPC_TASK_NOT_FOUND
-from agentvault_server_sdk.state import BaseTaskStore, InMemoryTaskStore, TaskContext
+from agentvault_server_sdk.state import BaseTaskStore, InMemoryTaskStore, TaskContext, LISTENER_DISCONNECTED
 
 
 # Import core library models and exceptions
@@ -302,6 +302,220 @@ def test_decorated_method_routing_not_found(test_app: Tuple[MockAgent, TestClien
     assert resp_data["error"]["code"] == JSONRPC_METHOD_NOT_FOUND
     assert resp_data["error"]["message"] == "Method not found"
 
+def test_parse_error_and_compact_json_responses(test_app: Tuple[MockAgent, TestClient]):
+    """Invalid JSON bodies get a parse error; responses are rendered by A2AJSONResponse."""
+    mock_agent, client = test_app
+    response = client.post("/a2a/", content=b"{not json", headers={"content-type": "application/json"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["error"]["code"] == JSONRPC_PARSE_ERROR
+    assert response.headers["content-type"] == "application/json"
+    assert b'"jsonrpc":"2.0"' in response.content # Compact codec output
+    assert A2AJSONResponse(content={"text": "ü"}).body == '{"text":"ü"}'.encode("utf-8")
+
+def test_decorated_method_dispatch_precompiled(test_app: Tuple[MockAgent, TestClient]):
+    """Test that handler signatures and params models are built at router creation, not per request."""
+    mock_agent, client = test_app
+    with patch("agentvault_server_sdk.fastapi_integration.inspect.signature") as mock_signature, \
+         patch("agentvault_server_sdk.fastapi_integration.create_model") as mock_create_model:
+        for i in range(3):
+            response = make_rpc_request(client, "custom/echo", params={"message": f"m{i}", "extra_param": i}, req_id=i)
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json()["result"] == f"Echo: m{i} | Extra: {i}"
+    mock_signature.assert_not_called()
+    mock_create_model.assert_not_called()
+
+def test_decorated_method_task_store_injection():
+    """Test that a parameter annotated with BaseTaskStore receives the router's store."""
+    class StoreAgent(MockAgent):
+        @a2a_method("custom/count")
+        async def count_tasks(self, store: BaseTaskStore, task_id: str) -> Dict[str, Any]:
+            context = await store.get_task(task_id)
+            return {"found": context is not None, "store_type": type(store).__name__}
+
+    agent = StoreAgent()
+    task_store = InMemoryTaskStore()
+    task_store._tasks["task-store-1"] = TaskContext(task_id="task-store-1", current_state=TaskState.WORKING)
+    app = FastAPI()
+    app.include_router(create_a2a_router(agent=agent, prefix="/a2a", task_store=task_store))
+    client = TestClient(app)
+
+    response = make_rpc_request(client, "custom/count", params={"id": "task-store-1"}, req_id="store-req")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["result"] == {"found": True, "store_type": "InMemoryTaskStore"}
+
+# Tests for JSON-RPC Batch Requests
+def test_batch_request_mixed_results(test_app: Tuple[MockAgent, TestClient]):
+    """Test a batch with successful and failing entries returns one response per id."""
+    mock_agent, client = test_app
+    task_id = "batch-task-1"
+    mock_agent.tasks[task_id] = TaskContext(task_id=task_id, current_state=TaskState.WORKING)
+    batch = [
+        {"jsonrpc": "2.0", "method": "tasks/get", "params": {"id": task_id}, "id": "get-1"},
+        {"jsonrpc": "2.0", "method": "tasks/get", "params": {"id": "missing-task"}, "id": "get-2"},
+        {"jsonrpc": "2.0", "method": "custom/echo", "params": {"message": 42}, "id": "echo-bad"},
+        {"jsonrpc": "2.0", "method": "custom/echo", "params": {"message": "hi"}, "id": 4},
+        {"jsonrpc": "2.0", "method": "no/such_method", "id": "unknown"},
+        "not-an-object",
+    ]
+    response = client.post("/a2a/", json=batch)
+
+    assert response.status_code == status.HTTP_200_OK
+    resp_data = response.json()
+    assert isinstance(resp_data, list) and len(resp_data) == len(batch)
+    by_id = {entry["id"]: entry for entry in resp_data if entry["id"] is not None}
+    assert by_id["get-1"]["result"]["id"] == task_id
+    assert by_id["get-1"]["result"]["state"] == TaskState.WORKING.value
+    assert by_id["get-2"]["error"]["code"] == JSONRPC_TASK_NOT_FOUND
+    assert by_id["echo-bad"]["error"]["code"] == JSONRPC_INVALID_PARAMS
+    assert by_id[4]["result"] == "Echo: hi"
+    assert by_id["unknown"]["error"]["code"] == JSONRPC_METHOD_NOT_FOUND
+    invalid_entries = [entry for entry in resp_data if entry["id"] is None]
+    assert len(invalid_entries) == 1 and invalid_entries[0]["error"]["code"] == JSONRPC_INVALID_REQUEST
+
+def test_batch_request_agent_errors_are_per_entry(test_app: Tuple[MockAgent, TestClient]):
+    """Test that agent exceptions inside a batch become error objects instead of failing the batch."""
+    mock_agent, client = test_app
+    mock_agent.configure_custom_echo_error(AgentServerError("echo broke"))
+    batch = [
+        {"jsonrpc": "2.0", "method": "custom/echo", "params": {"message": "x"}, "id": 1},
+        {"jsonrpc": "2.0", "method": "custom/bad_return", "params": {"value": 1}, "id": 2},
+    ]
+    response = client.post("/a2a/", json=batch)
+
+    assert response.status_code == status.HTTP_200_OK
+    by_id = {entry["id"]: entry for entry in response.json()}
+    assert by_id[1]["error"]["code"] == JSONRPC_APP_ERROR
+    assert "echo broke" in by_id[1]["error"]["message"]
+    assert by_id[2]["error"]["code"] == JSONRPC_INTERNAL_ERROR
+
+def test_batch_request_rejects_streaming_method(test_app: Tuple[MockAgent, TestClient]):
+    """Test that tasks/sendSubscribe is rejected inside a batch."""
+    mock_agent, client = test_app
+    batch = [{"jsonrpc": "2.0", "method": "tasks/sendSubscribe", "params": {"id": "t"}, "id": "sub"}]
+    response = client.post("/a2a/", json=batch)
+
+    assert response.json()[0]["error"]["code"] == JSONRPC_INVALID_REQUEST
+
+def test_batch_request_empty_and_oversized():
+    """Test that empty batches and batches above max_batch_size are rejected as a whole."""
+    app = FastAPI()
+    app.include_router(create_a2a_router(agent=MockAgent(), prefix="/a2a", max_batch_size=2))
+    client = TestClient(app)
+
+    empty_resp = client.post("/a2a/", json=[])
+    assert empty_resp.json()["error"]["code"] == JSONRPC_INVALID_REQUEST
+
+    entry = {"jsonrpc": "2.0", "method": "custom/echo", "params": {"message": "m"}, "id": 1}
+    oversized_resp = client.post("/a2a/", json=[entry, entry, entry])
+    assert oversized_resp.json()["error"]["code"] == JSONRPC_INVALID_REQUEST
+    assert "exceeds the maximum of 2" in oversized_resp.json()["error"]["message"]
+
+def test_batch_request_respects_concurrency_cap():
+    """Test that no more than batch_concurrency entries run at the same time."""
+    class SlowAgent(MockAgent):
+        def __init__(self):
+            super().__init__()
+            self.active = 0
+            self.max_active = 0
+
+        @a2a_method("custom/slow")
+        async def slow(self, n: int) -> int:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            await asyncio.sleep(0.01)
+            self.active -= 1
+            return n
+
+    agent = SlowAgent()
+    app = FastAPI()
+    app.include_router(create_a2a_router(agent=agent, prefix="/a2a", batch_concurrency=3))
+    client = TestClient(app)
+
+    batch = [{"jsonrpc": "2.0", "method": "custom/slow", "params": {"n": i}, "id": i} for i in range(10)]
+    response = client.post("/a2a/", json=batch)
+
+    assert [entry["result"] for entry in response.json()] == list(range(10))
+    assert 1 < agent.max_active <= 3
+
+def test_create_router_invalid_batch_settings():
+    with pytest.raises(ValueError, match="batch_concurrency"):
+        create_a2a_router(agent=MockAgent(), batch_concurrency=0)
+    with pytest.raises(ValueError, match="max_batch_size"):
+        create_a2a_router(agent=MockAgent(), max_batch_size=0)
+
+class HistoryAgent(BaseA2AAgent):
+    """Agent with a long message history, with and without its own tasks/get windowing."""
+    def __init__(self, history_size: int):
+        super().__init__()
+        self.history = [Message(role="user" if i % 2 == 0 else "assistant", parts=[TextPart(content=f"m{i}")]) for i in range(history_size)]
+        self.artifacts = [Artifact(id="a1", type="log", content="x")]
+        self.received_params: List[Any] = []
+
+    async def handle_task_get(self, task_id: str) -> Task:
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return Task(id=task_id, state=TaskState.WORKING, createdAt=now, updatedAt=now, messages=self.history, artifacts=self.artifacts)
+
+class WindowingHistoryAgent(HistoryAgent):
+    async def handle_task_get(self, task_id: str, params=None) -> Task:
+        self.received_params.append(params)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return Task(id=task_id, state=TaskState.WORKING, createdAt=now, updatedAt=now, **params.select(self.history, self.artifacts))
+
+@pytest.mark.parametrize("agent_class", [HistoryAgent, WindowingHistoryAgent])
+def test_tasks_get_windows(agent_class):
+    agent = agent_class(history_size=25)
+    app = FastAPI(); app.include_router(create_a2a_router(agent=agent, prefix="/a2a"))
+    app.add_exception_handler(ValidationError, validation_exception_handler)
+    client = TestClient(app)
+
+    full = make_rpc_request(client, "tasks/get", params={"id": "t1"}).json()["result"]
+    assert len(full["messages"]) == 25 and len(full["artifacts"]) == 1 and full["messageCount"] is None
+
+    state_only = make_rpc_request(client, "tasks/get", params={"id": "t1", "include": []}).json()["result"]
+    assert state_only["state"] == "WORKING" and state_only["messages"] == [] and state_only["artifacts"] == []
+    assert state_only["messageCount"] == 25
+
+    page = make_rpc_request(client, "tasks/get", params={"id": "t1", "include": ["messages"], "since": 20, "limit": 3}).json()["result"]
+    assert [m["parts"][0]["content"] for m in page["messages"]] == ["m20", "m21", "m22"]
+    assert page["artifacts"] == [] and page["nextCursor"] == 23
+    last = make_rpc_request(client, "tasks/get", params={"id": "t1", "since": page["nextCursor"], "limit": 10}).json()["result"]
+    assert len(last["messages"]) == 2 and last["nextCursor"] is None and len(last["artifacts"]) == 1
+
+    invalid = make_rpc_request(client, "tasks/get", params={"id": "t1", "limit": 0}).json()
+    assert invalid["error"]["code"] == JSONRPC_INVALID_PARAMS
+    if agent_class is WindowingHistoryAgent:
+        assert all(params is not None for params in agent.received_params) # Params are passed even without a window
+
+class StoreBackedAgent(BaseA2AAgent):
+    """Agent whose tasks/get reports the state held in a task store."""
+    def __init__(self, task_store: BaseTaskStore):
+        super().__init__()
+        self.task_store = task_store
+
+    async def handle_task_get(self, task_id: str) -> Task:
+        task_context = await self.task_store.get_task(task_id)
+        if task_context is None: raise TaskNotFoundError(task_id=task_id)
+        return Task(id=task_id, state=task_context.current_state, createdAt=task_context.created_at, updatedAt=task_context.updated_at, messages=[], artifacts=[])
+
+def test_tasks_wait():
+    task_store = InMemoryTaskStore()
+    asyncio.run(task_store.create_task("running"))
+    asyncio.run(task_store.create_task("done"))
+    for state in (TaskState.WORKING, TaskState.COMPLETED): asyncio.run(task_store.update_task_state("done", state))
+    app = FastAPI(); app.include_router(create_a2a_router(agent=StoreBackedAgent(task_store), prefix="/a2a", task_store=task_store, max_wait_timeout=0.05))
+    app.add_exception_handler(TaskNotFoundError, task_not_found_handler)
+    client = TestClient(app)
+
+    assert make_rpc_request(client, "tasks/wait", params={"id": "done"}).json()["result"]["state"] == "COMPLETED"
+    # The requested timeout is capped by max_wait_timeout; the current state is returned on timeout
+    assert make_rpc_request(client, "tasks/wait", params={"id": "running", "timeout": 300}).json()["result"]["state"] == "SUBMITTED"
+    assert make_rpc_request(client, "tasks/wait", params={"id": "running", "states": ["SUBMITTED"], "include": []}).json()["result"]["state"] == "SUBMITTED"
+    assert make_rpc_request(client, "tasks/wait", params={"id": "missing"}).json()["error"]["code"] == JSONRPC_TASK_NOT_FOUND
+
+    with pytest.raises(ValueError, match="max_wait_timeout"):
+        create_a2a_router(agent=MockAgent(), max_wait_timeout=0)
+
 # --- MODIFIED: Refactored test to create app/client inside ---
 def test_decorated_method_overrides_standard_if_named_same():
     """Test that a decorated method overrides a standard handle_ method if named identically."""
@@ -486,3 +700,108 @@ async def test_subscribe_generator_error(test_app: Tuple[MockAgent, TestClient])
     assert "event: error" in lines[0]
     assert '"error": "stream_error"' in lines[0]
     assert f'"message": "Error generating events: RuntimeError: {error_message}"' in lines[0]
+
+
+# --- Tests for SSE event IDs and Last-Event-ID resume ---
+async def _publish_logged_events(task_store: InMemoryTaskStore, task_id: str) -> List[A2AEvent]:
+    """Publishes three events through the store and returns the logged event objects in order."""
+    await task_store.notify_status_update(task_id, TaskState.WORKING)
+    await task_store.notify_message_event(task_id, Message(role="assistant", parts=[TextPart(content="partial")]))
+    await task_store.notify_status_update(task_id, TaskState.COMPLETED)
+    return [event for _, event in await task_store.get_events_since(task_id, 0)]
+
+def _make_resumable_app(mock_agent: MockAgent, task_store: InMemoryTaskStore) -> TestClient:
+    app = FastAPI()
+    app.include_router(create_a2a_router(agent=mock_agent, prefix="/a2a", task_store=task_store))
+    return TestClient(app)
+
+def _sse_ids(content: bytes) -> List[Optional[str]]:
+    ids = []
+    for block in content.decode("utf-8").strip().split("\n\n"):
+        id_lines = [line for line in block.split("\n") if line.startswith("id: ")]
+        ids.append(id_lines[0][len("id: "):] if id_lines else None)
+    return ids
+
+def _subscribe(client: TestClient, task_id: str, last_event_id: Optional[str] = None):
+    headers = {"Last-Event-ID": last_event_id} if last_event_id is not None else {}
+    payload = {"jsonrpc": "2.0", "method": "tasks/sendSubscribe", "params": {"id": task_id}, "id": "sub-1"}
+    return client.post("/a2a/", json=payload, headers=headers)
+
+@pytest.mark.asyncio
+async def test_subscribe_stream_includes_event_ids():
+    mock_agent, task_store = MockAgent(), InMemoryTaskStore()
+    await task_store.create_task("resume-task")
+    mock_agent.configure_sse_events(await _publish_logged_events(task_store, "resume-task"))
+
+    response = _subscribe(_make_resumable_app(mock_agent, task_store), "resume-task")
+
+    assert _sse_ids(response.content) == ["1", "2", "3"]
+    assert response.content.decode("utf-8").startswith("id: 1\nevent: task_status\ndata: ")
+
+@pytest.mark.asyncio
+async def test_subscribe_resumes_from_last_event_id():
+    mock_agent, task_store = MockAgent(), InMemoryTaskStore()
+    await task_store.create_task("resume-task")
+    events = await _publish_logged_events(task_store, "resume-task")
+    mock_agent.configure_sse_events(events) # Live events already covered by the replay are skipped
+
+    response = _subscribe(_make_resumable_app(mock_agent, task_store), "resume-task", last_event_id="1")
+
+    assert _sse_ids(response.content) == ["2", "3"]
+    assert "event: task_message" in response.content.decode("utf-8").split("\n\n")[0]
+
+@pytest.mark.asyncio
+async def test_subscribe_resume_fills_gap_before_first_live_event():
+    mock_agent, task_store = MockAgent(), InMemoryTaskStore()
+    await task_store.create_task("resume-task")
+    events = await _publish_logged_events(task_store, "resume-task")
+    logged = await task_store.get_events_since("resume-task", 0)
+    mock_agent.configure_sse_events([events[2]])
+
+    # Nothing to replay yet when the subscription starts; event 2 arrives before the agent subscribes
+    with patch.object(task_store, "get_events_since", AsyncMock(side_effect=[[], logged[1:]])):
+        response = _subscribe(_make_resumable_app(mock_agent, task_store), "resume-task", last_event_id="1")
+
+    assert _sse_ids(response.content) == ["2", "3"]
+
+@pytest.mark.asyncio
+async def test_subscribe_ignores_invalid_last_event_id():
+    mock_agent, task_store = MockAgent(), InMemoryTaskStore()
+    await task_store.create_task("resume-task")
+    mock_agent.configure_sse_events(await _publish_logged_events(task_store, "resume-task"))
+
+    response = _subscribe(_make_resumable_app(mock_agent, task_store), "resume-task", last_event_id="not-a-number")
+
+    assert _sse_ids(response.content) == ["1", "2", "3"]
+
+@pytest.mark.asyncio
+async def test_sse_response_without_ids_for_unlogged_events():
+    async def events():
+        yield TaskStatusUpdateEvent(taskId="t", state=TaskState.WORKING, timestamp=datetime.datetime.now(datetime.timezone.utc))
+    app = FastAPI()
+    app.get("/stream")(lambda: SSEResponse(events()))
+    response = TestClient(app).get("/stream")
+    assert _sse_ids(response.content) == [None]
+
+@pytest.mark.asyncio
+async def test_subscribe_stream_ends_on_listener_disconnected():
+    mock_agent, task_store = MockAgent(), InMemoryTaskStore()
+    await task_store.create_task("resume-task")
+    events = await _publish_logged_events(task_store, "resume-task")
+    # Events after the sentinel are never sent
+    mock_agent.configure_sse_events([events[0], LISTENER_DISCONNECTED, events[1]])
+
+    response = _subscribe(_make_resumable_app(mock_agent, task_store), "resume-task")
+
+    assert _sse_ids(response.content) == ["1"]
+
+@pytest.mark.asyncio
+async def test_sse_response_ends_on_listener_disconnected():
+    async def events():
+        yield TaskStatusUpdateEvent(taskId="t", state=TaskState.WORKING, timestamp=datetime.datetime.now(datetime.timezone.utc))
+        yield LISTENER_DISCONNECTED
+        await asyncio.Event().wait() # A dead listener queue never delivers again
+    app = FastAPI()
+    app.get("/stream")(lambda: SSEResponse(events()))
+    response = TestClient(app).get("/stream")
+    assert response.content.decode("utf-8").count("event: task_status") == 1
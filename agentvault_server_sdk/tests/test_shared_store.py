@@ -0,0 +1,171 @@
+import pytest
+import asyncio
+import os
+import socket
+from unittest.mock import AsyncMock
+
+from agentvault_server_sdk.shared_store import SharedSQLiteTaskStore
+
+try:
+    from agentvault.models import TaskState, TaskStatusUpdateEvent, TaskMessageEvent, Message, TextPart
+    _MODELS_AVAILABLE = True
+except ImportError:
+    _MODELS_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(not _MODELS_AVAILABLE or not hasattr(socket, "AF_UNIX"), reason="Requires agentvault models and AF_UNIX sockets")
+
+
+# --- Fixtures ---
+@pytest.fixture
+async def workers(tmp_path):
+    """Two stores on the same database, standing in for two worker processes."""
+    db_path = str(tmp_path / "tasks.db")
+    stores = [SharedSQLiteTaskStore(db_path, poll_interval=0) for _ in range(2)]
+    for store in stores:
+        await store._ensure_open()
+    yield stores
+    for store in stores:
+        await store.close()
+
+async def _next_event(queue: asyncio.Queue, timeout: float = 2.0):
+    return await asyncio.wait_for(queue.get(), timeout)
+
+
+# --- Tests ---
+@pytest.mark.asyncio
+async def test_shared_store_task_visible_in_other_worker(workers):
+    worker_a, worker_b = workers
+    await worker_a.create_task("task-1")
+    await worker_a.update_task_state("task-1", TaskState.WORKING)
+
+    context = await worker_b.get_task("task-1")
+    assert context is not None and context.current_state == TaskState.WORKING
+    updated = await worker_b.update_task_state("task-1", TaskState.COMPLETED)
+    assert updated is not None
+    assert (await worker_a.get_task("task-1")).current_state == TaskState.COMPLETED
+
+@pytest.mark.asyncio
+async def test_shared_store_events_fan_out_across_workers(workers):
+    worker_a, worker_b = workers
+    await worker_a.create_task("task-1")
+    queue_a, queue_b = worker_a.create_listener_queue(), worker_b.create_listener_queue()
+    await worker_a.add_listener("task-1", queue_a)
+    await worker_b.add_listener("task-1", queue_b)
+
+    await worker_a.update_task_state("task-1", TaskState.WORKING)
+    message = Message(role="assistant", parts=[TextPart(content="hello")])
+    await worker_a.notify_message_event("task-1", message)
+
+    for queue in (queue_a, queue_b):
+        first, second = await _next_event(queue), await _next_event(queue)
+        assert isinstance(first, TaskStatusUpdateEvent) and first.state == TaskState.WORKING
+        assert isinstance(second, TaskMessageEvent) and second.message.parts[0].content == "hello"
+        assert queue.empty()
+    assert worker_a.get_fanout_stats()["announcements_sent"] >= 2
+    assert worker_b.get_fanout_stats()["events_delivered"] == 2
+
+@pytest.mark.asyncio
+async def test_shared_store_subscription_starts_at_current_event(workers):
+    worker_a, worker_b = workers
+    await worker_a.create_task("task-1")
+    await worker_a.update_task_state("task-1", TaskState.WORKING)
+
+    queue = worker_b.create_listener_queue()
+    await worker_b.add_listener("task-1", queue)
+    await worker_a.update_task_state("task-1", TaskState.COMPLETED)
+
+    event = await _next_event(queue)
+    assert event.state == TaskState.COMPLETED
+    assert queue.empty()
+
+@pytest.mark.asyncio
+async def test_shared_store_poll_delivers_missed_events(tmp_path):
+    db_path = str(tmp_path / "tasks.db")
+    # Separate socket directories: announcements cannot reach the other worker
+    publisher = SharedSQLiteTaskStore(db_path, socket_dir=str(tmp_path / "a"), poll_interval=0)
+    subscriber = SharedSQLiteTaskStore(db_path, socket_dir=str(tmp_path / "b"), poll_interval=0)
+    try:
+        await publisher.create_task("task-1")
+        queue = subscriber.create_listener_queue()
+        await subscriber.add_listener("task-1", queue)
+        await publisher.update_task_state("task-1", TaskState.WORKING)
+        await asyncio.sleep(0.05)
+        assert queue.empty()
+
+        await subscriber.poll_events()
+        assert (await _next_event(queue)).state == TaskState.WORKING
+    finally:
+        await publisher.close(); await subscriber.close()
+
+@pytest.mark.asyncio
+async def test_shared_store_rejects_update_from_stale_state(workers, mocker):
+    worker_a, worker_b = workers
+    await worker_a.create_task("task-1")
+    stale_context = await worker_b.get_task("task-1")
+    await worker_a.update_task_state("task-1", TaskState.CANCELED)
+
+    # worker_b still holds the context it read while the task was SUBMITTED
+    mocker.patch.object(worker_b, "get_task", AsyncMock(return_value=stale_context))
+    assert await worker_b.update_task_state("task-1", TaskState.WORKING) is None
+    assert stale_context.current_state == TaskState.SUBMITTED
+    mocker.stopall()
+    assert (await worker_b.get_task("task-1")).current_state == TaskState.CANCELED
+
+@pytest.mark.asyncio
+async def test_shared_store_removes_stale_peer_sockets(workers):
+    worker_a, _ = workers
+    stale_path = os.path.join(worker_a.socket_dir, "99999-dead.sock")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    stale.bind(stale_path)
+    stale.close() # Socket file stays, nobody is bound
+
+    await worker_a.create_task("task-1")
+    worker_a._refresh_peers()
+    await worker_a.update_task_state("task-1", TaskState.WORKING)
+    await asyncio.sleep(0.01) # Announcements are sent on the next loop iteration
+
+    assert not os.path.exists(stale_path)
+    assert worker_a.get_fanout_stats()["stale_peers_removed"] == 1
+
+@pytest.mark.asyncio
+async def test_shared_store_close_removes_socket(tmp_path):
+    store = SharedSQLiteTaskStore(str(tmp_path / "tasks.db"), poll_interval=0)
+    await store._ensure_open()
+    socket_path = store._socket_path
+    assert socket_path is not None and os.path.exists(socket_path)
+    await store.close()
+    assert not os.path.exists(socket_path)
+
+@pytest.mark.asyncio
+async def test_shared_store_replays_events_from_any_worker(workers):
+    worker_a, worker_b = workers
+    await worker_a.create_task("task-1")
+    await worker_a.update_task_state("task-1", TaskState.WORKING)
+    await worker_a.update_task_state("task-1", TaskState.COMPLETED)
+
+    replayed = await worker_b.get_events_since("task-1", 0)
+    assert [event.state for _, event in replayed] == [TaskState.WORKING, TaskState.COMPLETED]
+    first_id = replayed[0][0]
+    assert [event_id for event_id, _ in await worker_b.get_events_since("task-1", first_id)] == [replayed[1][0]]
+
+    # Live events carry the same IDs in every worker
+    queue = worker_b.create_listener_queue()
+    await worker_b.add_listener("task-1", queue)
+    await worker_a.notify_message_event("task-1", Message(role="assistant", parts=[TextPart(content="late")]))
+    live_event = await _next_event(queue)
+    (live_id, _), = await worker_a.get_events_since("task-1", replayed[1][0])
+    assert worker_b.get_event_id("task-1", live_event) == live_id
+
+@pytest.mark.asyncio
+async def test_shared_store_wait_for_state_sees_other_worker(workers):
+    worker_a, worker_b = workers
+    await worker_a.create_task("task-1")
+    waiter = asyncio.create_task(worker_b.wait_for_state("task-1", [TaskState.COMPLETED], timeout=5))
+    await asyncio.sleep(0.05)
+    assert not waiter.done()
+
+    await worker_a.update_task_state("task-1", TaskState.WORKING)
+    await worker_a.update_task_state("task-1", TaskState.COMPLETED)
+    context = await asyncio.wait_for(waiter, 2)
+    assert context is not None and context.current_state == TaskState.COMPLETED
+    assert await worker_b.get_listeners("task-1") == []
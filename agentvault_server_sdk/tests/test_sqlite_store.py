@@ -0,0 +1,207 @@
+import pytest
+import asyncio
+import datetime
+import sqlite3
+
+from agentvault_server_sdk.sqlite_store import SQLiteTaskStore
+from agentvault_server_sdk.state import TaskContext, ListenerQueue
+
+try:
+    from agentvault.models import TaskState, TaskStatusUpdateEvent
+    _MODELS_AVAILABLE = True
+except ImportError:
+    _MODELS_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(not _MODELS_AVAILABLE, reason="Core agentvault models not available")
+
+
+# --- Fixtures ---
+@pytest.fixture
+def db_path(tmp_path) -> str:
+    return str(tmp_path / "tasks.db")
+
+@pytest.fixture
+async def sqlite_store(db_path):
+    store = SQLiteTaskStore(db_path)
+    yield store
+    await store.close()
+
+
+# --- Tests ---
+def test_sqlite_store_invalid_arguments(db_path):
+    with pytest.raises(ValueError): SQLiteTaskStore(db_path, cache_size=-1)
+    with pytest.raises(ValueError): SQLiteTaskStore(db_path, max_batch_size=0)
+    with pytest.raises(ValueError): SQLiteTaskStore(db_path, synchronous="SOMETIMES")
+
+@pytest.mark.asyncio
+async def test_sqlite_store_create_get_update(sqlite_store: SQLiteTaskStore):
+    context = await sqlite_store.create_task("task-1")
+    assert isinstance(context, TaskContext)
+    assert context.current_state == TaskState.SUBMITTED
+    assert await sqlite_store.create_task("task-1") is context
+
+    updated = await sqlite_store.update_task_state("task-1", TaskState.WORKING)
+    assert updated is not None and updated.current_state == TaskState.WORKING
+    # Invalid transitions and unknown tasks are rejected like InMemoryTaskStore
+    assert await sqlite_store.update_task_state("task-1", TaskState.SUBMITTED) is None
+    assert await sqlite_store.update_task_state("missing", TaskState.WORKING) is None
+    assert await sqlite_store.get_task("missing") is None
+
+@pytest.mark.asyncio
+async def test_sqlite_store_persists_across_instances(db_path):
+    store = SQLiteTaskStore(db_path)
+    await store.create_task("task-1")
+    await store.update_task_state("task-1", TaskState.WORKING)
+    await store.update_task_state("task-1", TaskState.COMPLETED)
+    await store.close()
+
+    reopened = SQLiteTaskStore(db_path)
+    try:
+        context = await reopened.get_task("task-1")
+        assert context is not None
+        assert context.current_state == TaskState.COMPLETED
+        assert context.created_at.tzinfo is not None
+        assert context.updated_at >= context.created_at
+    finally:
+        await reopened.close()
+
+@pytest.mark.asyncio
+async def test_sqlite_store_uses_wal_and_indexes(sqlite_store: SQLiteTaskStore, db_path):
+    await sqlite_store.create_task("task-1")
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        index_names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    finally:
+        conn.close()
+    assert {"ix_tasks_state", "ix_tasks_updated_at", "ix_task_events_task_id"} <= index_names
+
+@pytest.mark.asyncio
+async def test_sqlite_store_group_commit(sqlite_store: SQLiteTaskStore):
+    task_ids = [f"task-{i}" for i in range(50)]
+    await asyncio.gather(*(sqlite_store.create_task(task_id) for task_id in task_ids))
+    await asyncio.gather(*(sqlite_store.update_task_state(task_id, TaskState.WORKING) for task_id in task_ids))
+    await sqlite_store.flush()
+
+    stats = sqlite_store.get_write_stats()
+    assert stats["pending"] == 0
+    assert stats["failed_transactions"] == 0
+    # 100 task writes plus 50 status events, far fewer transactions
+    assert stats["operations"] == 150
+    assert stats["transactions"] < 20
+    assert stats["max_batch"] > 1
+
+@pytest.mark.asyncio
+async def test_sqlite_store_update_not_visible_until_committed(sqlite_store: SQLiteTaskStore, mocker):
+    context = await sqlite_store.create_task("task-1")
+    original_updated_at = context.updated_at
+    write_started, release_write = asyncio.Event(), asyncio.Event()
+    real_submit = sqlite_store._submit_writes
+
+    async def _slow_submit(ops, wait=True):
+        write_started.set()
+        await release_write.wait()
+        return await real_submit(ops, wait)
+
+    mocker.patch.object(sqlite_store, "_submit_writes", side_effect=_slow_submit)
+    update = asyncio.create_task(sqlite_store.update_task_state("task-1", TaskState.WORKING))
+    await write_started.wait()
+    # The queued transition is not visible to readers yet
+    assert (await sqlite_store.get_task("task-1")).current_state == TaskState.SUBMITTED
+    release_write.set()
+    updated = await update
+    assert updated is not None and updated is not context
+    assert (await sqlite_store.get_task("task-1")) is updated
+    assert context.current_state == TaskState.SUBMITTED and context.updated_at == original_updated_at
+
+@pytest.mark.asyncio
+async def test_sqlite_store_failed_update_leaves_cache_untouched(sqlite_store: SQLiteTaskStore, mocker):
+    context = await sqlite_store.create_task("task-1")
+    mocker.patch.object(sqlite_store, "_submit_writes", side_effect=sqlite3.OperationalError("disk I/O error"))
+    with pytest.raises(sqlite3.OperationalError):
+        await sqlite_store.update_task_state("task-1", TaskState.WORKING)
+    assert sqlite_store._cache["task-1"] is context
+    assert context.current_state == TaskState.SUBMITTED
+
+    # A write that matches no row (changed concurrently) drops the stale cached context
+    mocker.patch.object(sqlite_store, "_submit_writes", return_value=[(0, None)])
+    assert await sqlite_store.update_task_state("task-1", TaskState.WORKING) is None
+    assert context.current_state == TaskState.SUBMITTED
+    assert "task-1" not in sqlite_store._cache
+
+@pytest.mark.asyncio
+async def test_sqlite_store_cache_eviction_reloads(db_path):
+    store = SQLiteTaskStore(db_path, cache_size=2)
+    try:
+        for i in range(4):
+            await store.create_task(f"task-{i}")
+        assert len(store._cache) == 2
+        assert "task-0" not in store._cache
+        reloaded = await store.get_task("task-0")
+        assert reloaded is not None and reloaded.current_state == TaskState.SUBMITTED
+        assert "task-0" in store._cache
+    finally:
+        await store.close()
+
+@pytest.mark.asyncio
+async def test_sqlite_store_events_persisted_and_delivered(sqlite_store: SQLiteTaskStore):
+    await sqlite_store.create_task("task-1")
+    queue = sqlite_store.create_listener_queue()
+    assert isinstance(queue, ListenerQueue)
+    await sqlite_store.add_listener("task-1", queue)
+
+    await sqlite_store.update_task_state("task-1", TaskState.WORKING)
+
+    event = queue.get_nowait()
+    assert isinstance(event, TaskStatusUpdateEvent)
+    events = await sqlite_store.get_events("task-1")
+    assert len(events) == 1
+    assert events[0]["event_type"] == "TaskStatusUpdateEvent"
+    assert '"WORKING"' in events[0]["payload"]
+
+@pytest.mark.asyncio
+async def test_sqlite_store_event_ids_continue_after_reopen(db_path):
+    store = SQLiteTaskStore(db_path)
+    await store.create_task("task-1")
+    for state in (TaskState.WORKING, TaskState.INPUT_REQUIRED, TaskState.WORKING, TaskState.INPUT_REQUIRED):
+        await store.update_task_state("task-1", state)
+    logged = await store.get_events_since("task-1", 0)
+    assert len(logged) == 4
+    last_event_id = logged[-1][0]
+    await store.close()
+
+    reopened = SQLiteTaskStore(db_path)
+    try:
+        queue = reopened.create_listener_queue()
+        await reopened.add_listener("task-1", queue)
+        await reopened.update_task_state("task-1", TaskState.WORKING)
+        event = queue.get_nowait()
+        # IDs are the task_events row IDs, so they keep increasing for a resuming client
+        new_event_id = reopened.get_event_id("task-1", event)
+        assert new_event_id is not None and new_event_id > last_event_id
+        assert [event_id for event_id, _ in await reopened.get_events_since("task-1", 0)] == [event_id for event_id, _ in logged] + [new_event_id]
+        (replayed_id, replayed), = await reopened.get_events_since("task-1", last_event_id)
+        assert replayed_id == new_event_id
+        assert isinstance(replayed, TaskStatusUpdateEvent) and replayed.state == TaskState.WORKING
+    finally:
+        await reopened.close()
+
+@pytest.mark.asyncio
+async def test_sqlite_store_list_and_delete(sqlite_store: SQLiteTaskStore):
+    for task_id in ("a", "b", "c"):
+        await sqlite_store.create_task(task_id)
+    await sqlite_store.update_task_state("a", TaskState.CANCELED)
+
+    canceled = await sqlite_store.list_tasks(states=[TaskState.CANCELED])
+    assert [context.task_id for context in canceled] == ["a"]
+    assert len(await sqlite_store.list_tasks()) == 3
+
+    assert await sqlite_store.delete_task("b") is True
+    assert await sqlite_store.delete_task("b") is False
+    assert await sqlite_store.get_task("b") is None
+    assert await sqlite_store.get_events("a") != []
+
+    assert await sqlite_store.delete_terminal_tasks(older_than=datetime.timedelta(0)) == 1
+    assert await sqlite_store.get_task("a") is None
+    assert await sqlite_store.get_events("a") == []
+    assert [context.task_id for context in await sqlite_store.list_tasks()] == ["c"]
@@ -9,7 +9,9 @@ from unittest.mock import patch
 
 
 # Import components to test
-from agentvault_server_sdk.state import TaskContext, InMemoryTaskStore
+from agentvault_server_sdk.state import (
+    TaskContext, InMemoryTaskStore, ListenerQueue, ListenerOverflowPolicy, LISTENER_DISCONNECTED
+)
 from agentvault_server_sdk.exceptions import InvalidStateTransitionError
 
 # Import or define TaskState enum
@@ -345,3 +347,395 @@ async def test_update_task_state_triggers_notify(task_store: InMemoryTaskStore):
     event = await asyncio.wait_for(q1.get(), timeout=0.1)
     assert isinstance(event, TaskStatusUpdateEvent)
     assert event.state == TaskState.WORKING
+
+
+# --- Tests for Bounded Listener Queues ---
+def _drain(queue: asyncio.Queue) -> List[Any]:
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+def _message(text: str) -> Message:
+    return Message(role="assistant", parts=[TextPart(content=text)])
+
+def test_create_listener_queue_uses_store_defaults():
+    store = InMemoryTaskStore(listener_queue_size=5, listener_overflow_policy="drop_oldest", listener_block_timeout=0.5)
+    queue = store.create_listener_queue()
+    assert isinstance(queue, ListenerQueue)
+    assert queue.maxsize == 5
+    assert queue.policy is ListenerOverflowPolicy.DROP_OLDEST
+    assert queue.block_timeout == 0.5
+    custom = store.create_listener_queue(maxsize=2, policy=ListenerOverflowPolicy.DISCONNECT)
+    assert custom.maxsize == 2 and custom.policy is ListenerOverflowPolicy.DISCONNECT
+
+@pytestmark_notify
+@pytest.mark.asyncio
+async def test_listener_queue_drop_newest(task_store: InMemoryTaskStore):
+    task_id = "bounded-drop-newest"
+    await task_store.create_task(task_id)
+    queue = task_store.create_listener_queue(maxsize=2, policy=ListenerOverflowPolicy.DROP_NEWEST)
+    await task_store.add_listener(task_id, queue)
+
+    for i in range(4):
+        await task_store.notify_message_event(task_id, _message(f"m{i}"))
+
+    assert [event.message.parts[0].content for event in _drain(queue)] == ["m0", "m1"]
+    assert queue.dropped_events == 2
+    assert task_store.get_listener_stats()["dropped"] == 2
+
+@pytestmark_notify
+@pytest.mark.asyncio
+async def test_listener_queue_drop_oldest(task_store: InMemoryTaskStore):
+    task_id = "bounded-drop-oldest"
+    await task_store.create_task(task_id)
+    queue = task_store.create_listener_queue(maxsize=2, policy=ListenerOverflowPolicy.DROP_OLDEST)
+    await task_store.add_listener(task_id, queue)
+
+    for i in range(4):
+        await task_store.notify_message_event(task_id, _message(f"m{i}"))
+
+    assert [event.message.parts[0].content for event in _drain(queue)] == ["m2", "m3"]
+    assert queue.dropped_events == 2
+
+@pytestmark_notify
+@pytest.mark.asyncio
+async def test_listener_queue_block_with_timeout(task_store: InMemoryTaskStore):
+    task_id = "bounded-block"
+    await task_store.create_task(task_id)
+    queue = task_store.create_listener_queue(maxsize=1, policy=ListenerOverflowPolicy.BLOCK, block_timeout=0.05)
+    await task_store.add_listener(task_id, queue)
+    await task_store.notify_message_event(task_id, _message("first"))
+
+    # A consumer frees space while the notifier is blocked: the event is delivered
+    async def consume_soon():
+        await asyncio.sleep(0.01)
+        return await queue.get()
+    consumer = asyncio.create_task(consume_soon())
+    await task_store.notify_message_event(task_id, _message("second"))
+    assert (await consumer).message.parts[0].content == "first"
+    assert queue.get_nowait().message.parts[0].content == "second"
+
+    # Nobody consumes: the notifier gives up after the timeout and drops the event
+    await task_store.notify_message_event(task_id, _message("third"))
+    await task_store.notify_message_event(task_id, _message("fourth"))
+    assert [event.message.parts[0].content for event in _drain(queue)] == ["third"]
+    assert queue.dropped_events == 1
+
+@pytestmark_notify
+@pytest.mark.asyncio
+async def test_listener_queue_slow_consumer_does_not_stall_others(task_store: InMemoryTaskStore):
+    task_id = "bounded-isolation"
+    await task_store.create_task(task_id)
+    slow = task_store.create_listener_queue(maxsize=1, policy=ListenerOverflowPolicy.DROP_NEWEST)
+    fast = asyncio.Queue()
+    await task_store.add_listener(task_id, slow)
+    await task_store.add_listener(task_id, fast)
+
+    for i in range(5):
+        await asyncio.wait_for(task_store.notify_message_event(task_id, _message(f"m{i}")), timeout=0.5)
+
+    assert len(_drain(fast)) == 5
+    assert len(_drain(slow)) == 1
+
+@pytestmark_notify
+@pytest.mark.asyncio
+async def test_listener_queue_coalesce_status(task_store: InMemoryTaskStore):
+    task_id = "bounded-coalesce"
+    await task_store.create_task(task_id)
+    queue = task_store.create_listener_queue(maxsize=10, policy=ListenerOverflowPolicy.COALESCE_STATUS)
+    await task_store.add_listener(task_id, queue)
+
+    await task_store.notify_status_update(task_id, TaskState.WORKING)
+    await task_store.notify_message_event(task_id, _message("partial"))
+    await task_store.notify_status_update(task_id, TaskState.INPUT_REQUIRED)
+    await task_store.notify_status_update(task_id, TaskState.WORKING, message="resumed")
+
+    events = _drain(queue)
+    assert [type(event) for event in events] == [TaskMessageEvent, TaskStatusUpdateEvent]
+    assert events[1].message == "resumed"
+    assert queue.coalesced_events == 2
+    assert task_store.get_listener_stats()["coalesced"] == 2
+
+@pytestmark_notify
+@pytest.mark.asyncio
+@pytest.mark.parametrize("policy", [ListenerOverflowPolicy.COALESCE_STATUS, ListenerOverflowPolicy.DROP_OLDEST])
+async def test_listener_queue_join_after_discarding_events(task_store: InMemoryTaskStore, policy):
+    task_id = f"bounded-join-{policy.value}"
+    await task_store.create_task(task_id)
+    queue = task_store.create_listener_queue(maxsize=2, policy=policy)
+    await task_store.add_listener(task_id, queue)
+
+    await task_store.notify_status_update(task_id, TaskState.WORKING)
+    await task_store.notify_message_event(task_id, _message("partial"))
+    await task_store.notify_status_update(task_id, TaskState.INPUT_REQUIRED)
+
+    # Events removed by the store are marked done, so join() only waits for what the consumer received
+    for _ in range(queue.qsize()):
+        queue.get_nowait()
+        queue.task_done()
+    await asyncio.wait_for(queue.join(), timeout=0.5)
+
+@pytestmark_notify
+@pytest.mark.asyncio
+async def test_listener_queue_disconnect_slow_consumer(task_store: InMemoryTaskStore):
+    task_id = "bounded-disconnect"
+    await task_store.create_task(task_id)
+    queue = task_store.create_listener_queue(maxsize=2, policy=ListenerOverflowPolicy.DISCONNECT)
+    await task_store.add_listener(task_id, queue)
+
+    for i in range(3):
+        await task_store.notify_message_event(task_id, _message(f"m{i}"))
+
+    assert queue.get_nowait() is LISTENER_DISCONNECTED
+    assert queue.empty()
+    assert queue.disconnected
+    assert await task_store.get_listeners(task_id) == []
+    assert task_store.get_listener_stats()["disconnected"] == 1
+
+    # Further events are no longer delivered
+    await task_store.notify_message_event(task_id, _message("after"))
+    assert queue.empty()
+
+@pytestmark_notify
+@pytest.mark.asyncio
+async def test_plain_queue_uses_store_default_policy():
+    store = InMemoryTaskStore(listener_overflow_policy=ListenerOverflowPolicy.DROP_NEWEST)
+    task_id = "plain-bounded"
+    await store.create_task(task_id)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+    await store.add_listener(task_id, queue)
+
+    await store.notify_message_event(task_id, _message("kept"))
+    await store.notify_message_event(task_id, _message("dropped"))
+
+    assert [event.message.parts[0].content for event in _drain(queue)] == ["kept"]
+    assert store.get_listener_stats() == {"delivered": 1, "dropped": 1, "coalesced": 0, "disconnected": 0}
+
+
+# --- Tests for Retention / Eviction ---
+async def _complete_task(store: InMemoryTaskStore, task_id: str) -> None:
+    await store.create_task(task_id)
+    await store.update_task_state(task_id, TaskState.WORKING)
+    await store.update_task_state(task_id, TaskState.COMPLETED)
+
+def test_store_invalid_retention_settings():
+    with pytest.raises(ValueError, match="max_tasks"):
+        InMemoryTaskStore(max_tasks=0)
+    with pytest.raises(ValueError, match="sweep_interval"):
+        InMemoryTaskStore(sweep_interval=0)
+
+@pytest.mark.asyncio
+async def test_evict_expired_terminal_tasks():
+    store = InMemoryTaskStore(terminal_task_ttl=60)
+    with patch("agentvault_server_sdk.state.time.monotonic", return_value=1000.0):
+        await _complete_task(store, "done-early")
+        await store.create_task("still-running")
+    with patch("agentvault_server_sdk.state.time.monotonic", return_value=1030.0):
+        await _complete_task(store, "done-later")
+
+    with patch("agentvault_server_sdk.state.time.monotonic", return_value=1061.0):
+        assert await store.evict_expired_tasks() == 1
+
+    assert await store.get_task("done-early") is None
+    assert await store.get_task("done-later") is not None
+    assert await store.get_task("still-running") is not None
+    stats = store.get_eviction_stats()
+    assert stats["evicted_ttl"] == 1
+    assert stats["tasks"] == 2
+    assert stats["terminal_tasks"] == 1
+
+@pytest.mark.asyncio
+async def test_evict_expired_without_ttl_keeps_tasks(task_store: InMemoryTaskStore):
+    await _complete_task(task_store, "done")
+    assert await task_store.evict_expired_tasks() == 0
+    assert await task_store.get_task("done") is not None
+
+@pytest.mark.asyncio
+async def test_max_tasks_evicts_terminal_tasks_first():
+    store = InMemoryTaskStore(max_tasks=3)
+    await store.create_task("active-1")
+    await _complete_task(store, "done-1")
+    await store.create_task("active-2")
+    await store.create_task("active-3") # Over capacity: the terminal task goes first
+
+    assert await store.get_task("done-1") is None
+    assert {"active-1", "active-2", "active-3"} == set(store._tasks)
+    assert store.get_eviction_stats()["evicted_capacity"] == 1
+
+@pytest.mark.asyncio
+async def test_max_tasks_keeps_active_tasks_by_default():
+    store = InMemoryTaskStore(max_tasks=2)
+    await store.create_task("a")
+    await store.create_task("b")
+    await store.create_task("c") # Nothing terminal to evict: the store grows instead
+
+    assert {"a", "b", "c"} == set(store._tasks)
+    assert store.get_eviction_stats()["evicted_capacity"] == 0
+
+@pytest.mark.asyncio
+async def test_max_tasks_lru_eviction_of_active_tasks():
+    store = InMemoryTaskStore(max_tasks=2, evict_active_tasks=True)
+    await store.create_task("a")
+    await store.create_task("b")
+    await store.get_task("a") # 'a' becomes most recently used
+    await store.create_task("c")
+
+    assert await store.get_task("b") is None
+    assert await store.get_task("a") is not None
+    assert await store.get_task("c") is not None
+
+@pytest.mark.asyncio
+async def test_eviction_disconnects_listeners_and_waiters():
+    store = InMemoryTaskStore(terminal_task_ttl=0)
+    await _complete_task(store, "done")
+    full_queue = store.create_listener_queue(maxsize=1)
+    plain_queue = asyncio.Queue()
+    await store.add_listener("done", full_queue)
+    await store.add_listener("done", plain_queue)
+    full_queue.put_nowait("stale")
+
+    waiter = asyncio.create_task(store.wait_for_state("done", [TaskState.WORKING]))
+    await asyncio.sleep(0)
+    assert await store.evict_expired_tasks() == 1
+
+    assert full_queue.get_nowait() is LISTENER_DISCONNECTED and full_queue.disconnected
+    assert plain_queue.get_nowait() is LISTENER_DISCONNECTED
+    assert await asyncio.wait_for(waiter, timeout=0.5) is None
+    assert await store.get_listeners("done") == []
+    assert store.get_listener_stats()["disconnected"] == 2
+
+@pytest.mark.asyncio
+async def test_eviction_callbacks_sync_and_async():
+    store = InMemoryTaskStore(max_tasks=1)
+    evicted_sync = []
+    evicted_async = []
+
+    def on_evict(context: TaskContext, reason: str):
+        evicted_sync.append((context.task_id, reason))
+
+    async def on_evict_async(context: TaskContext, reason: str):
+        evicted_async.append((context.task_id, str(context.current_state)))
+
+    def failing_callback(context: TaskContext, reason: str):
+        raise RuntimeError("persist failed")
+
+    store.add_eviction_callback(on_evict)
+    store.add_eviction_callback(failing_callback)
+    store.add_eviction_callback(on_evict_async)
+    await _complete_task(store, "first")
+    await store.create_task("second")
+
+    assert evicted_sync == [("first", "capacity")]
+    assert evicted_async == [("first", str(TaskState.COMPLETED))]
+    assert store.get_eviction_stats()["callback_errors"] == 1
+    assert await store.get_task("first") is None # Eviction proceeds despite the failing callback
+
+    store.remove_eviction_callback(on_evict)
+    await store.create_task("third")
+    assert evicted_sync == [("first", "capacity")]
+
+@pytest.mark.asyncio
+async def test_sweeper_evicts_in_background():
+    store = InMemoryTaskStore(terminal_task_ttl=0, sweep_interval=0.01)
+    await _complete_task(store, "done")
+    store.start_sweeper()
+    store.start_sweeper() # Second start is a no-op
+    try:
+        for _ in range(50):
+            if "done" not in store._tasks: break
+            await asyncio.sleep(0.01)
+    finally:
+        await store.stop_sweeper()
+    assert "done" not in store._tasks
+    assert store.get_eviction_stats()["sweeps"] >= 1
+    assert store._sweeper_task is None
+
+@pytest.mark.asyncio
+async def test_delete_task_clears_terminal_tracking():
+    store = InMemoryTaskStore(terminal_task_ttl=60)
+    await _complete_task(store, "done")
+    assert await store.delete_task("done")
+    assert store.get_eviction_stats()["terminal_tasks"] == 0
+
+
+# --- Tests for the per-task event log ---
+@pytestmark_notify
+@pytest.mark.asyncio
+async def test_event_log_assigns_sequential_ids(task_store: InMemoryTaskStore):
+    await task_store.create_task("log-task")
+    await task_store.notify_status_update("log-task", TaskState.WORKING)
+    await task_store.notify_message_event("log-task", _message("hi"))
+
+    logged = await task_store.get_events_since("log-task", 0)
+    assert [event_id for event_id, _ in logged] == [1, 2]
+    assert task_store.get_event_id("log-task", logged[1][1]) == 2
+    assert await task_store.get_events_since("log-task", 1) == logged[1:]
+    # Events are logged even when nobody is listening
+    assert await task_store.get_listeners("log-task") == []
+
+@pytestmark_notify
+@pytest.mark.asyncio
+async def test_event_log_is_bounded():
+    task_store = InMemoryTaskStore(event_log_size=2)
+    await task_store.create_task("log-task")
+    for i in range(4):
+        await task_store.notify_message_event("log-task", _message(f"m{i}"))
+
+    logged = await task_store.get_events_since("log-task", 0)
+    assert [event_id for event_id, _ in logged] == [3, 4]
+    assert len(task_store._event_log_ids["log-task"]) == 2
+
+@pytestmark_notify
+@pytest.mark.asyncio
+async def test_event_log_discarded_with_task(task_store: InMemoryTaskStore):
+    await task_store.create_task("log-task")
+    await task_store.notify_status_update("log-task", TaskState.WORKING)
+    await task_store.delete_task("log-task")
+    assert await task_store.get_events_since("log-task", 0) == []
+
+    await task_store.create_task("log-task")
+    await task_store.notify_status_update("log-task", TaskState.WORKING)
+    assert [event_id for event_id, _ in await task_store.get_events_since("log-task", 0)] == [1]
+
+def test_event_log_disabled():
+    with pytest.raises(ValueError):
+        InMemoryTaskStore(event_log_size=-1)
+    assert InMemoryTaskStore(event_log_size=0)._record_event("t", object()) is None
+
+
+# --- Tests for wait_for_state ---
+@pytestmark_notify
+@pytest.mark.asyncio
+async def test_wait_for_state_returns_immediately_when_matching(task_store: InMemoryTaskStore):
+    await task_store.create_task("wait-task")
+    context = await task_store.wait_for_state("wait-task", [TaskState.SUBMITTED, TaskState.WORKING], timeout=0.01)
+    assert context is not None and context.current_state == TaskState.SUBMITTED
+    assert await task_store.wait_for_state("missing", [TaskState.COMPLETED], timeout=0.01) is None
+
+@pytestmark_notify
+@pytest.mark.asyncio
+async def test_wait_for_state_wakes_on_state_change(task_store: InMemoryTaskStore):
+    await task_store.create_task("wait-task")
+    waiters = [asyncio.create_task(task_store.wait_for_state("wait-task", [TaskState.COMPLETED], timeout=5)) for _ in range(2)]
+    await asyncio.sleep(0)
+    await task_store.update_task_state("wait-task", TaskState.WORKING)
+    await asyncio.sleep(0)
+    assert not any(waiter.done() for waiter in waiters)
+
+    await task_store.update_task_state("wait-task", TaskState.COMPLETED)
+    for context in await asyncio.wait_for(asyncio.gather(*waiters), 1):
+        assert context.current_state == TaskState.COMPLETED
+    assert task_store._state_changed == {} and task_store._state_waiters == {}
+
+@pytestmark_notify
+@pytest.mark.asyncio
+async def test_wait_for_state_timeout_and_delete(task_store: InMemoryTaskStore):
+    await task_store.create_task("wait-task")
+    context = await task_store.wait_for_state("wait-task", ["COMPLETED"], timeout=0.05)
+    assert context is not None and context.current_state == TaskState.SUBMITTED # Current state on timeout
+
+    waiter = asyncio.create_task(task_store.wait_for_state("wait-task", [TaskState.COMPLETED]))
+    await asyncio.sleep(0)
+    await task_store.delete_task("wait-task")
+    assert await asyncio.wait_for(waiter, 1) is None
@@ -16,7 +16,7 @@ from urllib.parse import parse_qs
 
 # Import core types from the agentvault library with fallback
 try:
-    from agentvault.models import Task, TaskState, A2AEvent, Message, TextPart, TaskStatusUpdateEvent, TaskMessageEvent, TaskArtifactUpdateEvent
+    from agentvault.models import Task, TaskState, A2AEvent, Message, TextPart, TaskStatusUpdateEvent, TaskMessageEvent, TaskArtifactUpdateEvent, TaskGetParams
     _MODELS_AVAILABLE = True
 except ImportError:
     logging.getLogger(__name__).warning("Failed to import core types from 'agentvault'. Using dummy types for mock server.")
@@ -25,6 +25,7 @@ except ImportError:
         SUBMITTED = "SUBMITTED"; WORKING = "WORKING"; COMPLETED = "COMPLETED"; FAILED = "FAILED"; CANCELED = "CANCELED" # type: ignore
     class Message: pass # type: ignore
     class TextPart: pass # type: ignore
+    class TaskGetParams: pass # type: ignore
     A2AEvent = Any # type: ignore
     class TaskStatusUpdateEvent: pass # type: ignore
     class TaskMessageEvent: pass # type: ignore
@@ -175,16 +176,34 @@ def setup_mock_a2a_routes(
     # --- MODIFIED: Default A2A Endpoint Handler (interacts with stores) ---
     def default_a2a_handler(request: httpx.Request) -> httpx.Response:
         logger.debug(f"Mock A2A Endpoint received request: {request.url} Method: {request.method}")
-        req_id: Union[str, int, None] = None; payload: Optional[Dict[str, Any]] = None
+        req_id: Union[str, int, None] = None; payload: Any = None
 
         # Auth Check (unchanged)
         if default_auth_check:
             auth_response = default_auth_check(request)
             if auth_response: logger.warning(f"Mock A2A auth check failed: {auth_response.status_code}"); error_resp = create_jsonrpc_error_response(req_id, JSONRPC_APP_ERROR, "Authentication failed"); return httpx.Response(200, json=error_resp, headers={"Content-Type": "application/json"})
 
+        try: payload = json.loads(request.content)
+        except Exception as e:
+            logger.warning(f"Mock A2A failed JSON parsing: {e}"); error_resp = create_jsonrpc_error_response(None, JSONRPC_PARSE_ERROR, "Parse error / Invalid Request"); return httpx.Response(200, json=error_resp, headers={"Content-Type": "application/json"})
+
+        # JSON-RPC batch: process each entry and collect the response objects
+        if isinstance(payload, list):
+            if not payload:
+                error_resp = create_jsonrpc_error_response(None, JSONRPC_INVALID_REQUEST, "Invalid Request: Batch must not be empty."); return httpx.Response(200, json=error_resp)
+            logger.info(f"Mock A2A processing batch of {len(payload)} entries")
+            batch_responses = []
+            for entry in payload:
+                if isinstance(entry, dict) and entry.get("method") == "tasks/sendSubscribe":
+                    batch_responses.append(create_jsonrpc_error_response(entry.get("id"), JSONRPC_INVALID_REQUEST, "Invalid Request: 'tasks/sendSubscribe' cannot be used in a batch.")); continue
+                batch_responses.append(json.loads(handle_single_request(entry).content))
+            return httpx.Response(200, json=batch_responses)
+        return handle_single_request(payload)
+
+    def handle_single_request(payload: Any) -> httpx.Response:
+        req_id: Union[str, int, None] = None
         # JSON-RPC Parsing (unchanged)
         try:
-            payload = json.loads(request.content);
             if not isinstance(payload, dict): raise ValueError("Payload not a dict")
             method = payload.get("method"); params = payload.get("params", {}); req_id = payload.get("id")
             if not method or "id" not in payload or payload.get("jsonrpc") != "2.0": raise ValueError("Invalid JSON-RPC structure")
@@ -217,15 +236,23 @@ def setup_mock_a2a_routes(
 
                 result = {"id": task_id}; resp_json = create_jsonrpc_success_response(req_id, result); return httpx.Response(200, json=resp_json)
 
-            elif method == "tasks/get":
+            elif method in ("tasks/get", "tasks/wait"):
+                # Stored states only change when the test changes them, so tasks/wait answers immediately like tasks/get
                 task_id = params.get("id")
                 if not task_id or task_store is None or task_id not in task_store:
-                    logger.warning(f"Mock A2A tasks/get: Task ID '{task_id}' not found in store.")
+                    logger.warning(f"Mock A2A {method}: Task ID '{task_id}' not found in store.")
                     error_resp = create_jsonrpc_error_response(req_id, JSONRPC_TASK_NOT_FOUND, "Task not found"); return httpx.Response(200, json=error_resp)
 
                 # Retrieve state from store and build response
                 task_state = task_store[task_id].get("state", TaskState.COMPLETED if _MODELS_AVAILABLE else "COMPLETED") # Default if state missing
                 task_data_dict = create_default_mock_task(task_id, state=task_state) # Use helper with state
+                if "messages" in task_store[task_id]: task_data_dict["messages"] = task_store[task_id]["messages"] # Message dicts stored by the test
+                if _MODELS_AVAILABLE and any(params.get(key) is not None for key in ("include", "since", "limit")):
+                    # Apply the tasks/get window like the Server SDK router does
+                    try: get_params = TaskGetParams.model_validate(params)
+                    except Exception as e:
+                        error_resp = create_jsonrpc_error_response(req_id, JSONRPC_INVALID_PARAMS, f"Invalid params: {e}"); return httpx.Response(200, json=error_resp)
+                    task_data_dict = get_params.apply(Task.model_validate(task_data_dict)).model_dump(mode="json", by_alias=True)
                 resp_json = create_jsonrpc_success_response(req_id, task_data_dict); return httpx.Response(200, json=resp_json)
 
             elif method == "tasks/cancel":
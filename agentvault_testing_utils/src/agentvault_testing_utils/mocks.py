@@ -115,12 +115,14 @@ class MockAgentVaultClient:
         return self.send_message_return_value
 
     async def get_task_status(
-        self, agent_card: AgentCard, task_id: str, key_manager: KeyManager
+        self, agent_card: AgentCard, task_id: str, key_manager: KeyManager,
+        *, include: Optional[List[str]] = None, since: Optional[int] = None, limit: Optional[int] = None
     ) -> Task:
-        """Mock implementation of get_task_status."""
+        """Mock implementation of get_task_status (window parameters are recorded, not applied)."""
         logger.debug(f"Mock get_task_status called with task_id: {task_id}")
-        await self.call_recorder.get_task_status( # Await recorder call
-            agent_card=agent_card, task_id=task_id, key_manager=key_manager
+        window = {key: value for key, value in (("include", include), ("since", since), ("limit", limit)) if value is not None}
+        await self.call_recorder.get_task_status( # Await recorder call (window parameters only if given)
+            agent_card=agent_card, task_id=task_id, key_manager=key_manager, **window
         )
         if self.get_task_status_side_effect:
             raise self.get_task_status_side_effect
@@ -88,11 +88,8 @@ class OAuthProtectedAgent(BaseA2AAgent):
         task_context = await self.task_store.get_task(task_id)
         if task_context is None: raise TaskNotFoundError(task_id=task_id)
 
-        # Keep connection open while task is running
+        # Keep connection open until the task finishes (or is deleted)
         terminal_states = {TaskState.COMPLETED, TaskState.FAILED, TaskState.CANCELED}
-        while task_context.current_state not in terminal_states:
-            await asyncio.sleep(1)
-            task_context = await self.task_store.get_task(task_id)
-            if task_context is None: break
+        await self.task_store.wait_for_state(task_id, terminal_states)
         logger.info(f"Subscription stream ending for OAuth task {task_id}")
         if False: yield # pragma: no cover
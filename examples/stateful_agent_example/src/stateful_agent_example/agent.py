@@ -12,7 +12,7 @@ from agentvault_server_sdk.exceptions import TaskNotFoundError, InvalidStateTran
 # Core Model Imports
 from agentvault.models import (
     Message, Task, TaskState, TextPart, A2AEvent,
-    TaskStatusUpdateEvent, TaskMessageEvent
+    TaskStatusUpdateEvent, TaskMessageEvent, TaskGetParams
 )
 
 # Local state import
@@ -76,21 +76,22 @@ class StatefulChatAgent(BaseA2AAgent):
 
             return new_task_id
 
-    async def handle_task_get(self, task_id: str) -> Task:
-        """Retrieve task status and history."""
+    async def handle_task_get(self, task_id: str, params: Optional[TaskGetParams] = None) -> Task:
+        """Retrieve task status and (a window of) its history."""
         logger.info(f"StatefulChatAgent handling task get: task_id={task_id}")
         task_context = await self.task_store.get_task(task_id)
         if task_context is None or not isinstance(task_context, ChatTaskContext):
             raise TaskNotFoundError(task_id=task_id)
 
+        # Only the requested window of the history is copied, so state polls stay cheap
+        selected = (params or TaskGetParams(id=task_id)).select(task_context.history, [])
         return Task(
             id=task_context.task_id,
             state=task_context.current_state,
             createdAt=task_context.created_at,
             updatedAt=task_context.updated_at,
-            messages=task_context.history, # Include history
-            artifacts=[],
-            metadata={"info": "Stateful chat agent task"}
+            metadata={"info": "Stateful chat agent task"},
+            **selected
         )
 
     async def handle_task_cancel(self, task_id: str) -> bool:
@@ -118,12 +119,9 @@ class StatefulChatAgent(BaseA2AAgent):
         task_context = await self.task_store.get_task(task_id)
         if task_context is None: raise TaskNotFoundError(task_id=task_id)
 
-        # Keep connection open while task is running
+        # Keep connection open until the task finishes (or is deleted)
         terminal_states = {TaskState.COMPLETED, TaskState.FAILED, TaskState.CANCELED}
-        while task_context.current_state not in terminal_states:
-            await asyncio.sleep(1) # Check periodically
-            task_context = await self.task_store.get_task(task_id)
-            if task_context is None: break
+        await self.task_store.wait_for_state(task_id, terminal_states)
         logger.info(f"Subscription stream ending for stateful task {task_id}")
         if False: yield # pragma: no cover
 